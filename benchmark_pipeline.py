@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+End-to-End Benchmark for the Motor Learning Pipeline
+Times each pipeline stage on synthetic cohorts and records peak memory.
+
+Cohorts come from synthetic_dflow_generator.py (reused when the parameters
+match), the pipeline classes come from the muh package, and stages are timed
+with muh.StageProfiler (peak RSS of this process sampled during each stage;
+pool workers are not included). Every run is
+written to benchmark_<run_id>.json and appended to benchmark_history.csv so
+regressions and speedups can be tracked over time.
+
+Stages: generate, ingest_cold (empty stride cache), ingest_warm (warm stride
+cache), ingest_cached (processed_data.pkl), metrics, gait (heel strikes from the
+raw force channels of every export), stats, population_plots,
+statistical_plots and individual_plots (only with --individual-plots N).
+
+Requirements:
+- the muh package's dependencies (numpy, pandas, scipy, scikit-learn, statsmodels,
+  matplotlib, seaborn, tqdm, pingouin)
+
+Usage:
+    python benchmark_pipeline.py --sizes 10 100 --sample-rate 60
+    python benchmark_pipeline.py --sizes 1000 --stages ingest_cold metrics --trace-memory
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+import muh
+import synthetic_dflow_generator as generator
+
+ALL_STAGES = ['generate', 'ingest_cold', 'ingest_warm', 'ingest_cached', 'metrics', 'gait', 'stats',
+              'population_plots', 'statistical_plots', 'individual_plots']
+
+
+def measure(stage: str, func: Callable, profiler: 'muh.StageProfiler', trace_memory: bool = False,
+            verbose: bool = False) -> Dict:
+    """Run one stage under `profiler`; returns its timing/memory record (the stage's result under 'result')."""
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    if trace_memory:
+        tracemalloc.start()
+
+    result, error = None, None
+    with output:
+        try:
+            with profiler.stage(stage):
+                result = func()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+
+    peak_traced = None
+    if trace_memory:
+        peak_traced = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        tracemalloc.stop()
+
+    timing = profiler.records.pop(stage)
+    return {
+        'stage': stage,
+        'wall_s': round(timing['wall_s'], 4),
+        'cpu_s': round(timing['cpu_s'], 4),
+        'peak_rss_mb': round(timing['peak_rss_mb'], 1) if timing['peak_rss_mb'] is not None else None,
+        'rss_source': profiler.rss_source,
+        'peak_traced_mb': round(peak_traced, 2) if peak_traced is not None else None,
+        'ok': error is None,
+        'error': error,
+        'result': result
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=Path(__file__).parent, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def run_stats(data_manager, metrics_df) -> Dict:
+    """The StatisticalAnalyzer models run by MotorLearningAnalysis."""
+    analyzer = muh.StatisticalAnalyzer(metrics_df, data_manager.config)
+    completed = {}
+    for name, call in [('regression', analyzer.run_regression_analysis),
+                       ('classification', analyzer.run_classification_analysis),
+                       ('mixed_effects', analyzer.run_mixed_effects_analysis),
+                       ('rm_anova', analyzer.run_repeated_measures_anova),
+                       ('multivariate_regression', analyzer.run_multivariate_regression)]:
+        try:
+            call()
+            completed[name] = True
+        except Exception as e:
+            completed[name] = f"{type(e).__name__}: {e}"
+    return completed
+
+
+def benchmark_cohort(n_subjects: int, args, run_dir: Path) -> List[Dict]:
+    """Run the selected stages on one synthetic cohort."""
+    cohort_dir = Path(args.output) / 'cohorts' / (
+        f"n{n_subjects}_s{args.strides}_r{args.sample_rate:g}_seed{args.seed}")
+    output_dir = run_dir / f"n{n_subjects}"
+    stages = args.stages
+    records = []
+    state = {}
+    profiler = muh.StageProfiler()
+
+    def record(stage: str, func: Callable):
+        entry = measure(stage, func, profiler, trace_memory=args.trace_memory, verbose=args.verbose)
+        state[stage] = entry.pop('result')
+        records.append({'n_subjects': n_subjects, **entry})
+        status = '✓' if entry['ok'] else f"❌ {entry['error']}"
+        memory = f", rss {entry['peak_rss_mb']:.0f} MB" if entry['peak_rss_mb'] is not None else ''
+        if entry['peak_traced_mb'] is not None:
+            memory += f", traced {entry['peak_traced_mb']:.1f} MB"
+        print(f"   {stage:<18} {entry['wall_s']:>9.3f}s wall {entry['cpu_s']:>9.3f}s cpu{memory}  {status}")
+        return state[stage]
+
+    print(f"\n📊 Cohort of {n_subjects} subjects")
+
+    generate = lambda: generator.generate_cohort(
+        cohort_dir, n_subjects=n_subjects, workers=args.workers, n_strides=args.strides,
+        sample_rate=args.sample_rate, seed=args.seed)
+    if 'generate' in stages:
+        record('generate', generate)
+    else:
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate()
+
+    shutil.rmtree(output_dir, ignore_errors=True)
+    config = None
+    with contextlib.redirect_stdout(io.StringIO()):
+        config = muh.Config(str(output_dir))
+
+    def ingest(force_reprocess: bool):
+        return muh.MotorLearningDataManager(
+            str(cohort_dir / 'metadata.csv'), str(cohort_dir), config=config,
+            force_reprocess=force_reprocess, debug=False, workers=args.workers)
+
+    data_manager = None
+    if 'ingest_cold' in stages:
+        shutil.rmtree(config.STRIDE_CACHE_DIR, ignore_errors=True)
+        data_manager = record('ingest_cold', lambda: ingest(True))
+    if 'ingest_warm' in stages:
+        data_manager = record('ingest_warm', lambda: ingest(True)) or data_manager
+    if 'ingest_cached' in stages:
+        data_manager = record('ingest_cached', lambda: ingest(False)) or data_manager
+    if data_manager is None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            data_manager = ingest(False)
+
+    metrics_df = None
+    calculate = lambda: muh.MetricsCalculator(data_manager).calculate_all_metrics(engine=args.metrics_engine)
+    if 'metrics' in stages:
+        metrics_df = record('metrics', calculate)
+    if metrics_df is None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            metrics_df = calculate()
+
+    if 'gait' in stages:
+        detector = muh.GaitEventDetector.from_config(config)
+        record('gait', lambda: {name: len(table) for name, table in detector.detect_cohort(data_manager).items()})
+
+    if 'stats' in stages:
+        record('stats', lambda: run_stats(data_manager, metrics_df))
+
+    needs_visualizer = {'population_plots', 'statistical_plots', 'individual_plots'} & set(stages)
+    if needs_visualizer:
+        with contextlib.redirect_stdout(io.StringIO()):
+            visualizer = muh.StandaloneEnhancedVisualizer(muh.MotorLearningAnalysis(data_manager, metrics_df))
+        if 'population_plots' in stages:
+            record('population_plots', visualizer.generate_enhanced_population_plots)
+        if 'statistical_plots' in stages:
+            record('statistical_plots', visualizer.generate_statistical_plots)
+        if 'individual_plots' in stages and args.individual_plots:
+            record('individual_plots', lambda: visualizer.plot_all_individual_stride_changes(
+                max_subjects=args.individual_plots, workers=args.workers, skip_unchanged=False))
+
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the motor learning pipeline on synthetic cohorts")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100], help="Cohort sizes (subjects)")
+    parser.add_argument('--stages', nargs='+', default=ALL_STAGES, choices=ALL_STAGES, help="Stages to time")
+    parser.add_argument('--strides', type=int, default=generator.DEFAULTS['n_strides'], help="Strides per trial")
+    parser.add_argument('--sample-rate', type=float, default=60.0,
+                        help="Samples per second (D-Flow records ~300; lower keeps large cohorts small on disk)")
+    parser.add_argument('--seed', type=int, default=0, help="Generator seed")
+    parser.add_argument('--workers', type=int, default=1, help="Processes for generation, ingestion and figures")
+    parser.add_argument('--metrics-engine', default=None, choices=['cohort', 'subject'],
+                        help="MetricsCalculator engine (default: Config.METRICS_ENGINE)")
+    parser.add_argument('--individual-plots', type=int, default=0,
+                        help="Render stride-change figures for the first N subjects")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="Record per-stage peak allocations with tracemalloc (slows stages down)")
+    parser.add_argument('--output', default='benchmark_results', help="Directory for cohorts and reports")
+    parser.add_argument('--verbose', action='store_true', help="Show pipeline output")
+    args = parser.parse_args()
+
+    run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+    run_dir = Path(args.output) / 'runs' / run_id
+    run_dir.mkdir(parents=True, exist_ok=True)
+
+    print(f"⏱️ Benchmark run {run_id}")
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+
+    records = []
+    for n_subjects in args.sizes:
+        records.extend(benchmark_cohort(n_subjects, args, run_dir))
+
+    environment = {
+        'run_id': run_id,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'git_commit': _git_commit(),
+        'python': sys.version.split()[0],
+        'pandas': pd.__version__,
+        'cpu_count': os.cpu_count(),
+        'strides': args.strides,
+        'sample_rate': args.sample_rate,
+        'seed': args.seed,
+        'workers': args.workers
+    }
+
+    report_path = Path(args.output) / f'benchmark_{run_id}.json'
+    with open(report_path, 'w') as f:
+        json.dump({'environment': environment, 'records': records}, f, indent=2, default=str)
+
+    history_path = Path(args.output) / 'benchmark_history.csv'
+    history = pd.DataFrame([{**environment, **record} for record in records])
+    if history_path.exists():
+        # Rewrite rather than append so runs with different columns stay aligned
+        history = pd.concat([pd.read_csv(history_path), history], ignore_index=True)
+    history.to_csv(history_path, index=False)
+
+    print(f"\n📄 Report: {report_path}")
+    print(f"📈 History: {history_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Motor Learning Analysis (MUH)
+Ingestion, metrics, statistics and figures for the D-Flow stride-length
+adaptation task.
+
+Classes are imported lazily on first access, so `import muh` is cheap and a
+metrics-only run never loads scikit-learn, statsmodels, matplotlib or seaborn:
+
+    from muh import Config, MotorLearningDataManager, MetricsCalculator
+
+The command line entry point is `python -m muh` (see muh/cli.py).
+"""
+
+import importlib
+import os
+
+os.environ.setdefault('OMP_NUM_THREADS', '1')  # fix for Kmeans potential memory leak
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'Config': 'config',
+    'DataUtils': 'utils',
+    'AnomalyLog': 'utils',
+    'StrideCache': 'utils',
+    'CompactFrame': 'utils',
+    'TrialRecord': 'utils',
+    'ExportCatalog': 'catalog',
+    'TrialProcessor': 'trials',
+    'MotorLearningDataManager': 'data',
+    'MetricsCalculator': 'metrics',
+    'StatisticalAnalyzer': 'stats',
+    'ResamplingEngine': 'resampling',
+    'DensityEstimator': 'density',
+    'MotorLearningAnalysis': 'analysis',
+    'StandaloneEnhancedVisualizer': 'visualization',
+    'StageProfiler': 'profiling',
+    'LiveTrialMonitor': 'streaming',
+    'GaitEventDetector': 'gait',
+    'MetricsStore': 'store',
+    'ArtifactGraph': 'artifacts',
+    'StreamlinedMotorLearningPipeline': 'pipeline',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{_EXPORTS[name]}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
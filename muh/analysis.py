@@ -0,0 +1,130 @@
+"""Top-level analysis object tying the data, statistics and figures together."""
+
+from typing import Dict
+
+import pandas as pd
+
+from .stats import StatisticalAnalyzer
+from .visualization import StandaloneEnhancedVisualizer
+
+
+# 8. ANALYSIS PIPELINE
+# ==============================================================================
+# ORIGINAL ANALYSIS CLASS (RESTORED)
+# ==================================
+# This version uses the fixed StandaloneEnhancedVisualizer
+
+class MotorLearningAnalysis:
+    """Updated to use centralized config and new visualizer."""
+    
+    def __init__(self, data_manager, metrics_df: pd.DataFrame):
+        self.data_manager = data_manager
+        self.metrics_df = metrics_df
+        
+        # KEY CHANGE: Get config from data_manager
+        self.config = data_manager.config
+        
+        # KEY CHANGE: Pass config to analyzer
+        self.analyzer = StatisticalAnalyzer(metrics_df, self.config)
+        
+        # KEY CHANGE: Use StandaloneEnhancedVisualizer with config
+        self.visualizer = StandaloneEnhancedVisualizer(self)
+    
+    def run_comprehensive_analysis(self, save_all: bool = True) -> Dict:
+        """Updated to use config for saving."""
+        
+        results = {}
+        
+        print("🔬 Running Comprehensive Motor Learning Analysis...")
+        print(f"📁 Outputs will be saved to: {self.config.BASE_OUTPUT_DIR}")
+        
+        # Print age summary (unchanged)
+        if 'age' in self.metrics_df.columns:
+            ages = self.metrics_df['age'].dropna()
+            print(f"📊 Age range: {ages.min():.1f} - {ages.max():.1f} years (n={len(ages)})")
+        
+        # 1. Regression Analysis (unchanged logic, but could use config thresholds)
+        print("📊 Running regression analysis...")
+        try:
+            regression_results = self.analyzer.run_regression_analysis()
+            results['regression'] = regression_results
+            print(f"✓ Regression R² = {regression_results['metrics']['r2']:.3f}")
+            cv = regression_results.get('cv') or {}
+            if 'summary' in cv:
+                r2 = cv['summary']['r2']
+                print(f"   Repeated {cv['n_splits']}-fold CV R² = {r2['mean']:.3f} ± {r2['std']:.3f} ({cv['n_repeats']} repeats)")
+            
+            for feature, importance in regression_results['feature_importances'].items():
+                print(f"   {feature}: {importance:.4f}")
+                
+        except Exception as e:
+            print(f"❌ Regression analysis failed: {e}")
+        
+        # 2. Classification Analysis (unchanged)
+        print("🎯 Running classification analysis...")
+        try:
+            classification_results = self.analyzer.run_classification_analysis()
+            results['classification'] = classification_results
+            print(f"✓ Classification AUC = {classification_results['metrics']['roc_auc']:.3f}")
+            print(f"   Accuracy = {classification_results['metrics']['accuracy']:.3f}")
+            cv = classification_results.get('cv') or {}
+            if 'summary' in cv:
+                auc = cv['summary']['roc_auc']
+                print(f"   Repeated {cv['n_splits']}-fold CV AUC = {auc['mean']:.3f} ± {auc['std']:.3f} ({cv['n_repeats']} repeats)")
+        except Exception as e:
+            print(f"❌ Classification analysis failed: {e}")
+        
+        # 3. Mixed Effects Analysis (unchanged)
+        print("📈 Running mixed-effects analysis...")
+        try:
+            mixed_model = self.analyzer.run_mixed_effects_analysis()
+            results['mixed_effects'] = mixed_model
+            print(f"✓ Mixed-effects R² = {mixed_model.rsquared:.3f}")
+        except Exception as e:
+            print(f"❌ Mixed-effects analysis failed: {e}")
+        
+        # 4. Enhanced Visualizations - KEY CHANGE: Uses config-managed paths
+        print("📊 Generating enhanced visualizations...")
+        try:
+            # The visualizer now automatically saves to config-managed directories
+            self.visualizer.plot_population_analyses(save=save_all)
+            print("✓ Enhanced visualizations complete")
+            print(f"📁 Plots saved to: {self.config.POPULATION_PLOTS_DIR}")
+        except Exception as e:
+            print(f"❌ Visualization failed: {e}")
+        
+        print("🎉 Comprehensive analysis complete!")
+        print(f"📁 All outputs in: {self.config.BASE_OUTPUT_DIR}")
+        return results
+
+    def run_repeated_measures_analysis(self) -> Dict:
+        """Run comprehensive repeated measures analysis."""
+        
+        print("🔬 Running repeated measures analysis...")
+        results = {}
+        
+        # 1. Repeated Measures ANOVA
+        print("📊 Repeated measures ANOVA...")
+        rm_anova = self.analyzer.run_repeated_measures_anova()
+        results['rm_anova'] = rm_anova
+        
+        if 'trial_type_effect' in rm_anova:
+            effect = rm_anova['trial_type_effect']
+            print(f"   Trial type effect: F={effect['F']:.3f}, p={effect['p_value']:.3f}, η²={effect['effect_size']:.3f}")
+        
+        # 2. Multivariate Regression
+        print("📈 Multivariate multiple regression...")
+        mv_regression = self.analyzer.run_multivariate_regression()
+        results['multivariate_regression'] = mv_regression
+        
+        if 'overall_r2' in mv_regression:
+            print(f"   Overall R²={mv_regression['overall_r2']:.3f}")
+            for outcome, r2 in mv_regression['individual_r2'].items():
+                print(f"   {outcome}: R²={r2:.3f}")
+        
+        # 3. Mixed Effects
+        print("🎯 Mixed effects model...")
+        mixed_model = self.analyzer.run_mixed_effects_repeated_measures()
+        results['mixed_effects'] = mixed_model
+        
+        return results
@@ -0,0 +1,481 @@
+"""Pipeline stages as a dependency graph whose outputs are memoized on disk."""
+
+import contextlib
+import hashlib
+import inspect
+import io
+import json
+import multiprocessing
+import os
+import pickle
+import time
+import types
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+import pandas as pd
+
+
+# ARTIFACT GRAPH (memoized, dependency-tracked pipeline stages)
+# ==========================================================================
+
+_ACTIVE_GRAPH = None  # graph whose parallel stages forked workers run (see _run_stage_job)
+
+
+def _code_digest(code: types.CodeType, digest) -> None:
+    """Feed bytecode, names and constants (recursively) into `digest`; line numbers are left out."""
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode('utf-8'))
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _code_digest(const, digest)
+        elif isinstance(const, frozenset):
+            digest.update(repr(sorted(map(repr, const))).encode('utf-8'))
+        else:
+            digest.update(repr(const).encode('utf-8'))
+
+
+def _code_names(code: types.CodeType) -> set:
+    """Global and attribute names used by `code` and its nested functions."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _code_names(const)
+    return names
+
+
+def _class_functions(cls: type) -> List[Callable]:
+    """Functions defined in `cls` (static and class methods unwrapped)."""
+    functions = []
+    for attr in vars(cls).values():
+        attr = getattr(attr, '__func__', attr)
+        if isinstance(attr, types.FunctionType):
+            functions.append(attr)
+    return functions
+
+
+def _package(obj) -> str:
+    return (getattr(obj, '__module__', None) or '').split('.')[0]
+
+
+def _code_closure(functions: Iterable[Callable]) -> List[Callable]:
+    """
+    `functions` plus the code of their package they reach: module functions
+    they call, and the methods named in their code on the object they are
+    bound to (self._helper) or on classes they use (MetricsCalculator(...).method,
+    estimator.evaluate for a DensityEstimator created there). Names are
+    resolved without running anything, so the closure may include code a call
+    does not take - it errs on the side of invalidating a stage. Classes passed
+    in `functions` contribute every method.
+    """
+    closure, seen = [], set()
+    pending = [(func, None) for func in functions]
+    while pending:
+        func, owner = pending.pop()
+        func = inspect.unwrap(func)
+        owner = getattr(func, '__self__', owner)
+        func = inspect.unwrap(getattr(func, '__func__', func))
+        if isinstance(func, type):
+            pending.extend((method, func) for method in _class_functions(func))
+            continue
+        code = getattr(func, '__code__', None)
+        if code is None or code in seen:
+            continue
+        seen.add(code)
+        closure.append(func)
+        
+        package = _package(func)
+        names = _code_names(code)
+        owners = [(owner if isinstance(owner, type) else type(owner), names)] if owner is not None else []
+        for name in names:
+            target = getattr(func, '__globals__', {}).get(name)
+            if isinstance(target, types.FunctionType) and _package(target) == package:
+                pending.append((target, None))
+            elif isinstance(target, type) and _package(target) == package:
+                owners.append((target, names | {'__init__'}))  # instantiated here
+        for owner_type, used in owners:
+            for name in used:
+                method = inspect.getattr_static(owner_type, name, None)
+                method = getattr(method, '__func__', method)
+                if isinstance(method, types.FunctionType) and _package(method) == package:
+                    pending.append((method, owner_type))
+    return closure
+
+
+def _code_fingerprint(functions: Iterable[Callable]) -> str:
+    """
+    Hash of the code that actually runs (profiler wrappers and bound methods
+    unwrapped), including the helpers it reaches (see _code_closure).
+    """
+    digest = hashlib.sha1()
+    for func in sorted(_code_closure(functions), key=lambda f: (f.__module__ or '', f.__qualname__)):
+        digest.update(f"{func.__module__}.{func.__qualname__}".encode('utf-8'))
+        _code_digest(func.__code__, digest)
+    return digest.hexdigest()
+
+
+def _file_signature(path: Union[str, Path]) -> Optional[List[int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _value_digest(value: Any):
+    """
+    Content hash of a stage value. DataFrames are hashed column by column from
+    their labels, dtypes and values (their pickles change with internal state,
+    e.g. after boolean indexing).
+    """
+    if not isinstance(value, pd.DataFrame):
+        return hashlib.sha1(pickle.dumps(value, protocol=4))
+    
+    digest = hashlib.sha1(pd.util.hash_pandas_object(value.index).to_numpy().tobytes())
+    for column in value.columns:
+        series = value[column]
+        digest.update(f"{column}:{series.dtype}".encode('utf-8'))
+        try:
+            digest.update(pd.util.hash_pandas_object(series, index=False).to_numpy().tobytes())
+        except TypeError:  # unhashable cells, e.g. the period index columns
+            digest.update(pickle.dumps(series.tolist(), protocol=4))
+    return digest
+
+
+def _run_stage_job(name: str):
+    """Process-pool worker: run one stage of the (forked) active graph, capturing its output."""
+    graph = _ACTIVE_GRAPH
+    stage = graph.stages[name]
+    log = io.StringIO()
+    value = error = None
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(log):
+        try:
+            value = stage['func'](*[graph.values[dep] for dep in stage['deps']])
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+    return value, log.getvalue(), error, time.perf_counter() - start
+
+
+class ArtifactGraph:
+    """
+    Pipeline stages wired by their inputs, each memoized on disk.
+
+    A stage is a function of its dependencies' values (passed positionally in
+    `deps` order). Its cache key hashes the stage's bytecode and that of the
+    helpers it reaches (plus anything listed in `code`), the fingerprints of
+    its inputs and the current values of the parameters it declares. run()
+    loads every stage whose key has a stored artifact - and whose output files
+    are unchanged since - and executes only the others. An executed stage is fingerprinted by its value
+    and the contents of its files, so a rerun that reproduces the same output
+    leaves the stages downstream of it cached.
+
+    Stages flagged `parallel` (figures) that become ready together run in a
+    forked process pool; where fork is unavailable they run serially.
+
+    Usage:
+        graph = ArtifactGraph(config.ARTIFACT_CACHE_DIR, params=[config])
+        graph.add('metrics', compute_metrics, store=False)
+        graph.add('filter', filter_cohort, deps=['metrics'], params=['MOTOR_NOISE_THRESHOLD'])
+        graph.add('age_vs_motor_noise', draw, deps=['filter'], params=['FIGURE_DPI'],
+                  files=lambda paths: paths, parallel=True)
+        values = graph.run(workers=4)
+        graph.summary()                 # status (cached / run / failed / blocked) per stage
+    """
+
+    ENTRY_VERSION = 1  # bump when the stored entry format changes
+    KEEP_ENTRIES = 4  # artifacts kept per stage, so toggling a parameter back is a cache hit
+
+    def __init__(self, cache_dir: Union[str, Path], params: Sequence = ()):
+        """
+        Parameters:
+        -----------
+        cache_dir : str or Path
+            Directory holding one subdirectory of artifacts per stage
+        params : sequence of dicts / objects
+            Where declared parameters are looked up, in order (dict keys or
+            attributes, e.g. the pipeline settings and a Config)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.param_sources = list(params)
+        self.stages = {}
+        self.values = {}
+        self.fingerprints = {}
+        self.records = {}
+
+    def add(self, name: str, func: Callable, deps: Sequence[str] = (), params: Sequence[str] = (),
+            code: Sequence[Callable] = (), files: Union[Sequence, Callable, None] = None,
+            fingerprint: Optional[Callable[[Any], str]] = None, store: bool = True,
+            parallel: bool = False) -> None:
+        """
+        Register a stage (dependencies must be added first).
+
+        Parameters:
+        -----------
+        name : str
+            Stage name (also its cache subdirectory)
+        func : callable
+            Called with the values of `deps`; its return value is the artifact
+        deps : sequence of str
+            Stages whose values are passed to `func`
+        params : sequence of str
+            Parameters `func` reads (looked up in the graph's param sources)
+        code : sequence of callables or classes
+            Code whose edits should also invalidate the stage, besides what
+            `func` reaches by itself (see _code_closure)
+        files : list of paths, or callable(value) -> paths
+            Files the stage writes; the artifact is stale once any of them changes
+        fingerprint : callable(value) -> str, optional
+            Cheaper or more stable fingerprint than hashing the pickled value
+        store : bool, default True
+            Memoize on disk; False for sources that are cheap to produce (always run)
+        parallel : bool, default False
+            May run in a worker process alongside other ready parallel stages
+        """
+        if name in self.stages:
+            raise ValueError(f"Stage '{name}' is already defined")
+        missing = [dep for dep in deps if dep not in self.stages]
+        if missing:
+            raise ValueError(f"Stage '{name}' depends on undefined stages {missing}")
+
+        self.stages[name] = {
+            'func': func,
+            'deps': list(deps),
+            'params': list(params),
+            'code': _code_fingerprint([func, *code]),
+            'files': files,
+            'fingerprint': fingerprint,
+            'store': store,
+            'parallel': parallel
+        }
+
+    def run(self, targets: Optional[Sequence[str]] = None, workers: int = 1, profiler=None,
+            profile: bool = False, initializer: Optional[Callable] = None) -> Dict[str, Any]:
+        """
+        Bring `targets` (default: every stage) and their dependencies up to date.
+
+        Parameters:
+        -----------
+        targets : sequence of str, optional
+            Stages wanted; their dependencies are included
+        workers : int, default 1
+            Processes for parallel stages
+        profiler : StageProfiler, optional
+            Records every executed stage (parallel batches as 'parallel_stages')
+        profile : bool, default False
+            Passed to profiler.stage (cProfile capture)
+        initializer : callable, optional
+            Run once in every worker process (e.g. to switch matplotlib to Agg)
+
+        Returns:
+        --------
+        Dict : Values of the stages that are up to date; failed stages and
+            the stages downstream of them are listed in summary()
+        """
+        needed = self._closure(targets)
+        self.values, self.fingerprints, self.records = {}, {}, {}
+        can_fork = workers > 1 and 'fork' in multiprocessing.get_all_start_methods()
+        batch = []
+
+        for name in self.stages:
+            if name not in needed:
+                continue
+            stage = self.stages[name]
+            if any(dep in batch for dep in stage['deps']):
+                self._run_batch(batch, workers, profiler, profile, initializer)
+                batch = []
+
+            failed = [dep for dep in stage['deps'] if self.records[dep]['status'] in ('failed', 'blocked')]
+            if failed:
+                self._record(name, 'blocked', None, error=f"needs {', '.join(failed)}")
+                continue
+
+            key = self._key(name)
+            if self._load(name, key):
+                continue
+            self.records[name] = {'status': 'pending', 'key': key}
+            if stage['parallel'] and can_fork:
+                batch.append(name)
+            else:
+                self._execute(name, key, profiler, profile)
+
+        if batch:
+            self._run_batch(batch, workers, profiler, profile, initializer)
+        return dict(self.values)
+
+    def summary(self) -> pd.DataFrame:
+        """One row per stage of the last run: status, seconds spent (or saved, if cached), key and error."""
+        rows = [{'stage': name, **record} for name, record in self.records.items()]
+        return pd.DataFrame(rows, columns=['stage', 'status', 'seconds', 'key', 'error'])
+
+    def clear(self, stages: Optional[Sequence[str]] = None) -> int:
+        """Delete the stored artifacts of `stages` (default: all); returns the number removed."""
+        removed = 0
+        for name in stages if stages is not None else self.stages:
+            for entry_file in (self.cache_dir / name).glob('*.pkl'):
+                entry_file.unlink()
+                removed += 1
+        return removed
+
+    # --------------------------------------------------------------------------
+
+    def _closure(self, targets: Optional[Sequence[str]]) -> set:
+        if targets is None:
+            return set(self.stages)
+        needed, stack = set(), list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in self.stages:
+                raise KeyError(f"Unknown stage '{name}'")
+            if name not in needed:
+                needed.add(name)
+                stack.extend(self.stages[name]['deps'])
+        return needed
+
+    def _param(self, name: str):
+        for source in self.param_sources:
+            if isinstance(source, dict):
+                if name in source:
+                    return source[name]
+            elif hasattr(source, name):
+                return getattr(source, name)
+        return None
+
+    def _key(self, name: str) -> str:
+        stage = self.stages[name]
+        return hashlib.sha1(json.dumps({
+            'version': self.ENTRY_VERSION,
+            'stage': name,
+            'code': stage['code'],
+            'inputs': [self.fingerprints[dep] for dep in stage['deps']],
+            'params': {param: self._param(param) for param in stage['params']}
+        }, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def _entry_path(self, name: str, key: str) -> Path:
+        return self.cache_dir / name / f'{key}.pkl'
+
+    def _load(self, name: str, key: str) -> bool:
+        """Use the stored artifact for `key` if there is one and its files are unchanged."""
+        if not self.stages[name]['store']:
+            return False
+        entry_path = self._entry_path(name, key)
+        try:
+            with open(entry_path, 'rb') as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            print(f"   ⚠️ Unreadable artifact for {name} ({type(e).__name__}) - rerunning")
+            return False
+        if any(_file_signature(path) != signature for path, signature in entry['files'].items()):
+            return False
+
+        os.utime(entry_path)  # recently used entries survive pruning
+        self.values[name] = entry['value']
+        self.fingerprints[name] = entry['fingerprint']
+        self._record(name, 'cached', key, seconds=entry['seconds'])
+        return True
+
+    def _execute(self, name: str, key: str, profiler, profile: bool) -> None:
+        stage = self.stages[name]
+        timer = profiler.stage(name, profile=profile) if profiler is not None else contextlib.nullcontext()
+        start = time.perf_counter()
+        try:
+            with timer:
+                value = stage['func'](*[self.values[dep] for dep in stage['deps']])
+        except Exception as e:
+            self._fail(name, key, f"{type(e).__name__}: {e}", time.perf_counter() - start)
+            return
+        self._finish(name, key, value, time.perf_counter() - start)
+
+    def _run_batch(self, names: List[str], workers: int, profiler, profile: bool,
+                   initializer: Optional[Callable]) -> None:
+        """Run ready parallel stages in forked workers (serially for any the pool could not run)."""
+        global _ACTIVE_GRAPH
+        outcomes = {}
+        timer = profiler.stage('parallel_stages') if profiler is not None else contextlib.nullcontext()
+        _ACTIVE_GRAPH = self
+        try:
+            with timer, ProcessPoolExecutor(max_workers=min(workers, len(names)), initializer=initializer,
+                                            mp_context=multiprocessing.get_context('fork')) as executor:
+                futures = {name: executor.submit(_run_stage_job, name) for name in names}
+                for name, future in futures.items():
+                    outcomes[name] = future.result()
+        except Exception as e:
+            print(f"   ⚠️ Process pool unavailable ({type(e).__name__}: {e}) - running serially")
+        finally:
+            _ACTIVE_GRAPH = None
+
+        for name in names:
+            key = self.records[name]['key']
+            if name not in outcomes:
+                self._execute(name, key, profiler, profile)
+                continue
+            value, log, error, seconds = outcomes[name]
+            print(log, end='')
+            if error:
+                self._fail(name, key, error, seconds)
+            else:
+                self._finish(name, key, value, seconds)
+
+    def _finish(self, name: str, key: str, value: Any, seconds: float) -> None:
+        """Fingerprint a fresh value and store it under `key`."""
+        stage = self.stages[name]
+        files = stage['files'](value) if callable(stage['files']) else (stage['files'] or [])
+        files = [str(path) for path in files]
+
+        if stage['fingerprint'] is not None:
+            fingerprint = hashlib.sha1(stage['fingerprint'](value).encode('utf-8'))
+        else:
+            try:
+                fingerprint = _value_digest(value)
+            except Exception:
+                fingerprint = hashlib.sha1(key.encode('utf-8'))  # unpicklable: identified by its inputs
+        for path in files:
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    fingerprint.update(hashlib.sha1(f.read()).digest())
+
+        self.values[name] = value
+        self.fingerprints[name] = fingerprint.hexdigest()
+        self._record(name, 'run', key, seconds=seconds)
+        if stage['store']:
+            self._save(name, key, {
+                'value': value,
+                'fingerprint': self.fingerprints[name],
+                'files': {path: _file_signature(path) for path in files},
+                'seconds': seconds
+            })
+
+    def _fail(self, name: str, key: str, error: str, seconds: float) -> None:
+        print(f"   ❌ {name} failed: {error}")
+        self._record(name, 'failed', key, seconds=seconds, error=error)
+
+    def _save(self, name: str, key: str, entry: Dict) -> None:
+        """Write an artifact (via a temp file) and prune the stage's oldest ones."""
+        entry_path = self._entry_path(name, key)
+        entry_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = entry_path.with_suffix('.tmp')
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(entry, f, protocol=4)
+            os.replace(tmp_path, entry_path)
+        except Exception as e:
+            print(f"   ⚠️ {name} not memoized ({type(e).__name__}: {e})")
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        entries = sorted(entry_path.parent.glob('*.pkl'), key=lambda path: path.stat().st_mtime, reverse=True)
+        for old_entry in entries[self.KEEP_ENTRIES:]:
+            old_entry.unlink(missing_ok=True)
+
+    def _record(self, name: str, status: str, key: Optional[str], seconds: float = 0.0,
+                error: Optional[str] = None) -> None:
+        self.records[name] = {'status': status, 'seconds': round(seconds, 3), 'key': key, 'error': error}
+        if status == 'run':
+            print(f"   ✓ {name} ({seconds:.1f}s)")
+        elif status == 'cached':
+            print(f"   ♻️ {name} (cached)")
+        elif status == 'blocked':
+            print(f"   ⏭️ {name} skipped ({error})")
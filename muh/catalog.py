@@ -0,0 +1,256 @@
+"""Content-hash catalog of raw D-Flow exports across data roots."""
+
+import hashlib
+import json
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import List, Dict, Optional, Union
+
+import pandas as pd
+
+
+# EXPORT CATALOG
+# ==============================================================================
+
+class ExportCatalog:
+    """
+    Every ``.txt`` file under one or more data roots, hashed and de-duplicated.
+
+    Files with identical bytes are one recording, and so is a file whose bytes
+    are a strict prefix of another (an export copied before D-Flow finished
+    writing it). Each recording has one canonical file, the most complete copy,
+    and is assigned to the subject/trial slot(s) where it appears under the
+    primary root as ``<root>/<subject>/<type>NNNN.txt``.
+
+    Every file gets an entry with its status:
+
+    - ``canonical``: the file to parse for its recording
+    - ``duplicate``: byte-identical to the canonical file
+    - ``truncated``: a prefix of the canonical file
+    - ``not_export``: no tab-separated header (README.txt and the like)
+
+    It also gets a ``reason`` saying why. Hashes are reused from the previous
+    catalog file while a file's size and mtime are unchanged.
+
+    Usage:
+        catalog = ExportCatalog(['muh_data', 'dflow_data'])
+        catalog.scan()
+        catalog.explain('dflow_data/Nick/c_drive/Nick/pref0001.txt')
+    """
+
+    VERSION = 1
+    HEAD_BYTES = 4096
+    SLOT_PATTERN = re.compile(r'^(primer|trial|vis|pref)(\d+)$')
+
+    def __init__(self, roots: List[Union[str, Path]], catalog_file: Optional[Path] = None,
+                 debug: bool = False):
+        self.roots = [Path(root).resolve() for root in roots]
+        self.catalog_file = Path(catalog_file) if catalog_file else None
+        self.debug = debug
+        self.entries: Dict[str, Dict] = {}
+
+    # --------------------------------------------------------------------------
+    # Scanning
+    # --------------------------------------------------------------------------
+
+    def scan(self) -> pd.DataFrame:
+        """Hash every export under the roots and resolve duplicates; returns to_frame()."""
+        previous = self._load_previous()
+        entries, rehashed = {}, 0
+
+        for root_index, root in enumerate(self.roots):
+            if not root.exists():
+                if self.debug:
+                    print(f"⚠️ Catalog root not found: {root}")
+                continue
+            for file_path in sorted(root.rglob('*.txt')):
+                key = str(file_path)
+                if key in entries:  # nested roots
+                    continue
+                stat = file_path.stat()
+                entry = {'path': key, 'root': root_index, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                         **self._slot(file_path, root, root_index)}
+                old = previous.get(key)
+                if old and old['size'] == entry['size'] and old['mtime_ns'] == entry['mtime_ns']:
+                    entry.update({k: old[k] for k in ('sha1', 'head_sha1', 'header_sha1', 'is_export')})
+                else:
+                    entry.update(self._hash(file_path))
+                    rehashed += 1
+                entries[key] = entry
+
+        self.entries = entries
+        self._resolve()
+        self.save()
+
+        if self.debug:
+            statuses = pd.Series([entry['status'] for entry in entries.values()]).value_counts().to_dict()
+            print(f"🗂️ Export catalog: {len(entries)} files ({rehashed} hashed) - {statuses}")
+        return self.to_frame()
+
+    def _slot(self, file_path: Path, root: Path, root_index: int) -> Dict:
+        """Subject/trial slot of a file placed as <primary root>/<subject>/<type>NNNN.txt."""
+        match = self.SLOT_PATTERN.match(file_path.stem)
+        relative = file_path.relative_to(root).parts
+        if root_index == 0 and len(relative) == 2 and match:
+            return {'subject': relative[0], 'trial_prefix': match.group(1), 'part': int(match.group(2))}
+        return {'subject': None, 'trial_prefix': None, 'part': None}
+
+    def _hash(self, file_path: Path, chunk_size: int = 1 << 20) -> Dict:
+        digest = hashlib.sha1()
+        with open(file_path, 'rb') as f:
+            head = f.read(self.HEAD_BYTES)
+            digest.update(head)
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+        header = head.split(b'\n', 1)[0]
+        return {
+            'sha1': digest.hexdigest(),
+            'head_sha1': hashlib.sha1(head).hexdigest(),
+            'header_sha1': hashlib.sha1(header).hexdigest(),
+            'is_export': b'\t' in header
+        }
+
+    @staticmethod
+    def _prefix_sha1(file_path: str, n_bytes: int, chunk_size: int = 1 << 20) -> str:
+        digest = hashlib.sha1()
+        with open(file_path, 'rb') as f:
+            remaining = n_bytes
+            while remaining > 0:
+                chunk = f.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                digest.update(chunk)
+                remaining -= len(chunk)
+        return digest.hexdigest()
+
+    def _rank(self, entry: Dict):
+        """Preferred copy among identical files: a subject slot, then the primary root, then the shortest path."""
+        return (entry['subject'] is None, entry['root'], len(Path(entry['path']).parts), entry['path'])
+
+    def _resolve(self):
+        """Group identical and prefix-identical files and pick each recording's canonical file."""
+        exports = [entry for entry in self.entries.values() if entry['is_export']]
+        for entry in self.entries.values():
+            if not entry['is_export']:
+                entry.update({'status': 'not_export', 'canonical': None, 'slots': [],
+                              'reason': "no tab-separated header line"})
+
+        # 1. Byte-identical groups, represented by their preferred copy
+        identical = defaultdict(list)
+        for entry in exports:
+            identical[entry['sha1']].append(entry)
+        representatives = {sha1: min(group, key=self._rank) for sha1, group in identical.items()}
+
+        # 2. Prefix relations between distinct contents with the same header
+        by_header = defaultdict(list)
+        for rep in representatives.values():
+            by_header[rep['header_sha1']].append(rep)
+
+        extends = {}  # sha1 -> sha1 of the longest content it is a prefix of
+        for group in by_header.values():
+            group.sort(key=lambda entry: entry['size'])
+            for i, short in enumerate(group):
+                for long in reversed(group[i + 1:]):
+                    if long['size'] == short['size']:
+                        break
+                    if short['size'] >= self.HEAD_BYTES and short['head_sha1'] != long['head_sha1']:
+                        continue
+                    if self._prefix_sha1(long['path'], short['size']) == short['sha1']:
+                        extends[short['sha1']] = long['sha1']
+                        break
+
+        def recording(sha1: str) -> str:
+            while sha1 in extends:
+                sha1 = extends[sha1]
+            return sha1
+
+        # 3. Slots of each recording (from every copy, complete or not)
+        slots = defaultdict(set)
+        for entry in exports:
+            if entry['subject'] is not None:
+                slots[recording(entry['sha1'])].add((entry['subject'], entry['trial_prefix'], entry['part']))
+
+        completed = {recording(sha1) for sha1 in extends}
+        for entry in exports:
+            final = recording(entry['sha1'])
+            canonical = representatives[final]
+            entry['canonical'] = canonical['path']
+            entry['slots'] = [f"{subject}/{prefix}{part:04d}" for subject, prefix, part in sorted(slots[final])]
+            copies = len(identical[final])
+
+            if entry is canonical:
+                entry['status'] = 'canonical'
+                reason = "unique recording" if copies == 1 else f"preferred of {copies} identical copies"
+                if final in completed:
+                    reason += "; most complete version of truncated copies"
+            elif entry['sha1'] == final:
+                entry['status'] = 'duplicate'
+                reason = f"byte-identical to {canonical['path']}"
+            else:
+                entry['status'] = 'truncated'
+                reason = (f"first {entry['size']} bytes of {canonical['path']} "
+                          f"({canonical['size'] - entry['size']} bytes shorter)")
+
+            if not entry['slots']:
+                reason += "; no subject/trial slot (not <subject>/<type>NNNN.txt under the primary root)"
+            elif len({slot.split('/')[0] for slot in entry['slots']}) > 1:
+                reason += f"; ⚠️ same recording in several subjects: {entry['slots']}"
+            entry['reason'] = reason
+
+    # --------------------------------------------------------------------------
+    # Queries
+    # --------------------------------------------------------------------------
+
+    def resolve(self, file_path: Union[str, Path]) -> Path:
+        """File to parse for the recording `file_path` holds (itself if unknown)."""
+        entry = self.entries.get(str(Path(file_path).resolve()))
+        return Path(entry['canonical']) if entry and entry.get('canonical') else Path(file_path)
+
+    def resolve_files(self, files: List[Path]) -> List[Path]:
+        """Canonical files for a list of exports, one per recording, in first-seen order."""
+        resolved = []
+        for file_path in files:
+            canonical = self.resolve(file_path)
+            if canonical not in resolved:
+                resolved.append(canonical)
+        return resolved
+
+    def explain(self, file_path: Union[str, Path]) -> Dict:
+        """Catalog entry of a file, with the status, canonical copy, slots and reason."""
+        entry = self.entries.get(str(Path(file_path).resolve()))
+        if entry is None:
+            return {'path': str(file_path), 'status': 'unknown', 'reason': "not under any catalog root"}
+        return dict(entry)
+
+    def copies(self, file_path: Union[str, Path]) -> List[Dict]:
+        """Every file holding (part of) the same recording as `file_path`."""
+        canonical = self.explain(file_path).get('canonical')
+        return [dict(entry) for entry in self.entries.values() if canonical and entry['canonical'] == canonical]
+
+    def to_frame(self) -> pd.DataFrame:
+        columns = ['path', 'status', 'canonical', 'slots', 'subject', 'trial_prefix', 'part',
+                   'size', 'sha1', 'reason']
+        return pd.DataFrame(list(self.entries.values()), columns=columns)
+
+    # --------------------------------------------------------------------------
+    # Persistence
+    # --------------------------------------------------------------------------
+
+    def _load_previous(self) -> Dict:
+        if not self.catalog_file or not self.catalog_file.exists():
+            return {}
+        try:
+            with open(self.catalog_file, 'r') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return stored.get('entries', {}) if stored.get('version') == self.VERSION else {}
+
+    def save(self):
+        if not self.catalog_file:
+            return
+        self.catalog_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.catalog_file, 'w') as f:
+            json.dump({'version': self.VERSION, 'roots': [str(root) for root in self.roots],
+                       'entries': self.entries}, f, indent=1)
@@ -0,0 +1,401 @@
+"""
+Command line entry point for the motor learning analysis.
+
+    python -m muh ingest  --metadata muh_metadata.csv --data muh_data/ --output analysis
+    python -m muh catalog --extra-roots dflow_data --explain dflow_data/Nick/c_drive/Nick/pref0001.txt
+    python -m muh metrics --output analysis
+    python -m muh history --metric invis_sr_min_const --age 7 10
+    python -m muh history --diff -2 -1
+    python -m muh gait    --output analysis --trial-types pref
+    python -m muh stats   --output analysis
+    python -m muh plots   --output analysis --individual
+    python -m muh report  --output analysis --profile
+    python -m muh report  --output analysis --individual --deck
+    python -m muh deck    --output analysis
+    python -m muh live    muh_data/S01/trial0001.txt --trial-type invis
+
+Each subcommand imports only what it needs: ingest, metrics and gait load numpy
+and pandas, stats adds scikit-learn/statsmodels/pingouin, plots and report add
+matplotlib/seaborn, deck needs python-pptx, and live and history only pandas.
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+DEFAULT_REQUIRED_TRIALS = ['vis1', 'invis', 'vis2']
+
+
+def _config(args):
+    from .config import Config
+    config = Config(args.output, verbose=False)
+    config.PLOT_WORKERS = config.STATS_WORKERS = args.workers or os.cpu_count()
+    config.EXTRA_DATA_ROOTS = args.extra_roots
+    return config
+
+
+def _load_data(args, force_reprocess: bool = False):
+    """Ingest the cohort (reusing the processed-data cache) and keep complete subjects."""
+    from .data import MotorLearningDataManager
+
+    data_manager = MotorLearningDataManager(
+        args.metadata, args.data, config=_config(args),
+        force_reprocess=force_reprocess, debug=args.verbose, workers=args.workers)
+    if args.require:
+        data_manager = data_manager.filter_trials(required_trial_types=args.require)
+    if not data_manager.processed_data and args.command != 'ingest':
+        sys.exit(f"❌ No subjects with trial types {args.require} (use --require to change the filter)")
+    return data_manager
+
+
+def _load_metrics(args, data_manager):
+    from .metrics import MetricsCalculator
+    return MetricsCalculator(data_manager).calculate_all_metrics(engine=getattr(args, 'engine', None))
+
+
+def _load_analysis(args):
+    os.environ.setdefault('MPLBACKEND', 'Agg')  # figures are only written to disk
+    from .analysis import MotorLearningAnalysis
+
+    data_manager = _load_data(args)
+    return MotorLearningAnalysis(data_manager, _load_metrics(args, data_manager))
+
+
+def _jsonable(obj):
+    """Best-effort conversion of analysis results (frames, arrays, fitted models) for JSON."""
+    import numpy as np
+    import pandas as pd
+
+    if isinstance(obj, dict):
+        return {str(key): _jsonable(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_jsonable(item) for item in obj]
+    if isinstance(obj, pd.DataFrame):
+        return _jsonable(obj.reset_index().to_dict(orient='records'))
+    if isinstance(obj, pd.Series):
+        return _jsonable(obj.to_dict())
+    if isinstance(obj, np.ndarray):
+        return _jsonable(obj.tolist())
+    if isinstance(obj, np.generic):
+        obj = obj.item()
+    if isinstance(obj, float) and not np.isfinite(obj):
+        return None
+    if obj is None or isinstance(obj, (str, int, float, bool)):
+        return obj
+    if hasattr(obj, 'summary'):
+        return str(obj.summary())
+    return str(obj)
+
+
+def cmd_ingest(args):
+    data_manager = _load_data(args, force_reprocess=args.force)
+    n_trials = sum(len(subject['trial_data']) for subject in data_manager.processed_data.values())
+    print(f"✓ {len(data_manager.processed_data)} subjects, {n_trials} trials "
+          f"cached in {data_manager.config.PROCESSED_DATA_DIR}")
+
+
+def cmd_catalog(args):
+    from .catalog import ExportCatalog
+
+    config = _config(args)
+    catalog = ExportCatalog([args.data] + args.extra_roots, catalog_file=config.CATALOG_FILE)
+    table = catalog.scan()
+    print(f"🗂️ {len(table)} files: {table['status'].value_counts().to_dict()}")
+
+    for _, entry in table[table['status'].isin(['duplicate', 'truncated'])].iterrows():
+        print(f"   {entry['status']:9s} {entry['path']}\n             → {entry['canonical']}")
+    for path in args.explain or []:
+        print(json.dumps(_jsonable(catalog.explain(path)), indent=2))
+
+    catalog_csv = config.get_report_path('export_catalog.csv')
+    table.to_csv(catalog_csv, index=False)
+    print(f"📋 Catalog: {catalog_csv}")
+
+
+def cmd_metrics(args):
+    from .store import MetricsStore
+
+    data_manager = _load_data(args)
+    metrics_df = _load_metrics(args, data_manager)
+    metrics_file = Path(args.csv) if args.csv else data_manager.config.get_export_path('metrics.csv')
+    metrics_df.to_csv(metrics_file, index=False)
+    print(f"✓ {len(metrics_df)} subjects × {len(metrics_df.columns)} metrics → {metrics_file}")
+
+    if args.curves:
+        from .metrics import MetricsCalculator
+        curves = MetricsCalculator(data_manager).calculate_learning_curves(window=args.window)
+        curves_file = data_manager.config.get_export_path('learning_curves.csv')
+        curves.to_csv(curves_file, index=False)
+        print(f"📈 {len(curves)} strides of {curves['ID'].nunique()} subjects → {curves_file}")
+
+    store = MetricsStore(data_manager.config.METRICS_STORE_FILE)
+    run = store.record(metrics_df, config=data_manager.config,
+                       input_hashes=MetricsStore.input_hashes(data_manager.manifest), label=args.label)
+    print(f"🗄️ Run {run['run_id']}: {run['n_changed']} of {run['n_values']} values changed → {store.db_path}")
+
+
+def cmd_history(args):
+    import pandas as pd
+    from .store import MetricsStore
+
+    db_path = _config(args).METRICS_STORE_FILE
+    if not db_path.exists():
+        print(f"❌ No metrics store at {db_path} (run: python -m muh metrics)")
+        return 1
+    store = MetricsStore(db_path)
+
+    if args.diff:
+        run_a, run_b = args.diff
+        table = store.diff(run_a, run_b, metrics=args.metric)
+        for name, (value_a, value_b) in store.config_diff(run_a, run_b).items():
+            print(f"⚙️ {name}: {value_a} → {value_b}")
+    elif args.metric:
+        table = store.query(args.metric, runs=args.runs, subjects=args.subjects,
+                            age_range=tuple(args.age) if args.age else None)
+    else:
+        table = store.runs()
+
+    with pd.option_context('display.max_rows', args.max_rows, 'display.width', 200):
+        print(table.to_string(index=False) if len(table) else "(no rows)")
+    if args.csv:
+        table.to_csv(args.csv, index=False)
+        print(f"📋 {len(table)} rows → {args.csv}")
+
+
+def cmd_gait(args):
+    import time
+    from .gait import GaitEventDetector
+
+    data_manager = _load_data(args)
+    detector = GaitEventDetector.from_config(data_manager.config)
+    start = time.perf_counter()
+    tables = detector.detect_cohort(data_manager, trial_types=args.trial_types)
+    elapsed = time.perf_counter() - start
+
+    if tables['events'].empty:
+        print("❌ No exports with force and marker channels")
+        return 1
+    strides, summary = tables['strides'], tables['summary']
+    print(f"👣 {int(summary['n_detected'].sum())} heel strikes in {summary['file'].nunique()} exports "
+          f"({elapsed:.1f}s): {int(summary['n_matched'].sum())} matched D-Flow's "
+          f"{int(summary['n_dflow'].sum())}, {strides['valid'].mean():.0%} of strides valid")
+    for name, table in tables.items():
+        path = data_manager.config.get_report_path(f'gait_{name}.csv')
+        table.to_csv(path, index=False)
+        print(f"📋 {name.capitalize()}: {path}")
+
+
+def cmd_stats(args):
+    import pandas as pd
+    from .metrics import MetricsCalculator
+    from .stats import StatisticalAnalyzer
+
+    data_manager = _load_data(args)
+    analyzer = StatisticalAnalyzer(_load_metrics(args, data_manager), data_manager.config)
+
+    # Repeated CV is off by default (Config.CV_REPEATS); muh stats reports it
+    cv_repeats = args.cv_repeats if args.cv_repeats is not None else analyzer.DEFAULT_CV_REPEATS
+
+    results = {}
+    for name, run in [('regression', lambda: analyzer.run_regression_analysis(cv_repeats=cv_repeats)),
+                      ('classification', lambda: analyzer.run_classification_analysis(cv_repeats=cv_repeats)),
+                      ('mixed_effects', analyzer.run_mixed_effects_analysis),
+                      ('rm_anova', analyzer.run_repeated_measures_anova),
+                      ('multivariate_regression', analyzer.run_multivariate_regression)]:
+        try:
+            results[name] = run()
+            print(f"✓ {name}")
+        except Exception as e:
+            results[name] = {'error': str(e)}
+            print(f"❌ {name} failed: {e}")
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    stats_file = data_manager.config.get_report_path(f'stats_{timestamp}.json')
+    with open(stats_file, 'w') as f:
+        json.dump(_jsonable(results), f, indent=2)
+    print(f"📋 Statistics: {stats_file}")
+
+    # Permutation p-values and bootstrap CIs for every _const metric
+    effects = [analyzer.run_resampling_analysis(n_resamples=args.resamples)]
+    if 'mot_noise' in analyzer.metrics_df.columns:
+        effects.append(analyzer.run_motor_noise_resampling(n_resamples=args.resamples)
+                       .assign(predictor='mot_noise_high_vs_low'))
+    _, stride_changes = MetricsCalculator(data_manager).load_stride_changes()
+    effects.append(analyzer.run_stride_change_analysis(stride_changes, n_resamples=args.resamples))
+    effects_file = data_manager.config.get_report_path(f'effects_{timestamp}.csv')
+    pd.concat(effects, ignore_index=True).to_csv(effects_file, index=False)
+    print(f"📋 Effects: {effects_file}")
+
+    if args.sweep:
+        sweep = analyzer.run_model_sweep(n_repeats=cv_repeats)
+        sweep_file = data_manager.config.get_report_path(f'model_sweep_{timestamp}.csv')
+        sweep.to_csv(sweep_file, index=False)
+        print(f"📋 Model sweep: {sweep_file}")
+
+
+def cmd_plots(args):
+    analysis = _load_analysis(args)
+    analysis.visualizer.generate_all_enhanced_plots(
+        include_individual_plots=args.individual,
+        max_individual_subjects=args.max_subjects)
+
+
+def cmd_report(args):
+    from .pipeline import StreamlinedMotorLearningPipeline
+
+    analysis = _load_analysis(args)
+    if args.fresh:
+        import shutil
+        shutil.rmtree(analysis.config.ARTIFACT_CACHE_DIR, ignore_errors=True)
+    pipeline = StreamlinedMotorLearningPipeline(analysis, str(analysis.config.BASE_OUTPUT_DIR))
+    pipeline.run_complete_analysis_updated(
+        include_individual_plots=args.individual,
+        include_advanced_analysis=not args.skip_advanced,
+        profile_stages=args.profile,
+        build_deck=args.deck)
+
+
+def cmd_deck(args):
+    try:
+        from . import deck
+    except ModuleNotFoundError as e:
+        if e.name != 'pptx':
+            raise
+        print("❌ python-pptx required for decks: pip install python-pptx")
+        return 1
+
+    config = _config(args)
+    images_dir = args.images or config.INDIVIDUAL_PLOTS_DIR / 'stride_change_after_success_vs_failure'
+    image_paths = deck.find_images_in_directory(str(images_dir), recursive=False)
+    if not image_paths:
+        print(f"❌ No stride change figures found in {images_dir} (run: python -m muh plots --individual)")
+        return 1
+
+    pptx_file = args.pptx or config.get_report_path('stride_change_analysis_by_age.pptx')
+    result = deck.create_powerpoint_from_images(
+        image_paths=image_paths, output_filename=str(pptx_file),
+        metadata_path=args.metadata, title=args.title, update=args.update,
+        thumbnail_dir=str(config.PROCESSED_DATA_DIR / 'slide_thumbnails'),
+        workers=args.workers or os.cpu_count())
+    return 0 if result else 1
+
+
+def cmd_live(args):
+    from .streaming import LiveTrialMonitor
+
+    def show(snapshot):
+        values = [f"{condition}: SR {snapshot.get(f'{args.trial_type}_sr_{condition}_const', float('nan')):.2f} "
+                  f"SD {snapshot.get(f'{args.trial_type}_sd_{condition}_const', float('nan')):.3f}"
+                  for condition in ('max', 'min')]
+        print(f"📡 stride {snapshot['last_stride']:.0f} ({snapshot['n_strides']} strides) | " + " | ".join(values))
+
+    monitor = LiveTrialMonitor(args.file, trial_type=args.trial_type, length=args.length)
+    final = monitor.watch(interval=args.interval, idle_timeout=args.idle_timeout, callback=show)
+    print(json.dumps(_jsonable(final), indent=2))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--metadata', default='muh_metadata.csv', help="Subject metadata CSV")
+    common.add_argument('--data', default='muh_data/', help="Directory with one folder of D-Flow exports per subject")
+    common.add_argument('--output', default='analysis', help="Output directory (Config base directory)")
+    common.add_argument('--workers', type=int, default=1, help="Processes for ingestion and figures (0 = one per core)")
+    common.add_argument('--require', nargs='*', default=DEFAULT_REQUIRED_TRIALS,
+                        help="Keep only subjects with these trial types (none = keep all)")
+    common.add_argument('--extra-roots', nargs='*', default=[],
+                        help="Other folders with copies of the exports (deduplicated against --data)")
+    common.add_argument('--verbose', action='store_true', help="Per-file ingestion output")
+
+    parser = argparse.ArgumentParser(prog='muh', description="Motor learning analysis of D-Flow stride data")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ingest = commands.add_parser('ingest', parents=[common], help="Process raw exports into the cache")
+    ingest.add_argument('--force', action='store_true', help="Reprocess every subject")
+    ingest.set_defaults(func=cmd_ingest)
+
+    catalog = commands.add_parser('catalog', parents=[common], help="Hash the exports and list duplicate copies")
+    catalog.add_argument('--explain', nargs='*', default=None, help="Show why these files map where they do")
+    catalog.set_defaults(func=cmd_catalog)
+
+    metrics = commands.add_parser('metrics', parents=[common], help="Compute the per-subject metrics table")
+    metrics.add_argument('--engine', choices=['cohort', 'subject'], default=None,
+                         help="MetricsCalculator engine (default: Config.METRICS_ENGINE)")
+    metrics.add_argument('--csv', default=None, help="Output CSV (default: <output>/exports/metrics.csv)")
+    metrics.add_argument('--label', default=None, help="Name for this run in the metrics store")
+    metrics.add_argument('--curves', action='store_true',
+                         help="Also write rolling learning curves of every stride (exports/learning_curves.csv)")
+    metrics.add_argument('--window', type=int, default=20, help="Strides per learning curve window")
+    metrics.set_defaults(func=cmd_metrics)
+
+    history = commands.add_parser('history', parents=[common], help="Query the metrics recorded by earlier runs")
+    history.add_argument('--metric', nargs='*', default=None, help="Metrics to list across runs (none = list runs)")
+    history.add_argument('--runs', nargs='*', type=int, default=None,
+                         help="Run ids (negative counts back from the latest; default: all)")
+    history.add_argument('--subjects', nargs='*', default=None, help="Subject IDs (default: all)")
+    history.add_argument('--age', nargs=2, type=float, default=None, metavar=('LOW', 'HIGH'),
+                         help="Keep subjects with LOW < age <= HIGH")
+    history.add_argument('--diff', nargs=2, type=int, default=None, metavar=('RUN_A', 'RUN_B'),
+                         help="Values that differ between two runs, e.g. --diff -2 -1")
+    history.add_argument('--csv', default=None, help="Also write the table to this CSV")
+    history.add_argument('--max-rows', type=int, default=200, help="Rows to print")
+    history.set_defaults(func=cmd_history)
+
+    gait = commands.add_parser('gait', parents=[common],
+                               help="Detect heel strikes from the force channels and check D-Flow's strides")
+    gait.add_argument('--trial-types', nargs='*', default=None,
+                      help="Trial types to process, e.g. pref invis (default: all)")
+    gait.set_defaults(func=cmd_gait)
+
+    stats = commands.add_parser('stats', parents=[common], help="Fit the statistical models")
+    stats.add_argument('--resamples', type=int, default=None,
+                       help="Permutations / bootstrap resamples (default: Config.RESAMPLES)")
+    stats.add_argument('--sweep', action='store_true',
+                       help="Cross-validate every trial type × condition × model × predictor set")
+    stats.add_argument('--cv-repeats', type=int, default=None,
+                       help="Repeated CV passes (at least 1) for the regression/classification "
+                            "models and the sweep (default: 20)")
+    stats.set_defaults(func=cmd_stats)
+
+    plots = commands.add_parser('plots', parents=[common], help="Generate population and statistical figures")
+    plots.add_argument('--individual', action='store_true', help="Also render per-subject stride change figures")
+    plots.add_argument('--max-subjects', type=int, default=None, help="Limit the individual figures")
+    plots.set_defaults(func=cmd_plots)
+
+    report = commands.add_parser('report', parents=[common], help="Run the full pipeline and write the HTML report")
+    report.add_argument('--individual', action='store_true', help="Include per-subject stride change figures")
+    report.add_argument('--skip-advanced', action='store_true', help="Skip the learning pattern analysis")
+    report.add_argument('--profile', action='store_true', help="Capture each step with cProfile")
+    report.add_argument('--deck', action='store_true', help="Also update the stride change PowerPoint (with --individual)")
+    report.add_argument('--fresh', action='store_true', help="Ignore the memoized stages and rerun everything")
+    report.set_defaults(func=cmd_report)
+
+    deck = commands.add_parser('deck', parents=[common], help="Build a PowerPoint of stride change figures by age")
+    deck.add_argument('--images', default=None, help="Figure directory (default: the stride change plots)")
+    deck.add_argument('--pptx', default=None, help="Output file (default: <output>/reports/...pptx)")
+    deck.add_argument('--title', default="Motor Learning: Stride Change After Success vs Failure")
+    deck.add_argument('--update', action='store_true',
+                      help="Only add, replace or drop the slides whose figures changed since the last build")
+    deck.set_defaults(func=cmd_deck)
+
+    live = commands.add_parser('live', help="Follow a D-Flow export while it is written and print period metrics")
+    live.add_argument('file', help="Export being written, e.g. muh_data/S01/trial0001.txt")
+    live.add_argument('--trial-type', default='invis', help="Prefix for the metric names (vis1, invis, vis2)")
+    live.add_argument('--length', type=int, default=20, help="Strides per period window")
+    live.add_argument('--interval', type=float, default=1.0, help="Seconds between polls")
+    live.add_argument('--idle-timeout', type=float, default=30.0, help="Stop after this many seconds without new data")
+    live.set_defaults(func=cmd_live)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, 'cv_repeats', None) is not None and args.cv_repeats < 1:
+        parser.error(f"--cv-repeats must be at least 1 (got {args.cv_repeats})")
+    if getattr(args, 'workers', 1) == 0:
+        args.workers = None
+    sys.exit(args.func(args) or 0)
@@ -0,0 +1,110 @@
+"""Output layout and analysis parameters shared by every pipeline stage."""
+
+from pathlib import Path
+
+
+# 1. CONFIGURATION
+# ==============================================================================
+
+
+class Config:
+    """Enhanced configuration settings for the motor learning analysis."""
+    
+    def __init__(self, base_output_dir: str = 'motor_learning_output', verbose: bool = True):
+        # Base directory for all outputs
+        self.BASE_OUTPUT_DIR = Path(base_output_dir)
+        
+        # Organized subdirectory structure (created by the stages that write to them)
+        self.FIGURES_DIR = self.BASE_OUTPUT_DIR / 'figures'
+        self.INDIVIDUAL_PLOTS_DIR = self.FIGURES_DIR / 'individual_plots'
+        self.POPULATION_PLOTS_DIR = self.FIGURES_DIR / 'population_plots'
+        self.STATISTICAL_PLOTS_DIR = self.FIGURES_DIR / 'statistical_plots'
+        self.REPORTS_DIR = self.BASE_OUTPUT_DIR / 'reports'
+        self.EXPORTS_DIR = self.BASE_OUTPUT_DIR / 'exports'
+        self.PROCESSED_DATA_DIR = self.BASE_OUTPUT_DIR / 'processed_data'
+        
+        # File processing parameters
+        self.MIN_COMPLETE_STRIDES = 20
+        self.PROCESSED_DATA_FILE = self.PROCESSED_DATA_DIR / 'processed_data.pkl'
+        self.MANIFEST_FILE = self.PROCESSED_DATA_DIR / 'manifest.json'
+
+        # Stride-level columnar cache of raw D-Flow exports
+        self.USE_STRIDE_CACHE = True
+        self.STRIDE_CACHE_DIR = self.PROCESSED_DATA_DIR / 'stride_cache'
+        self.CACHE_SAMPLE_CHANNELS = False  # also keep the ~300 Hz per-sample table
+        self.COMPACT_TRIALS = True  # hold processed trials as TrialRecord/CompactFrame
+        self.USE_EXPORT_CATALOG = True  # parse each recording once (see ExportCatalog)
+        self.EXTRA_DATA_ROOTS = []  # other folders holding copies of the exports, e.g. ['dflow_data']
+        self.CATALOG_FILE = self.PROCESSED_DATA_DIR / 'export_catalog.json'
+        self.METRICS_STORE_FILE = self.EXPORTS_DIR / 'metrics_store.sqlite'  # metrics of every run (see MetricsStore)
+        self.ARTIFACT_CACHE_DIR = self.PROCESSED_DATA_DIR / 'artifacts'  # memoized pipeline stages (see ArtifactGraph)
+        
+        # Trial type mappings
+        self.TRIAL_TYPE_MAPPING = {
+            'primer': 'vis1',
+            'trial': 'invis', 
+            'vis': 'vis2',
+            'pref': 'pref'
+        }
+        
+        # Analysis parameters
+        self.MOTOR_NOISE_STRIDES = 20
+        self.MOTOR_NOISE_THRESHOLD = 0.3
+        self.SUCCESS_RATE_THRESHOLD = 0.68
+        self.TARGET_SIZE_THRESHOLD = 0.31
+        self.MAX_STRIDES_THRESHOLD = 415
+        self.GAIT_FORCE_ON = 50.0  # N; a foot is in contact above this vertical force...
+        self.GAIT_FORCE_OFF = 20.0  # ...until it drops below this one (see GaitEventDetector)
+        self.GAIT_MIN_CONTACT = 0.1  # s; shorter contacts are not heel strikes
+        self.GAIT_MATCH_WINDOW = 0.25  # s between a detected heel strike and D-Flow's
+        self.GAIT_STEP_TOLERANCE = 0.05  # m of step length disagreement still counted as valid
+        self.METRICS_ENGINE = 'cohort'  # or 'subject' for the per-subject loop
+        self.RESAMPLES = 10000  # permutations / bootstrap resamples for effect inference
+        self.CV_FOLDS = 5
+        self.CV_REPEATS = 0  # repeated k-fold passes added to every regression/classification fit (0 = off)
+        self.STATS_WORKERS = 1  # processes for repeated cross-validation
+        
+        # Visualization parameters
+        self.FIGURE_DPI = 300
+        self.PLOT_WORKERS = 1  # processes for individual stride-change figures
+        self.DENSITY_GRID_POINTS = 1024  # grid of the stride-change densities (see DensityEstimator)
+        self.ALPHA_LEVEL = 0.05
+        self.AGE_BINS = [7, 10, 13, 16, 18]
+        self.AGE_LABELS = ['7-10', '10-13', '13-16', '16-18']
+        
+        if verbose:
+            print(f"📁 Config initialized with base directory: {self.BASE_OUTPUT_DIR}")
+            print(f"   📊 Figures: {self.FIGURES_DIR}")
+            print(f"   📋 Reports: {self.REPORTS_DIR}")
+            print(f"   💾 Exports: {self.EXPORTS_DIR}")
+
+    def ensure_directories(self) -> None:
+        """Create the full output directory structure up front."""
+        for directory in [self.FIGURES_DIR, self.INDIVIDUAL_PLOTS_DIR, 
+                         self.POPULATION_PLOTS_DIR, self.STATISTICAL_PLOTS_DIR,
+                         self.REPORTS_DIR, self.EXPORTS_DIR, self.PROCESSED_DATA_DIR]:
+            directory.mkdir(parents=True, exist_ok=True)
+
+    def get_figure_path(self, filename: str, subdir: str = 'general') -> Path:
+        """Get standardized figure path with automatic subdirectory creation."""
+        if subdir == 'individual':
+            target_dir = self.INDIVIDUAL_PLOTS_DIR
+        elif subdir == 'population':
+            target_dir = self.POPULATION_PLOTS_DIR
+        elif subdir == 'statistical':
+            target_dir = self.STATISTICAL_PLOTS_DIR
+        else:
+            target_dir = self.FIGURES_DIR
+        
+        target_dir.mkdir(parents=True, exist_ok=True)
+        return target_dir / filename
+    
+    def get_report_path(self, filename: str) -> Path:
+        """Get standardized report path."""
+        self.REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+        return self.REPORTS_DIR / filename
+    
+    def get_export_path(self, filename: str) -> Path:
+        """Get standardized export path."""
+        self.EXPORTS_DIR.mkdir(parents=True, exist_ok=True)
+        return self.EXPORTS_DIR / filename
@@ -0,0 +1,591 @@
+"""Cohort ingestion: metadata, per-subject trials and the processed-data cache."""
+
+import contextlib
+import hashlib
+import io
+import json
+import os
+import pickle
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Tuple, Optional
+
+import pandas as pd
+
+from .catalog import ExportCatalog
+from .config import Config
+from .trials import TrialProcessor
+from .utils import AnomalyLog, DataUtils, StrideCache, TrialRecord
+
+
+# 4. MAIN DATA MANAGER
+# ==============================================================================
+
+class MotorLearningDataManager:
+    """Updated to use centralized config."""
+    
+    def __init__(self, metadata_path: str, data_root_dir: str, 
+                 config: Config = None, force_reprocess: bool = False, debug: bool = True,
+                 incremental: bool = True, workers: Optional[int] = 1):
+        self.metadata_path = metadata_path
+        self.data_root_dir = data_root_dir
+        self.debug = debug
+        
+        # Number of processes for subject ingestion (None = one per core)
+        self.workers = workers if workers else os.cpu_count()
+        self.processing_errors = {}
+        
+        # KEY CHANGE: Use provided config or create default
+        self.config = config if config else Config()
+        
+        # Initialize components - raw exports are read through the stride cache
+        stride_cache = None
+        if self.config.USE_STRIDE_CACHE:
+            stride_cache = StrideCache(self.config.STRIDE_CACHE_DIR,
+                                       keep_samples=self.config.CACHE_SAMPLE_CHANNELS,
+                                       debug=debug)
+        self.trial_processor = TrialProcessor(debug=debug, stride_cache=stride_cache,
+                                              catalog=self._scan_catalog())
+        
+        # Data storage (unchanged)
+        self.metadata = None
+        self.processed_data = {}
+        self.manifest = {}
+        
+        # Reuse the cache and only reprocess subjects whose exports changed
+        if (not force_reprocess and self.config.PROCESSED_DATA_FILE.exists()
+                and self._load_processed_data()):
+            if incremental and self._update_processed_data():
+                self._save_processed_data()
+        else:
+            self._process_all_data()
+            self._save_processed_data()
+    
+    def _scan_catalog(self) -> Optional[ExportCatalog]:
+        """Hash the exports under the data root (and EXTRA_DATA_ROOTS) and resolve duplicates."""
+        if not self.config.USE_EXPORT_CATALOG:
+            return None
+        catalog = ExportCatalog([self.data_root_dir] + list(self.config.EXTRA_DATA_ROOTS),
+                                catalog_file=self.config.CATALOG_FILE, debug=self.debug)
+        try:
+            catalog.scan()
+        except OSError as e:
+            print(f"⚠️ Export catalog unavailable ({e}) - reading exports as found")
+            return None
+        return catalog
+    
+    def _load_processed_data(self) -> bool:
+        """Updated to use config path. Returns False if the cache cannot be unpickled."""
+        try:
+            with open(self.config.PROCESSED_DATA_FILE, 'rb') as f:
+                self.processed_data = pickle.load(f)
+        except (pickle.UnpicklingError, AttributeError, ImportError, EOFError) as e:
+            # e.g. a cache pickled from notebook-defined classes
+            print(f"⚠️ Could not load {self.config.PROCESSED_DATA_FILE.name} ({e}); reprocessing all subjects")
+            self.processed_data = {}
+            return False
+            
+        # Caches written before trials were stored compactly
+        if self.config.COMPACT_TRIALS:
+            for subject_data in self.processed_data.values():
+                subject_data['trial_data'] = {
+                    trial_type: TrialRecord.from_dict(trial_dict) if isinstance(trial_dict, dict) else trial_dict
+                    for trial_type, trial_dict in subject_data['trial_data'].items()
+                }
+            
+        # Rebuild metadata DataFrame (unchanged)
+        self.metadata = pd.DataFrame.from_dict(
+            {subj: data['metadata'] for subj, data in self.processed_data.items()}, 
+            orient='index'
+        )
+        
+        if self.config.MANIFEST_FILE.exists():
+            with open(self.config.MANIFEST_FILE, 'r') as f:
+                self.manifest = json.load(f)
+        return True
+    
+    def _save_processed_data(self):
+        """Updated to use config path."""
+        self.config.PROCESSED_DATA_DIR.mkdir(parents=True, exist_ok=True)
+        with open(self.config.PROCESSED_DATA_FILE, 'wb') as f:
+            pickle.dump(self.processed_data, f)
+        
+        with open(self.config.MANIFEST_FILE, 'w') as f:
+            json.dump(self.manifest, f, indent=1)
+    
+    def _process_all_data(self):
+        """Process all subject data."""
+        self._load_metadata()
+        total_subjects = len(self.metadata)
+        self.manifest = self._new_manifest()
+        
+        if self.debug:
+            print(f"🔄 Processing {total_subjects} subjects...")
+        
+        jobs = []
+        for _, row in self.metadata.iterrows():
+            subject_id = row['ID']
+            subject_dir = Path(self.data_root_dir) / subject_id
+            if subject_dir.exists():
+                self.manifest['subjects'][subject_id] = self._fingerprint_subject(subject_dir)
+            jobs.append((subject_id, row, None))
+        
+        for (subject_id, _, _), subject_data in zip(jobs, self._process_subjects(jobs)):
+            if subject_data:
+                self.processed_data[subject_id] = subject_data
+    
+    def _process_subjects(self, jobs: List[Tuple[str, pd.Series, Optional[List[str]]]]) -> List[Optional[Dict]]:
+        """
+        Run _process_subject_data for (subject_id, metadata_row, trial_prefixes) jobs.
+        
+        With workers > 1 subjects are fanned out over a process pool. Each worker's
+        console output and errors are captured and replayed in job (metadata) order,
+        so the log and the returned results are the same as a serial run. If the
+        pool cannot be used (e.g. workers on spawn-based platforms such as Windows
+        cannot import the muh package) processing falls back to serial.
+        """
+        total = len(jobs)
+        
+        if self.workers > 1 and total > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=min(self.workers, total)) as executor:
+                    futures = [
+                        executor.submit(_process_subject_job, self.config, self.data_root_dir,
+                                        self.debug, self.trial_processor, subject_id, row, prefixes)
+                        for subject_id, row, prefixes in jobs
+                    ]
+                    outcomes = [future.result() for future in futures]
+            except Exception as e:
+                print(f"⚠️ Process pool unavailable ({type(e).__name__}: {e}) - processing serially")
+            else:
+                results = []
+                for i, ((subject_id, _, _), (subject_data, log, error)) in enumerate(zip(jobs, outcomes), 1):
+                    if self.debug:
+                        print(f"\n[{i}/{total}] Processing {subject_id}...")
+                    print(log, end='')
+                    if error:
+                        print(f"Error processing {subject_id}: {error}")
+                        self.processing_errors[subject_id] = error
+                    results.append(subject_data)
+                return results
+        
+        results = []
+        for i, (subject_id, row, prefixes) in enumerate(jobs, 1):
+            if self.debug:
+                print(f"\n[{i}/{total}] Processing {subject_id}...")
+            try:
+                results.append(self._process_subject_data(subject_id, row, trial_prefixes=prefixes))
+            except Exception as e:
+                print(f"Error processing {subject_id}: {str(e)}")
+                self.processing_errors[subject_id] = f"{type(e).__name__}: {e}"
+                results.append(None)
+        return results
+    
+    def _load_metadata(self):
+        """Load and clean metadata."""
+        self.metadata = pd.read_csv(self.metadata_path)
+        self.metadata['DOB'] = pd.to_datetime(self.metadata['DOB'], errors='coerce')
+        self.metadata['Session Date'] = pd.to_datetime(self.metadata['Session Date'], errors='coerce')
+        self.metadata = self.metadata.dropna(subset=['ID', 'age_months'])
+    
+    # ==========================================================================
+    # INCREMENTAL REPROCESSING
+    # ==========================================================================
+    
+    MANIFEST_VERSION = 4  # bump when the processed trial format changes
+    
+    def _new_manifest(self) -> Dict:
+        """Empty manifest for the current data root."""
+        return {
+            'version': self.MANIFEST_VERSION,
+            'data_root_dir': str(Path(self.data_root_dir).resolve()),
+            'subjects': {}
+        }
+    
+    def fingerprint(self) -> str:
+        """
+        Hash of the cohort as processed: the subjects and trial types kept, their
+        metadata and the content hashes of their raw exports (from the manifest).
+        Cached results derived from processed_data are keyed on it.
+        """
+        subjects = self.manifest.get('subjects', {})
+        digest = hashlib.sha1(json.dumps(
+            [self.MANIFEST_VERSION, self.config.TRIAL_TYPE_MAPPING], sort_keys=True).encode('utf-8'))
+        for subject_id, subject_data in self.processed_data.items():
+            exports = {trial_type: self._content_key(entries)
+                       for trial_type, entries in subjects.get(subject_id, {}).items()}
+            digest.update(json.dumps([
+                subject_id, subject_data['metadata'], sorted(subject_data['trial_data']), exports
+            ], sort_keys=True, default=str).encode('utf-8'))
+        return digest.hexdigest()
+
+    @staticmethod
+    def _hash_file(file_path: Path, chunk_size: int = 1 << 20) -> str:
+        """SHA-1 of a file's contents."""
+        digest = hashlib.sha1()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def _fingerprint_subject(self, subject_dir: Path, previous: Dict = None) -> Dict:
+        """
+        Fingerprint every raw export of a subject, per trial type.
+        
+        Content hashes are only recomputed when size or mtime differ from the
+        previous manifest entry, so an unchanged cohort is checked with stat calls.
+        """
+        previous = previous or {}
+        fingerprints = {}
+        
+        for original_type in self.config.TRIAL_TYPE_MAPPING:
+            known = {entry['path']: entry for entry in previous.get(original_type, [])}
+            entries = []
+            
+            for f in self.trial_processor.find_trial_files(subject_dir, original_type):
+                stat = f.stat()
+                entry = {'path': str(f), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+                old = known.get(entry['path'])
+                if old is None and self.trial_processor.catalog is not None:
+                    old = self.trial_processor.catalog.entries.get(str(f))
+                if old and old['size'] == entry['size'] and old['mtime_ns'] == entry['mtime_ns']:
+                    entry['sha1'] = old['sha1']
+                else:
+                    entry['sha1'] = self._hash_file(f)
+                entries.append(entry)
+            
+            fingerprints[original_type] = entries
+        
+        return fingerprints
+    
+    @staticmethod
+    def _content_key(entries: List[Dict]) -> List[Tuple]:
+        """Comparable view of a fingerprint list (ignores mtime-only touches)."""
+        return [(e['path'], e['size'], e['sha1']) for e in entries]
+    
+    def _update_processed_data(self) -> bool:
+        """
+        Bring the loaded cache up to date with the metadata and data directories.
+        
+        New subjects are processed, subjects whose exports changed have only the
+        affected trial types reprocessed, and subjects that were removed from the
+        metadata or data root are evicted. Returns True if anything changed.
+        """
+        if not Path(self.metadata_path).exists():
+            if self.debug:
+                print(f"⚠️ Metadata not found ({self.metadata_path}) - using cached data as is")
+            return False
+        
+        if (self.manifest.get('version') != self.MANIFEST_VERSION or
+                self.manifest.get('data_root_dir') != str(Path(self.data_root_dir).resolve())):
+            if self.debug:
+                print("🔄 No usable manifest for cached data - rebuilding once")
+            self.processed_data = {}
+            self._process_all_data()
+            return True
+        
+        self._load_metadata()
+        previous_manifest = self.manifest.get('subjects', {})
+        manifest = self._new_manifest()
+        changed = False
+        counts = {'new': 0, 'changed': 0, 'removed': 0}
+        jobs = []
+        
+        for _, row in self.metadata.iterrows():
+            subject_id = row['ID']
+            subject_dir = Path(self.data_root_dir) / subject_id
+            if not subject_dir.exists():
+                continue
+            
+            previous = previous_manifest.get(subject_id)
+            fingerprints = self._fingerprint_subject(subject_dir, previous)
+            manifest['subjects'][subject_id] = fingerprints
+            changed |= fingerprints != previous
+            
+            if previous is None:
+                stale_types = list(self.config.TRIAL_TYPE_MAPPING)
+                counts['new'] += 1
+            else:
+                stale_types = [t for t in self.config.TRIAL_TYPE_MAPPING
+                               if self._content_key(fingerprints[t]) != self._content_key(previous.get(t, []))]
+                if stale_types:
+                    counts['changed'] += 1
+            
+            subject_data = self.processed_data.get(subject_id)
+            if subject_data is not None and not row.astype(object).equals(
+                    pd.Series(subject_data['metadata'], dtype=object)):
+                subject_data['metadata'] = row.to_dict()
+                changed = True
+            
+            if stale_types:
+                if self.debug:
+                    print(f"🔄 Reprocessing {subject_id}: {', '.join(stale_types)}")
+                jobs.append((subject_id, row, stale_types))
+        
+        # Merge reprocessed trial types into the cached subject entries
+        for (subject_id, row, stale_types), update in zip(jobs, self._process_subjects(jobs)):
+            subject_data = self.processed_data.get(subject_id)
+            trial_data = dict(subject_data['trial_data']) if subject_data else {}
+            for original_type in stale_types:
+                trial_data.pop(self.config.TRIAL_TYPE_MAPPING[original_type], None)
+            if update:
+                trial_data.update(update['trial_data'])
+            
+            if trial_data:
+                self.processed_data[subject_id] = {'metadata': row.to_dict(), 'trial_data': trial_data}
+            else:
+                self.processed_data.pop(subject_id, None)
+        
+        # Evict subjects no longer in the metadata or data root; keep metadata order
+        ordered = {subject_id: self.processed_data[subject_id]
+                   for subject_id in manifest['subjects'] if subject_id in self.processed_data}
+        counts['removed'] = len(self.processed_data) - len(ordered)
+        changed |= counts['removed'] > 0 or list(ordered) != list(self.processed_data)
+        
+        self.processed_data = ordered
+        self.manifest = manifest
+        
+        if self.debug:
+            print(f"🔄 Incremental update: {counts['new']} new, {counts['changed']} changed, "
+                  f"{counts['removed']} removed subjects")
+        
+        return changed
+    
+    def _process_subject_data(self, subject_id: str, metadata_row: pd.Series,
+                              trial_prefixes: List[str] = None) -> Optional[Dict]:
+        """Process data for a single subject (optionally only some trial types)."""
+        subject_dir = Path(self.data_root_dir) / subject_id
+        if not subject_dir.exists():
+            if self.debug:
+                print(f"❌ Directory not found: {subject_dir}")
+            return None
+        
+        trial_data = {}
+        
+        for original_type in (trial_prefixes or ['primer', 'trial', 'vis', 'pref']):
+            try:
+                # Load trial data
+                df = self.trial_processor.find_and_combine_trial_files(subject_dir, original_type)
+                
+                if df is not None:
+                    # Process the data
+                    processed_df, anomalies = self._process_trial_data(df, original_type)
+                    
+                    # Store with mapped name
+                    new_type = self.config.TRIAL_TYPE_MAPPING[original_type]
+                    trial_data[new_type] = {
+                        'data': processed_df,
+                        'anomalies': anomalies,
+                        'periods': DataUtils.build_period_index(processed_df)
+                    }
+                    if self.config.COMPACT_TRIALS:
+                        trial_data[new_type] = TrialRecord.from_dict(trial_data[new_type])
+                    
+            except Exception as e:
+                print(f"Error processing {subject_id}/{original_type}: {str(e)}")
+                continue
+        
+        return {
+            'metadata': metadata_row.to_dict(),
+            'trial_data': trial_data
+        } if trial_data else None
+    
+    def _process_trial_data(self, df: pd.DataFrame, trial_type: str) -> Tuple[Optional[pd.DataFrame], AnomalyLog]:
+        """Process trial data and calculate metrics."""
+        if df is None or df.empty:
+            return None, AnomalyLog.empty()
+        
+        # Skip processing for pref trials (just clean duplicates)
+        if trial_type == 'pref':
+            df = df.drop_duplicates(subset='Left heel strike', keep='last')
+            return df, AnomalyLog.empty()
+        
+        # Validate required columns
+        required_cols = ['Stride Number', 'Success', 'Upper bound success', 
+                        'Lower bound success', 'Constant']
+        missing_cols = [col for col in required_cols if col not in df.columns]
+        if missing_cols:
+            print(f"Missing required columns: {missing_cols}")
+            return None, AnomalyLog.empty()
+        
+        try:
+            # Process trial data
+            df = df.sort_values('Stride Number')
+            df['Target size'] = df['Upper bound success'] - df['Lower bound success']
+            df = df.drop_duplicates(subset='Stride Number', keep='last')
+            
+            # Scale sum of gains and steps
+            if 'Sum of gains and steps' in df.columns:
+                df['Sum of gains and steps'] = 1.5 * df['Sum of gains and steps']
+            
+            # Detect anomalies
+            df, anomalies = DataUtils.detect_anomalies(df)
+            
+            return df, anomalies
+            
+        except Exception as e:
+            print(f"Error processing {trial_type} data: {str(e)}")
+            return None, AnomalyLog.empty()
+    
+    def get_trial_df(self, trial_dict: Dict) -> Optional[pd.DataFrame]:
+        """Get trial data from trial dictionary."""
+        if trial_dict and 'data' in trial_dict:
+            return trial_dict['data']
+        return None
+    
+    @staticmethod
+    def _has_stride_data(trial_dict) -> bool:
+        """Whether a trial has a stride table (without building a compact trial's frame)."""
+        if isinstance(trial_dict, TrialRecord):
+            return trial_dict.compact is not None
+        return bool(trial_dict) and trial_dict.get('data') is not None
+    
+    def filter_trials(self, max_target_size=None, min_age=None, max_age=None, 
+                     required_trial_types=None, min_strides=None, max_strides=None):
+        """
+        Filter trials based on specified criteria.
+        
+        Edits to the filtered trials never reach the parent manager. Under pandas
+        Copy-on-Write (always from pandas 3.0, ``pd.set_option('mode.copy_on_write',
+        True)`` on 2.x) each surviving trial is a shallow ``df.copy(deep=False)``
+        view that copies a column only when it is written, so filtering costs the
+        size of the subject/trial index rather than the data; without it the
+        frames are copied deeply. Compact trials (TrialRecord) share the parent's
+        encoded columns and are checked without building a frame.
+        """
+        filtered_data = {}
+        copy_on_write = DataUtils.copy_on_write_enabled()
+        
+        for subject_id, subject_data in self.processed_data.items():
+            # SIMPLIFIED AGE FILTERING - always use age_months/12
+            age = subject_data['metadata']['age_months'] / 12
+            if min_age is not None and age < min_age:
+                continue
+            if max_age is not None and age > max_age:
+                continue
+            
+            # Check required trial types
+            if required_trial_types:
+                missing_trials = [
+                    t for t in required_trial_types 
+                    if t not in subject_data['trial_data'] or 
+                       not self._has_stride_data(subject_data['trial_data'][t])
+                ]
+                if missing_trials:
+                    continue
+            
+            # Check other criteria
+            valid_subject = True
+            filtered_trial_data = {}
+            
+            for trial_type, trial_dict in subject_data['trial_data'].items():
+                if isinstance(trial_dict, TrialRecord) and trial_dict.compact is not None:
+                    # Only the columns the filters read (no whole frame is built)
+                    df = trial_dict.frame([col for col in ['Target size'] if col in trial_dict.compact.columns])
+                else:
+                    df = trial_dict['data'] if trial_dict else None
+                if df is not None:
+                    
+                    # Apply filters
+                    if (max_target_size is not None and 
+                        'Target size' in df.columns and 
+                        df['Target size'].min() > max_target_size):
+                        valid_subject = False
+                        break
+                    
+                    n_strides = len(df)
+                    if ((min_strides is not None and n_strides < min_strides) or
+                        (max_strides is not None and n_strides > max_strides)):
+                        valid_subject = False
+                        break
+                    
+                    # Include valid trial (anomaly log is read-only and shared)
+                    if isinstance(trial_dict, TrialRecord):
+                        filtered_trial_data[trial_type] = trial_dict.copy()
+                    else:
+                        filtered_trial_data[trial_type] = {
+                            **trial_dict,
+                            'data': df.copy(deep=not copy_on_write)
+                        }
+            
+            if valid_subject and filtered_trial_data:
+                filtered_data[subject_id] = {
+                    'metadata': subject_data['metadata'].copy(),
+                    'trial_data': filtered_trial_data
+                }
+        
+        # Create new instance with filtered data
+        new_instance = MotorLearningDataManager.__new__(MotorLearningDataManager)
+        new_instance.config = self.config
+        new_instance.trial_processor = self.trial_processor
+        new_instance.metadata_path = self.metadata_path
+        new_instance.data_root_dir = self.data_root_dir
+        new_instance.debug = self.debug
+        new_instance.workers = self.workers
+        new_instance.processing_errors = self.processing_errors
+        new_instance.manifest = self.manifest
+        new_instance.processed_data = filtered_data
+        new_instance.metadata = pd.DataFrame.from_dict(
+            {subj: data['metadata'] for subj, data in filtered_data.items()}, 
+            orient='index'
+        )
+        
+        return new_instance
+    
+    def get_trial_data(self, subject_id: str, trial_type: str) -> Optional[pd.DataFrame]:
+        """Get trial data for a specific subject and trial type."""
+        try:
+            trial_dict = self.processed_data[subject_id]['trial_data'][trial_type]
+            return trial_dict['data'] if trial_dict else None
+        except KeyError:
+            return None
+    
+    def get_period_index(self, subject_id: str, trial_type: str) -> Optional[Dict]:
+        """Get the precomputed condition-period index of a trial (see DataUtils.build_period_index)."""
+        try:
+            trial_dict = self.processed_data[subject_id]['trial_data'][trial_type]
+            return trial_dict.get('periods') if trial_dict else None
+        except KeyError:
+            return None
+    
+    def print_summary(self):
+        """Print summary statistics of the dataset."""
+        print(f"📊 Dataset Summary:")
+        print(f"Total subjects: {len(self.processed_data)}")
+        
+        if self.metadata is not None:
+            # SIMPLIFIED AGE DISPLAY - always use age_months/12
+            ages = self.metadata['age_months'] / 12
+            print(f"Age range: {ages.min():.1f} - {ages.max():.1f} years")
+            print(f"Mean age: {ages.mean():.1f} years")
+        
+        # Trial type counts
+        trial_counts = defaultdict(int)
+        for subject_data in self.processed_data.values():
+            for trial_type in subject_data['trial_data'].keys():
+                trial_counts[trial_type] += 1
+        
+        print(f"Trial type counts: {dict(trial_counts)}")
+
+
+def _process_subject_job(config: Config, data_root_dir: str, debug: bool,
+                         trial_processor: TrialProcessor, subject_id: str,
+                         metadata_row: pd.Series, trial_prefixes: Optional[List[str]]):
+    """Process-pool worker: process one subject and capture its console output."""
+    manager = MotorLearningDataManager.__new__(MotorLearningDataManager)
+    manager.config = config
+    manager.data_root_dir = data_root_dir
+    manager.debug = debug
+    manager.trial_processor = trial_processor
+    
+    log = io.StringIO()
+    error = None
+    subject_data = None
+    with contextlib.redirect_stdout(log):
+        try:
+            subject_data = manager._process_subject_data(subject_id, metadata_row, trial_prefixes=trial_prefixes)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+    
+    return subject_data, log.getvalue(), error
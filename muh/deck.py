@@ -0,0 +1,619 @@
+"""
+Automated PowerPoint Generator for Motor Learning Stride Change Images
+Creates a PowerPoint presentation with one image per slide, ordered by participant age.
+
+Images are downscaled to slide resolution (in parallel, cached on disk) before
+they are embedded, and with update=True an existing deck is edited in place:
+only slides whose image was added, changed or removed are touched, so adding
+one participant does not rebuild the whole deck.
+
+Requirements:
+- pip install python-pptx pandas
+
+Usage:
+- From the pipeline: python -m muh deck (or python -m muh report --individual --deck)
+- Standalone: update the file paths in main() and run python powerpoint_auto_generator.py
+"""
+
+import fnmatch
+import hashlib
+import json
+import os
+import re
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
+from PIL import Image
+from pptx import Presentation
+from pptx.util import Inches, Pt
+from pptx.enum.text import PP_ALIGN
+from pptx.dml.color import RGBColor
+
+def extract_subject_id_from_filename(filename: str) -> Optional[str]:
+    """
+    Extract subject ID from filename.
+    
+    Examples:
+    - "stride_change_MUH1396_fixed_grid.png" -> "MUH1396"
+    - "stride_change_MUH1069_fixed_grid.png" -> "MUH1069"
+    """
+    # Match pattern: stride_change_[SUBJECT_ID]_fixed_grid.png
+    match = re.search(r'stride_change_([A-Z]+\d+)_fixed_grid\.png', filename)
+    if match:
+        return match.group(1)
+    return None
+
+def load_subject_metadata(metadata_path: str) -> Dict[str, float]:
+    """
+    Load subject metadata and extract age information.
+    Returns dictionary mapping subject_id -> age_in_years
+    """
+    try:
+        # Load metadata CSV
+        metadata_df = pd.read_csv(metadata_path)
+        
+        # Convert age_months to years if that column exists
+        if 'age_months' in metadata_df.columns:
+            metadata_df['age_years'] = metadata_df['age_months'] / 12
+        elif 'age' in metadata_df.columns:
+            metadata_df['age_years'] = metadata_df['age']
+        else:
+            print("⚠️ Warning: No age column found in metadata")
+            return {}
+        
+        # Create mapping from ID to age
+        with_age = metadata_df[metadata_df['age_years'].notna()]
+        age_mapping = dict(zip(with_age['ID'].astype(str), with_age['age_years'].astype(float)))
+        
+        print(f"✅ Loaded age data for {len(age_mapping)} subjects")
+        return age_mapping
+        
+    except FileNotFoundError:
+        print(f"❌ Metadata file not found: {metadata_path}")
+        return {}
+    except Exception as e:
+        print(f"❌ Error loading metadata: {e}")
+        return {}
+
+def parse_image_paths_from_file(file_path: str) -> List[str]:
+    """
+    Parse image paths from your paste.txt file.
+    """
+    try:
+        with open(file_path, 'r') as f:
+            content = f.read()
+        
+        paths = []
+        for line in content.strip().split('\n'):
+            # Remove quotes and clean the path
+            path = line.strip().strip('"')
+            if path and path.endswith('.png'):
+                paths.append(path)
+        
+        print(f"📁 Found {len(paths)} image paths in {file_path}")
+        return paths
+        
+    except FileNotFoundError:
+        print(f"❌ Image paths file not found: {file_path}")
+        return []
+    except Exception as e:
+        print(f"❌ Error reading image paths: {e}")
+        return []
+
+# Folders (relative to the working directory) searched for images given by a bare
+# or foreign (e.g. Windows) path
+IMAGE_SEARCH_DIRS = [
+    ".",
+    "figures/individual_plots/stride_change_after_success_vs_failure",
+    "analysis/figures/individual_plots/stride_change_after_success_vs_failure",
+    "motor_learning_output/figures/individual_plots/stride_change_after_success_vs_failure"
+]
+
+def build_image_index(directories: List[str], recursive: bool = False) -> Dict[str, str]:
+    """
+    Map file name -> path for every file in the given directories.
+    
+    Built once per run so resolving N images costs one directory listing per
+    folder instead of several os.path.exists calls per image. The first folder
+    listing a name wins.
+    """
+    index = {}
+    for directory in directories:
+        if not os.path.isdir(directory):
+            continue
+        if recursive:
+            for root, _, files in os.walk(directory):
+                for name in files:
+                    index.setdefault(name, os.path.join(root, name))
+        else:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        index.setdefault(entry.name, os.path.join(directory, entry.name))
+    return index
+
+def find_images_in_directory(directory: str, pattern: str = "*stride_change*fixed_grid.png",
+                             recursive: bool = True) -> List[str]:
+    """
+    Alternative method: Find all stride change images in a directory.
+    
+    With recursive=False only the directory itself is listed (enough for the
+    flat figure folders, and much faster than walking a whole project tree).
+    """
+    try:
+        if not Path(directory).exists():
+            print(f"❌ Directory not found: {directory}")
+            return []
+        
+        index = build_image_index([directory], recursive=recursive)
+        image_paths_str = sorted(path for name, path in index.items() if fnmatch.fnmatch(name, pattern))
+        
+        print(f"📁 Found {len(image_paths_str)} images in {directory}")
+        return image_paths_str
+        
+    except Exception as e:
+        print(f"❌ Error searching directory: {e}")
+        return []
+
+def _source_signature(path: str) -> Dict:
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+def _downscale_image(job: Tuple[str, str, int, int]) -> str:
+    """Write a copy of an image no taller than max_height px and no wider than max_width px."""
+    source, target, max_width, max_height = job
+    with Image.open(source) as img:
+        img.load()
+        if img.mode in ('RGBA', 'LA', 'P'):
+            background = Image.new('RGB', img.size, 'white')
+            rgba = img.convert('RGBA')
+            background.paste(rgba, mask=rgba.getchannel('A'))
+            img = background
+        scale = min(1.0, max_width / img.width, max_height / img.height)
+        if scale < 1.0:
+            img = img.resize((max(1, round(img.width * scale)), max(1, round(img.height * scale))),
+                             Image.LANCZOS)
+        tmp_path = target + '.tmp'
+        img.save(tmp_path, format='PNG', optimize=True)
+    os.replace(tmp_path, target)
+    return target
+
+def prepare_slide_images(image_data: List[Dict], cache_dir: str, max_width: int, max_height: int,
+                         workers: int = 1) -> None:
+    """
+    Point each image at a slide-resolution copy in cache_dir (img_info['slide_path']).
+    
+    Copies are keyed by the source size/mtime and the target size, so only new
+    or changed figures are downscaled; those are done in parallel.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    jobs = []
+    for img_info in image_data:
+        signature = _source_signature(img_info['path'])
+        key = hashlib.sha1(json.dumps([os.path.abspath(img_info['path']), signature, max_width, max_height])
+                           .encode()).hexdigest()[:12]
+        img_info['signature'] = signature
+        img_info['slide_path'] = os.path.join(cache_dir, f"{Path(img_info['filename']).stem}_{key}.png")
+        if not os.path.exists(img_info['slide_path']):
+            jobs.append((img_info['path'], img_info['slide_path'], max_width, max_height))
+    
+    if not jobs:
+        return
+    print(f"🖼️ Downscaling {len(jobs)} images to {max_width}×{max_height} px...")
+    if workers == 1 or len(jobs) == 1:
+        for job in jobs:
+            _downscale_image(job)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(_downscale_image, jobs))
+
+# Slide geometry (16:9); images sit below a title band with side and bottom margins
+SLIDE_WIDTH = Inches(13.333)
+SLIDE_HEIGHT = Inches(7.5)
+IMAGE_LEFT = Inches(0.5)
+IMAGE_TOP = Inches(1.2)
+IMAGE_WIDTH = Inches(13.333 - 1.0)
+IMAGE_HEIGHT = Inches(7.5 - 1.2 - 0.3)
+TITLE_SHAPE_NAME = "Slide title"
+DECK_MANIFEST_VERSION = 1
+
+def _resolve_image_data(image_paths: List[str], age_mapping: Dict[str, float]) -> Tuple[List[Dict], List[Dict]]:
+    """Existing images with subject ID and age, and the ones missing on disk."""
+    image_data = []
+    missing_images = []
+    index = None  # file name -> path in IMAGE_SEARCH_DIRS, listed on first use
+    
+    for img_path in image_paths:
+        # Convert Windows path to current OS format and handle relative paths
+        img_path = img_path.replace('\\', os.sep).replace('/', os.sep)
+        
+        # If path starts with C:\ but we're not on Windows, look the file name up in the common locations
+        if img_path.startswith('C:') and os.name != 'nt':
+            filename = os.path.basename(img_path)
+            if index is None:
+                index = build_image_index(IMAGE_SEARCH_DIRS)
+            if filename not in index:
+                print(f"⚠️ Could not find image: {filename}")
+                continue
+            img_path = index[filename]
+        
+        # Extract subject ID from filename
+        filename = os.path.basename(img_path)
+        subject_id = extract_subject_id_from_filename(filename)
+        
+        if subject_id is None:
+            print(f"⚠️ Could not extract subject ID from: {filename}")
+            continue
+        
+        img_info = {
+            'path': img_path,
+            'subject_id': subject_id,
+            'age': age_mapping.get(subject_id, None),
+            'filename': filename
+        }
+        (image_data if os.path.exists(img_path) else missing_images).append(img_info)
+    
+    return image_data, missing_images
+
+def _slide_title_text(img_info: Dict, i: int, n_slides: int) -> str:
+    title_text = f"Subject {img_info['subject_id']}"
+    if img_info['age'] is not None:
+        title_text += f" (Age: {img_info['age']:.1f} years)"
+    return title_text + f" - Slide {i} of {n_slides}"
+
+def _subtitle_text(image_data: List[Dict], has_ages: bool) -> str:
+    subtitle_text = f"Individual Stride Change Distributions\n"
+    subtitle_text += f"{len(image_data)} participants"
+    if has_ages:
+        ages_with_data = [img['age'] for img in image_data if img['age'] is not None]
+        if ages_with_data:
+            subtitle_text += f"\nAge range: {min(ages_with_data):.1f} - {max(ages_with_data):.1f} years"
+            subtitle_text += f"\nOrdered from youngest to oldest"
+    return subtitle_text
+
+def _add_image_slide(prs, img_info: Dict, i: int, n_slides: int):
+    """Append one subject's slide (title text box and centred figure)."""
+    slide = prs.slides.add_slide(prs.slide_layouts[6])  # Blank slide layout
+    
+    # Add title text box
+    title_box = slide.shapes.add_textbox(Inches(0.5), Inches(0.2), Inches(12), Inches(0.8))
+    title_box.name = TITLE_SHAPE_NAME
+    title_frame = title_box.text_frame
+    title_frame.margin_left = Inches(0.1)
+    title_frame.margin_right = Inches(0.1)
+    title_frame.margin_top = Inches(0.1)
+    title_frame.margin_bottom = Inches(0.1)
+    
+    title_paragraph = title_frame.paragraphs[0]
+    title_paragraph.text = _slide_title_text(img_info, i, n_slides)
+    title_paragraph.alignment = PP_ALIGN.CENTER
+    
+    # Format title text
+    title_run = title_paragraph.runs[0]
+    title_run.font.size = Pt(24)
+    title_run.font.bold = True
+    title_run.font.color.rgb = RGBColor(47, 84, 150)  # Dark blue
+    
+    # Add image
+    try:
+        # Height constraint only - PowerPoint keeps the aspect ratio
+        pic = slide.shapes.add_picture(img_info.get('slide_path', img_info['path']),
+                                       IMAGE_LEFT, IMAGE_TOP, height=IMAGE_HEIGHT)
+        
+        # Center the image horizontally if it's narrower than available width
+        if pic.width < IMAGE_WIDTH:
+            pic.left = int(IMAGE_LEFT + (IMAGE_WIDTH - pic.width) / 2)
+            
+    except Exception as e:
+        print(f"❌ Error adding image {img_info['filename']}: {e}")
+        # Add error text instead of image
+        error_box = slide.shapes.add_textbox(Inches(2), Inches(3), Inches(8), Inches(2))
+        error_frame = error_box.text_frame
+        error_paragraph = error_frame.paragraphs[0]
+        error_paragraph.text = f"Error loading image:\n{img_info['filename']}"
+        error_paragraph.alignment = PP_ALIGN.CENTER
+    
+    return slide
+
+def _set_slide_title(slide, text: str):
+    """Change a subject slide's title text, keeping its formatting."""
+    for shape in slide.shapes:
+        if shape.name == TITLE_SHAPE_NAME and shape.has_text_frame:
+            runs = shape.text_frame.paragraphs[0].runs
+            if runs:
+                runs[0].text = text
+            return
+
+def _delete_slide(prs, slide):
+    """Remove a slide and its part (python-pptx has no public API for this)."""
+    slide_ids = prs.slides._sldIdLst
+    for slide_id in list(slide_ids):
+        if slide_id.id == slide.slide_id:
+            prs.part.drop_rel(slide_id.rId)
+            slide_ids.remove(slide_id)
+            return
+
+def _order_slides(prs, slide_ids: List[int]):
+    """Put the slides with these IDs first, in this order; other slides keep their order after them."""
+    id_list = prs.slides._sldIdLst
+    elements = {element.id: element for element in id_list}
+    listed = set(slide_ids)
+    ordered = [elements[slide_id] for slide_id in slide_ids if slide_id in elements]
+    ordered += [element for element in id_list if element.id not in listed]
+    for element in list(id_list):
+        id_list.remove(element)
+    for element in ordered:
+        id_list.append(element)
+    
+    # Slides added after a deletion can reuse an existing part name; renumber them all
+    prs.part.rename_slide_parts([element.rId for element in id_list])
+
+def _deck_manifest_path(output_filename: str) -> Path:
+    """Sidecar recording which image each slide of a deck shows."""
+    return Path(output_filename).with_suffix('.slides.json')
+
+def _load_deck_manifest(output_filename: str, title: str, slide_dpi: Optional[int]) -> Optional[Dict]:
+    manifest_path = _deck_manifest_path(output_filename)
+    if not os.path.exists(output_filename) or not manifest_path.exists():
+        return None
+    try:
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (manifest.get('version') != DECK_MANIFEST_VERSION or manifest.get('title') != title or
+            manifest.get('slide_dpi') != slide_dpi):
+        return None
+    return manifest
+
+def _slide_entry(img_info: Dict, slide_id: int) -> Dict:
+    return {'slide_id': slide_id, 'path': img_info['path'], 'age': img_info['age'],
+            'signature': img_info.get('signature') or _source_signature(img_info['path'])}
+
+def create_powerpoint_from_images(
+    image_paths: List[str], 
+    output_filename: str = "stride_change_presentation.pptx",
+    metadata_path: Optional[str] = None,
+    title: str = "Motor Learning Stride Change Analysis",
+    update: bool = False,
+    thumbnail_dir: Optional[str] = None,
+    slide_dpi: Optional[int] = 150,
+    workers: int = 1
+) -> str:
+    """
+    Create PowerPoint presentation from stride change images, ordered by age.
+    
+    Parameters:
+    -----------
+    image_paths : List[str]
+        List of image file paths
+    output_filename : str
+        Name of output PowerPoint file
+    metadata_path : str, optional
+        Path to metadata CSV file containing age information
+    title : str
+        Title for the presentation
+    update : bool, default False
+        Edit the existing deck instead of rebuilding it: only slides of
+        subjects whose image was added, changed or removed are touched, then
+        slides are re-sorted by age and renumbered. Falls back to a full build
+        when there is no deck (or its .slides.json sidecar) from the same
+        title and slide_dpi.
+    thumbnail_dir : str, optional
+        Cache of slide-resolution copies (default: slide_thumbnails/ next to
+        the output file)
+    slide_dpi : int or None, default 150
+        Resolution of the embedded images at their size on the slide; None
+        embeds the original files
+    workers : int, default 1
+        Processes for downscaling new or changed images
+    
+    Returns:
+    --------
+    str : Path to created PowerPoint file
+    """
+    
+    print(f"🚀 Creating PowerPoint presentation: {output_filename}")
+    
+    # Load subject metadata for age information
+    age_mapping = {}
+    if metadata_path and os.path.exists(metadata_path):
+        age_mapping = load_subject_metadata(metadata_path)
+    
+    # Process image paths and extract subject information
+    image_data, missing_images = _resolve_image_data(image_paths, age_mapping)
+    
+    print(f"📊 Found {len(image_data)} valid images")
+    if missing_images:
+        print(f"⚠️ {len(missing_images)} images not found on disk")
+        print("   First few missing:")
+        for missing in missing_images[:5]:
+            print(f"     {missing['filename']}")
+    
+    if not image_data:
+        print("❌ No valid images found! Check your paths.")
+        return ""
+    
+    # Sort by age (subjects without age data will be at the end)
+    image_data.sort(key=lambda x: (x['age'] is None, x['age'] if x['age'] is not None else 999, x['subject_id']))
+    
+    # Downscale to what the slide can show (new or changed images only)
+    if slide_dpi:
+        if thumbnail_dir is None:
+            thumbnail_dir = os.path.join(os.path.dirname(os.path.abspath(output_filename)), 'slide_thumbnails')
+        prepare_slide_images(image_data, thumbnail_dir, max_width=int(IMAGE_WIDTH.inches * slide_dpi),
+                             max_height=int(IMAGE_HEIGHT.inches * slide_dpi), workers=workers)
+    
+    manifest = _load_deck_manifest(output_filename, title, slide_dpi) if update else None
+    if update and manifest is None:
+        print("🔄 No matching deck to update - building it from scratch")
+    n_slides = len(image_data)
+    
+    if manifest is not None:
+        prs = Presentation(output_filename)
+        slides_by_id = {slide.slide_id: slide for slide in prs.slides}
+        previous = manifest['slides']
+        current = {img['subject_id'] for img in image_data}
+        entries = {}
+        added = replaced = unchanged = 0
+        
+        # Drop slides of subjects that are gone
+        removed = [subject_id for subject_id in previous if subject_id not in current]
+        for subject_id in removed:
+            slide = slides_by_id.get(previous[subject_id]['slide_id'])
+            if slide is not None:
+                _delete_slide(prs, slide)
+        
+        # Replace slides whose image changed, add slides for new subjects
+        for i, img_info in enumerate(image_data, 1):
+            entry = previous.get(img_info['subject_id'])
+            slide = slides_by_id.get(entry['slide_id']) if entry else None
+            if (slide is not None and entry['path'] == img_info['path'] and
+                    entry['signature'] == img_info.get('signature', _source_signature(img_info['path']))):
+                entries[img_info['subject_id']] = _slide_entry(img_info, slide.slide_id)
+                unchanged += 1
+                continue
+            if slide is not None:
+                _delete_slide(prs, slide)
+                replaced += 1
+            else:
+                added += 1
+            slide = _add_image_slide(prs, img_info, i, n_slides)
+            entries[img_info['subject_id']] = _slide_entry(img_info, slide.slide_id)
+        
+        # Age order and slide numbers (ages or the slide count may have changed)
+        _order_slides(prs, [manifest['title_slide_id']] +
+                      [entries[img['subject_id']]['slide_id'] for img in image_data])
+        slides_by_id = {slide.slide_id: slide for slide in prs.slides}
+        for i, img_info in enumerate(image_data, 1):
+            _set_slide_title(slides_by_id[entries[img_info['subject_id']]['slide_id']],
+                             _slide_title_text(img_info, i, n_slides))
+        title_slide = slides_by_id.get(manifest['title_slide_id'])
+        if title_slide is not None and len(title_slide.placeholders) > 1:
+            title_slide.placeholders[1].text = _subtitle_text(image_data, bool(age_mapping))
+        
+        print(f"✏️ Updating deck: {added} added, {replaced} replaced, {len(removed)} removed, "
+              f"{unchanged} unchanged")
+        title_slide_id = manifest['title_slide_id']
+    
+    else:
+        # Create new presentation
+        prs = Presentation()
+        
+        # Set slide size to widescreen (16:9)
+        prs.slide_width = SLIDE_WIDTH
+        prs.slide_height = SLIDE_HEIGHT
+        
+        # Add title slide
+        title_slide_layout = prs.slide_layouts[0]  # Title slide layout
+        title_slide = prs.slides.add_slide(title_slide_layout)
+        title_slide_id = title_slide.slide_id
+        
+        # Set title
+        title_slide.shapes.title.text = title
+        
+        # Set subtitle with summary information
+        if title_slide.placeholders[1]:
+            title_slide.placeholders[1].text = _subtitle_text(image_data, bool(age_mapping))
+        
+        print(f"📝 Adding {n_slides} image slides...")
+        
+        entries = {}
+        for i, img_info in enumerate(image_data, 1):
+            slide = _add_image_slide(prs, img_info, i, n_slides)
+            entries[img_info['subject_id']] = _slide_entry(img_info, slide.slide_id)
+            if i % 10 == 0:  # Progress update every 10 slides
+                print(f"   Added slide {i}/{n_slides}")
+    
+    # Save presentation
+    try:
+        prs.save(output_filename)
+        with open(_deck_manifest_path(output_filename), 'w') as f:
+            json.dump({'version': DECK_MANIFEST_VERSION, 'title': title, 'slide_dpi': slide_dpi,
+                       'title_slide_id': title_slide_id, 'slides': entries}, f, indent=1)
+        print(f"✅ PowerPoint presentation saved: {output_filename}")
+        print(f"📊 Total slides: {len(prs.slides)} (1 title + {n_slides} image slides, "
+              f"{os.path.getsize(output_filename) / 2**20:.1f} MB)")
+        
+        # Print age summary
+        if age_mapping:
+            ages_with_data = [img['age'] for img in image_data if img['age'] is not None]
+            ages_without_data = len([img for img in image_data if img['age'] is None])
+            
+            if ages_with_data:
+                print(f"👥 Age range: {min(ages_with_data):.1f} - {max(ages_with_data):.1f} years")
+                print(f"📈 Subjects with age data: {len(ages_with_data)}")
+            if ages_without_data > 0:
+                print(f"⚠️ Subjects without age data: {ages_without_data} (placed at end)")
+        
+        return output_filename
+        
+    except Exception as e:
+        print(f"❌ Error saving PowerPoint: {e}")
+        return ""
+
+def main():
+    """
+    Main function - Update these paths for your setup
+    """
+    
+    print("🎯 Motor Learning Stride Change PowerPoint Generator")
+    print("=" * 60)
+    
+    # =============================================================================
+    # UPDATE THESE PATHS FOR YOUR SETUP
+    # =============================================================================
+    
+    # Option 1: Use the paste.txt file with image paths
+    image_paths_file = "paste.txt"  # Your file with the image paths
+    
+    # Option 2: Search a directory for images (alternative)
+    # images_directory = "analysis/figures/individual_plots/stride_change_after_success_vs_failure/"
+    
+    # Metadata file with age information
+    metadata_file = "muh_metadata.csv"
+    
+    # Output PowerPoint filename
+    output_file = "stride_change_analysis_by_age.pptx"
+    
+    # Presentation title
+    presentation_title = "Motor Learning: Stride Change After Success vs Failure"
+    
+    # =============================================================================
+    
+    # Method 1: Load paths from file
+    if os.path.exists(image_paths_file):
+        print(f"📁 Loading image paths from: {image_paths_file}")
+        image_paths = parse_image_paths_from_file(image_paths_file)
+    else:
+        # Method 2: Search directory (fallback)
+        print(f"📁 Image paths file not found, searching current directory...")
+        image_paths = find_images_in_directory(".", "*stride_change*fixed_grid.png")
+    
+    if not image_paths:
+        print("❌ No image paths found!")
+        print("💡 Make sure either:")
+        print("   1. paste.txt exists with your image paths, OR")
+        print("   2. Image files are in the current directory or subdirectories")
+        return
+    
+    # Create PowerPoint presentation
+    result = create_powerpoint_from_images(
+        image_paths=image_paths,
+        output_filename=output_file,
+        metadata_path=metadata_file,
+        title=presentation_title
+    )
+    
+    if result:
+        print("\n" + "=" * 60)
+        print("🎉 SUCCESS! PowerPoint presentation created!")
+        print(f"📄 File: {result}")
+        print("💡 Images are ordered from youngest to oldest participant")
+        print("💡 Open the file in PowerPoint to view/edit")
+    else:
+        print("\n❌ Failed to create PowerPoint presentation")
+
+if __name__ == "__main__":
+    main()
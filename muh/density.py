@@ -0,0 +1,146 @@
+"""Batched Gaussian kernel density estimates for many 1-D samples at once."""
+
+from typing import List, Sequence
+
+import numpy as np
+
+
+# DENSITY ESTIMATOR
+# ==============================================================================
+
+class DensityEstimator:
+    """
+    Gaussian kernel density estimates of many samples, evaluated on grids in
+    one pass instead of one scipy.stats.gaussian_kde fit per sample.
+
+    Bandwidths follow Scott's rule exactly as gaussian_kde does (sample
+    standard deviation × n^(-1/5)). Small samples are evaluated directly as a
+    (samples × points × grid) array in batches that bound memory; samples of at
+    least `binned_min_samples` points are linearly binned onto their grid and
+    smoothed with the Gaussian's Fourier transform, which costs O(grid log grid)
+    however many points they hold.
+    """
+
+    def __init__(self, grid_points: int = 1024, padding: float = 0.1, tail: float = 3.0,
+                 max_batch_elements: int = 4_000_000, binned_min_samples: int = 500):
+        self.grid_points = grid_points
+        self.padding = padding
+        self.tail = tail
+        self.max_batch_elements = max_batch_elements
+        self.binned_min_samples = binned_min_samples
+
+    @staticmethod
+    def bandwidths(samples: Sequence[np.ndarray]) -> np.ndarray:
+        """Scott's rule bandwidth per sample (NaN below two points or without spread)."""
+        result = np.full(len(samples), np.nan)
+        for i, sample in enumerate(samples):
+            if len(sample) >= 2:
+                result[i] = np.std(sample, ddof=1) * len(sample) ** (-1 / 5)
+        result[result == 0] = np.nan
+        return result
+
+    def grid_for(self, samples: Sequence) -> np.ndarray:
+        """
+        One grid covering every sample: the pooled range widened by `padding`
+        of itself and by `tail` bandwidths, so no density is cut off at the edges.
+        """
+        samples = self._clean(samples)
+        values = np.concatenate(samples) if samples else np.array([])
+        if values.size == 0:
+            return np.linspace(-1.0, 1.0, self.grid_points)
+
+        low, high = values.min(), values.max()
+        h = self.bandwidths(samples)
+        margin = max(self.padding * (high - low),
+                     self.tail * np.nanmax(h) if np.isfinite(h).any() else 0.0)
+        margin = margin or self.padding
+        return np.linspace(low - margin, high + margin, self.grid_points)
+
+    def evaluate(self, samples: Sequence, grid: np.ndarray) -> np.ndarray:
+        """
+        Densities of every sample on `grid`, either one grid shared by all
+        samples (shape (G,)) or one per sample (shape (k, G)).
+
+        Returns a (k × G) array; rows of samples gaussian_kde cannot fit (fewer
+        than two points, or all points equal) are NaN.
+        """
+        samples = self._clean(samples)
+        k = len(samples)
+        grid = np.asarray(grid, dtype=float)
+        grids = np.broadcast_to(grid, (k, grid.shape[-1])) if grid.ndim == 1 else grid
+        densities = np.full(grids.shape, np.nan)
+        if k == 0:
+            return densities
+
+        h = self.bandwidths(samples)
+        n = np.array([len(sample) for sample in samples])
+        step = grids[:, 1] - grids[:, 0] if grids.shape[1] > 1 else np.full(k, np.inf)
+        inside = np.array([sample.size > 0 and sample.min() >= row[0] and sample.max() <= row[-1]
+                           for sample, row in zip(samples, grids)])
+
+        fitted = np.isfinite(h)
+        binned = fitted & inside & (n >= self.binned_min_samples) & (step <= h / 4)
+        direct = fitted & ~binned
+
+        if binned.any():
+            rows = np.flatnonzero(binned)
+            densities[rows] = self._binned([samples[i] for i in rows], grids[rows], h[rows])
+        if direct.any():
+            rows = np.flatnonzero(direct)
+            densities[rows] = self._direct([samples[i] for i in rows], grids[rows], h[rows])
+        return densities
+
+    @staticmethod
+    def _clean(samples: Sequence) -> List[np.ndarray]:
+        cleaned = []
+        for sample in samples:
+            values = np.asarray(sample, dtype=float).ravel()
+            cleaned.append(values[~np.isnan(values)])
+        return cleaned
+
+    def _direct(self, samples: List[np.ndarray], grids: np.ndarray, h: np.ndarray) -> np.ndarray:
+        """Sum of every point's kernel, for batches of similar-sized samples padded to equal length."""
+        n = np.array([len(sample) for sample in samples])
+        order = np.argsort(n, kind='stable')
+        G = grids.shape[1]
+
+        densities = np.empty(grids.shape)
+        start = 0
+        while start < len(order):
+            # Grow the batch (in ascending size) while the padded array stays within bounds
+            stop = start + 1
+            while stop < len(order) and (stop + 1 - start) * n[order[stop]] * G <= self.max_batch_elements:
+                stop += 1
+            rows = order[start:stop]
+            width = n[rows].max()
+            X = np.zeros((len(rows), width))
+            mask = np.arange(width) < n[rows, None]
+            X[mask] = np.concatenate([samples[i] for i in rows])
+
+            z = (grids[rows, None, :] - X[:, :, None]) / h[rows, None, None]
+            kernels = np.exp(-0.5 * z * z) * mask[:, :, None]
+            densities[rows] = kernels.sum(axis=1) / (n[rows, None] * h[rows, None] * np.sqrt(2 * np.pi))
+            start = stop
+        return densities
+
+    def _binned(self, samples: List[np.ndarray], grids: np.ndarray, h: np.ndarray) -> np.ndarray:
+        """Linear binning onto each grid, then Gaussian smoothing as a product in Fourier space."""
+        k, G = grids.shape
+        step = grids[:, 1] - grids[:, 0]
+        sigma = h / step  # kernel width in grid steps
+        pad = int(np.ceil(5 * sigma.max()))  # keeps the circular convolution from wrapping
+        length = 1 << int(np.ceil(np.log2(G + 2 * pad)))
+
+        n = np.array([len(sample) for sample in samples])
+        row = np.repeat(np.arange(k), n)
+        position = (np.concatenate(samples) - grids[row, 0]) / step[row] + pad
+        left = np.minimum(np.floor(position).astype(int), length - 2)
+        fraction = position - left
+        offsets = row * length + left
+        counts = (np.bincount(offsets, weights=1 - fraction, minlength=k * length)
+                  + np.bincount(offsets + 1, weights=fraction, minlength=k * length)).reshape(k, length)
+
+        frequencies = np.fft.rfftfreq(length)
+        transfer = np.exp(-0.5 * (2 * np.pi * frequencies[None, :] * sigma[:, None]) ** 2)
+        smoothed = np.fft.irfft(np.fft.rfft(counts, axis=1) * transfer, n=length, axis=1)
+        return np.maximum(smoothed[:, pad:pad + G], 0) / (n[:, None] * step[:, None])
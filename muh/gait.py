@@ -0,0 +1,301 @@
+"""Heel strikes, toe-offs and step lengths detected from the raw force and marker channels."""
+
+from pathlib import Path
+from typing import List, Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .utils import StrideCache
+
+
+# GAIT EVENT DETECTION
+# ==============================================================================
+
+class GaitEventDetector:
+    """
+    Batched gait-event detection on the ~300 Hz channels of D-Flow exports.
+
+    A foot is in contact while its vertical force is above ``force_on`` and
+    until it drops below ``force_off`` (hysteresis, so noise around a single
+    threshold cannot split one contact). Heel strikes and toe-offs are the
+    rising and falling edges of that contact signal; contacts shorter than
+    ``min_contact`` seconds are discarded. The step length of a heel strike is
+    the distance between the two foot markers at that sample, which is how
+    D-Flow's own step length columns are computed.
+
+    Any number of trials is processed at once: their samples are concatenated
+    into flat arrays and every step (hysteresis, edges, matching against
+    D-Flow's heel strike counters) is an array operation with trial
+    boundaries masked, never a loop over samples or trials.
+
+    Usage:
+        detector = GaitEventDetector.from_config(config)
+        events = detector.detect([detector.load(path) for path in files])
+        strides = detector.strides(events)
+    """
+
+    SIDES = ('Left', 'Right')
+    CHANNELS = ['Time', 'Left vertical force', 'Right vertical force', 'Left foot marker', 'Right foot marker',
+                'Left heel strike', 'Right heel strike', 'Left step length', 'Right step length']
+    REQUIRED = ['Time', 'Left vertical force', 'Right vertical force', 'Left foot marker', 'Right foot marker']
+
+    def __init__(self, force_on: float = 50.0, force_off: float = 20.0, min_contact: float = 0.1,
+                 match_window: float = 0.25, step_tolerance: float = 0.05,
+                 stride_cache: Optional[StrideCache] = None):
+        if force_off > force_on:
+            raise ValueError(f"force_off ({force_off}) must not exceed force_on ({force_on})")
+        self.force_on = force_on
+        self.force_off = force_off
+        self.min_contact = min_contact
+        self.match_window = match_window
+        self.step_tolerance = step_tolerance
+        self.stride_cache = stride_cache
+
+    @classmethod
+    def from_config(cls, config) -> 'GaitEventDetector':
+        # Samples are added to the stride cache on the first run, then memory-mapped
+        stride_cache = StrideCache(config.STRIDE_CACHE_DIR, keep_samples=True) if config.USE_STRIDE_CACHE else None
+        return cls(force_on=config.GAIT_FORCE_ON, force_off=config.GAIT_FORCE_OFF,
+                   min_contact=config.GAIT_MIN_CONTACT, match_window=config.GAIT_MATCH_WINDOW,
+                   step_tolerance=config.GAIT_STEP_TOLERANCE, stride_cache=stride_cache)
+
+    # --------------------------------------------------------------------------
+    # Loading
+    # --------------------------------------------------------------------------
+
+    def load(self, file_path: Union[str, Path]) -> Optional[pd.DataFrame]:
+        """Sample channels of one export (from the stride cache when it keeps them)."""
+        samples = self.stride_cache.load_samples(file_path) if self.stride_cache is not None else None
+        if samples is None:
+            try:
+                samples = pd.read_csv(file_path, sep='\t', usecols=lambda col: col in self.CHANNELS)
+            except Exception as e:
+                print(f"❌ Error loading {Path(file_path).name}: {str(e)}")
+                return None
+        if not set(self.REQUIRED).issubset(samples.columns) or samples.empty:
+            return None
+        return samples[[col for col in self.CHANNELS if col in samples.columns]]
+
+    # --------------------------------------------------------------------------
+    # Detection
+    # --------------------------------------------------------------------------
+
+    def _contact(self, force: np.ndarray, first: np.ndarray) -> np.ndarray:
+        """Hysteresis contact state: each sample holds the last decided state of its trial."""
+        decided = (force >= self.force_on) | (force <= self.force_off)
+        state = force >= self.force_on
+        # The first sample of a trial always decides, at the midpoint when inside the band
+        state[first] = force[first] >= (self.force_on + self.force_off) / 2
+        decided |= first
+        last = np.maximum.accumulate(np.where(decided, np.arange(len(force)), 0))
+        return state[last]
+
+    @staticmethod
+    def _flatten(samples: List[pd.DataFrame], column: str) -> np.ndarray:
+        return np.concatenate([df[column].to_numpy(dtype=np.float64, na_value=np.nan) if column in df.columns
+                               else np.full(len(df), np.nan) for df in samples])
+
+    def _match(self, detected: np.ndarray, reported: np.ndarray, time: np.ndarray,
+               trial_of: np.ndarray) -> np.ndarray:
+        """Index into `reported` of the nearest same-trial event within match_window (-1 = none), one-to-one."""
+        match = np.full(len(detected), -1)
+        if not len(detected) or not len(reported):
+            return match
+
+        j = np.searchsorted(reported, detected)
+        candidates = np.stack([np.clip(j - 1, 0, len(reported) - 1), np.clip(j, 0, len(reported) - 1)])
+        gap = np.abs(time[reported[candidates]] - time[detected])
+        gap[trial_of[reported[candidates]] != trial_of[detected]] = np.inf
+        best = np.argmin(gap, axis=0)
+        nearest = candidates[best, np.arange(len(detected))]
+        nearest_gap = gap[best, np.arange(len(detected))]
+        ok = nearest_gap <= self.match_window
+
+        # Keep only the closest detection when several claim the same D-Flow event
+        order = np.lexsort((nearest_gap, nearest))
+        order = order[ok[order]]
+        _, first = np.unique(nearest[order], return_index=True)
+        winners = order[first]
+        match[winners] = nearest[winners]
+        return match
+
+    def detect(self, samples: List[pd.DataFrame], labels: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        Heel strikes of both feet in every trial, cross-checked against D-Flow.
+
+        One row per event with trial (position in `samples`, plus the columns
+        of `labels` when given, one row per trial), side, status ('matched',
+        'detected_only' or 'dflow_only'), the detected heel strike (sample,
+        time, toe_off_time, contact_time, step_length) and the D-Flow event it
+        matched (dflow_count, dflow_time, dflow_step_length, lag,
+        step_length_diff, step_ok).
+        """
+        samples = list(samples or [])
+        lengths = np.array([len(df) if df is not None else 0 for df in samples], dtype=np.int64)
+        samples = [df if df is not None else pd.DataFrame(columns=self.CHANNELS) for df in samples]
+        starts = np.cumsum(lengths) - lengths
+        n_samples = int(lengths.sum())
+        if n_samples == 0:
+            return pd.DataFrame(columns=['trial', 'side', 'status'])
+
+        trial_of = np.repeat(np.arange(len(samples)), lengths)
+        first = np.zeros(n_samples, dtype=bool)
+        first[starts[lengths > 0]] = True
+        time = self._flatten(samples, 'Time')
+        markers = {side: self._flatten(samples, f'{side} foot marker') for side in self.SIDES}
+
+        frames = []
+        for side, other in zip(self.SIDES, reversed(self.SIDES)):
+            contact = self._contact(self._flatten(samples, f'{side} vertical force'), first)
+            previous = np.roll(contact, 1)
+            strikes = np.flatnonzero(contact & ~previous & ~first)
+            offs = np.flatnonzero(~contact & previous & ~first)
+
+            # Toe-off ending each contact, if it happens in the same trial
+            toe_off = np.full(len(strikes), np.nan)
+            if len(offs):
+                j = np.searchsorted(offs, strikes)
+                jc = np.minimum(j, len(offs) - 1)
+                same_trial = (j < len(offs)) & (trial_of[offs[jc]] == trial_of[strikes])
+                toe_off[same_trial] = time[offs[jc[same_trial]]]
+            contact_time = toe_off - time[strikes]
+            keep = ~(contact_time < self.min_contact)  # NaN (trial ends in contact) is kept
+            strikes, toe_off, contact_time = strikes[keep], toe_off[keep], contact_time[keep]
+
+            # D-Flow heel strikes: samples where its counter for this foot goes up
+            counter = self._flatten(samples, f'{side} heel strike')
+            with np.errstate(invalid='ignore'):
+                reported = np.flatnonzero((np.diff(counter, prepend=np.nan) > 0) & ~first)
+            match = self._match(strikes, reported, time, trial_of)
+            matched = match >= 0
+            reported_step = self._flatten(samples, f'{side} step length')
+
+            detected = pd.DataFrame({
+                'trial': trial_of[strikes],
+                'side': side,
+                'status': np.where(matched, 'matched', 'detected_only'),
+                'sample': strikes - starts[trial_of[strikes]],
+                'time': time[strikes],
+                'toe_off_time': toe_off,
+                'contact_time': contact_time,
+                'step_length': np.abs(markers[other][strikes] - markers[side][strikes])
+            })
+            # Trials without counter increments leave nothing to index into
+            dflow_rows = reported[np.maximum(match, 0)] if len(reported) else np.zeros(len(strikes), dtype=np.int64)
+            for column, values in [('dflow_count', counter), ('dflow_time', time),
+                                   ('dflow_step_length', reported_step)]:
+                detected[column] = np.where(matched, values[dflow_rows], np.nan)
+
+            unclaimed = np.setdiff1d(np.arange(len(reported)), match[matched])
+            missed = reported[unclaimed]
+            dflow_only = pd.DataFrame({
+                'trial': trial_of[missed],
+                'side': side,
+                'status': 'dflow_only',
+                'dflow_count': counter[missed],
+                'dflow_time': time[missed],
+                'dflow_step_length': reported_step[missed]
+            })
+            frames.extend([detected, dflow_only])
+
+        events = pd.concat(frames, ignore_index=True)
+        events['lag'] = events['dflow_time'] - events['time']
+        events['step_length_diff'] = events['step_length'] - events['dflow_step_length']
+        events['step_ok'] = events['step_length_diff'].abs() <= self.step_tolerance
+        events = events.sort_values(['trial', 'side', 'time', 'dflow_time'], kind='stable').reset_index(drop=True)
+
+        if labels is not None:
+            events = labels.reset_index(drop=True).rename_axis('trial').reset_index().merge(events, on='trial')
+        return events
+
+    # --------------------------------------------------------------------------
+    # Strides and validation
+    # --------------------------------------------------------------------------
+
+    def strides(self, events: pd.DataFrame) -> pd.DataFrame:
+        """
+        One row per detected stride (left heel strike to the next one) in every trial.
+
+        stride is D-Flow's left heel strike count where the strike matched one
+        (the 'Stride Number' of stride trials). The right step is the first
+        right heel strike inside the stride. valid means both steps were
+        detected, matched a D-Flow event and agree with its step length.
+        """
+        label_columns = [col for col in events.columns[:list(events.columns).index('side')] if col != 'trial']
+        detected = events[events['status'] != 'dflow_only']
+        left = detected[detected['side'] == 'Left'].sort_values(['trial', 'time'])
+        right = detected[detected['side'] == 'Right'].sort_values(['trial', 'time'])
+
+        table = left[['trial'] + label_columns].copy()
+        table['stride'] = left['dflow_count'].to_numpy()
+        table['time'] = left['time'].to_numpy()
+        next_same_trial = left['trial'].shift(-1) == left['trial']
+        table['stride_time'] = np.where(next_same_trial, left['time'].shift(-1) - left['time'], np.nan)
+        table['left_step_length'] = left['step_length'].to_numpy()
+        table['dflow_left_step_length'] = left['dflow_step_length'].to_numpy()
+        table['left_ok'] = (left['status'] == 'matched').to_numpy() & left['step_ok'].to_numpy()
+
+        # First right heel strike after each left one, within the same trial and stride
+        table['right_step_length'] = table['dflow_right_step_length'] = np.nan
+        table['right_ok'] = False
+        if len(right):
+            l_trial, l_time = left['trial'].to_numpy(), left['time'].to_numpy()
+            r_trial, r_time = right['trial'].to_numpy(), right['time'].to_numpy()
+            span = np.nanmax(np.concatenate([l_time, r_time])) - np.nanmin(np.concatenate([l_time, r_time])) + 1
+            j = np.searchsorted(r_trial * span + r_time, l_trial * span + l_time)
+            jc = np.minimum(j, len(right) - 1)
+            end = np.where(next_same_trial, left['time'].shift(-1), np.inf)
+            found = (j < len(right)) & (r_trial[jc] == l_trial) & (r_time[jc] < end)
+            table['right_step_length'] = np.where(found, right['step_length'].to_numpy()[jc], np.nan)
+            table['dflow_right_step_length'] = np.where(found, right['dflow_step_length'].to_numpy()[jc], np.nan)
+            table['right_ok'] = found & (right['status'].to_numpy()[jc] == 'matched') & right['step_ok'].to_numpy()[jc]
+        table['valid'] = table['left_ok'] & table['right_ok']
+        return table.reset_index(drop=True)
+
+    def summary(self, events: pd.DataFrame) -> pd.DataFrame:
+        """Per trial and side: detected, D-Flow and matched heel strikes, lag and step length agreement."""
+        keys = [col for col in events.columns[:list(events.columns).index('side') + 1]]
+        grouped = events.assign(
+            detected=events['status'] != 'dflow_only',
+            reported=events['status'] != 'detected_only',
+            matched=events['status'] == 'matched',
+            abs_diff=events['step_length_diff'].abs()
+        ).groupby(keys, sort=True)
+        table = grouped.agg(n_detected=('detected', 'sum'), n_dflow=('reported', 'sum'),
+                            n_matched=('matched', 'sum'), median_lag=('lag', 'median'),
+                            median_abs_step_diff=('abs_diff', 'median'), n_step_ok=('step_ok', 'sum'))
+        table['match_rate'] = table['n_matched'] / table[['n_detected', 'n_dflow']].max(axis=1)
+        return table.reset_index()
+
+    # --------------------------------------------------------------------------
+    # Cohort
+    # --------------------------------------------------------------------------
+
+    def detect_cohort(self, data_manager, trial_types: Optional[List[str]] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Events, strides and summary for every raw export of the data manager's subjects.
+
+        Files are the ones ingestion reads (TrialProcessor.find_trial_files, so
+        catalogued duplicates are processed once); all of them go through a
+        single detect() call.
+        """
+        mapping = data_manager.config.TRIAL_TYPE_MAPPING
+        trial_types = trial_types or list(mapping.values())
+        root = Path(data_manager.data_root_dir)
+
+        samples, labels = [], []
+        for subject_id in data_manager.processed_data:
+            for prefix, trial_type in mapping.items():
+                if trial_type not in trial_types:
+                    continue
+                for file_path in data_manager.trial_processor.find_trial_files(root / subject_id, prefix):
+                    df = self.load(file_path)
+                    if df is not None:
+                        samples.append(df)
+                        labels.append({'ID': subject_id, 'trial_type': trial_type, 'file': file_path.name})
+
+        events = self.detect(samples, pd.DataFrame(labels, columns=['ID', 'trial_type', 'file']))
+        if events.empty:
+            return {'events': events, 'strides': pd.DataFrame(), 'summary': pd.DataFrame()}
+        return {'events': events, 'strides': self.strides(events), 'summary': self.summary(events)}
@@ -0,0 +1,782 @@
+"""Per-subject learning metrics (success rates, stride statistics, motor noise)."""
+
+import hashlib
+import json
+from typing import List, Dict, Tuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from .data import MotorLearningDataManager
+from .utils import DataUtils, StrideCache
+
+
+# 5. METRICS CALCULATOR
+# ==============================================================================
+
+class MetricsCalculator:
+    """Updated to use config thresholds."""
+    
+    def __init__(self, data_manager: MotorLearningDataManager, motor_noise_strides: int = 10):
+        self.data_manager = data_manager
+        # KEY CHANGE: Get config from data_manager
+        self.config = data_manager.config
+        self.motor_noise_strides = self.config.MOTOR_NOISE_STRIDES
+    
+    # Stride columns carried into the long-format cohort table
+    STRIDE_COLUMNS = ['Target size', 'Constant', 'Success', 'Sum of gains and steps',
+                      'Right step length', 'Left step length']
+    TRIAL_TYPES = ['vis1', 'invis', 'vis2']
+    
+    def calculate_all_metrics(self, engine: Optional[str] = None) -> pd.DataFrame:
+        """
+        Calculate comprehensive performance metrics for all subjects.
+        
+        ``engine`` selects 'cohort' (one grouped, vectorized pass over the long
+        stride table) or 'subject' (per-subject loop); both produce the same
+        table. Defaults to config.METRICS_ENGINE.
+        """
+        engine = engine or self.config.METRICS_ENGINE
+        
+        print(f"🧮 Calculating metrics for {len(self.data_manager.processed_data)} subjects...")
+        
+        if engine == 'cohort':
+            results = self._calculate_cohort_metrics()
+        else:
+            results = []
+            for i, (subject_id, data) in enumerate(self.data_manager.processed_data.items(), 1):
+                if i % 20 == 0:
+                    print(f"   Processed {i}/{len(self.data_manager.processed_data)} subjects...")
+                
+                try:
+                    subject_result = self._calculate_subject_metrics(subject_id, data)
+                    if subject_result:
+                        results.append(subject_result)
+                except Exception as e:
+                    print(f"   ⚠️ Error processing {subject_id}: {str(e)}")
+                    continue
+        
+        if not results:
+            print("❌ No valid metrics calculated!")
+            return pd.DataFrame()
+        
+        df = pd.DataFrame(results).infer_objects()
+        print(f"✓ Successfully calculated metrics for {len(df)} subjects")
+        
+        # Print age and column summary
+        if 'age' in df.columns:
+            ages = df['age'].dropna()
+            print(f"📊 Age range: {ages.min():.1f} - {ages.max():.1f} years")
+        
+        sr_cols = [col for col in df.columns if '_sr_' in col]
+        print(f"🎯 Success rate columns created: {sr_cols}")
+        
+        return df
+    
+    def build_stride_table(self, trial_types: List[str] = None) -> pd.DataFrame:
+        """
+        Long-format table with one row per stride of every subject's trials.
+        
+        Columns are ID, trial_type, row (index label in the trial frame) and the
+        STRIDE_COLUMNS, NaN where a trial lacks a column. Only trials the cohort
+        engine can use are included (non-empty, with a numeric 'Success' column).
+        """
+        trials, columns, _ = self._collect_strides(trial_types)
+        lengths = trials['length'].to_numpy() if len(trials) else np.zeros(0, dtype=np.int64)
+        table = pd.DataFrame({
+            'ID': np.repeat(trials['ID'].to_numpy(dtype=object), lengths) if len(trials) else [],
+            'trial_type': np.repeat(trials['trial_type'].to_numpy(dtype=object), lengths) if len(trials) else [],
+            'row': columns['row']
+        })
+        for col in self.STRIDE_COLUMNS:
+            table[col] = columns[col]
+        return table
+    
+    def calculate_learning_curves(self, window: int = 20, min_periods: Optional[int] = None,
+                                  criterion: Optional[float] = None,
+                                  trial_types: List[str] = None) -> pd.DataFrame:
+        """
+        Rolling learning curves of every stride of every subject's trials.
+
+        One row per stride with ID, trial_type, stride (1-based position in the
+        trial), rolling_sr (mean Success), rolling_sd (sample SD of 'Sum of gains
+        and steps') over the trailing `window` strides, and strides_to_criterion:
+        the first stride of the trial whose full-window rolling_sr reaches
+        `criterion` (default config.SUCCESS_RATE_THRESHOLD), NaN if never.
+
+        Windows never cross trial boundaries; like Series.rolling, NaNs are
+        skipped and a window needs `min_periods` values (default `window`). All
+        trials are computed at once from cumulative sums over the flat stride
+        arrays; subjects left to the per-subject metrics path are not included.
+        """
+        criterion = self.config.SUCCESS_RATE_THRESHOLD if criterion is None else criterion
+        min_periods = window if min_periods is None else min_periods
+        trials, columns, _ = self._collect_strides(trial_types)
+        lengths = trials['length'].to_numpy() if len(trials) else np.zeros(0, dtype=np.int64)
+        starts = trials['start'].to_numpy() if len(trials) else np.zeros(0, dtype=np.int64)
+        n_strides = int(lengths.sum())
+
+        trial_of = np.repeat(np.arange(len(trials)), lengths)
+        position = np.arange(n_strides) - np.repeat(starts, lengths)
+        window_start = np.maximum(np.arange(n_strides) - window + 1, np.repeat(starts, lengths))
+        window_end = np.arange(n_strides) + 1
+
+        def window_sums(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+            valid = ~np.isnan(values)
+            total = np.concatenate([[0.0], np.cumsum(np.where(valid, values, 0.0))])
+            count = np.concatenate([[0], np.cumsum(valid)])
+            return total[window_end] - total[window_start], count[window_end] - count[window_start]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            success_sum, success_n = window_sums(columns['Success'])
+            rolling_sr = np.where(success_n >= max(min_periods, 1), success_sum / success_n, np.nan)
+
+            # Centre each trial on its mean first so the sum of squares does not cancel
+            sogs = columns['Sum of gains and steps']
+            sogs_mean = self._segment_reduce(sogs, starts, lengths, self._nanmean_rows)
+            centred = sogs - sogs_mean[trial_of]
+            sogs_sum, sogs_n = window_sums(centred)
+            sogs_sq, _ = window_sums(centred ** 2)
+            variance = (sogs_sq - sogs_sum ** 2 / sogs_n) / (sogs_n - 1)
+            rolling_sd = np.where(sogs_n >= max(min_periods, 2), np.sqrt(np.maximum(variance, 0.0)), np.nan)
+
+        # First full-window stride at criterion, per trial
+        reached = (rolling_sr >= criterion) & (position >= window - 1)
+        first = np.full(len(trials), np.nan)
+        hit_trials, hit_index = np.unique(trial_of[reached], return_index=True)
+        first[hit_trials] = position[reached][hit_index] + 1
+
+        return pd.DataFrame({
+            'ID': np.repeat(trials['ID'].to_numpy(dtype=object), lengths) if len(trials) else [],
+            'trial_type': np.repeat(trials['trial_type'].to_numpy(dtype=object), lengths) if len(trials) else [],
+            'stride': position + 1,
+            'rolling_sr': rolling_sr,
+            'rolling_sd': rolling_sd,
+            'strides_to_criterion': first[trial_of]
+        })
+
+    STRIDE_CHANGES_VERSION = 1  # bump when calculate_stride_changes changes, to drop cached tables
+    
+    def calculate_stride_changes(self, length: int = 20, stride_col: str = 'Sum of gains and steps',
+                                 trial_types: List[str] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Change in `stride_col` from each stride to the next, after a success or
+        a failure, in the last `length` strides of every (trial, condition)
+        period of the cohort.
+        
+        Returns (changes, summary). `changes` has one row per stride of each
+        period but the last, in Stride Number order: ID, trial_type, condition,
+        Stride Number, Success, outcome ('success'/'failure', NaN for other
+        Success values) and Delta (next stride minus this one). `summary` has
+        one row per period: n_strides, success_rate (over the rows of
+        `changes`), n/mean/sd of the Deltas after success and after failure, and
+        mean_difference (failure minus success). ID, trial_type, condition and
+        outcome are categoricals.
+        
+        Periods need `stride_col`, 'Stride Number', 'Target size' and 'Constant'.
+        They are selected and differenced for all trials at once from the flat
+        stride arrays; subjects left to the per-subject path go through
+        DataUtils.get_period_data.
+        """
+        trial_types = trial_types or self.TRIAL_TYPES
+        required = ['Target size', 'Constant', 'Stride Number', stride_col]
+        trials, columns, fallback = self._collect_strides(trial_types, extra_columns=required)
+        conditions = np.array(['max', 'min'], dtype=object)
+        changes, periods = [], []
+        
+        if len(trials):
+            usable = np.logical_and.reduce([trials[col].to_numpy(dtype=bool) for col in required])
+            _, _, tail_rows, tail_len = self._condition_periods(
+                trials, columns, {col: trials[col].to_numpy(dtype=bool) for col in required}, length)
+            n_groups = len(tail_len)
+            gid = np.repeat(np.arange(n_groups), tail_len)
+            keep = usable[gid // 2]
+            rows, gid = tail_rows[keep], gid[keep]
+            
+            # Stride Number order within each period, then the change to the next stride
+            order = np.lexsort((columns['Stride Number'][rows], gid))
+            rows, gid = rows[order], gid[order]
+            values = columns[stride_col][rows]
+            has_next = np.append(gid[1:] == gid[:-1], False)
+            delta = np.append(values[1:] - values[:-1], np.nan)
+            
+            ids = trials['ID'].to_numpy(dtype=object)
+            kinds = trials['trial_type'].to_numpy(dtype=object)
+            g = gid[has_next]
+            changes.append(pd.DataFrame({
+                'ID': ids[g // 2], 'trial_type': kinds[g // 2], 'condition': conditions[g % 2],
+                'Stride Number': columns['Stride Number'][rows][has_next],
+                'Success': columns['Success'][rows][has_next],
+                'Delta': delta[has_next]
+            }))
+            g = np.flatnonzero(usable[np.arange(n_groups) // 2] & (tail_len > 0))
+            periods.append(pd.DataFrame({'ID': ids[g // 2], 'trial_type': kinds[g // 2],
+                                         'condition': conditions[g % 2], 'n_strides': tail_len[g]}))
+        
+        for subject_id in fallback:
+            subject_changes, subject_periods = self._subject_stride_changes(
+                subject_id, self.data_manager.processed_data[subject_id], length, stride_col, trial_types)
+            changes.append(subject_changes)
+            periods.append(subject_periods)
+        
+        return self._stride_change_tables(changes, periods, trial_types)
+    
+    def load_stride_changes(self, length: int = 20, stride_col: str = 'Sum of gains and steps',
+                            trial_types: List[str] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        calculate_stride_changes, persisted in the stride cache and recomputed
+        only when the processed data or the parameters change.
+        """
+        trial_types = trial_types or self.TRIAL_TYPES
+        cache = None
+        if self.config.USE_STRIDE_CACHE and getattr(self.data_manager, 'manifest', None) is not None:
+            cache = StrideCache(self.config.STRIDE_CACHE_DIR)
+            key = hashlib.sha1(json.dumps([
+                self.STRIDE_CHANGES_VERSION, self.data_manager.fingerprint(), length, stride_col, list(trial_types)
+            ]).encode('utf-8')).hexdigest()
+            changes = cache.load_table('stride_changes', key)
+            summary = cache.load_table('stride_change_summary', key)
+            if changes is not None and summary is not None:
+                return changes, summary
+        
+        changes, summary = self.calculate_stride_changes(length, stride_col, trial_types)
+        if cache is not None:
+            cache.save_table('stride_changes', changes, key)
+            cache.save_table('stride_change_summary', summary, key)
+        return changes, summary
+    
+    def _collect_strides(self, trial_types: List[str] = None,
+                         extra_columns: List[str] = None) -> Tuple[pd.DataFrame, Dict, set]:
+        """
+        Concatenate the stride columns of all trials into flat float arrays.
+        
+        Returns one row per trial (ID, trial_type, start/length in the flat arrays
+        and one bool per STRIDE_COLUMNS / `extra_columns` entry telling whether
+        the trial has it),
+        the flat arrays keyed by column (plus 'row' index labels), and the set of
+        subjects whose trials have non-numeric columns or index labels; those are
+        left to the per-subject path.
+        """
+        trial_types = trial_types or self.TRIAL_TYPES
+        stride_columns = self.STRIDE_COLUMNS + [col for col in extra_columns or [] if col not in self.STRIDE_COLUMNS]
+        trials = []
+        chunks = {col: [] for col in stride_columns + ['row']}
+        fallback = set()
+        start = 0
+        
+        for subject_id, data in self.data_manager.processed_data.items():
+            subject_trials = []
+            for trial_type in trial_types:
+                trial_dict = data['trial_data'].get(trial_type)
+                df = trial_dict['data'] if trial_dict else None
+                if df is None or df.empty or 'Success' not in df.columns:
+                    continue
+                
+                present = [col for col in stride_columns if col in df.columns]
+                dtypes = df.dtypes
+                if not (pd.api.types.is_integer_dtype(df.index) and
+                        all(pd.api.types.is_numeric_dtype(dtypes[col]) for col in present)):
+                    fallback.add(subject_id)
+                    break
+                subject_trials.append((trial_type, df, present))
+            
+            if subject_id in fallback:
+                continue
+            
+            for trial_type, df, present in subject_trials:
+                n_strides = len(df)
+                trials.append({'ID': subject_id, 'trial_type': trial_type,
+                               'start': start, 'length': n_strides,
+                               **{col: col in present for col in stride_columns}})
+                for col in stride_columns:
+                    chunks[col].append(df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+                                       if col in present else np.full(n_strides, np.nan))
+                chunks['row'].append(df.index.to_numpy(dtype=np.int64))
+                start += n_strides
+        
+        columns = {col: np.concatenate(arrays) if arrays else np.zeros(0, dtype=np.int64 if col == 'row' else np.float64)
+                   for col, arrays in chunks.items()}
+        return pd.DataFrame(trials), columns, fallback
+    
+    @staticmethod
+    def _segment_reduce(values: np.ndarray, offsets: np.ndarray, lengths: np.ndarray, func) -> np.ndarray:
+        """Apply a row-wise reduction to contiguous segments, batched by segment length."""
+        result = np.full(len(lengths), np.nan)
+        for n in np.unique(lengths[lengths > 0]):
+            segments = np.flatnonzero(lengths == n)
+            result[segments] = func(values[offsets[segments, None] + np.arange(n)])
+        return result
+    
+    @staticmethod
+    def _nanmean_rows(block: np.ndarray) -> np.ndarray:
+        """Row means skipping NaN (same summation as pandas' Series.mean)."""
+        mask = np.isnan(block)
+        count = (block.shape[1] - mask.sum(axis=1)).astype(np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(mask, 0.0, block).sum(axis=1) / count
+        mean[count == 0] = np.nan
+        return mean
+    
+    @staticmethod
+    def _nanstd_rows(block: np.ndarray) -> np.ndarray:
+        """Row sample std skipping NaN (same two-pass algorithm as Series.std)."""
+        mask = np.isnan(block)
+        values = np.where(mask, 0.0, block)
+        count = (block.shape[1] - mask.sum(axis=1)).astype(np.float64)
+        count[count <= 1] = np.nan
+        avg = values.sum(axis=1) / count
+        sqr = (avg[:, None] - values) ** 2
+        sqr[mask] = 0
+        return np.sqrt(sqr.sum(axis=1) / (count - 1))
+    
+    def _condition_periods(self, trials: pd.DataFrame, columns: Dict, has: Dict,
+                           length: Optional[int] = 20) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Select every (trial, condition) period of the flat stride arrays at once.
+        
+        Periods are the strides at the trial's minimum target size whose Constant
+        matches the max/min Constant there (as in DataUtils.build_period_index),
+        grouped by group id 2*trial + condition (0 = max, 1 = min). Returns the
+        period rows and lengths per group, and the same for the last `length`
+        strides of each period (the whole period with length=None).
+        """
+        n_trials = len(trials)
+        starts = trials['start'].to_numpy()
+        trial_of = np.repeat(np.arange(n_trials), trials['length'].to_numpy())
+        target, const = columns['Target size'], columns['Constant']
+        
+        # Strides at the minimum target size and the Constant of each condition there
+        min_target = np.fmin.reduceat(target, starts)
+        with np.errstate(invalid='ignore'):
+            at_min = (target <= min_target[trial_of] + 0.001) & (has['Target size'] & has['Constant'])[trial_of]
+        const_at_min = np.where(at_min, const, np.nan)
+        condition_const = [np.fmax.reduceat(const_at_min, starts), np.fmin.reduceat(const_at_min, starts)]
+        
+        # Period rows grouped by (trial, condition) -> group id 2*trial + condition
+        period_rows, period_gid = [], []
+        for c, cond_const in enumerate(condition_const):
+            rows = np.flatnonzero(at_min & np.isclose(const, cond_const[trial_of], rtol=1e-5))
+            period_rows.append(rows)
+            period_gid.append(trial_of[rows] * 2 + c)
+        period_rows = np.concatenate(period_rows)
+        period_gid = np.concatenate(period_gid)
+        order = np.argsort(period_gid, kind='stable')
+        period_rows, period_gid = period_rows[order], period_gid[order]
+        
+        period_len = np.bincount(period_gid, minlength=2 * n_trials)
+        period_off = np.cumsum(period_len) - period_len
+        if length is None:
+            return period_rows, period_len, period_rows, period_len
+        
+        # Last `length` strides of each period
+        position = np.arange(len(period_rows)) - period_off[period_gid]
+        in_tail = position >= (period_len - length)[period_gid]
+        return period_rows, period_len, period_rows[in_tail], np.minimum(period_len, length)
+    
+    def _calculate_cohort_metrics(self, length: int = 20) -> List[Dict]:
+        """
+        Cohort-wide equivalent of _calculate_subject_metrics for every subject.
+        
+        All trials are flattened into one long stride table and each (trial,
+        condition) period is selected and reduced with grouped array operations;
+        only the assembly of the per-subject result dicts is a Python loop.
+        """
+        trials, columns, fallback = self._collect_strides()
+        n_trials = len(trials)
+        has = {col: trials[col].to_numpy(dtype=bool) if n_trials else np.zeros(0, dtype=bool)
+               for col in self.STRIDE_COLUMNS}
+        
+        if n_trials:
+            starts = trials['start'].to_numpy()
+            trial_of = np.repeat(np.arange(n_trials), trials['length'].to_numpy())
+            const = columns['Constant']
+            labels = columns['row']
+            
+            # Trial-level extremes (NaN-skipping, like Series.min/max)
+            min_target = np.fmin.reduceat(columns['Target size'], starts)
+            max_const = np.fmax.reduceat(const, starts)
+            min_const = np.fmin.reduceat(const, starts)
+            
+            n_groups = 2 * n_trials
+            period_rows, period_len, tail_rows, tail_len = self._condition_periods(trials, columns, has, length)
+            period_off = np.cumsum(period_len) - period_len
+            tail_off = np.cumsum(tail_len) - tail_len
+            tail_gid = np.repeat(np.arange(n_groups), tail_len)
+            tail = {col: columns[col][tail_rows] for col in self.STRIDE_COLUMNS}
+            
+            success_rate = self._segment_reduce(tail['Success'], tail_off, tail_len, self._nanmean_rows)
+            sogs = tail['Sum of gains and steps']
+            sogs_sd = self._segment_reduce(sogs, tail_off, tail_len, self._nanstd_rows)
+            sogs_mean = self._segment_reduce(sogs, tail_off, tail_len, self._nanmean_rows)
+            sogs_error = self._segment_reduce(sogs - tail['Constant'], tail_off, tail_len, self._nanmean_rows)
+            
+            # Asymmetry over strides with a non-zero step length sum
+            right, left = tail['Right step length'], tail['Left step length']
+            denominator = right + left
+            valid = denominator != 0
+            with np.errstate(invalid='ignore', divide='ignore'):
+                asymmetry_values = np.abs((right - left) / denominator)[valid]
+            asymmetry_len = np.bincount(tail_gid[valid], minlength=n_groups)
+            asymmetry = self._segment_reduce(asymmetry_values, np.cumsum(asymmetry_len) - asymmetry_len,
+                                             asymmetry_len, self._nanmean_rows)
+            
+            # Mean gap between successes = (last - first) / (count - 1) within the tail
+            success = tail['Success'] == 1
+            success_pos = (np.arange(len(tail_rows)) - tail_off[tail_gid])[success]
+            success_count = np.bincount(tail_gid[success], minlength=n_groups)
+            success_off = np.cumsum(success_count) - success_count
+            strides_between = np.full(n_groups, np.nan)
+            multi = success_count >= 2
+            strides_between[multi] = (
+                (success_pos[success_off[multi] + success_count[multi] - 1] - success_pos[success_off[multi]])
+                / (success_count[multi] - 1)
+            )
+            
+            # First index label at the max/min Constant of the whole trial (condition order)
+            labels_f = labels.astype(np.float64)
+            first_max = np.fmin.reduceat(np.where(const == max_const[trial_of], labels_f, np.inf), starts)
+            first_min = np.fmin.reduceat(np.where(const == min_const[trial_of], labels_f, np.inf), starts)
+        
+        trial_lookup = {(trial['ID'], trial['trial_type']): t
+                        for t, trial in enumerate(trials[['ID', 'trial_type']].to_dict('records'))}
+        results = []
+        
+        for subject_id, data in self.data_manager.processed_data.items():
+            if subject_id in fallback:
+                try:
+                    subject_result = self._calculate_subject_metrics(subject_id, data)
+                    if subject_result:
+                        results.append(subject_result)
+                except Exception as e:
+                    print(f"   ⚠️ Error processing {subject_id}: {str(e)}")
+                continue
+            
+            result = {
+                'ID': subject_id,
+                'age': data['metadata'].get('age_months', np.nan) / 12,
+                'session_date': data['metadata'].get('Session Date')
+            }
+            
+            for trial_type in self.TRIAL_TYPES:
+                t = trial_lookup.get((subject_id, trial_type))
+                if t is None:
+                    continue
+                
+                for c, condition in enumerate(['max', 'min']):
+                    g = 2 * t + c
+                    if period_len[g] == 0:
+                        continue
+                    result[f'{trial_type}_sr_{condition}_const'] = success_rate[g]
+                    if has['Sum of gains and steps'][t]:
+                        result[f'{trial_type}_sd_{condition}_const'] = sogs_sd[g]
+                        result[f'{trial_type}_msl_{condition}_const'] = sogs_mean[g]
+                        result[f'{trial_type}_error_{condition}_const'] = sogs_error[g]
+                    if has['Right step length'][t] and has['Left step length'][t] and asymmetry_len[g]:
+                        result[f'{trial_type}_asymmetry_{condition}_const'] = asymmetry[g]
+                    if multi[g]:
+                        result[f'{trial_type}_strides_between_success_{condition}_const'] = strides_between[g]
+                    result[f'{trial_type}_{condition}_const_indices'] = pd.Index(
+                        labels[period_rows[period_off[g]:period_off[g] + period_len[g]]])
+                
+                result.update({
+                    f'{trial_type}_min_target_size': min_target[t] if has['Target size'][t] else None,
+                    f'{trial_type}_max_constant': max_const[t] if has['Constant'][t] else None,
+                    f'{trial_type}_min_constant': min_const[t] if has['Constant'][t] else None
+                })
+                
+                if trial_type == 'invis':
+                    if has['Constant'][t] and np.isfinite(first_max[t]) and np.isfinite(first_min[t]):
+                        result.update({
+                            'invis_max_first': bool(first_max[t] < first_min[t]),
+                            'invis_min_first': bool(first_min[t] < first_max[t])
+                        })
+                    else:
+                        result.update({'invis_max_first': False, 'invis_min_first': False})
+            
+            try:
+                result.update(self._calculate_preference_metrics(data['trial_data'].get('pref')))
+            except Exception as e:
+                result.update({'mot_noise': None, 'pref_asymmetry': None})
+            
+            results.append(result)
+        
+        return results
+    
+    def _subject_stride_changes(self, subject_id: str, subject_data: Dict, length: int, stride_col: str,
+                                trial_types: List[str]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """calculate_stride_changes rows of one subject, from its trial frames."""
+        changes, periods = [], []
+        for trial_type in trial_types:
+            trial_dict = subject_data['trial_data'].get(trial_type)
+            df = trial_dict['data'] if trial_dict else None
+            required = [stride_col, 'Success', 'Stride Number', 'Target size', 'Constant']
+            if df is None or df.empty or not set(required).issubset(df.columns):
+                continue
+            
+            for condition in ['max', 'min']:
+                period_data = DataUtils.get_period_data(df, condition, length=length, periods=trial_dict.get('periods'))
+                if period_data is None or period_data.empty:
+                    continue
+                period_sorted = period_data.sort_values('Stride Number')
+                values = pd.to_numeric(period_sorted[stride_col], errors='coerce').to_numpy(dtype=float)
+                periods.append({'ID': subject_id, 'trial_type': trial_type, 'condition': condition,
+                                'n_strides': len(period_sorted)})
+                changes.append(pd.DataFrame({
+                    'ID': subject_id, 'trial_type': trial_type, 'condition': condition,
+                    'Stride Number': period_sorted['Stride Number'].to_numpy(dtype=float)[:-1],
+                    'Success': pd.to_numeric(period_sorted['Success'], errors='coerce').to_numpy(dtype=float)[:-1],
+                    'Delta': np.diff(values)
+                }))
+        
+        columns = ['ID', 'trial_type', 'condition', 'Stride Number', 'Success', 'Delta']
+        return (pd.concat(changes, ignore_index=True) if changes else pd.DataFrame(columns=columns),
+                pd.DataFrame(periods, columns=['ID', 'trial_type', 'condition', 'n_strides']))
+    
+    def _stride_change_tables(self, changes: List[pd.DataFrame], periods: List[pd.DataFrame],
+                              trial_types: List[str]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Assemble the changes and per-period summary in subject / trial / condition order."""
+        key_columns = ['ID', 'trial_type', 'condition']
+        categories = {'ID': list(self.data_manager.processed_data.keys()),
+                      'trial_type': list(trial_types), 'condition': ['max', 'min']}
+        
+        def ordered(frames: List[pd.DataFrame], columns: List[str]) -> pd.DataFrame:
+            frames = [frame for frame in frames if len(frame)]
+            table = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+            for col in key_columns:
+                table[col] = pd.Categorical(table[col], categories=categories[col])
+            return table.sort_values(key_columns, kind='stable').reset_index(drop=True)
+        
+        changes = ordered(changes, key_columns + ['Stride Number', 'Success', 'Delta'])
+        changes = changes.astype({'Stride Number': float, 'Success': float, 'Delta': float})
+        success = changes['Success'].to_numpy()
+        outcome = np.where(success == 1, 'success', np.where(success == 0, 'failure', None))
+        changes.insert(5, 'outcome', pd.Categorical(outcome, categories=['success', 'failure']))
+        
+        summary = ordered(periods, key_columns + ['n_strides']).astype({'n_strides': int})
+        summary = summary.set_index(key_columns)
+        by_period = changes.groupby(key_columns, observed=True)
+        summary['success_rate'] = by_period['Success'].mean()
+        stats = (changes.dropna(subset=['outcome', 'Delta'])
+                 .groupby(key_columns + ['outcome'], observed=True)['Delta'].agg(['count', 'mean', 'std']))
+        for outcome in ['success', 'failure']:
+            if outcome in stats.index.get_level_values('outcome'):
+                outcome_stats = stats.xs(outcome, level='outcome').reindex(summary.index)
+            else:
+                outcome_stats = pd.DataFrame(np.nan, index=summary.index, columns=stats.columns)
+            summary[f'n_{outcome}'] = outcome_stats['count'].fillna(0).astype(int)
+            summary[f'{outcome}_mean'] = outcome_stats['mean']
+            summary[f'{outcome}_sd'] = outcome_stats['std']
+        summary['mean_difference'] = summary['failure_mean'] - summary['success_mean']
+        
+        return changes, summary.reset_index()
+    
+    def _calculate_subject_metrics(self, subject_id: str, subject_data: Dict) -> Optional[Dict]:
+        """Calculate metrics for a single subject with simplified age handling."""
+        
+        # SIMPLIFIED: Only store age as age_months/12, call it 'age'
+        result = {
+            'ID': subject_id,
+            'age': subject_data['metadata'].get('age_months', np.nan) / 12,  # Single age field
+            'session_date': subject_data['metadata'].get('Session Date')
+        }
+        
+        # Process each trial type
+        for trial_type in ['vis1', 'invis', 'vis2']:
+            try:
+                trial_dict = subject_data['trial_data'].get(trial_type)
+                df = trial_dict['data'] if trial_dict else None
+                
+                if df is None or df.empty or 'Success' not in df.columns:
+                    continue
+                
+                # Calculate metrics for both conditions
+                for condition in ['max', 'min']:
+                    period_data, indices = self._get_period_data(df, condition, periods=trial_dict.get('periods'))
+                    if period_data is not None and not period_data.empty:
+                        metrics = self._calculate_period_metrics(period_data, trial_type, condition)
+                        result.update(metrics)
+                        result[f'{trial_type}_{condition}_const_indices'] = indices
+                
+                # Add trial metadata - ONLY if df is not None
+                if df is not None:
+                    result.update({
+                        f'{trial_type}_min_target_size': df['Target size'].min() if 'Target size' in df.columns else None,
+                        f'{trial_type}_max_constant': df['Constant'].max() if 'Constant' in df.columns else None,
+                        f'{trial_type}_min_constant': df['Constant'].min() if 'Constant' in df.columns else None
+                    })
+                    
+                    # Order information for invis trials
+                    if trial_type == 'invis':
+                        result.update(self._calculate_condition_order(df))
+                        
+            except Exception as e:
+                continue
+        
+        # Process preference trial
+        try:
+            pref_metrics = self._calculate_preference_metrics(subject_data['trial_data'].get('pref'))
+            result.update(pref_metrics)
+        except Exception as e:
+            result.update({'mot_noise': None, 'pref_asymmetry': None})
+        
+        return result
+    
+    def _get_period_data(self, df: pd.DataFrame, condition: str, length: int = 20,
+                         periods: Optional[Dict] = None):
+        """Extract data for specific condition period (sliced from the trial's period index)."""
+        try:
+            period_data = DataUtils.get_period_data(df, condition, length=None, periods=periods)
+            if period_data is None:
+                return None, None
+            
+            return period_data.tail(length), period_data.index
+            
+        except Exception as e:
+            return None, None
+    
+    def _calculate_period_metrics(self, period_data: pd.DataFrame, trial_type: str, condition: str) -> Dict:
+        """Calculate metrics for a specific period with naming."""
+        metrics = {}
+        
+        try:
+            # CORRECTED: Use the format that analysis expects
+            # Success rate - THE KEY METRIC  
+            metrics[f'{trial_type}_sr_{condition}_const'] = period_data['Success'].mean()
+            
+            # Other metrics
+            if 'Sum of gains and steps' in period_data.columns:
+                sogs = period_data['Sum of gains and steps']
+                metrics[f'{trial_type}_sd_{condition}_const'] = sogs.std()
+                metrics[f'{trial_type}_msl_{condition}_const'] = sogs.mean()
+                metrics[f'{trial_type}_error_{condition}_const'] = (sogs - period_data['Constant']).mean()
+            
+            # Asymmetry
+            if all(col in period_data.columns for col in ['Right step length', 'Left step length']):
+                right_steps = period_data['Right step length']
+                left_steps = period_data['Left step length']
+                denominator = right_steps + left_steps
+                
+                valid_mask = denominator != 0
+                if valid_mask.any():
+                    asymmetry = ((right_steps - left_steps) / denominator).abs()[valid_mask].mean()
+                    metrics[f'{trial_type}_asymmetry_{condition}_const'] = asymmetry
+            
+            # Strides between successes
+            strides_between = self._calculate_strides_between_successes(period_data)
+            if strides_between is not None:
+                metrics[f'{trial_type}_strides_between_success_{condition}_const'] = strides_between
+            
+        except Exception as e:
+            pass
+        
+        return metrics
+    
+    def _calculate_strides_between_successes(self, df: pd.DataFrame) -> Optional[float]:
+        """Calculate average strides between successful trials."""
+        try:
+            if df is None or 'Success' not in df.columns:
+                return None
+            
+            df = df.reset_index(drop=True)
+            success_positions = df.index[df['Success'] == 1].tolist()
+            
+            if len(success_positions) < 2:
+                return None
+            
+            return np.mean(np.diff(success_positions))
+            
+        except Exception as e:
+            return None
+    
+    def _calculate_condition_order(self, df: pd.DataFrame) -> Dict:
+        """Determine which condition came first for invis trials."""
+        try:
+            all_max_indices = df.index[df['Constant'] == df['Constant'].max()].tolist()
+            all_min_indices = df.index[df['Constant'] == df['Constant'].min()].tolist()
+            
+            if all_max_indices and all_min_indices:
+                first_max = min(all_max_indices)
+                first_min = min(all_min_indices)
+                return {
+                    'invis_max_first': first_max < first_min,
+                    'invis_min_first': first_min < first_max
+                }
+            
+            return {'invis_max_first': False, 'invis_min_first': False}
+            
+        except Exception as e:
+            return {'invis_max_first': False, 'invis_min_first': False}
+    
+    def _calculate_preference_metrics(self, pref_trial_dict: Optional[Dict]) -> Dict:
+        """Calculate metrics from preference trial with configurable stride count."""
+        metrics = {'mot_noise': None, 'pref_asymmetry': None}
+        
+        try:
+            if not pref_trial_dict or pref_trial_dict.get('data') is None:
+                return metrics
+            
+            pref_df = pref_trial_dict['data']
+            if pref_df is None or pref_df.empty:
+                return metrics
+            
+            # Check for required columns
+            if not all(col in pref_df.columns for col in ['Right step length', 'Left step length']):
+                return metrics
+            
+            # Get non-zero steps
+            right_steps = pref_df['Right step length']
+            left_steps = pref_df['Left step length']
+            
+            # Remove zeros and NaNs
+            right_clean = right_steps[(right_steps != 0) & (right_steps.notna())]
+            left_clean = left_steps[(left_steps != 0) & (left_steps.notna())]
+            
+            # Check if we have enough data
+            min_required = self.motor_noise_strides
+            if len(right_clean) < min_required or len(left_clean) < min_required:
+                print(f"   ⚠️ Insufficient data for motor noise: need {min_required}, have R:{len(right_clean)}, L:{len(left_clean)}")
+                return metrics
+            
+            # Calculate motor noise using configurable number of strides
+            final_right = right_clean.iloc[-1]
+            final_left = left_clean.iloc[-1]
+            
+            if final_right <= 0 or final_left <= 0:
+                return metrics
+            
+            # Normalize steps
+            norm_right = right_clean / final_right
+            norm_left = left_clean / final_left
+            
+            # Calculate sum of normalized steps
+            min_length = min(len(norm_right), len(norm_left))
+            if min_length < min_required:
+                return metrics
+            
+            sum_steps = norm_right.iloc[:min_length] + norm_left.iloc[:min_length]
+            
+            # Motor noise from last N points (configurable)
+            if len(sum_steps) >= self.motor_noise_strides:
+                noise = sum_steps.tail(self.motor_noise_strides).std()
+                if not pd.isna(noise) and noise > 0:
+                    metrics['mot_noise'] = noise
+            
+            # Calculate step length asymmetry using same number of strides
+            if len(right_clean) >= self.motor_noise_strides and len(left_clean) >= self.motor_noise_strides:
+                last_n_right = right_clean.tail(self.motor_noise_strides) / final_right
+                last_n_left = left_clean.tail(self.motor_noise_strides) / final_left
+                
+                if len(last_n_right) == len(last_n_left):
+                    denominator = last_n_right.values + last_n_left.values
+                    valid_mask = denominator != 0
+                    
+                    if valid_mask.any():
+                        asymmetry_vals = np.abs((last_n_right.values - last_n_left.values) / denominator)[valid_mask]
+                        if len(asymmetry_vals) > 0:
+                            metrics['pref_asymmetry'] = np.mean(asymmetry_vals)
+            
+        except Exception as e:
+            print(f"   ⚠️ Error calculating preference metrics: {e}")
+            pass
+        
+        return metrics
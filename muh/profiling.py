@@ -0,0 +1,274 @@
+"""Wall time, CPU time and peak memory of named pipeline stages."""
+
+import contextlib
+import cProfile
+import functools
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import List, Dict, Tuple, Optional, Union
+
+import pandas as pd
+
+try:
+    import resource  # peak RSS fallback (not available on Windows)
+except ImportError:
+    resource = None
+try:
+    import psutil  # optional: sampled RSS on every platform
+except ImportError:
+    psutil = None
+
+
+# STAGE PROFILER (wall time, CPU time and peak RSS per pipeline stage)
+# ==========================================================================
+
+def _current_rss_mb() -> Optional[float]:
+    """Resident memory of this process in MB (None where it cannot be read)."""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / 2**20
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _max_rss_mb() -> Optional[float]:
+    """Process high-water mark of resident memory in MB (None on Windows)."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 2**20 if sys.platform == 'darwin' else rss / 1024
+
+
+def _children_cpu() -> float:
+    """CPU time of finished child processes (process-pool workers)."""
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+class StageProfiler:
+    """
+    Records wall time, CPU time and peak RSS of named pipeline stages.
+    
+    Stages nest: a stage opened inside another is recorded under the path
+    'outer/inner', and repeated calls of the same path are aggregated into one
+    record (calls, summed times, largest peak). Peak RSS is sampled by a
+    background thread while any stage is open; where the current RSS cannot be
+    read, the process high-water mark at the end of the stage is used instead.
+    Outermost stages can optionally be captured with cProfile.
+    """
+    
+    COLUMNS = ['path', 'stage', 'parent', 'depth', 'calls', 'failures', 'wall_s', 'cpu_s',
+               'peak_rss_mb', 'profile_file']
+    
+    def __init__(self, profile_dir: Optional[Union[str, Path]] = None, sample_interval: float = 0.05):
+        self.profile_dir = Path(profile_dir) if profile_dir is not None else None
+        self.sample_interval = sample_interval
+        self.rss_source = 'sampled' if _current_rss_mb() is not None else (
+            'high_water' if resource is not None else None)
+        self.records = {}
+        self._stack = []
+        self._open = []
+        self._sampler = None
+        self._stop_sampling = threading.Event()
+    
+    def reset(self) -> None:
+        """Forget all records (open stages are unaffected)."""
+        self.records = {}
+    
+    @contextlib.contextmanager
+    def stage(self, name: str, profile: bool = False):
+        """
+        Time the enclosed block as stage `name`.
+        
+        Parameters:
+        -----------
+        name : str
+            Stage name; nested stages are recorded under 'parent/name'
+        profile : bool, default False
+            Capture the stage with cProfile (outermost stages only) and write
+            <path>.prof plus a cumulative-time summary to profile_dir
+        """
+        parent = '/'.join(self._stack) or None
+        path = f"{parent}/{name}" if parent else name
+        frame = {'peak_rss_mb': _current_rss_mb()}
+        self._stack.append(name)
+        self._open.append(frame)
+        self._start_sampler()
+        
+        profiler = None
+        if profile and parent is None and self.profile_dir is not None:
+            profiler = cProfile.Profile()
+        
+        failed = False
+        wall_start, cpu_start, children_start = time.perf_counter(), time.process_time(), _children_cpu()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start + (_children_cpu() - children_start)
+            
+            self._open.pop()
+            self._stack.pop()
+            if not self._stack:
+                self._stop_sampler()
+            
+            peak = self._peak(frame['peak_rss_mb'], _current_rss_mb())
+            if self.rss_source == 'high_water':
+                peak = _max_rss_mb()
+            
+            record = self.records.get(path)
+            if record is None:
+                record = self.records[path] = {
+                    'path': path, 'stage': name, 'parent': parent, 'depth': path.count('/'),
+                    'calls': 0, 'failures': 0, 'wall_s': 0.0, 'cpu_s': 0.0,
+                    'peak_rss_mb': None, 'profile_file': None
+                }
+            record['calls'] += 1
+            record['failures'] += int(failed)
+            record['wall_s'] += wall
+            record['cpu_s'] += cpu
+            record['peak_rss_mb'] = self._peak(record['peak_rss_mb'], peak)
+            if profiler is not None:
+                record['profile_file'] = str(self._dump_profile(profiler, path))
+    
+    def instrument(self, obj, prefixes: Tuple[str, ...] = ('generate_', 'plot_', '_plot_'),
+                   exclude: Tuple[str, ...] = ()) -> List[str]:
+        """
+        Wrap the matching methods of `obj` (on the instance only) so every call
+        is recorded as a stage named after the method. Returns the wrapped names.
+        """
+        wrapped = []
+        for name in dir(type(obj)):
+            if not name.startswith(prefixes) or name in exclude:
+                continue
+            method = getattr(obj, name)
+            if not callable(method) or getattr(method, '_stage_profiled', False):
+                continue
+            setattr(obj, name, self._wrap(name, method))
+            wrapped.append(name)
+        return wrapped
+    
+    def _wrap(self, name: str, method):
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            with self.stage(name):
+                return method(*args, **kwargs)
+        timed._stage_profiled = True
+        return timed
+    
+    def to_frame(self) -> pd.DataFrame:
+        """One row per stage path, in the order the stages were first entered."""
+        if not self.records:
+            return pd.DataFrame(columns=self.COLUMNS)
+        order = self._entry_order()
+        ordered = sorted(self.records.values(), key=lambda r: order[r['path']])
+        df = pd.DataFrame(ordered, columns=self.COLUMNS)
+        df[['wall_s', 'cpu_s']] = df[['wall_s', 'cpu_s']].round(4)
+        df['peak_rss_mb'] = df['peak_rss_mb'].astype(float).round(1)
+        return df
+    
+    def save(self, reports_dir: Union[str, Path], timestamp: str) -> Dict[str, Path]:
+        """Write timing_report_<timestamp>.json and .csv to `reports_dir`."""
+        reports_dir = Path(reports_dir)
+        df = self.to_frame()
+        top_level = df[df['depth'] == 0]
+        
+        json_file = reports_dir / f'timing_report_{timestamp}.json'
+        csv_file = reports_dir / f'timing_report_{timestamp}.csv'
+        report = {
+            'timestamp': timestamp,
+            'rss_source': self.rss_source,
+            'total_wall_s': round(float(top_level['wall_s'].sum()), 4),
+            'total_cpu_s': round(float(top_level['cpu_s'].sum()), 4),
+            'stages': df.astype(object).where(df.notna(), None).to_dict(orient='records')
+        }
+        with open(json_file, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+        df.to_csv(csv_file, index=False)
+        return {'json': json_file, 'csv': csv_file}
+    
+    def summary_html(self) -> str:
+        """HTML table of the recorded stages (nested stages indented)."""
+        df = self.to_frame()
+        if df.empty:
+            return "Stage timings not available"
+        
+        total = df.loc[df['depth'] == 0, 'wall_s'].sum()
+        rows = []
+        for record in df.itertuples():
+            share = f"{100 * record.wall_s / total:.1f}%" if total > 0 else '-'
+            peak = f"{record.peak_rss_mb:.1f}" if pd.notna(record.peak_rss_mb) else '-'
+            calls = f" ×{record.calls}" if record.calls > 1 else ''
+            status = ' ❌' if record.failures else ''
+            rows.append(f"<tr><td style=\"padding-left: {8 + 20 * record.depth}px\">{record.stage}{calls}{status}</td>"
+                        f"<td>{record.wall_s:.2f}</td><td>{record.cpu_s:.2f}</td><td>{share}</td><td>{peak}</td></tr>")
+        
+        return ("<table><tr><th>Stage</th><th>Wall (s)</th><th>CPU (s)</th><th>% of run</th>"
+                "<th>Peak RSS (MB)</th></tr>" + ''.join(rows) + "</table>")
+    
+    def print_summary(self, max_depth: int = 1) -> None:
+        """Print the recorded stages down to `max_depth`."""
+        df = self.to_frame()
+        for record in df[df['depth'] <= max_depth].itertuples():
+            peak = f", peak {record.peak_rss_mb:.0f} MB" if pd.notna(record.peak_rss_mb) else ''
+            label = '   ' + '  ' * record.depth + record.stage
+            print(f"{label:<60} {record.wall_s:>9.2f}s wall {record.cpu_s:>9.2f}s cpu{peak}")
+    
+    def _entry_order(self) -> Dict[str, List[int]]:
+        # Records are created when a stage closes (children before parents);
+        # sort each path by the creation order of its prefixes to restore entry order
+        created = {path: i for i, path in enumerate(self.records)}
+        order = {}
+        for path in self.records:
+            parts = path.split('/')
+            order[path] = [created.get('/'.join(parts[:i + 1]), len(created)) for i in range(len(parts))]
+        return order
+    
+    def _dump_profile(self, profiler: 'cProfile.Profile', path: str) -> Path:
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        stem = self.profile_dir / path.replace('/', '__')
+        profiler.dump_stats(f"{stem}.prof")
+        with open(f"{stem}.txt", 'w') as f:
+            pstats.Stats(profiler, stream=f).sort_stats('cumulative').print_stats(40)
+        return Path(f"{stem}.prof")
+    
+    @staticmethod
+    def _peak(*values) -> Optional[float]:
+        values = [v for v in values if v is not None]
+        return max(values) if values else None
+    
+    def _start_sampler(self) -> None:
+        if self._sampler is not None or self.rss_source != 'sampled':
+            return
+        self._stop_sampling.clear()
+        self._sampler = threading.Thread(target=self._sample, name='stage-rss-sampler', daemon=True)
+        self._sampler.start()
+    
+    def _stop_sampler(self) -> None:
+        if self._sampler is None:
+            return
+        self._stop_sampling.set()
+        self._sampler.join()
+        self._sampler = None
+    
+    def _sample(self) -> None:
+        while not self._stop_sampling.wait(self.sample_interval):
+            rss = _current_rss_mb()
+            for frame in list(self._open):
+                frame['peak_rss_mb'] = self._peak(frame['peak_rss_mb'], rss)
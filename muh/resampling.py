@@ -0,0 +1,177 @@
+"""Batched permutation and bootstrap statistics for whole metric tables."""
+
+import warnings
+from typing import List, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# RESAMPLING ENGINE
+# ==============================================================================
+
+class ResamplingEngine:
+    """
+    Permutation p-values and bootstrap confidence intervals for many metric
+    columns at once.
+
+    Every resample is a row of an (n_resamples × n_subjects) index array;
+    statistics for all columns sharing the same missing-data pattern are then
+    computed together with matrix products, in batches that bound memory.
+    """
+
+    def __init__(self, n_resamples: int = 10000, confidence: float = 0.95,
+                 random_state: Optional[int] = 42, max_batch_elements: int = 4_000_000,
+                 min_samples: int = 10):
+        self.n_resamples = n_resamples
+        self.confidence = confidence
+        self.random_state = random_state
+        self.max_batch_elements = max_batch_elements
+        self.min_samples = min_samples
+
+    def correlations(self, df: pd.DataFrame, predictor: str, columns: List[str]) -> pd.DataFrame:
+        """
+        Pearson correlation of `predictor` with each column, with a two-sided
+        permutation p-value and a percentile bootstrap CI.
+
+        Returns one row per column: metric, n, r, p_value, ci_low, ci_high.
+        """
+        x_all = df[predictor].to_numpy(dtype=float)
+        Y_all = df[columns].to_numpy(dtype=float)
+        valid = ~np.isnan(Y_all) & ~np.isnan(x_all)[:, None]
+
+        result = self._empty_result(columns, ['n', 'r', 'p_value', 'ci_low', 'ci_high'])
+        for rows, positions, cols in self._missing_patterns(valid, columns):
+            n = int(rows.sum())
+            result.loc[cols, 'n'] = n
+            if n < self.min_samples:
+                continue
+
+            # Centre once; correlations are invariant to shifts
+            x = x_all[rows] - x_all[rows].mean()
+            Y = Y_all[np.ix_(rows, positions)]
+            Y = Y - Y.mean(axis=0)
+            r_obs = self._weighted_correlations(np.ones((1, n)), x, Y, n)[0]
+
+            rng = np.random.default_rng(self.random_state)
+            extreme = np.zeros(len(cols))
+            for batch in self._batches(n):
+                permutations = rng.permuted(np.tile(np.arange(n), (batch, 1)), axis=1)
+                r_perm = self._correlations_of_permutations(x, Y, permutations)
+                extreme += (np.abs(r_perm) >= np.abs(r_obs) - 1e-12).sum(axis=0)
+
+            boot = np.vstack([
+                self._weighted_correlations(self._counts(rng.integers(0, n, (batch, n)), n), x, Y, n)
+                for batch in self._batches(n)
+            ])
+
+            result.loc[cols, 'r'] = r_obs
+            result.loc[cols, 'p_value'] = np.where(np.isnan(r_obs), np.nan,
+                                                   (extreme + 1) / (self.n_resamples + 1))
+            result.loc[cols, ['ci_low', 'ci_high']] = self._percentile_ci(boot)
+
+        return result.reset_index()
+
+    def mean_differences(self, df: pd.DataFrame, group: pd.Series, columns: List[str]) -> pd.DataFrame:
+        """
+        Difference in column means between subjects where `group` is True and
+        the rest, with a two-sided permutation p-value (shuffled group labels)
+        and a percentile bootstrap CI (resampling within each group).
+
+        Returns one row per column: metric, n_group, n_rest, mean_group,
+        mean_rest, difference, p_value, ci_low, ci_high.
+        """
+        g_all = group.reindex(df.index).fillna(False).to_numpy(dtype=bool)
+        Y_all = df[columns].to_numpy(dtype=float)
+        valid = ~np.isnan(Y_all)
+
+        result = self._empty_result(columns, ['n_group', 'n_rest', 'mean_group', 'mean_rest',
+                                              'difference', 'p_value', 'ci_low', 'ci_high'])
+        for rows, positions, cols in self._missing_patterns(valid, columns):
+            g = g_all[rows]
+            Y = Y_all[np.ix_(rows, positions)]
+            n, n1 = len(g), int(g.sum())
+            n0 = n - n1
+            result.loc[cols, 'n_group'] = n1
+            result.loc[cols, 'n_rest'] = n0
+            if n1:
+                result.loc[cols, 'mean_group'] = mean1 = Y[g].mean(axis=0)
+            if n0:
+                result.loc[cols, 'mean_rest'] = mean0 = Y[~g].mean(axis=0)
+            if n1 == 0 or n0 == 0:
+                continue
+
+            observed = mean1 - mean0
+
+            rng = np.random.default_rng(self.random_state)
+            extreme = np.zeros(len(cols))
+            total = Y.sum(axis=0)
+            for batch in self._batches(n):
+                labels = rng.permuted(np.tile(g, (batch, 1)), axis=1).astype(float)
+                sum1 = labels @ Y
+                diff = sum1 / n1 - (total - sum1) / n0
+                extreme += (np.abs(diff) >= np.abs(observed) - 1e-12).sum(axis=0)
+
+            Y1, Y0 = Y[g], Y[~g]
+            boot = np.vstack([
+                self._counts(rng.integers(0, n1, (batch, n1)), n1) @ Y1 / n1
+                - self._counts(rng.integers(0, n0, (batch, n0)), n0) @ Y0 / n0
+                for batch in self._batches(n)
+            ])
+
+            result.loc[cols, 'difference'] = observed
+            result.loc[cols, 'p_value'] = (extreme + 1) / (self.n_resamples + 1)
+            result.loc[cols, ['ci_low', 'ci_high']] = self._percentile_ci(boot)
+
+        return result.reset_index()
+
+    @staticmethod
+    def _empty_result(columns: List[str], fields: List[str]) -> pd.DataFrame:
+        return pd.DataFrame(np.nan, index=pd.Index(columns, name='metric'), columns=fields)
+
+    @staticmethod
+    def _missing_patterns(valid: np.ndarray, columns: List[str]):
+        """(row mask, column positions, column names) per shared missing-data pattern."""
+        patterns: Dict[bytes, List[int]] = {}
+        for j in range(valid.shape[1]):
+            patterns.setdefault(np.packbits(valid[:, j]).tobytes(), []).append(j)
+        return [(valid[:, positions[0]], positions, [columns[j] for j in positions])
+                for positions in patterns.values()]
+
+    def _batches(self, n: int):
+        """Split n_resamples into batches of at most max_batch_elements indices."""
+        size = max(1, self.max_batch_elements // max(n, 1))
+        for start in range(0, self.n_resamples, size):
+            yield min(size, self.n_resamples - start)
+
+    @staticmethod
+    def _counts(indices: np.ndarray, n: int) -> np.ndarray:
+        """(batch × n) bootstrap index array -> (batch × n) multiplicity weights."""
+        batch = indices.shape[0]
+        offsets = (indices + np.arange(batch)[:, None] * n).ravel()
+        return np.bincount(offsets, minlength=batch * n).reshape(batch, n).astype(float)
+
+    @staticmethod
+    def _correlations_of_permutations(x: np.ndarray, Y: np.ndarray, permutations: np.ndarray) -> np.ndarray:
+        # Permuting x leaves both means and variances unchanged
+        scale = np.sqrt((x ** 2).sum() * (Y ** 2).sum(axis=0))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return (x[permutations] @ Y) / scale
+
+    @staticmethod
+    def _weighted_correlations(W: np.ndarray, x: np.ndarray, Y: np.ndarray, n: int) -> np.ndarray:
+        """Pearson r of x with every column of Y for each weight row of W."""
+        Sx, Sxx = W @ x, W @ (x * x)
+        SY, SYY, SxY = W @ Y, W @ (Y * Y), W @ (x[:, None] * Y)
+        cov = n * SxY - Sx[:, None] * SY
+        var_x = n * Sxx - Sx ** 2
+        var_Y = n * SYY - SY ** 2
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return cov / np.sqrt(var_x[:, None] * var_Y)
+
+    def _percentile_ci(self, samples: np.ndarray) -> np.ndarray:
+        alpha = (1 - self.confidence) / 2
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # all-NaN columns (zero variance)
+            bounds = np.nanpercentile(samples, [100 * alpha, 100 * (1 - alpha)], axis=0)
+        return bounds.T
@@ -0,0 +1,1018 @@
+"""Regression, classification and repeated-measures models over the metrics table."""
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from typing import List, Dict, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import statsmodels.formula.api as smf
+from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
+from sklearn.linear_model import LinearRegression, LogisticRegression
+from sklearn.metrics import (mean_squared_error, r2_score, accuracy_score, 
+                             precision_score, recall_score, f1_score, 
+                             roc_auc_score, confusion_matrix)
+from sklearn.model_selection import KFold, StratifiedKFold, train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from .config import Config
+from .resampling import ResamplingEngine
+
+
+# 6. STATISTICAL ANALYZER
+# ==============================================================================
+
+class StatisticalAnalyzer:
+    """Updated to use config thresholds."""
+    
+    def __init__(self, metrics_df: pd.DataFrame, config: Config = None):
+        # Long-format success rate tables, built once per frame (see long_format)
+        self._long_tables = {}
+        
+        self.metrics_df = metrics_df
+        
+        # KEY CHANGE: Accept config parameter
+        self.config = config if config else Config()
+        
+        # Apply motor noise filter using config
+        if 'mot_noise' in metrics_df.columns:
+            self.filtered_df = metrics_df[metrics_df['mot_noise'] <= self.config.MOTOR_NOISE_THRESHOLD]
+            print(f"📊 Filtered to {len(self.filtered_df)}/{len(metrics_df)} subjects (motor noise ≤ {self.config.MOTOR_NOISE_THRESHOLD})")
+        else:
+            self.filtered_df = metrics_df
+    
+    @property
+    def metrics_df(self) -> pd.DataFrame:
+        return self._metrics_df
+    
+    @metrics_df.setter
+    def metrics_df(self, df: pd.DataFrame):
+        self._metrics_df = df
+        self._long_tables.pop(False, None)
+    
+    @property
+    def filtered_df(self) -> pd.DataFrame:
+        return self._filtered_df
+    
+    @filtered_df.setter
+    def filtered_df(self, df: pd.DataFrame):
+        self._filtered_df = df
+        self._long_tables.pop(True, None)
+    
+    TRIAL_TYPES = ['vis1', 'invis', 'vis2']
+    CONDITIONS = ['max', 'min']
+    DEFAULT_CV_REPEATS = 20  # repeated CV passes when CV is asked for and config.CV_REPEATS is 0
+    
+    def long_format(self, trial_types: List[str] = None, columns: List[str] = None,
+                    use_filtered: bool = True) -> pd.DataFrame:
+        """
+        Success rates in long format: one row per subject × trial type × condition.
+        
+        The wide-to-long transform runs once per frame (numpy ravel of the
+        {trial}_sr_{condition}_const block) and is cached until metrics_df or
+        filtered_df is reassigned; calls only select rows.
+        trial_type and condition are categoricals (unused levels dropped), so
+        rm_anova, OLS and MixedLM all see the same level order.
+        
+        Parameters:
+        -----------
+        trial_types : List[str], optional
+            Keep only these trial types
+        columns : List[str], optional
+            Keep only these success rate columns (the 'metric' column)
+        use_filtered : bool
+            Motor-noise filtered subjects (True) or the full metrics table
+            
+        Returns:
+        --------
+        pd.DataFrame : subject, metric, trial_type, condition, success_rate,
+                       age, mot_noise, pref_asymmetry (NaN success rates dropped)
+        """
+        if use_filtered not in self._long_tables:
+            self._long_tables[use_filtered] = self._build_long_format(
+                self.filtered_df if use_filtered else self.metrics_df)
+        df_long = self._long_tables[use_filtered]
+        
+        keep = np.ones(len(df_long), dtype=bool)
+        if trial_types is not None:
+            keep &= df_long['trial_type'].isin(trial_types).to_numpy()
+        if columns is not None:
+            keep &= df_long['metric'].isin(columns).to_numpy()
+        if keep.all():
+            return df_long.copy()
+        
+        subset = df_long[keep].reset_index(drop=True)
+        for col in ('metric', 'trial_type', 'condition'):
+            subset[col] = subset[col].cat.remove_unused_categories()
+        return subset
+    
+    def _build_long_format(self, df: pd.DataFrame) -> pd.DataFrame:
+        sr_cols, trials, conditions = [], [], []
+        for trial in self.TRIAL_TYPES:
+            for condition in self.CONDITIONS:
+                col = f'{trial}_sr_{condition}_const'
+                if col in df.columns:
+                    sr_cols.append(col)
+                    trials.append(trial)
+                    conditions.append(condition)
+        
+        n_subjects, n_cols = len(df), len(sr_cols)
+        subjects = df['ID'].to_numpy() if 'ID' in df.columns else df.index.to_numpy()
+        
+        # Row-major ravel: subject i's measures are rows i*n_cols ... (i+1)*n_cols - 1
+        values = df[sr_cols].to_numpy(dtype=float).ravel()
+        col_codes = np.tile(np.arange(n_cols), n_subjects)
+        subject_pos = np.repeat(np.arange(n_subjects), n_cols)
+        valid = ~np.isnan(values)
+        col_codes, subject_pos = col_codes[valid], subject_pos[valid]
+        
+        def covariate(name):
+            return df[name].to_numpy(dtype=float)[subject_pos] if name in df.columns else np.nan
+        
+        return pd.DataFrame({
+            'subject': subjects[subject_pos],
+            'metric': pd.Categorical.from_codes(col_codes, categories=sr_cols),
+            'trial_type': pd.Categorical(np.array(trials, dtype=object)[col_codes],
+                                         categories=[t for t in self.TRIAL_TYPES if t in trials]),
+            'condition': pd.Categorical(np.array(conditions, dtype=object)[col_codes],
+                                        categories=[c for c in self.CONDITIONS if c in conditions]),
+            'success_rate': values[valid],
+            'age': covariate('age'),
+            'mot_noise': covariate('mot_noise'),
+            'pref_asymmetry': covariate('pref_asymmetry')
+        })
+    
+    def run_regression_analysis(self, trial_type: str = 'invis', condition: str = 'max',
+                               predictors: List[str] = None, model_type: str = 'linear',
+                               cv_repeats: Optional[int] = None) -> Dict:
+        """
+        Run regression analysis withtarget column naming.
+        
+        The single 80/20 split is kept for the returned model and predictions;
+        'cv' holds repeated k-fold scores (see run_repeated_cv), which are far
+        more stable at our sample sizes. cv_repeats=0 skips them.
+        """
+        
+        if predictors is None:
+            predictors = ['age', 'mot_noise', 'pref_asymmetry']
+        
+        # Filter available predictors
+        available_predictors = [p for p in predictors if p in self.filtered_df.columns]
+        
+        # CORRECTED: Use the exact column format that exists
+        target_col = f'{trial_type}_sr_{condition}_const'
+        
+        if target_col not in self.filtered_df.columns:
+            available_cols = [col for col in self.filtered_df.columns if '_sr_' in col]
+            raise ValueError(f"Target column {target_col} not found. Available: {available_cols}")
+        
+        # Prepare data
+        valid_data = self.filtered_df[available_predictors + [target_col]].dropna()
+        
+        if len(valid_data) < 10:
+            raise ValueError(f"Insufficient data: only {len(valid_data)} valid samples")
+        
+        X = valid_data[available_predictors]
+        y = valid_data[target_col]
+        
+        # Split data
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=0.2, random_state=42
+        )
+        
+        # Create model
+        model = self._build_model('regression', model_type)
+        
+        # Fit and predict
+        model.fit(X_train, y_train)
+        y_pred = model.predict(X_test)
+        
+        # Calculate metrics
+        r2 = r2_score(y_test, y_pred)
+        rmse = np.sqrt(mean_squared_error(y_test, y_pred))
+        
+        # Feature importance
+        if model_type == 'random_forest':
+            importances = dict(zip(available_predictors, model.feature_importances_))
+        else:
+            importances = dict(zip(available_predictors, 
+                                 np.abs(model.named_steps['regressor'].coef_)))
+        
+        return {
+            'model': model,
+            'X_test': X_test,
+            'y_test': y_test,
+            'y_pred': y_pred,
+            'metrics': {
+                'r2': r2,
+                'rmse': rmse,
+                'n_samples': len(valid_data),
+                'trial_type': trial_type,
+                'condition': condition,
+                'predictors': available_predictors
+            },
+            'feature_importances': importances,
+            'cv': self._maybe_repeated_cv('regression', X, y, model_type, cv_repeats)
+        }
+    
+    def run_classification_analysis(self, trial_type: str = 'invis', condition: str = 'max',
+                                   threshold: float = 0.68, model_type: str = 'logistic',
+                                   cv_repeats: Optional[int] = None) -> Dict:
+        """
+        Run binary classification withtarget column naming.
+        
+        As for regression, 'cv' holds repeated stratified k-fold scores
+        alongside the single-split metrics (cv_repeats=0 skips them).
+        """
+        
+        predictors = ['age', 'mot_noise']
+        available_predictors = [p for p in predictors if p in self.filtered_df.columns]
+        
+        # CORRECTED: Use the exact column format that exists
+        target_col = f'{trial_type}_sr_{condition}_const'
+        
+        if target_col not in self.filtered_df.columns:
+            available_cols = [col for col in self.filtered_df.columns if '_sr_' in col]
+            raise ValueError(f"Target column {target_col} not found. Available: {available_cols}")
+        
+        # Prepare data
+        valid_data = self.filtered_df[available_predictors + [target_col]].dropna()
+        
+        if len(valid_data) < 10:
+            raise ValueError(f"Insufficient data: only {len(valid_data)} valid samples")
+        
+        # Create binary target
+        y = (valid_data[target_col] >= threshold).astype(int)
+        X = valid_data[available_predictors]
+        
+        # Split data
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=0.2, random_state=42, stratify=y
+        )
+        
+        # Create model
+        model = self._build_model('classification', model_type)
+        
+        # Fit and predict
+        model.fit(X_train, y_train)
+        y_pred = model.predict(X_test)
+        y_proba = model.predict_proba(X_test)[:, 1]
+        
+        # Calculate metrics
+        metrics = {
+            'accuracy': accuracy_score(y_test, y_pred),
+            'precision': precision_score(y_test, y_pred),
+            'recall': recall_score(y_test, y_pred),
+            'f1': f1_score(y_test, y_pred),
+            'roc_auc': roc_auc_score(y_test, y_proba),
+            'confusion_matrix': confusion_matrix(y_test, y_pred),
+            'n_samples': len(valid_data),
+            'threshold': threshold,
+            'trial_type': trial_type,
+            'condition': condition,
+            'predictors': available_predictors
+        }
+        
+        # Feature importance
+        if model_type == 'random_forest':
+            importances = dict(zip(available_predictors, 
+                                 model.named_steps['classifier'].feature_importances_))
+        else:
+            importances = dict(zip(available_predictors, 
+                                 model.named_steps['classifier'].coef_[0]))
+        
+        return {
+            'model': model,
+            'X_test': X_test,
+            'y_test': y_test,
+            'y_pred': y_pred,
+            'y_proba': y_proba,
+            'metrics': metrics,
+            'feature_importances': importances,
+            'cv': self._maybe_repeated_cv('classification', X, y, model_type, cv_repeats)
+        }
+    
+    @staticmethod
+    def _build_model(task: str, model_type: str):
+        """Unfitted estimator for run_regression_analysis / run_classification_analysis."""
+        if task == 'regression':
+            if model_type == 'linear':
+                return Pipeline([
+                    ('scaler', StandardScaler()),
+                    ('regressor', LinearRegression())
+                ])
+            if model_type == 'random_forest':
+                return RandomForestRegressor(random_state=42)
+            raise ValueError("model_type must be 'linear' or 'random_forest'")
+        
+        if model_type == 'logistic':
+            return Pipeline([
+                ('scaler', StandardScaler()),
+                ('classifier', LogisticRegression(random_state=42))
+            ])
+        if model_type == 'random_forest':
+            return Pipeline([
+                ('scaler', StandardScaler()),
+                ('classifier', RandomForestClassifier(random_state=42))
+            ])
+        raise ValueError("model_type must be 'logistic' or 'random_forest'")
+    
+    # ==========================================================================
+    # REPEATED CROSS-VALIDATION
+    # ==========================================================================
+    
+    def run_repeated_cv(self, task: str = 'regression', trial_type: str = 'invis', condition: str = 'max',
+                        model_type: str = None, predictors: List[str] = None, threshold: float = 0.68,
+                        n_splits: int = None, n_repeats: int = None, workers: int = None,
+                        random_state: int = 42) -> Dict:
+        """
+        Repeated (stratified, for classification) k-fold cross-validation.
+        
+        Each repeat reshuffles the folds with its own seed and runs in a process
+        pool when workers > 1 (falling back to serial if the pool is unavailable).
+        
+        Parameters:
+        -----------
+        task : str
+            'regression' (target: success rate) or 'classification' (success
+            rate >= threshold)
+        model_type : str, optional
+            As for the single-split methods ('linear'/'logistic' by default)
+        n_splits, n_repeats, workers : int, optional
+            Default to config.CV_FOLDS, config.CV_REPEATS (DEFAULT_CV_REPEATS
+            while that is 0) and config.STATS_WORKERS
+            
+        Returns:
+        --------
+        Dict : 'scores' (one row per repeat and fold), 'summary' (mean, std and
+               2.5/97.5 percentiles per score) and the CV settings
+        """
+        if task not in ('regression', 'classification'):
+            raise ValueError("task must be 'regression' or 'classification'")
+        if model_type is None:
+            model_type = 'linear' if task == 'regression' else 'logistic'
+        if predictors is None:
+            predictors = ['age', 'mot_noise', 'pref_asymmetry'] if task == 'regression' else ['age', 'mot_noise']
+        
+        target_col = f'{trial_type}_sr_{condition}_const'
+        if target_col not in self.filtered_df.columns:
+            raise ValueError(f"Target column {target_col} not found")
+        available_predictors = [p for p in predictors if p in self.filtered_df.columns]
+        valid_data = self.filtered_df[available_predictors + [target_col]].dropna()
+        if len(valid_data) < 10:
+            raise ValueError(f"Insufficient data: only {len(valid_data)} valid samples")
+        
+        X = valid_data[available_predictors]
+        y = valid_data[target_col]
+        if task == 'classification':
+            y = (y >= threshold).astype(int)
+        
+        return self._repeated_cv(task, X, y, model_type, n_splits, n_repeats, workers, random_state)
+    
+    def _maybe_repeated_cv(self, task: str, X: pd.DataFrame, y: pd.Series, model_type: str,
+                           cv_repeats: Optional[int]) -> Optional[Dict]:
+        n_repeats = getattr(self.config, 'CV_REPEATS', 0) if cv_repeats is None else cv_repeats
+        if not n_repeats:
+            return None
+        try:
+            return self._repeated_cv(task, X, y, model_type, None, n_repeats, None, 42)
+        except ValueError as e:
+            print(f"⚠️ Repeated cross-validation skipped: {e}")
+            return {'error': str(e)}
+    
+    def _cv_repeats(self, n_repeats: Optional[int]) -> int:
+        """Repeats to run: n_repeats if given, else config.CV_REPEATS, else DEFAULT_CV_REPEATS."""
+        if n_repeats is None:
+            n_repeats = getattr(self.config, 'CV_REPEATS', 0) or self.DEFAULT_CV_REPEATS
+        if n_repeats < 1:
+            raise ValueError(f"n_repeats must be at least 1 (got {n_repeats})")
+        return n_repeats
+    
+    def _repeated_cv(self, task: str, X: pd.DataFrame, y: pd.Series, model_type: str,
+                     n_splits: Optional[int], n_repeats: Optional[int], workers: Optional[int],
+                     random_state: int) -> Dict:
+        n_splits = n_splits or getattr(self.config, 'CV_FOLDS', 5)
+        n_repeats = self._cv_repeats(n_repeats)
+        workers = workers or getattr(self.config, 'STATS_WORKERS', 1)
+        
+        if task == 'classification':
+            # Every fold needs both classes
+            n_splits = min(n_splits, int(np.bincount(y, minlength=2).min()))
+        if n_splits < 2:
+            raise ValueError("Not enough samples per class for cross-validation")
+        
+        X_values, y_values = X.to_numpy(dtype=float), y.to_numpy()
+        seeds = [random_state + repeat for repeat in range(n_repeats)]
+        
+        outcomes = None
+        if workers > 1 and n_repeats > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=min(workers, n_repeats)) as executor:
+                    futures = [executor.submit(_cv_repeat_job, task, model_type, X_values, y_values, n_splits, seed)
+                               for seed in seeds]
+                    outcomes = [future.result() for future in futures]
+            except Exception as e:
+                print(f"⚠️ Process pool unavailable ({type(e).__name__}: {e}) - cross-validating serially")
+        if outcomes is None:
+            outcomes = [_cv_repeat_job(task, model_type, X_values, y_values, n_splits, seed) for seed in seeds]
+        
+        scores = pd.DataFrame([{'repeat': repeat, 'fold': fold, **fold_scores}
+                               for repeat, folds in enumerate(outcomes)
+                               for fold, fold_scores in enumerate(folds)])
+        score_cols = [col for col in scores.columns if col not in ('repeat', 'fold')]
+        summary = {
+            col: {
+                'mean': scores[col].mean(),
+                'std': scores[col].std(),
+                'ci_low': scores[col].quantile(0.025),
+                'ci_high': scores[col].quantile(0.975)
+            }
+            for col in score_cols
+        }
+        
+        return {
+            'scores': scores,
+            'summary': summary,
+            'n_splits': n_splits,
+            'n_repeats': n_repeats,
+            'n_samples': len(y_values),
+            'model_type': model_type,
+            'predictors': list(X.columns)
+        }
+    
+    # ==========================================================================
+    # MODEL SWEEP
+    # ==========================================================================
+    
+    SWEEP_MODELS = [('regression', 'linear'), ('regression', 'random_forest'),
+                    ('classification', 'logistic'), ('classification', 'random_forest')]
+    
+    def run_model_sweep(self, trial_types: List[str] = None, conditions: List[str] = None,
+                        models: List[Tuple[str, str]] = None, predictors: List[str] = None,
+                        predictor_sets: List[Tuple[str, ...]] = None, threshold: float = 0.68,
+                        n_splits: int = None, n_repeats: int = None, workers: int = None,
+                        random_state: int = 42) -> pd.DataFrame:
+        """
+        Repeated cross-validation of every trial type × condition × model ×
+        predictor set combination.
+        
+        Design matrices are built once per (target, predictor set) from numpy
+        columns and the CV folds once per fold shape (regression folds depend
+        only on the sample count, stratified folds on the class labels), so
+        combinations sharing rows share folds. The fits run in a process pool
+        when workers > 1 (falling back to serial if the pool is unavailable).
+        
+        Parameters:
+        -----------
+        trial_types, conditions : List[str], optional
+            Default to vis1/invis/vis2 and max/min
+        models : List[Tuple[str, str]], optional
+            (task, model_type) pairs; defaults to SWEEP_MODELS
+        predictors : List[str], optional
+            Candidate predictors (default age, mot_noise, pref_asymmetry); every
+            non-empty subset is tried unless predictor_sets is given
+        n_splits, n_repeats, workers : int, optional
+            Default to config.CV_FOLDS, config.CV_REPEATS (DEFAULT_CV_REPEATS
+            while that is 0) and config.STATS_WORKERS
+            
+        Returns:
+        --------
+        pd.DataFrame : one row per combination with the sample size, CV settings,
+                       <score>_mean / <score>_std columns and any error
+        """
+        df = self.filtered_df
+        trial_types = trial_types or ['vis1', 'invis', 'vis2']
+        conditions = conditions or ['max', 'min']
+        models = models or self.SWEEP_MODELS
+        n_splits = n_splits or getattr(self.config, 'CV_FOLDS', 5)
+        n_repeats = self._cv_repeats(n_repeats)
+        workers = workers or getattr(self.config, 'STATS_WORKERS', 1)
+        seeds = [random_state + repeat for repeat in range(n_repeats)]
+        
+        if predictor_sets is None:
+            candidates = [p for p in (predictors or ['age', 'mot_noise', 'pref_asymmetry']) if p in df.columns]
+            predictor_sets = [combo for k in range(1, len(candidates) + 1) for combo in combinations(candidates, k)]
+        
+        # Column arrays and missing-value masks, shared by every combination
+        targets = {(trial, condition): f'{trial}_sr_{condition}_const'
+                   for trial in trial_types for condition in conditions}
+        needed = {col for combo in predictor_sets for col in combo} | set(targets.values())
+        values = {col: df[col].to_numpy(dtype=float) for col in needed if col in df.columns}
+        present = {col: ~np.isnan(array) for col, array in values.items()}
+        
+        fold_cache = {}
+        rows, jobs = [], []
+        for (trial, condition), target in targets.items():
+            for combo in predictor_sets:
+                missing = [col for col in (target, *combo) if col not in values]
+                rows_mask = np.logical_and.reduce([present[col] for col in (target, *combo) if col in present])
+                X = np.column_stack([values[col][rows_mask] for col in combo]) if not missing else None
+                
+                for task, model_type in models:
+                    row = {
+                        'task': task, 'model_type': model_type, 'trial_type': trial, 'condition': condition,
+                        'target': target, 'predictors': '+'.join(combo), 'n_predictors': len(combo),
+                        'n_samples': int(rows_mask.sum()) if not missing else 0, 'n_splits': None,
+                        'n_repeats': n_repeats, 'error': None
+                    }
+                    rows.append(row)
+                    if missing:
+                        row['error'] = f"Missing columns: {missing}"
+                        continue
+                    if row['n_samples'] < 10:
+                        row['error'] = f"Insufficient data: only {row['n_samples']} valid samples"
+                        continue
+                    
+                    y = values[target][rows_mask]
+                    if task == 'classification':
+                        y = (y >= threshold).astype(int)
+                        splits = min(n_splits, int(np.bincount(y, minlength=2).min()))
+                        key = (task, splits, y.tobytes())
+                    else:
+                        splits = n_splits
+                        key = (task, splits, len(y))
+                    if splits < 2:
+                        row['error'] = "Not enough samples per class for cross-validation"
+                        continue
+                    if key not in fold_cache:
+                        fold_cache[key] = [_cv_folds(task, y, splits, seed) for seed in seeds]
+                    row['n_splits'] = splits
+                    jobs.append((row, (task, model_type, X, y, fold_cache[key])))
+        
+        print(f"🔁 Model sweep: {len(jobs)} combinations × {n_repeats} repeats "
+              f"({len(fold_cache)} distinct fold sets, {workers} worker{'s' if workers != 1 else ''})")
+        
+        outcomes = None
+        if workers > 1 and len(jobs) > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+                    futures = [executor.submit(_sweep_job, *args) for _, args in jobs]
+                    outcomes = [future.result() for future in futures]
+            except Exception as e:
+                print(f"⚠️ Process pool unavailable ({type(e).__name__}: {e}) - fitting serially")
+        if outcomes is None:
+            outcomes = [_sweep_job(*args) for _, args in jobs]
+        
+        for (row, _), fold_scores in zip(jobs, outcomes):
+            scores = pd.DataFrame(fold_scores)
+            for col in scores.columns:
+                row[f'{col}_mean'] = scores[col].mean()
+                row[f'{col}_std'] = scores[col].std()
+        
+        results = pd.DataFrame(rows)
+        score_cols = [col for col in results.columns if col.endswith(('_mean', '_std'))]
+        return results[[col for col in results.columns if col not in score_cols + ['error']] + score_cols + ['error']]
+    
+    # ==========================================================================
+    # PERMUTATION AND BOOTSTRAP INFERENCE
+    # ==========================================================================
+    
+    def _resampling_engine(self, n_resamples: Optional[int]) -> ResamplingEngine:
+        return ResamplingEngine(
+            n_resamples=n_resamples or getattr(self.config, 'RESAMPLES', 10000),
+            confidence=1 - getattr(self.config, 'ALPHA_LEVEL', 0.05)
+        )
+    
+    def run_resampling_analysis(self, predictors: List[str] = None, columns: List[str] = None,
+                                n_resamples: int = None, use_filtered: bool = True) -> pd.DataFrame:
+        """
+        Correlation of each predictor with every metric column, with permutation
+        p-values and bootstrap confidence intervals.
+        
+        Parameters:
+        -----------
+        predictors : List[str], optional
+            Defaults to age and mot_noise
+        columns : List[str], optional
+            Metric columns; defaults to every _const column
+        n_resamples : int, optional
+            Permutations and bootstrap resamples (default: config.RESAMPLES)
+        use_filtered : bool, default True
+            Use the motor-noise filtered subjects
+            
+        Returns:
+        --------
+        pd.DataFrame : one row per (predictor, metric) with n, r, p_value, ci_low, ci_high
+        """
+        df = self.filtered_df if use_filtered else self.metrics_df
+        if predictors is None:
+            predictors = ['age', 'mot_noise']
+        if columns is None:
+            columns = [col for col in df.columns if col.endswith('_const')]
+        
+        engine = self._resampling_engine(n_resamples)
+        results = []
+        for predictor in predictors:
+            if predictor not in df.columns:
+                continue
+            metrics = [col for col in columns if col in df.columns and col != predictor]
+            results.append(engine.correlations(df, predictor, metrics).assign(predictor=predictor))
+        
+        if not results:
+            return pd.DataFrame(columns=['predictor', 'metric', 'n', 'r', 'p_value', 'ci_low', 'ci_high'])
+        result = pd.concat(results, ignore_index=True)
+        return result[['predictor'] + [col for col in result.columns if col != 'predictor']]
+    
+    def run_motor_noise_resampling(self, threshold: float = None, columns: List[str] = None,
+                                   n_resamples: int = None) -> pd.DataFrame:
+        """
+        High vs low motor noise difference in every metric column (all subjects,
+        before the motor noise filter), with permutation p-values and bootstrap
+        confidence intervals.
+        
+        Returns:
+        --------
+        pd.DataFrame : one row per metric with n_group/mean_group (high noise),
+                       n_rest/mean_rest (low noise), difference, p_value, ci_low, ci_high
+        """
+        df = self.metrics_df
+        if 'mot_noise' not in df.columns:
+            raise ValueError("mot_noise column not available")
+        if threshold is None:
+            threshold = self.config.MOTOR_NOISE_THRESHOLD
+        if columns is None:
+            columns = [col for col in df.columns if col.endswith('_const')]
+        
+        high_noise = df['mot_noise'] > threshold
+        return self._resampling_engine(n_resamples).mean_differences(df, high_noise, columns)
+    
+    def run_stride_change_analysis(self, stride_changes: pd.DataFrame, predictors: List[str] = None,
+                                   n_resamples: int = None, use_filtered: bool = True) -> pd.DataFrame:
+        """
+        Correlation of each predictor with the mean stride change after success,
+        after failure and their difference, per trial type and condition, with
+        permutation p-values and bootstrap confidence intervals.
+        
+        Parameters:
+        -----------
+        stride_changes : pd.DataFrame
+            Per-period summary from MetricsCalculator.load_stride_changes (or
+            calculate_stride_changes)
+        predictors : List[str], optional
+            Defaults to age and mot_noise
+        n_resamples : int, optional
+            Permutations and bootstrap resamples (default: config.RESAMPLES)
+        use_filtered : bool, default True
+            Use the motor-noise filtered subjects
+            
+        Returns:
+        --------
+        pd.DataFrame : one row per (predictor, metric) with n, r, p_value, ci_low, ci_high;
+                       metrics are named {trial}_change_after_success_{condition}_const,
+                       ..._after_failure_... and {trial}_change_difference_{condition}_const
+        """
+        df = self.filtered_df if use_filtered else self.metrics_df
+        if predictors is None:
+            predictors = ['age', 'mot_noise']
+        
+        # One column per (measure, trial type, condition), one row per subject
+        measures = {'success_mean': 'change_after_success', 'failure_mean': 'change_after_failure',
+                    'mean_difference': 'change_difference'}
+        wide = stride_changes.assign(ID=stride_changes['ID'].astype(object)).pivot_table(
+            index='ID', columns=['trial_type', 'condition'], values=list(measures), observed=True)
+        wide.columns = [f'{trial}_{measures[measure]}_{condition}_const' for measure, trial, condition in wide.columns]
+        columns = [f'{trial}_{name}_{condition}_const' for trial in self.TRIAL_TYPES for name in measures.values()
+                   for condition in self.CONDITIONS if f'{trial}_{name}_{condition}_const' in wide.columns]
+        
+        subjects = df[['ID'] + [col for col in predictors if col in df.columns]]
+        table = subjects.merge(wide[columns], left_on='ID', right_index=True, how='inner')
+        
+        engine = self._resampling_engine(n_resamples)
+        results = [engine.correlations(table, predictor, columns).assign(predictor=predictor)
+                   for predictor in predictors if predictor in table.columns]
+        
+        if not results:
+            return pd.DataFrame(columns=['predictor', 'metric', 'n', 'r', 'p_value', 'ci_low', 'ci_high'])
+        result = pd.concat(results, ignore_index=True)
+        return result[['predictor'] + [col for col in result.columns if col != 'predictor']]
+    
+    def run_mixed_effects_analysis(self, trial_types: Union[str, List[str]] = 'all') -> object:
+        """Run mixed-effects analysis withcolumn naming."""
+        
+        if trial_types == 'all':
+            trials_to_include = ['vis1', 'invis', 'vis2']
+        elif isinstance(trial_types, str):
+            trials_to_include = [trial_types]
+        else:
+            trials_to_include = trial_types
+        
+        df_long = self.long_format(trial_types=trials_to_include)
+        df_long = df_long.dropna(subset=['success_rate', 'mot_noise', 'age'])
+        
+        if df_long.empty:
+            raise ValueError("No success rate data available")
+        
+        # Fit model
+        if len(trials_to_include) == 1:
+            formula = 'success_rate ~ C(condition) + mot_noise + age'
+        else:
+            formula = 'success_rate ~ C(trial_type) + C(condition) + mot_noise + age'
+        
+        model = smf.ols(formula, data=df_long).fit()
+        return model
+
+    def run_repeated_measures_anova(self, outcome_cols: List[str] = None, 
+                                   subject_col: str = 'ID') -> Dict:
+        """
+        Run repeated measures ANOVA for trial type comparisons.
+        
+        Parameters:
+        -----------
+        outcome_cols : List[str], optional
+            Success rate columns to analyze. If None, uses all _sr_ columns
+        subject_col : str
+            Column identifying subjects
+            
+        Returns:
+        --------
+        Dict : ANOVA results and effect sizes
+        """
+        try:
+            import pingouin as pg
+        except ImportError:
+            print("⚠️ pingouin required for repeated measures ANOVA: pip install pingouin")
+            return {'error': 'pingouin not available'}
+        
+        if outcome_cols is None:
+            outcome_cols = [col for col in self.filtered_df.columns 
+                           if '_sr_' in col and '_const' in col]
+        
+        df_long = self.long_format(columns=outcome_cols).dropna(subset=['age', 'mot_noise'])
+        if subject_col != 'ID' and {'ID', subject_col} <= set(self.filtered_df.columns):
+            df_long['subject'] = self.filtered_df.set_index('ID')[subject_col].reindex(df_long['subject']).to_numpy()
+        
+        if df_long.empty:
+            return {'error': 'No valid data for analysis'}
+        
+        # Repeated measures ANOVA
+        results = {}
+        
+        # Main effect of trial type
+        if len(df_long['trial_type'].unique()) > 1:
+            aov_trial = pg.rm_anova(data=df_long, dv='success_rate', 
+                                   within='trial_type', subject='subject', detailed=True).rename(columns={'p-unc': 'p_unc'})
+            results['trial_type_effect'] = {
+                'F': aov_trial['F'].iloc[0],
+                'p_value': aov_trial['p_unc'].iloc[0],
+                'effect_size': aov_trial['ng2'].iloc[0],  # partial eta squared
+                'significant': aov_trial['p_unc'].iloc[0] < 0.05
+            }
+        
+        # Main effect of condition
+        if len(df_long['condition'].unique()) > 1:
+            aov_condition = pg.rm_anova(data=df_long, dv='success_rate',
+                                       within='condition', subject='subject').rename(columns={'p-unc': 'p_unc'})
+            results['condition_effect'] = {
+                'F': aov_condition['F'].iloc[0],
+                'p_value': aov_condition['p_unc'].iloc[0],
+                'effect_size': aov_condition['ng2'].iloc[0],
+                'significant': aov_condition['p_unc'].iloc[0] < 0.05
+            }
+        
+        # Two-way repeated measures ANOVA
+        if len(df_long['trial_type'].unique()) > 1 and len(df_long['condition'].unique()) > 1:
+            aov_interaction = pg.rm_anova(data=df_long, dv='success_rate',
+                                         within=['trial_type', 'condition'], 
+                                         subject='subject').rename(columns={'p-unc': 'p_unc'})
+            results['interaction_effect'] = {
+                'trial_type': {
+                    'F': aov_interaction[aov_interaction['Source'] == 'trial_type']['F'].iloc[0],
+                    'p_value': aov_interaction[aov_interaction['Source'] == 'trial_type']['p_unc'].iloc[0],
+                    'effect_size': aov_interaction[aov_interaction['Source'] == 'trial_type']['ng2'].iloc[0]
+                },
+                'condition': {
+                    'F': aov_interaction[aov_interaction['Source'] == 'condition']['F'].iloc[0],
+                    'p_value': aov_interaction[aov_interaction['Source'] == 'condition']['p_unc'].iloc[0],
+                    'effect_size': aov_interaction[aov_interaction['Source'] == 'condition']['ng2'].iloc[0]
+                },
+                'trial_type_x_condition': {
+                    'F': aov_interaction[aov_interaction['Source'] == 'trial_type * condition']['F'].iloc[0],
+                    'p_value': aov_interaction[aov_interaction['Source'] == 'trial_type * condition']['p_unc'].iloc[0],
+                    'effect_size': aov_interaction[aov_interaction['Source'] == 'trial_type * condition']['ng2'].iloc[0]
+                }
+            }
+        
+        # Post-hoc comparisons if significant main effects
+        if results.get('trial_type_effect', {}).get('significant'):
+            posthoc_trial = pg.pairwise_ttests(data=df_long, dv='success_rate',
+                                              within='trial_type', subject='subject',
+                                              padjust='bonf')
+            results['posthoc_trial_type'] = posthoc_trial.to_dict('records')
+        
+        results['data_summary'] = {
+            'n_subjects': df_long['subject'].nunique(),
+            'n_observations': len(df_long),
+            'trial_types': df_long['trial_type'].unique().tolist(),
+            'conditions': df_long['condition'].unique().tolist()
+        }
+        
+        return results
+    
+    def run_multivariate_regression(self, outcome_cols: List[str] = None,
+                                    predictor_cols: List[str] = None) -> Dict:
+        """
+        Run multivariate multiple regression analyzing multiple outcomes simultaneously.
+        
+        Parameters:
+        -----------
+        outcome_cols : List[str], optional
+            Success rate columns to analyze as outcomes
+        predictor_cols : List[str], optional
+            Predictor variables
+            
+        Returns:
+        --------
+        Dict : Multivariate regression results
+        """
+        try:
+            from sklearn.multioutput import MultiOutputRegressor
+            from sklearn.linear_model import LinearRegression
+            from sklearn.metrics import r2_score
+        except ImportError:
+            return {'error': 'sklearn required for multivariate regression'}
+        
+        if outcome_cols is None:
+            outcome_cols = [col for col in self.filtered_df.columns 
+                           if '_sr_' in col and '_const' in col]
+        
+        if predictor_cols is None:
+            predictor_cols = ['age', 'mot_noise']
+            if 'pref_asymmetry' in self.filtered_df.columns:
+                predictor_cols.append('pref_asymmetry')
+        
+        # Filter available columns
+        available_outcomes = [col for col in outcome_cols if col in self.filtered_df.columns]
+        available_predictors = [col for col in predictor_cols if col in self.filtered_df.columns]
+        
+        if len(available_outcomes) < 2:
+            return {'error': 'Need at least 2 outcome variables'}
+        
+        # Prepare data
+        all_cols = available_predictors + available_outcomes
+        valid_data = self.filtered_df[all_cols].dropna()
+        
+        if len(valid_data) < 10:
+            return {'error': f'Insufficient data: {len(valid_data)} complete cases'}
+        
+        X = valid_data[available_predictors]
+        Y = valid_data[available_outcomes]
+        
+        # Fit multivariate model
+        multioutput_regressor = MultiOutputRegressor(LinearRegression())
+        multioutput_regressor.fit(X, Y)
+        
+        # Predictions
+        Y_pred = multioutput_regressor.predict(X)
+        
+        # Calculate R² for each outcome
+        individual_r2 = {}
+        for i, outcome in enumerate(available_outcomes):
+            r2 = r2_score(Y.iloc[:, i], Y_pred[:, i])
+            individual_r2[outcome] = r2
+        
+        # Overall multivariate R² (Wilks' Lambda approximation)
+        try:
+            # Calculate canonical correlation for overall fit
+            from scipy.stats import wilcoxon
+            overall_r2 = r2_score(Y.values.flatten(), Y_pred.flatten())
+        except:
+            overall_r2 = np.mean(list(individual_r2.values()))
+        
+        # Individual model coefficients
+        coefficients = {}
+        for i, outcome in enumerate(available_outcomes):
+            regressor = multioutput_regressor.estimators_[i]
+            coefficients[outcome] = dict(zip(available_predictors, regressor.coef_))
+        
+        # Statistical significance testing (approximate)
+        significance_tests = {}
+        for i, outcome in enumerate(available_outcomes):
+            # Fit individual model for p-values
+            individual_model = LinearRegression().fit(X, Y.iloc[:, i])
+            
+            # Calculate standard errors (simplified)
+            mse = np.mean((Y.iloc[:, i] - Y_pred[:, i]) ** 2)
+            var_coef = mse * np.linalg.inv(X.T @ X).diagonal()
+            se_coef = np.sqrt(var_coef)
+            t_stats = individual_model.coef_ / se_coef
+            
+            # Approximate p-values (df = n - p - 1)
+            from scipy.stats import t
+            df = len(valid_data) - len(available_predictors) - 1
+            p_values = 2 * (1 - t.cdf(np.abs(t_stats), df))
+            
+            significance_tests[outcome] = {
+                'coefficients': dict(zip(available_predictors, individual_model.coef_)),
+                'p_values': dict(zip(available_predictors, p_values)),
+                'significant_predictors': [pred for pred, p in zip(available_predictors, p_values) if p < 0.05]
+            }
+        
+        return {
+            'model': multioutput_regressor,
+            'individual_r2': individual_r2,
+            'overall_r2': overall_r2,
+            'coefficients': coefficients,
+            'significance_tests': significance_tests,
+            'data_summary': {
+                'n_subjects': len(valid_data),
+                'outcomes': available_outcomes,
+                'predictors': available_predictors
+            },
+            'method': 'MultiOutputRegressor with LinearRegression'
+        }
+    
+    def run_mixed_effects_repeated_measures(self, outcome_col: str = 'success_rate') -> object:
+        """
+        Run mixed-effects model for repeated measures with random intercepts.
+        
+        Parameters:
+        -----------
+        outcome_col : str
+            Name of outcome variable in long format
+            
+        Returns:
+        --------
+        Mixed effects model results
+        """
+        try:
+            import statsmodels.formula.api as smf
+        except ImportError:
+            return {'error': 'statsmodels required'}
+        
+        df_long = self.long_format().dropna(subset=['success_rate', 'age', 'mot_noise'])
+        
+        if df_long.empty:
+            return {'error': 'No valid data for mixed effects model'}
+        
+        # Fit mixed effects model with random intercepts for subjects
+        try:
+            # Using statsmodels MixedLM
+            import statsmodels.api as sm
+            
+            model = smf.mixedlm("success_rate ~ C(trial_type) + C(condition) + age + mot_noise",
+                               df_long, groups=df_long["subject"])
+            result = model.fit()
+            
+            return {
+                'model': result,
+                'summary': result.summary(),
+                'aic': result.aic,
+                'bic': result.bic,
+                'random_effects_var': result.cov_re,
+                'residual_var': result.scale,
+                'n_subjects': df_long['subject'].nunique(),
+                'n_observations': len(df_long)
+            }
+            
+        except Exception as e:
+            # Fallback to regular mixed effects
+            return self.run_mixed_effects_analysis(['vis1', 'invis', 'vis2'])
+
+
+def _cv_folds(task: str, y: np.ndarray, n_splits: int, seed: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """One shuffled (stratified, for classification) k-fold split of len(y) samples."""
+    if task == 'regression':
+        splitter = KFold(n_splits=n_splits, shuffle=True, random_state=seed)
+    else:
+        splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=seed)
+    return list(splitter.split(np.empty((len(y), 0)), y))
+
+
+def _score_folds(task: str, model_type: str, X: np.ndarray, y: np.ndarray,
+                 folds: List[Tuple[np.ndarray, np.ndarray]]) -> List[Dict]:
+    """Fit a fresh model on each training fold; returns the test scores of each fold."""
+    scores = []
+    for train_idx, test_idx in folds:
+        model = StatisticalAnalyzer._build_model(task, model_type)
+        model.fit(X[train_idx], y[train_idx])
+        y_pred = model.predict(X[test_idx])
+        y_test = y[test_idx]
+        
+        if task == 'regression':
+            scores.append({
+                'r2': r2_score(y_test, y_pred),
+                'rmse': np.sqrt(mean_squared_error(y_test, y_pred))
+            })
+        else:
+            y_proba = model.predict_proba(X[test_idx])[:, 1]
+            scores.append({
+                'accuracy': accuracy_score(y_test, y_pred),
+                'precision': precision_score(y_test, y_pred, zero_division=0),
+                'recall': recall_score(y_test, y_pred, zero_division=0),
+                'f1': f1_score(y_test, y_pred, zero_division=0),
+                'roc_auc': roc_auc_score(y_test, y_proba) if len(np.unique(y_test)) > 1 else np.nan
+            })
+    return scores
+
+
+def _cv_repeat_job(task: str, model_type: str, X: np.ndarray, y: np.ndarray,
+                   n_splits: int, seed: int) -> List[Dict]:
+    """Process-pool worker: one shuffled k-fold pass; returns the scores of each fold."""
+    return _score_folds(task, model_type, X, y, _cv_folds(task, y, n_splits, seed))
+
+
+def _sweep_job(task: str, model_type: str, X: np.ndarray, y: np.ndarray,
+               repeats: List[List[Tuple[np.ndarray, np.ndarray]]]) -> List[Dict]:
+    """Process-pool worker: every precomputed repeat of one sweep combination (flat fold scores)."""
+    return [fold for folds in repeats for fold in _score_folds(task, model_type, X, y, folds)]
@@ -0,0 +1,346 @@
+"""Append-only SQLite store of per-subject metrics across analysis runs."""
+
+import contextlib
+import hashlib
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+# METRICS STORE
+# ==============================================================================
+
+class MetricsStore:
+    """
+    Every metrics table the pipeline exports, as one queryable SQLite file.
+
+    Each call to record() is a run: it stores the run's config parameters, the
+    subjects it covered with a hash of their raw exports, and one row per
+    subject × metric whose value differs from the latest stored one. Unchanged
+    values are not written again; the value of a metric in run R is the most
+    recent row at or before R, so every run can still be read back in full.
+    Non-numeric metrics are stored as text, list-valued ones (the stride
+    indices of each condition period) as JSON lists.
+
+    Usage:
+        store = MetricsStore('analysis/exports/metrics_store.sqlite')
+        store.record(metrics_df, config=config, input_hashes=MetricsStore.input_hashes(manifest))
+        store.query('invis_sr_min_const', age_range=(7, 10))
+        store.diff(3, 4)
+    """
+
+    VERSION = 1
+    ID_COLUMN = 'ID'
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        CREATE TABLE IF NOT EXISTS runs (
+            run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            created_at TEXT NOT NULL,
+            label TEXT,
+            config TEXT,
+            config_hash TEXT,
+            n_subjects INTEGER,
+            n_changed INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS run_subjects (
+            run_id INTEGER NOT NULL REFERENCES runs(run_id),
+            subject_id TEXT NOT NULL,
+            input_hash TEXT,
+            PRIMARY KEY (run_id, subject_id)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS metric_values (
+            subject_id TEXT NOT NULL,
+            metric TEXT NOT NULL,
+            run_id INTEGER NOT NULL REFERENCES runs(run_id),
+            value REAL,
+            text TEXT,
+            PRIMARY KEY (subject_id, metric, run_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS metric_values_by_metric ON metric_values (metric, run_id);
+    """
+
+    def __init__(self, db_path: Union[str, Path]):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(self.SCHEMA)
+            version = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if version is None:
+                conn.execute("INSERT INTO meta VALUES ('version', ?)", (str(self.VERSION),))
+            elif int(version[0]) != self.VERSION:
+                raise ValueError(f"{self.db_path} is a version {version[0]} metrics store "
+                                 f"(this code reads version {self.VERSION})")
+
+    @contextlib.contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:  # one transaction, committed on success
+                yield conn
+        finally:
+            conn.close()
+
+    # --------------------------------------------------------------------------
+    # Recording
+    # --------------------------------------------------------------------------
+
+    @staticmethod
+    def config_parameters(config) -> Dict:
+        """Analysis parameters of a Config (upper-case scalar/list attributes, no paths)."""
+        if config is None:
+            return {}
+        if isinstance(config, dict):
+            items = config.items()
+        else:
+            items = ((key, value) for key, value in vars(config).items() if key.isupper())
+        return {key: value for key, value in sorted(items)
+                if isinstance(value, (bool, int, float, str, list, tuple, dict, type(None)))}
+
+    @staticmethod
+    def input_hashes(manifest: Dict) -> Dict[str, str]:
+        """One hash per subject over the content hashes of its raw exports (see the data manifest)."""
+        hashes = {}
+        for subject_id, fingerprints in (manifest or {}).get('subjects', {}).items():
+            content = sorted((trial_type, entry['size'], entry['sha1'])
+                             for trial_type, entries in fingerprints.items() for entry in entries)
+            hashes[subject_id] = hashlib.sha1(json.dumps(content).encode()).hexdigest()
+        return hashes
+
+    @staticmethod
+    def _as_text(value) -> str:
+        """Text form of a non-numeric value; sequences (e.g. the *_const_indices) as JSON lists."""
+        if isinstance(value, (pd.Index, pd.Series, np.ndarray)):
+            value = value.tolist()
+        if isinstance(value, (list, tuple)):
+            return json.dumps(list(value), default=str)
+        return str(value)
+
+    def _melt(self, metrics_df: pd.DataFrame) -> pd.DataFrame:
+        """Long subject_id/metric/value/text view of a wide metrics table."""
+        frames = []
+        subject_ids = metrics_df[self.ID_COLUMN].astype(str).to_numpy()
+        for column in metrics_df.columns:
+            if column == self.ID_COLUMN:
+                continue
+            series = metrics_df[column]
+            numeric = pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series)
+            if numeric:
+                text = None
+            else:
+                text = np.array([self._as_text(v) for v in series.to_numpy(dtype=object)], dtype=object)
+                text[series.isna().to_numpy()] = None
+            frames.append(pd.DataFrame({
+                'subject_id': subject_ids,
+                'metric': str(column),
+                'value': series.astype(float).to_numpy() if numeric else np.nan,
+                'text': text
+            }))
+        if not frames:
+            return pd.DataFrame(columns=['subject_id', 'metric', 'value', 'text'])
+        return pd.concat(frames, ignore_index=True)
+
+    def _latest(self, conn) -> pd.DataFrame:
+        """Most recent stored value of every subject × metric."""
+        return pd.read_sql_query("""
+            SELECT v.subject_id, v.metric, v.value, v.text
+            FROM metric_values v
+            JOIN (SELECT subject_id, metric, MAX(run_id) AS run_id
+                  FROM metric_values GROUP BY subject_id, metric) latest
+              USING (subject_id, metric, run_id)
+        """, conn)
+
+    def record(self, metrics_df: pd.DataFrame, config=None, input_hashes: Optional[Dict[str, str]] = None,
+               label: Optional[str] = None) -> Dict:
+        """
+        Append a run and write the subject × metric values that changed.
+
+        A metric that disappeared for a subject in this run is written as NULL.
+        Returns run_id, n_changed (rows written) and n_values (values in the run).
+        """
+        current = self._melt(metrics_df)
+        subjects = list(dict.fromkeys(metrics_df[self.ID_COLUMN].astype(str)))
+        parameters = self.config_parameters(config)
+        config_json = json.dumps(parameters, sort_keys=True, default=str)
+        input_hashes = input_hashes or {}
+
+        with self._connect() as conn:
+            previous = self._latest(conn)
+            previous = previous[previous['subject_id'].isin(subjects)]
+            merged = current.merge(previous, on=['subject_id', 'metric'], how='outer',
+                                   suffixes=('', '_prev'), indicator=True)
+            same_value = (merged['value'] == merged['value_prev']) | (
+                merged['value'].isna() & merged['value_prev'].isna())
+            same_text = (merged['text'] == merged['text_prev']) | (
+                merged['text'].isna() & merged['text_prev'].isna())
+            changed = merged[(merged['_merge'] == 'left_only') | ~(same_value & same_text)]
+            changed = changed[~((changed['_merge'] == 'left_only') &
+                                changed['value'].isna() & changed['text'].isna())]
+
+            cursor = conn.execute(
+                "INSERT INTO runs (created_at, label, config, config_hash, n_subjects, n_changed) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (datetime.now().isoformat(timespec='seconds'), label, config_json,
+                 hashlib.sha1(config_json.encode()).hexdigest(), len(subjects), len(changed)))
+            run_id = cursor.lastrowid
+
+            conn.executemany("INSERT INTO run_subjects VALUES (?, ?, ?)",
+                             [(run_id, subject_id, input_hashes.get(subject_id)) for subject_id in subjects])
+            conn.executemany(
+                "INSERT INTO metric_values VALUES (?, ?, ?, ?, ?)",
+                [(subject_id, metric, run_id, None if pd.isna(value) else float(value),
+                  None if pd.isna(text) else text)
+                 for subject_id, metric, value, text in changed[['subject_id', 'metric', 'value', 'text']]
+                 .itertuples(index=False, name=None)])
+
+        n_values = int(current['value'].notna().sum() + current['text'].notna().sum())
+        return {'run_id': run_id, 'n_changed': len(changed), 'n_values': n_values}
+
+    # --------------------------------------------------------------------------
+    # Queries
+    # --------------------------------------------------------------------------
+
+    def runs(self) -> pd.DataFrame:
+        """One row per run (without the config JSON; see run_config())."""
+        with self._connect() as conn:
+            return pd.read_sql_query(
+                "SELECT run_id, created_at, label, config_hash, n_subjects, n_changed FROM runs ORDER BY run_id", conn)
+
+    def run_config(self, run_id: Optional[int] = None) -> Dict:
+        """Config parameters recorded with a run (default: the latest)."""
+        run_id = self._run_id(run_id)
+        with self._connect() as conn:
+            row = conn.execute("SELECT config FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return json.loads(row[0]) if row and row[0] else {}
+
+    def config_diff(self, run_a: int, run_b: int) -> Dict[str, Tuple]:
+        """Parameters that differ between two runs, as name -> (value in a, value in b)."""
+        a, b = self.run_config(run_a), self.run_config(run_b)
+        return {key: (a.get(key), b.get(key)) for key in sorted(set(a) | set(b)) if a.get(key) != b.get(key)}
+
+    def _run_id(self, run_id: Optional[int]) -> int:
+        with self._connect() as conn:
+            if run_id is None:
+                row = conn.execute("SELECT MAX(run_id) FROM runs").fetchone()
+                if row[0] is None:
+                    raise ValueError(f"No runs recorded in {self.db_path}")
+                return int(row[0])
+            if run_id < 0:  # -1 = latest, -2 = the one before, ...
+                row = conn.execute("SELECT run_id FROM runs ORDER BY run_id DESC LIMIT 1 OFFSET ?",
+                                   (-run_id - 1,)).fetchone()
+            else:
+                row = conn.execute("SELECT run_id FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if row is None:
+            raise ValueError(f"No run {run_id} in {self.db_path}")
+        return int(row[0])
+
+    def values(self, runs: Optional[Sequence[int]] = None, metrics: Optional[Sequence[str]] = None,
+               subjects: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Long run_id/subject_id/metric/value/text table of the values in effect in each run.
+
+        Only subjects recorded in a run appear for it; runs default to all of them.
+        """
+        with self._connect() as conn:
+            run_ids = [self._run_id(run_id) for run_id in runs] if runs is not None else [
+                row[0] for row in conn.execute("SELECT run_id FROM runs")]
+            columns = ['run_id', 'subject_id', 'metric', 'value', 'text']
+            if not run_ids:
+                return pd.DataFrame(columns=columns)
+
+            members = pd.read_sql_query(
+                f"SELECT run_id, subject_id FROM run_subjects WHERE run_id IN ({','.join('?' * len(run_ids))})",
+                conn, params=run_ids)
+            query, params = "SELECT subject_id, metric, run_id AS changed_in, value, text FROM metric_values " \
+                            "WHERE run_id <= ?", [max(run_ids)]
+            if metrics is not None:
+                query += f" AND metric IN ({','.join('?' * len(metrics))})"
+                params += list(metrics)
+            history = pd.read_sql_query(query, conn, params=params)
+
+        if subjects is not None:
+            subjects = [str(subject) for subject in subjects]
+            members = members[members['subject_id'].isin(subjects)]
+            history = history[history['subject_id'].isin(subjects)]
+        if members.empty or history.empty:
+            return pd.DataFrame(columns=columns)
+
+        # Every (run, subject, metric) picks the latest change at or before its run
+        names = pd.DataFrame({'metric': list(metrics) if metrics is not None else history['metric'].unique()})
+        grid = members.merge(names, how='cross').astype({'run_id': 'int64'}).sort_values('run_id')
+        history = history.astype({'changed_in': 'int64'}).sort_values('changed_in')
+        table = pd.merge_asof(grid, history, left_on='run_id', right_on='changed_in',
+                              by=['subject_id', 'metric'], direction='backward')
+        table = table[table['value'].notna() | table['text'].notna()]
+        return table[columns].sort_values(['run_id', 'subject_id', 'metric']).reset_index(drop=True)
+
+    def snapshot(self, run_id: Optional[int] = None) -> pd.DataFrame:
+        """Wide metrics table as it was exported in a run (default: the latest)."""
+        table = self.values(runs=[self._run_id(run_id)])
+        table['value'] = table['value'].astype(object).where(table['text'].isna(), table['text'])
+        wide = table.pivot(index='subject_id', columns='metric', values='value')
+        wide = wide.rename_axis(index=self.ID_COLUMN, columns=None).reset_index()
+        for column in wide.columns[1:]:
+            try:
+                wide[column] = pd.to_numeric(wide[column])
+            except (TypeError, ValueError):  # text metric
+                pass
+        return wide
+
+    def query(self, metrics: Union[str, Sequence[str]], runs: Optional[Sequence[int]] = None,
+              subjects: Optional[Sequence[str]] = None,
+              age_range: Optional[Tuple[float, float]] = None) -> pd.DataFrame:
+        """
+        Values of one or more metrics across runs.
+
+        age_range=(7, 10) keeps subjects whose recorded 'age' in that run is in
+        (7, 10], the same convention as the Config.AGE_BINS groups.
+        """
+        metrics = [metrics] if isinstance(metrics, str) else list(metrics)
+        wanted = metrics + (['age'] if age_range is not None and 'age' not in metrics else [])
+        table = self.values(runs=runs, metrics=wanted, subjects=subjects)
+
+        if age_range is not None:
+            ages = (table[table['metric'] == 'age'][['run_id', 'subject_id', 'value']]
+                    .rename(columns={'value': 'age'}))
+            table = table[table['metric'].isin(metrics)].merge(ages, on=['run_id', 'subject_id'])
+            low, high = age_range
+            table = table[(table['age'] > low) & (table['age'] <= high)]
+
+        table = table.merge(self.runs()[['run_id', 'created_at', 'label']], on='run_id', how='left')
+        if table['text'].isna().all():
+            table = table.drop(columns='text')
+        leading = ['run_id', 'created_at', 'label', 'subject_id'] + (['age'] if age_range is not None else [])
+        return table[leading + [c for c in table.columns if c not in leading]].reset_index(drop=True)
+
+    def diff(self, run_a: Optional[int] = -2, run_b: Optional[int] = -1,
+             metrics: Optional[Sequence[str]] = None, atol: float = 0.0) -> pd.DataFrame:
+        """
+        Subject × metric values that differ between two runs (default: the last two).
+
+        status is 'changed', 'added' (only in run_b) or 'removed' (only in run_a);
+        numeric changes within atol are ignored.
+        """
+        run_a, run_b = self._run_id(run_a), self._run_id(run_b)
+        table = self.values(runs=[run_a, run_b], metrics=metrics)
+        keys = ['subject_id', 'metric']
+        a = table[table['run_id'] == run_a].drop(columns='run_id')
+        b = table[table['run_id'] == run_b].drop(columns='run_id')
+        merged = a.merge(b, on=keys, how='outer', suffixes=('_a', '_b'), indicator=True)
+
+        merged['delta'] = merged['value_b'] - merged['value_a']
+        same_value = ((merged['delta'].abs() <= atol) |
+                      (merged['value_a'].isna() & merged['value_b'].isna()))
+        same_text = (merged['text_a'] == merged['text_b']) | (merged['text_a'].isna() & merged['text_b'].isna())
+        merged['status'] = merged['_merge'].map({'left_only': 'removed', 'right_only': 'added', 'both': 'changed'})
+        merged = merged[(merged['_merge'] != 'both') | ~(same_value & same_text)]
+
+        columns = keys + ['status', 'value_a', 'value_b', 'delta']
+        if merged[['text_a', 'text_b']].notna().any().any():
+            columns += ['text_a', 'text_b']
+        return merged[columns].sort_values(keys).reset_index(drop=True)
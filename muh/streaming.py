@@ -0,0 +1,269 @@
+"""Live monitoring of a D-Flow export while it is still being written."""
+
+import math
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+
+# LIVE STREAMING
+# ==============================================================================
+
+class RollingPeriodStats:
+    """
+    Last-N stride window of one condition period with running sums.
+
+    Adding a stride (and evicting the oldest one) updates every metric in
+    O(1); the values match MetricsCalculator._calculate_period_metrics on the
+    same N strides (NaNs are skipped like pandas does).
+    """
+
+    def __init__(self, length: int = 20):
+        self.length = length
+        self.strides = deque()
+        self.success_positions = deque()
+        self.position = 0  # running stride counter, so window positions never shift
+        self.sums = {'success': [0.0, 0], 'sogs': [0.0, 0], 'sogs_sq': [0.0, 0],
+                     'error': [0.0, 0], 'asymmetry': [0.0, 0]}
+
+    def _apply(self, values: Dict[str, float], sign: int):
+        for key, value in values.items():
+            if not math.isnan(value):
+                self.sums[key][0] += sign * value
+                self.sums[key][1] += sign
+
+    def add(self, stride: Dict[str, float]):
+        """Push one stride record (see LiveTrialMonitor.FIELDS) into the window."""
+        sogs, right, left = stride['Sum of gains and steps'], stride['Right step length'], stride['Left step length']
+        denominator = right + left
+        values = {
+            'success': stride['Success'],
+            'sogs': sogs,
+            'sogs_sq': sogs * sogs,
+            'error': sogs - stride['Constant'],
+            'asymmetry': abs((right - left) / denominator) if denominator != 0 else math.nan
+        }
+        self.strides.append((self.position, stride, values))
+        self._apply(values, +1)
+        if stride['Success'] == 1:
+            self.success_positions.append(self.position)
+        self.position += 1
+
+        if len(self.strides) > self.length:
+            position, _, old_values = self.strides.popleft()
+            self._apply(old_values, -1)
+            if self.success_positions and self.success_positions[0] == position:
+                self.success_positions.popleft()
+
+    def rebuild(self, keep: Callable[[Dict], bool]):
+        """Drop the strides failing `keep` (bounded by the window length)."""
+        strides = [stride for _, stride, _ in self.strides if keep(stride)]
+        self.__init__(self.length)
+        for stride in strides:
+            self.add(stride)
+
+    def _mean(self, key: str) -> float:
+        total, count = self.sums[key]
+        return total / count if count else math.nan
+
+    def metrics(self, trial_type: str, condition: str) -> Dict[str, float]:
+        """Current window metrics, named like MetricsCalculator's columns."""
+        prefix, suffix = f'{trial_type}_', f'_{condition}_const'
+        total, count = self.sums['sogs']
+        variance = ((self.sums['sogs_sq'][0] - total * total / count) / (count - 1)) if count > 1 else math.nan
+
+        metrics = {
+            f'{prefix}sr{suffix}': self._mean('success'),
+            f'{prefix}sd{suffix}': math.sqrt(max(variance, 0.0)) if not math.isnan(variance) else math.nan,
+            f'{prefix}msl{suffix}': self._mean('sogs'),
+            f'{prefix}error{suffix}': self._mean('error')
+        }
+        if self.sums['asymmetry'][1]:
+            metrics[f'{prefix}asymmetry{suffix}'] = self._mean('asymmetry')
+        if len(self.success_positions) >= 2:
+            metrics[f'{prefix}strides_between_success{suffix}'] = (
+                (self.success_positions[-1] - self.success_positions[0]) / (len(self.success_positions) - 1))
+        metrics[f'{prefix}n_strides{suffix}'] = len(self.strides)
+        return metrics
+
+
+class LiveTrialMonitor:
+    """
+    Tail a growing D-Flow export and keep the period metrics up to date.
+
+    Each poll() reads only the bytes appended since the previous call, parses
+    the complete lines, and collapses samples to strides: a stride is emitted
+    (its first sample, as in DataUtils.load_and_validate_file) once the next
+    Stride Number appears, or on finish(). Every emitted stride costs O(1):
+    it lands in the rolling window of its Constant at the minimum target size,
+    so snapshot() gives what MetricsCalculator would report for the strides
+    written so far.
+
+    Usage:
+        monitor = LiveTrialMonitor('muh_data/S01/trial0001.txt', trial_type='invis')
+        monitor.watch(callback=print)          # until the file stops growing
+    """
+
+    FIELDS = ['Stride Number', 'Success', 'Upper bound success', 'Lower bound success',
+              'Constant', 'Sum of gains and steps', 'Right step length', 'Left step length']
+    SOGS_SCALE = 1.5  # as MotorLearningDataManager._process_trial_data
+
+    def __init__(self, file_path: Optional[str] = None, trial_type: str = 'invis',
+                 length: int = 20, target_tolerance: float = 0.001, keep_strides: bool = True):
+        self.trial_type = trial_type
+        self.length = length
+        self.target_tolerance = target_tolerance
+        self.keep_strides = keep_strides
+
+        self.stride_rows: List[Dict[str, float]] = []
+        self.windows: Dict[float, RollingPeriodStats] = {}  # Constant -> window at min target
+        self.min_target = math.inf
+        self.n_strides = 0
+        self.n_lines = 0
+        self.last_stride = -math.inf
+        self.pending = None
+
+        self.file_path = None
+        if file_path is not None:
+            self.tail(file_path)
+
+    def tail(self, file_path: str):
+        """
+        Follow a (new) export file, e.g. the next fragment after a restart.
+        Stride state carries over; strides already seen are skipped.
+        """
+        self.file_path = Path(file_path)
+        self.offset = 0
+        self.buffer = b''
+        self.columns = None
+
+    def poll(self) -> int:
+        """Parse what was appended since the last poll; returns the number of new strides."""
+        try:
+            size = self.file_path.stat().st_size
+        except OSError:
+            return 0
+        if size < self.offset:  # truncated or replaced - start over on the new content
+            self.tail(self.file_path)
+        if size == self.offset:
+            return 0
+
+        with open(self.file_path, 'rb') as file:
+            file.seek(self.offset)
+            chunk = file.read(size - self.offset)
+        self.offset += len(chunk)
+
+        # Only complete lines; the remainder may still be being written
+        lines = (self.buffer + chunk).split(b'\n')
+        self.buffer = lines.pop()
+
+        before = self.n_strides
+        for line in lines:
+            self._parse_line(line.decode(errors='replace').rstrip('\r'))
+        return self.n_strides - before
+
+    def _parse_line(self, line: str):
+        if not line.strip():
+            return
+        fields = line.split('\t')
+        if self.columns is None:
+            header = {name: i for i, name in enumerate(fields)}
+            self.columns = {name: header.get(name) for name in self.FIELDS}
+            if self.columns['Stride Number'] is None:
+                raise ValueError(f"{self.file_path.name} has no 'Stride Number' column")
+            return
+
+        self.n_lines += 1
+        sample = {}
+        for name, position in self.columns.items():
+            try:
+                sample[name] = float(fields[position]) if position is not None else math.nan
+            except (IndexError, ValueError):
+                sample[name] = math.nan
+
+        stride_number = sample['Stride Number']
+        if math.isnan(stride_number) or stride_number <= self.last_stride:
+            return
+        if self.pending is not None and stride_number == self.pending['Stride Number']:
+            return
+
+        # A new stride number completes the pending stride
+        if self.pending is not None:
+            self._emit(self.pending)
+        self.pending = sample
+
+    def finish(self) -> Dict[str, float]:
+        """Flush the last stride (the export is complete) and return the final snapshot."""
+        self.poll()
+        if self.buffer.strip():
+            self._parse_line(self.buffer.decode(errors='replace').rstrip('\r'))
+            self.buffer = b''
+        if self.pending is not None:
+            self._emit(self.pending)
+            self.pending = None
+        return self.snapshot()
+
+    def _emit(self, stride: Dict[str, float]):
+        stride['Target size'] = stride['Upper bound success'] - stride['Lower bound success']
+        stride['Sum of gains and steps'] *= self.SOGS_SCALE
+        self.last_stride = stride['Stride Number']
+        self.n_strides += 1
+        if self.keep_strides:
+            self.stride_rows.append(stride)
+
+        target, constant = stride['Target size'], stride['Constant']
+        if math.isnan(target):
+            return
+        if target < self.min_target:
+            # A smaller target redefines the period; strides outside the new
+            # tolerance leave their (bounded) windows
+            self.min_target = target
+            limit = target + self.target_tolerance
+            for window in self.windows.values():
+                window.rebuild(lambda s: s['Target size'] <= limit)
+            self.windows = {c: w for c, w in self.windows.items() if w.strides}
+        if target <= self.min_target + self.target_tolerance and not math.isnan(constant):
+            self.windows.setdefault(constant, RollingPeriodStats(self.length)).add(stride)
+
+    def snapshot(self) -> Dict[str, float]:
+        """Current metrics for the 'max' and 'min' Constant periods at the minimum target."""
+        result = {
+            'trial_type': self.trial_type,
+            'n_strides': self.n_strides,
+            'last_stride': self.last_stride if self.n_strides else None,
+            f'{self.trial_type}_min_target_size': self.min_target if self.n_strides else None
+        }
+        if self.windows:
+            constants = sorted(self.windows)
+            for condition, constant in [('max', constants[-1]), ('min', constants[0])]:
+                result[f'{self.trial_type}_{condition}_constant'] = constant
+                result.update(self.windows[constant].metrics(self.trial_type, condition))
+        return result
+
+    def strides(self) -> pd.DataFrame:
+        """Strides emitted so far (requires keep_strides)."""
+        return pd.DataFrame(self.stride_rows, columns=self.FIELDS + ['Target size'])
+
+    def watch(self, interval: float = 1.0, idle_timeout: Optional[float] = 30.0,
+              callback: Optional[Callable[[Dict], None]] = None) -> Dict[str, float]:
+        """
+        Poll every `interval` seconds, calling `callback(snapshot)` whenever new
+        strides arrive. Stops (and flushes the last stride) once the file has not
+        grown for `idle_timeout` seconds, or on Ctrl-C.
+        """
+        last_change = time.monotonic()
+        try:
+            while True:
+                if self.poll():
+                    last_change = time.monotonic()
+                    if callback is not None:
+                        callback(self.snapshot())
+                elif idle_timeout is not None and time.monotonic() - last_change > idle_timeout:
+                    break
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
+        return self.finish()
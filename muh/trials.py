@@ -0,0 +1,197 @@
+"""Reading and segmenting individual D-Flow trial exports."""
+
+import os
+from pathlib import Path
+from typing import List, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .catalog import ExportCatalog
+from .utils import DataUtils, StrideCache
+
+
+# 3. TRIAL PROCESSING
+# ==============================================================================
+
+class TrialProcessor:
+    """Handles loading, combining, and processing of trial data."""
+    
+    def __init__(self, debug: bool = True, stride_cache: Optional[StrideCache] = None,
+                 catalog: Optional[ExportCatalog] = None):
+        self.debug = debug
+        self.stride_cache = stride_cache
+        self.catalog = catalog
+        
+        # Stride range of each probed fragment, keyed by path (validated by size/mtime)
+        self.stride_index = {}
+    
+    def _load_file(self, file_path: Path) -> Optional[pd.DataFrame]:
+        """Load one export, through the stride cache when one is configured."""
+        if self.stride_cache is not None:
+            return self.stride_cache.load_strides(file_path)
+        return DataUtils.load_and_validate_file(file_path)
+        
+    def find_trial_files(self, subject_dir: Path, trial_prefix: str) -> List[Path]:
+        """
+        List the raw export files for a given trial type.
+        
+        With an export catalog, each file is replaced by the canonical copy of
+        its recording (the most complete one, possibly under another data root)
+        and copies of the same recording are listed once.
+        """
+        files = sorted(subject_dir.glob(f"{trial_prefix}*.txt"))
+        return self.catalog.resolve_files(files) if self.catalog is not None else files
+
+    def find_and_combine_trial_files(self, subject_dir: Path, trial_prefix: str) -> Optional[pd.DataFrame]:
+        """Find and combine trial files for a given trial type."""
+        all_files = self.find_trial_files(subject_dir, trial_prefix)
+        
+        if not all_files:
+            if self.debug:
+                print(f"  ⚠️ No files found for {trial_prefix}")
+            return None
+        
+        # Special handling for preference trials
+        if trial_prefix == 'pref':
+            return self._handle_pref_trial(all_files)
+        
+        # Single file case
+        if len(all_files) == 1:
+            return self._load_file(all_files[0])
+        
+        # Multiple files - combine them
+        return self._combine_trial_fragments(all_files)
+    
+    def _handle_pref_trial(self, files: List[Path]) -> Optional[pd.DataFrame]:
+        """Handle preference trial - select largest file."""
+        largest_file = max(files, key=lambda f: f.stat().st_size)
+        if self.debug and len(files) > 1:
+            print(f"  ⚡ pref trial - selected largest of {len(files)} files")
+        return self._load_file(largest_file)
+    
+    def _combine_trial_fragments(self, files: List[Path]) -> Optional[pd.DataFrame]:
+        """Combine multiple trial fragments intelligently."""
+        file_info = [info for info in (self.probe_stride_range(f) for f in files) if info]
+        
+        if not file_info:
+            return self._load_file(max(files, key=lambda f: f.stat().st_size))
+        
+        # Find best continuous sequence
+        file_info.sort(key=lambda x: x['first'])
+        best_sequence = self._find_best_sequence(file_info)
+        
+        if len(best_sequence) >= 2:
+            return self._merge_files([f['path'] for f in best_sequence], stride_ranges=best_sequence)
+        
+        # Fallback to largest file
+        return self._load_file(max(file_info, key=lambda x: x['size'])['path'])
+    
+    def probe_stride_range(self, file_path: Path) -> Optional[Dict]:
+        """
+        First and last stride number of an export without reading the whole file.
+        
+        Only the header, the first data line and the last complete line (found by
+        seeking back from EOF) are read. Results are kept in ``stride_index`` and
+        reused until the file's size or mtime changes.
+        """
+        try:
+            stat = file_path.stat()
+            cached = self.stride_index.get(str(file_path))
+            if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+                return cached
+            
+            with open(file_path, 'rb') as file:
+                header = file.readline().decode().strip().split('\t')
+                stride_col = next((i for i, col in enumerate(header) 
+                                 if 'stride' in col.lower() and 
+                                 ('num' in col.lower() or 'no' in col.lower())), None)
+                
+                if stride_col is None:
+                    return None
+                
+                first_line = file.readline().decode()
+                last_line = self._read_last_line(file)
+                
+                info = {
+                    'path': file_path,
+                    'first': float(first_line.split('\t')[stride_col]),
+                    'last': float(last_line.split('\t')[stride_col]),
+                    'size': stat.st_size,
+                    'mtime_ns': stat.st_mtime_ns
+                }
+        except Exception:
+            return None
+        
+        self.stride_index[str(file_path)] = info
+        return info
+    
+    @staticmethod
+    def _read_last_line(file, block_size: int = 8192) -> str:
+        """Last complete, non-empty line of a binary file, read backwards from EOF."""
+        file.seek(0, os.SEEK_END)
+        position = file.tell()
+        buffer = b''
+        
+        while position > 0:
+            step = min(block_size, position)
+            position -= step
+            file.seek(position)
+            buffer = file.read(step) + buffer
+            
+            # The text after the final newline may still be being written; the
+            # first piece is only a whole line once we have reached the file start
+            lines = buffer.split(b'\n')
+            candidates = lines[:-1] if position == 0 else lines[1:-1]
+            complete = [line for line in candidates if line.strip()]
+            if complete:
+                return complete[-1].decode()
+        
+        raise ValueError("no complete line found")
+    
+    def _find_best_sequence(self, file_info: List[Dict]) -> List[Dict]:
+        """Find the best continuous sequence of files."""
+        best_sequence = []
+        current_sequence = [file_info[0]]
+        
+        for file_data in file_info[1:]:
+            if file_data['first'] == current_sequence[-1]['last'] + 1:
+                current_sequence.append(file_data)
+            else:
+                if len(current_sequence) > len(best_sequence):
+                    best_sequence = current_sequence
+                current_sequence = [file_data]
+        
+        return max([best_sequence, current_sequence], key=len)
+    
+    def _merge_files(self, file_paths: List[Path], stride_ranges: List[Dict] = None) -> Optional[pd.DataFrame]:
+        """
+        Merge multiple files into a single DataFrame.
+        
+        ``stride_ranges`` are the probed ranges of the files (in the same order);
+        when they show contiguous, ascending fragments the concatenation is already
+        in stride order and the sort is skipped.
+        """
+        dfs = []
+        for f in file_paths:
+            df = self._load_file(f)
+            if df is not None:
+                dfs.append(df)
+        
+        if not dfs:
+            return None
+        
+        combined = pd.concat(dfs, ignore_index=True)
+        
+        # Clean and sort
+        if 'Stride Number' in combined.columns:
+            ordered = (
+                stride_ranges is not None and len(dfs) == len(stride_ranges) and
+                all(nxt['first'] > prev['last'] for prev, nxt in zip(stride_ranges, stride_ranges[1:])) and
+                bool((np.diff(combined['Stride Number'].to_numpy()) > 0).all())
+            )
+            if not ordered:
+                combined = combined.sort_values('Stride Number')
+            combined = combined.drop_duplicates('Stride Number')
+        
+        return combined
@@ -0,0 +1,638 @@
+"""Stride-level helpers, anomaly flags and the columnar stride cache."""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+from collections.abc import Mapping
+from pathlib import Path
+from typing import List, Dict, Tuple, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+# 2. UTILITY FUNCTIONS
+# ==============================================================================
+
+class DataUtils:
+    """Utility functions for data processing."""
+    
+    @staticmethod
+    def copy_on_write_enabled() -> bool:
+        """
+        Whether pandas copies shared data before writing to it: always from
+        pandas 3.0, on 2.x only with ``pd.set_option('mode.copy_on_write', True)``.
+        Shallow copies are only isolated from their parent when this holds.
+        """
+        if int(pd.__version__.split('.')[0]) >= 3:
+            return True
+        return getattr(pd.options.mode, 'copy_on_write', False) is True
+    
+    @staticmethod
+    def load_and_validate_file(file_path: Path, required_cols: set = None) -> Optional[pd.DataFrame]:
+        """Load and validate a single data file."""
+        try:
+            df = pd.read_csv(file_path, sep='\t')
+            
+            if required_cols and not required_cols.issubset(df.columns):
+                return None
+                
+            # Basic cleaning
+            if 'Stride Number' in df.columns:
+                df['Stride Number'] = pd.to_numeric(df['Stride Number'], errors='coerce')
+                df = df.dropna(subset=['Stride Number'])
+                df = df.drop_duplicates(subset=['Stride Number'])
+            
+            return df if not df.empty else None
+            
+        except Exception as e:
+            print(f"❌ Error loading {file_path.name}: {str(e)}")
+            return None
+
+    # Anomaly bit flags stored in the 'Anomaly flags' column
+    ANOMALY_FLAG_COLUMN = 'Anomaly flags'
+    ANOMALY_TIME_JUMP = 1
+    ANOMALY_SUM_GAIN_STEP_HIGH = 2
+    ANOMALY_SUM_GAIN_STEP_ZERO = 4
+    ANOMALY_DUPLICATE_ROW = 8
+    ANOMALY_NAMES = {
+        ANOMALY_TIME_JUMP: 'time_jump',
+        ANOMALY_SUM_GAIN_STEP_HIGH: 'sum_gain_step_high',
+        ANOMALY_SUM_GAIN_STEP_ZERO: 'sum_gain_step_zero',
+        ANOMALY_DUPLICATE_ROW: 'duplicate_row'
+    }
+
+    @staticmethod
+    def detect_anomalies(df: pd.DataFrame) -> Tuple[pd.DataFrame, 'AnomalyLog']:
+        """
+        Detect and flag anomalies in stride data.
+        
+        Adds a uint8 'Anomaly flags' bitmask column to ``df`` in place (see the
+        ANOMALY_* constants) and returns it with an AnomalyLog, which only builds
+        the {row: [anomaly names]} dict when it is accessed.
+        """
+        if df is None or df.empty:
+            return df, AnomalyLog.empty()
+
+        flag_col = DataUtils.ANOMALY_FLAG_COLUMN
+        flags = np.zeros(len(df), dtype=np.uint8)
+
+        # Time-based anomalies
+        time_col = next((col for col in ['Time', 'Timestamp', 'Time (s)'] 
+                        if col in df.columns), None)
+        if time_col:
+            times = pd.to_numeric(df[time_col], errors='coerce').to_numpy(dtype=np.float64)
+            time_diff = np.diff(times, prepend=np.nan)
+            if np.isfinite(time_diff).any():
+                with np.errstate(invalid='ignore'):
+                    jump_mask = time_diff > np.nanquantile(time_diff, 0.99) * 5
+                flags[jump_mask] |= DataUtils.ANOMALY_TIME_JUMP
+
+        # Sum of gains and steps anomalies
+        if 'Sum of gains and steps' in df.columns:
+            sogs = df['Sum of gains and steps'].to_numpy(dtype=np.float64)
+            with np.errstate(invalid='ignore'):
+                flags[sogs > 4] |= DataUtils.ANOMALY_SUM_GAIN_STEP_HIGH
+                flags[sogs == 0] |= DataUtils.ANOMALY_SUM_GAIN_STEP_ZERO
+
+        # Duplicate rows (ignoring flags from an earlier pass)
+        data_cols = [col for col in df.columns if col != flag_col]
+        flags[df.duplicated(subset=data_cols).to_numpy()] |= DataUtils.ANOMALY_DUPLICATE_ROW
+
+        df[flag_col] = flags
+        return df, AnomalyLog(df.index, flags)
+
+    @staticmethod
+    def build_period_index(df: pd.DataFrame, target_tolerance: float = 0.001) -> Optional[Dict]:
+        """
+        Locate the condition periods of a trial once, by row position.
+        
+        The 'max'/'min' entries hold the positions of the strides at the minimum
+        target size whose Constant matches that condition; 'blocks' holds the
+        [start, end) runs of constant (Target size, Constant). Returns None when
+        the trial has no 'Target size'/'Constant' columns.
+        
+        Built at ingestion and stored as ``trial_dict['periods']``; rebuild it
+        after editing a trial's 'Target size' or 'Constant' values.
+        """
+        if df is None or df.empty or 'Target size' not in df.columns or 'Constant' not in df.columns:
+            return None
+
+        target = df['Target size'].to_numpy(dtype=np.float64)
+        const = df['Constant'].to_numpy(dtype=np.float64)
+
+        min_target = np.nanmin(target) if (~np.isnan(target)).any() else np.nan
+        with np.errstate(invalid='ignore'):
+            at_min = target <= min_target + target_tolerance
+        at_min_positions = np.flatnonzero(at_min).astype(np.int32)
+
+        change = np.flatnonzero((target[1:] != target[:-1]) | (const[1:] != const[:-1])) + 1
+        starts = np.concatenate([[0], change]).astype(np.int32)
+        ends = np.concatenate([change, [len(df)]]).astype(np.int32)
+
+        periods = {
+            'n_strides': len(df),
+            'min_target': float(min_target),
+            'min_target_positions': at_min_positions,
+            'blocks': {'start': starts, 'end': ends, 'target': target[starts], 'constant': const[starts]}
+        }
+        for condition, reduce in [('max', np.nanmax), ('min', np.nanmin)]:
+            at_min_const = const[at_min_positions]
+            const_value = reduce(at_min_const) if (~np.isnan(at_min_const)).any() else np.nan
+            matches = np.isclose(at_min_const, const_value, rtol=1e-5)
+            periods[condition] = {'constant': const_value, 'positions': at_min_positions[matches]}
+
+        return periods
+
+    @staticmethod
+    def get_period_data(df: pd.DataFrame, condition: str, length: Optional[int] = 20,
+                        periods: Optional[Dict] = None) -> Optional[pd.DataFrame]:
+        """
+        Last ``length`` strides of a condition period ('max' or 'min' Constant at
+        the minimum target size), sliced from a precomputed period index.
+        
+        The index is rebuilt if it is missing or does not match the frame.
+        Pass ``length=None`` for the whole period.
+        """
+        if df is None or df.empty:
+            return None
+        if periods is None or periods.get('n_strides') != len(df):
+            periods = DataUtils.build_period_index(df)
+        if periods is None or len(periods[condition]['positions']) == 0:
+            return None
+
+        positions = periods[condition]['positions']
+        return df.iloc[positions if length is None else positions[-length:]]
+
+
+class AnomalyLog(Mapping):
+    """
+    Read-only {row index: [anomaly names]} view over an anomaly bitmask.
+    
+    Only the flagged rows are stored; the per-row dict of lists is built on
+    first access and is not pickled, so cached trials stay compact.
+    """
+
+    def __init__(self, index: pd.Index, flags: np.ndarray):
+        flagged = np.flatnonzero(flags)
+        self.index = np.asarray(index)[flagged]
+        self.flags = np.asarray(flags)[flagged]
+        self._rows = None
+
+    @classmethod
+    def empty(cls) -> 'AnomalyLog':
+        """Log without flagged rows (trials that could not be processed)."""
+        return cls(pd.RangeIndex(0), np.zeros(0, dtype=np.uint8))
+
+    def _materialize(self) -> Dict:
+        if self._rows is None:
+            self._rows = {
+                idx: [name for bit, name in DataUtils.ANOMALY_NAMES.items() if flag & bit]
+                for idx, flag in zip(self.index.tolist(), self.flags.tolist())
+            }
+        return self._rows
+
+    def __getitem__(self, key):
+        return self._materialize()[key]
+
+    def __iter__(self):
+        return iter(self.index.tolist())
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getstate__(self):
+        return {'index': self.index, 'flags': self.flags, '_rows': None}
+
+    def __repr__(self):
+        return f"AnomalyLog({len(self)} flagged rows)"
+
+    def copy(self) -> 'AnomalyLog':
+        return self
+
+    def count(self, bit: int) -> int:
+        """Number of rows carrying a given ANOMALY_* flag."""
+        return int(np.count_nonzero(self.flags & bit))
+
+
+class CompactFrame:
+    """
+    Lossless compact storage for a stride table.
+
+    Each column gets the smallest encoding that reproduces it exactly:
+
+    - ``rle``: run values plus int32 run starts, for columns that change only
+      between segments (gains, preferred step lengths, Constant, bounds, flags)
+    - ``int``: bool / int8 / int16 / int32 for integer-valued columns
+      (Success, Feedback, Stride Number)
+    - ``float32``: continuous channels whose values survive float32, optionally
+      after rounding back to the export's ``decimals``
+    - ``raw``: everything else, unchanged
+
+    to_frame() restores the original column dtypes and index, so consumers
+    see exactly the DataFrame that was encoded.
+    """
+
+    MAX_RUN_FRACTION = 0.125  # RLE only if runs <= this fraction of rows
+    DECIMALS = 6              # D-Flow writes six decimals
+
+    def __init__(self, columns: List, encoded: List[Dict], index: Dict, n_rows: int):
+        self.columns = columns
+        self.encoded = encoded
+        self.index = index
+        self.n_rows = n_rows
+
+    def __len__(self):
+        return self.n_rows
+
+    def __repr__(self):
+        kinds = pd.Series([column['kind'] for column in self.encoded]).value_counts().to_dict()
+        return f"CompactFrame({self.n_rows} rows, {len(self.columns)} columns, {kinds}, {self.nbytes} bytes)"
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'CompactFrame':
+        encoded = [cls._encode_values(df[col]) for col in df.columns]
+        return cls(list(df.columns), encoded, cls._encode_index(df.index), len(df))
+
+    @classmethod
+    def _encode_values(cls, values: Union[pd.Series, pd.Index]) -> Dict:
+        # Extension arrays (strings, categoricals, nullable ints) are kept as they
+        # are; to_numpy() would turn them into object columns
+        if isinstance(values.dtype, np.dtype):
+            return cls._encode(values.to_numpy())
+        return {'kind': 'raw', 'values': values.array}
+
+    @classmethod
+    def _encode(cls, values: np.ndarray) -> Dict:
+        dtype = values.dtype
+        if dtype.kind not in 'biuf':
+            return {'kind': 'raw', 'values': values}
+
+        n = len(values)
+        if n > 1:
+            same = values[1:] == values[:-1]
+            if dtype.kind == 'f':
+                same |= np.isnan(values[1:]) & np.isnan(values[:-1])
+            starts = np.concatenate([[0], np.flatnonzero(~same) + 1]).astype(np.int32)
+            if len(starts) <= max(1, n * cls.MAX_RUN_FRACTION):
+                return {'kind': 'rle', 'dtype': dtype.str, 'starts': starts, 'values': values[starts]}
+
+        if dtype.kind == 'f':
+            finite = np.isfinite(values)
+            if finite.all() and n and np.array_equal(values, np.round(values)):
+                return cls._encode_int(values)
+            single = values.astype(np.float32)
+            if np.array_equal(single.astype(dtype), values, equal_nan=True):
+                return {'kind': 'float32', 'dtype': dtype.str, 'values': single, 'decimals': None}
+            if np.array_equal(np.round(single.astype(dtype), cls.DECIMALS), values, equal_nan=True):
+                return {'kind': 'float32', 'dtype': dtype.str, 'values': single, 'decimals': cls.DECIMALS}
+            return {'kind': 'raw', 'values': values}
+
+        return cls._encode_int(values) if n else {'kind': 'raw', 'values': values}
+
+    @staticmethod
+    def _encode_int(values: np.ndarray) -> Dict:
+        low, high = values.min(), values.max()
+        if low >= 0 and high <= 1:
+            small = values.astype(bool)
+        else:
+            small_dtype = next((t for t in (np.int8, np.int16, np.int32)
+                                if np.iinfo(t).min <= low and high <= np.iinfo(t).max), None)
+            if small_dtype is None:
+                return {'kind': 'raw', 'values': values}
+            small = values.astype(small_dtype)
+        if small.dtype.itemsize >= values.dtype.itemsize:
+            return {'kind': 'raw', 'values': values}
+        return {'kind': 'int', 'dtype': values.dtype.str, 'values': small}
+
+    @classmethod
+    def _encode_index(cls, index: pd.Index) -> Dict:
+        if isinstance(index, pd.RangeIndex):
+            return {'kind': 'range', 'start': index.start, 'stop': index.stop, 'step': index.step, 'name': index.name}
+        return {**cls._encode_values(index), 'name': index.name}
+
+    @staticmethod
+    def _decode(column: Dict, n_rows: int) -> np.ndarray:
+        kind = column['kind']
+        if kind == 'raw':
+            return column['values']
+        dtype = np.dtype(column['dtype'])
+        if kind == 'rle':
+            lengths = np.diff(np.append(column['starts'], n_rows))
+            return np.repeat(column['values'], lengths)
+        values = column['values'].astype(dtype)
+        if kind == 'float32' and column['decimals'] is not None:
+            values = np.round(values, column['decimals'])
+        return values
+
+    def to_frame(self, columns: List = None) -> pd.DataFrame:
+        """Rebuild the DataFrame (or only some of its columns)."""
+        if self.index['kind'] == 'range':
+            index = pd.RangeIndex(self.index['start'], self.index['stop'], self.index['step'], name=self.index['name'])
+        else:
+            index = pd.Index(self._decode(self.index, self.n_rows), name=self.index['name'])
+
+        positions = range(len(self.columns)) if columns is None else [self.columns.index(col) for col in columns]
+        data = {self.columns[i]: self._decode(self.encoded[i], self.n_rows) for i in positions}
+        return pd.DataFrame(data, index=index, columns=[self.columns[i] for i in positions])
+
+    @property
+    def nbytes(self) -> int:
+        total = 0
+        for column in self.encoded + [self.index]:
+            total += sum(value.nbytes for value in column.values() if isinstance(value, np.ndarray))
+        return total
+
+
+class TrialRecord(Mapping):
+    """
+    Processed trial: {'data', 'anomalies', 'periods'}.
+
+    The stride table is held as a CompactFrame and rebuilt on the first
+    ``['data']`` access. The rebuilt DataFrame is kept, so every lookup returns
+    the same frame and edits to it (``df['x'] = ...``) persist, as they did with
+    plain trial dicts. frame(columns) decodes only those columns without
+    building the whole frame. Pickles (processed_data.pkl, process-pool
+    results) carry only the compact form, re-encoded from the frame once it
+    has been built so that edits survive a save.
+    """
+
+    def __init__(self, data: Optional[pd.DataFrame] = None, **fields):
+        self.compact = CompactFrame.from_frame(data) if data is not None else None
+        self.fields = fields
+        self._frame = None
+
+    @classmethod
+    def from_dict(cls, trial_dict: Dict) -> 'TrialRecord':
+        fields = {key: value for key, value in trial_dict.items() if key != 'data'}
+        return cls(trial_dict.get('data'), **fields)
+
+    def frame(self, columns: List = None) -> Optional[pd.DataFrame]:
+        if self.compact is None:
+            return None
+        if self._frame is not None:
+            return self._frame if columns is None else self._frame[columns]
+        if columns is not None:
+            return self.compact.to_frame(columns)
+        self._frame = self.compact.to_frame()
+        return self._frame
+
+    def copy(self) -> 'TrialRecord':
+        """
+        Record sharing the compact data; edits to the copy stay local.
+
+        An unbuilt copy decodes its own frame on first access. A built frame is
+        copied shallowly under pandas Copy-on-Write and deeply otherwise.
+        """
+        record = TrialRecord.__new__(TrialRecord)
+        record.compact, record.fields = self.compact, dict(self.fields)
+        record._frame = (self._frame.copy(deep=not DataUtils.copy_on_write_enabled())
+                         if self._frame is not None else None)
+        return record
+
+    def __getitem__(self, key):
+        if key == 'data':
+            return self.frame()
+        return self.fields[key]
+
+    def __contains__(self, key):
+        return key == 'data' or key in self.fields
+
+    def __iter__(self):
+        yield 'data'
+        yield from self.fields
+
+    def __len__(self):
+        return len(self.fields) + 1
+
+    def __getstate__(self):
+        compact = CompactFrame.from_frame(self._frame) if self._frame is not None else self.compact
+        return {'compact': compact, 'fields': self.fields, '_frame': None}
+
+    def __repr__(self):
+        return f"TrialRecord({self.compact!r}, fields={list(self.fields)})"
+
+
+class StrideCache:
+    """
+    Stride-level columnar cache of raw D-Flow ``.txt`` exports.
+
+    Each export is parsed once and written as ``.npy`` arrays that are
+    memory-mapped on reload:
+
+    - ``<key>.strides.npy``: one row per stride (what ``load_and_validate_file`` returns)
+    - ``<key>.index.npy``: original sample row of each stride
+    - ``<key>.samples.npy``: full per-sample channels (only if ``keep_samples``)
+    - ``<key>.json``: column names/dtypes and the source size/mtime
+
+    The JSON sidecar is written last, so an entry only counts as fresh once
+    all of its arrays are on disk and the source file has not changed since.
+    """
+
+    VERSION = 1
+    KEEP_TABLES = 8  # derived tables kept per name (one per parameter set)
+
+    def __init__(self, cache_dir: Path, keep_samples: bool = False, debug: bool = False):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.keep_samples = keep_samples
+        self.debug = debug
+
+    def entry_stem(self, file_path: Path) -> Path:
+        """Cache path prefix for a source file (readable name + path hash)."""
+        file_path = Path(file_path)
+        digest = hashlib.sha1(str(file_path.resolve()).encode('utf-8')).hexdigest()[:12]
+        readable = re.sub(r'[^A-Za-z0-9_-]+', '_', f"{file_path.parent.name}_{file_path.stem}")
+        return self.cache_dir / f"{readable}_{digest}"
+
+    @staticmethod
+    def source_signature(file_path: Path) -> Dict:
+        """Size and modification time used to detect changed exports."""
+        stat = Path(file_path).stat()
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    def read_sidecar(self, file_path: Path) -> Optional[Dict]:
+        """Return the sidecar of a fresh cache entry, or None if missing/stale."""
+        sidecar_path = self.entry_stem(file_path).with_suffix('.json')
+        try:
+            with open(sidecar_path, 'r') as f:
+                sidecar = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if sidecar.get('version') != self.VERSION:
+            return None
+        if sidecar.get('source') != self.source_signature(file_path):
+            return None
+        if self.keep_samples and not sidecar.get('has_samples'):
+            return None
+        return sidecar
+
+    def convert(self, file_path: Path) -> Optional[Dict]:
+        """Parse a raw export once and write its cache entry."""
+        file_path = Path(file_path)
+        try:
+            signature = self.source_signature(file_path)
+            samples = pd.read_csv(file_path, sep='\t')
+        except Exception as e:
+            print(f"❌ Error loading {file_path.name}: {str(e)}")
+            return None
+
+        # Same cleaning as DataUtils.load_and_validate_file
+        strides = samples
+        if 'Stride Number' in strides.columns:
+            strides = strides.copy()
+            strides['Stride Number'] = pd.to_numeric(strides['Stride Number'], errors='coerce')
+            strides = strides.dropna(subset=['Stride Number'])
+            strides = strides.drop_duplicates(subset=['Stride Number'])
+
+        # Only all-numeric exports fit in a single float array
+        if not all(pd.api.types.is_numeric_dtype(dtype) for dtype in strides.dtypes):
+            if self.debug:
+                print(f"  ⚠️ {file_path.name} has non-numeric columns - not cached")
+            return None
+
+        stem = self.entry_stem(file_path)
+        np.save(stem.with_suffix('.strides.npy'), strides.to_numpy(dtype=np.float64))
+        np.save(stem.with_suffix('.index.npy'), strides.index.to_numpy(dtype=np.int64))
+
+        has_samples = False
+        if self.keep_samples and all(pd.api.types.is_numeric_dtype(dtype) for dtype in samples.dtypes):
+            np.save(stem.with_suffix('.samples.npy'), samples.to_numpy(dtype=np.float64))
+            has_samples = True
+
+        sidecar = {
+            'version': self.VERSION,
+            'source_path': str(file_path),
+            'source': signature,
+            'columns': list(strides.columns),
+            'dtypes': [str(dtype) for dtype in strides.dtypes],
+            'sample_columns': list(samples.columns) if has_samples else [],
+            'sample_dtypes': [str(dtype) for dtype in samples.dtypes] if has_samples else [],
+            'n_samples': len(samples),
+            'n_strides': len(strides),
+            'has_samples': has_samples
+        }
+        with open(stem.with_suffix('.json'), 'w') as f:
+            json.dump(sidecar, f, indent=1)
+
+        return sidecar
+
+    def warm(self, root_dir: Path, pattern: str = '**/*.txt') -> int:
+        """Convert every stale export below root_dir; returns the number converted."""
+        converted = 0
+        for file_path in sorted(Path(root_dir).glob(pattern)):
+            if self.read_sidecar(file_path) is None and self.convert(file_path) is not None:
+                converted += 1
+        if self.debug:
+            print(f"💾 Stride cache: converted {converted} exports under {root_dir}")
+        return converted
+
+    def _frame(self, stem: Path, suffix: str, columns: List[str], dtypes: List[str],
+               index: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """Memory-map a cached array back into a DataFrame."""
+        values = np.asarray(np.load(stem.with_suffix(suffix), mmap_mode='c'))
+        df = pd.DataFrame(values, columns=columns, index=index, copy=False)
+
+        # Restore non-float columns (e.g. integer-only exports)
+        restore = {col: dtype for col, dtype in zip(columns, dtypes) if dtype != 'float64'}
+        return df.astype(restore) if restore else df
+
+    def load_strides(self, file_path: Path, required_cols: set = None) -> Optional[pd.DataFrame]:
+        """Cached equivalent of DataUtils.load_and_validate_file."""
+        sidecar = self.read_sidecar(file_path) or self.convert(file_path)
+        if sidecar is None:
+            return DataUtils.load_and_validate_file(Path(file_path), required_cols)
+
+        if required_cols and not required_cols.issubset(sidecar['columns']):
+            return None
+        if sidecar['n_strides'] == 0:
+            return None
+
+        stem = self.entry_stem(file_path)
+        index = np.load(stem.with_suffix('.index.npy'))
+        return self._frame(stem, '.strides.npy', sidecar['columns'], sidecar['dtypes'], index)
+
+    def table_dir(self, name: str, key: str) -> Path:
+        """Directory of a derived table computed from the inputs identified by ``key``."""
+        return self.cache_dir / f"{name}.{key[:16]}"
+
+    def save_table(self, name: str, table: pd.DataFrame, key: str) -> None:
+        """
+        Store a table derived from the exports (e.g. the cohort stride changes)
+        as one ``<i>.npy`` array per column, categoricals as integer codes;
+        ``key`` identifies the inputs it was computed from.
+
+        Each key gets its own ``<name>.<key>`` directory, so tables computed
+        with other parameters are kept side by side (the oldest beyond
+        KEEP_TABLES are pruned). The directory is written under a temporary
+        name and renamed into place, so a reader never sees a half-written
+        table or columns from two writers.
+        """
+        entry_dir = self.table_dir(name, key)
+        tmp_dir = Path(tempfile.mkdtemp(prefix=f".{entry_dir.name}.", dir=self.cache_dir))
+        try:
+            columns = []
+            for i, col in enumerate(table.columns):
+                values = table[col]
+                if isinstance(values.dtype, pd.CategoricalDtype):
+                    columns.append({'name': col, 'dtype': 'category',
+                                    'categories': values.cat.categories.tolist()})
+                    array = values.cat.codes.to_numpy()
+                else:
+                    columns.append({'name': col, 'dtype': str(values.dtype)})
+                    array = values.to_numpy()
+                np.save(tmp_dir / f'{i}.npy', array)
+
+            sidecar = {'version': self.VERSION, 'key': key, 'n_rows': len(table), 'columns': columns}
+            with open(tmp_dir / 'table.json', 'w') as f:
+                json.dump(sidecar, f, indent=1, default=str)
+
+            try:
+                os.replace(tmp_dir, entry_dir)
+            except OSError:
+                # Another writer stored the same key first; its table is identical
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        except Exception as e:
+            print(f"⚠️ {name} not cached ({type(e).__name__}: {e})")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return
+
+        entries = sorted((path for path in self.cache_dir.glob(f'{name}.*') if path.is_dir()),
+                         key=lambda path: path.stat().st_mtime, reverse=True)
+        for old_entry in entries[self.KEEP_TABLES:]:
+            shutil.rmtree(old_entry, ignore_errors=True)
+
+    def load_table(self, name: str, key: str) -> Optional[pd.DataFrame]:
+        """Memory-map a table stored by save_table, or None if missing or computed from other inputs."""
+        entry_dir = self.table_dir(name, key)
+        try:
+            with open(entry_dir / 'table.json', 'r') as f:
+                sidecar = json.load(f)
+            if sidecar.get('version') != self.VERSION or sidecar.get('key') != key:
+                return None
+
+            data = {}
+            for i, column in enumerate(sidecar['columns']):
+                array = np.load(entry_dir / f'{i}.npy', mmap_mode='c', allow_pickle=False)
+                if column['dtype'] == 'category':
+                    data[column['name']] = pd.Categorical.from_codes(np.asarray(array), column['categories'])
+                else:
+                    data[column['name']] = pd.Series(array, dtype=column['dtype'])
+        except (OSError, ValueError, KeyError):
+            return None
+        return pd.DataFrame(data)
+
+    def load_samples(self, file_path: Path) -> Optional[pd.DataFrame]:
+        """Per-sample channels of an export, or None if they were not kept."""
+        sidecar = self.read_sidecar(file_path)
+        if sidecar is None and self.keep_samples:
+            sidecar = self.convert(file_path)
+        if not sidecar or not sidecar.get('has_samples'):
+            return None
+
+        stem = self.entry_stem(file_path)
+        return self._frame(stem, '.samples.npy', sidecar['sample_columns'], sidecar['sample_dtypes'])
@@ -0,0 +1,2392 @@
+"""Population, statistical and individual stride-change figures."""
+
+import contextlib
+import hashlib
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Tuple, Optional
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+import seaborn as sns
+from scipy.stats import pearsonr
+from tqdm import tqdm
+
+from .config import Config
+from .data import MotorLearningDataManager
+from .density import DensityEstimator
+from .metrics import MetricsCalculator
+from .resampling import ResamplingEngine
+from .utils import DataUtils
+
+
+# ENHANCED STANDALONE VISUALIZER WITH CONSOLIDATED PLOTTING METHODS
+# ==============================================================================
+# This consolidates all plotting methods from StreamlinedMotorLearningPipeline
+# into the StandaloneEnhancedVisualizer class for better organization
+
+class StandaloneEnhancedVisualizer:
+    """
+    Enhanced visualizer that consolidates ALL plotting functionality.
+    
+    Key improvements:
+    - All plotting methods moved from StreamlinedMotorLearningPipeline
+    - Enhanced population statistics with motor noise coloring
+    - Age vs success rates by trial/condition
+    - Age vs stride variability by trial/condition  
+    - Mean stride length vs success rate by trial/condition
+    - Motor noise vs success rates analysis
+    - Age vs mean stride length and error analysis
+    - Statistical analysis plots
+    - Summary dashboard generation
+    """
+    
+    def __init__(self, analysis_instance, config: 'Config' = None):
+        """
+        Initialize with your existing analysis instance.
+        
+        Parameters:
+        -----------
+        analysis_instance : Your existing MotorLearningAnalysis object
+            Should have .data_manager, .metrics_df attributes
+        config : Config object
+            Configuration settings
+        """
+        self.analysis = analysis_instance
+        self.metrics_df = analysis_instance.metrics_df
+        self.data_manager = analysis_instance.data_manager
+        
+        # Use provided config or get from data_manager or create default
+        if config:
+            self.config = config
+        elif hasattr(self.data_manager, 'config'):
+            self.config = self.data_manager.config
+        else:
+            # Create minimal config if none available
+            self.config = self._create_minimal_config()
+        
+        # Set up directory attributes properly
+        self.individual_plots_dir = self.config.INDIVIDUAL_PLOTS_DIR
+        self.population_plots_dir = self.config.POPULATION_PLOTS_DIR
+        self.statistical_plots_dir = self.config.STATISTICAL_PLOTS_DIR
+        for dir_path in [self.individual_plots_dir, self.population_plots_dir, self.statistical_plots_dir]:
+            dir_path.mkdir(parents=True, exist_ok=True)
+        
+        # Apply motor noise filter
+        self.filtered_df = self.filter_cohort()
+        
+        # Set colors
+        self.colors = {
+            'primary': '#667eea',
+            'secondary': '#764ba2',
+            'success': '#28a745',
+            'warning': '#ffc107',
+            'danger': '#dc3545',
+            'vis1': '#1f77b4',
+            'invis': '#ff7f0e', 
+            'vis2': '#2ca02c'
+        }
+        
+        print(f"✓ Enhanced visualizer initialized with consolidated plotting methods")
+        print(f"📁 Individual plots: {self.individual_plots_dir}")
+        print(f"📁 Population plots: {self.population_plots_dir}")
+        print(f"📁 Statistical plots: {self.statistical_plots_dir}")
+
+    def filter_cohort(self, metrics_df: pd.DataFrame = None) -> pd.DataFrame:
+        """Subjects with motor noise ≤ Config.MOTOR_NOISE_THRESHOLD (all of them without motor noise data)."""
+        metrics_df = self.metrics_df if metrics_df is None else metrics_df
+        if 'mot_noise' in metrics_df.columns:
+            motor_noise_threshold = getattr(self.config, 'MOTOR_NOISE_THRESHOLD', 0.3)
+            filtered_df = metrics_df[metrics_df['mot_noise'] <= motor_noise_threshold]
+            print(f"📊 Using {len(filtered_df)}/{len(metrics_df)} subjects (motor noise ≤ {motor_noise_threshold})")
+        else:
+            filtered_df = metrics_df
+            print(f"📊 Using all {len(filtered_df)} subjects")
+        return filtered_df
+
+    def _create_minimal_config(self):
+        """Create minimal config if none provided."""
+        class MinimalConfig:
+            def __init__(self):
+                base_dir = Path('motor_learning_output')
+                base_dir.mkdir(exist_ok=True)
+                
+                self.BASE_OUTPUT_DIR = base_dir
+                self.INDIVIDUAL_PLOTS_DIR = base_dir / 'figures' / 'individual_plots'
+                self.POPULATION_PLOTS_DIR = base_dir / 'figures' / 'population_plots'
+                self.STATISTICAL_PLOTS_DIR = base_dir / 'figures' / 'statistical_plots'
+                
+                for dir_path in [self.INDIVIDUAL_PLOTS_DIR, self.POPULATION_PLOTS_DIR, self.STATISTICAL_PLOTS_DIR]:
+                    dir_path.mkdir(parents=True, exist_ok=True)
+                
+                self.MOTOR_NOISE_THRESHOLD = 0.3
+                self.SUCCESS_RATE_THRESHOLD = 0.68
+                self.FIGURE_DPI = 300
+        
+        return MinimalConfig()
+
+    # ==========================================================================
+    # COMPREHENSIVE PLOTTING METHODS
+    # ==========================================================================
+
+    def generate_all_enhanced_plots(self, include_individual_plots: bool = False, 
+                                  max_individual_subjects: int = None) -> Dict:
+        """
+        Generate ALL enhanced visualizations in one call.
+        
+        Parameters:
+        -----------
+        include_individual_plots : bool, default False
+            Whether to generate individual participant plots (time-consuming)
+        max_individual_subjects : int, optional
+            Maximum number of subjects for individual plots (useful for testing)
+            
+        Returns:
+        --------
+        Dict : Summary of generated plots
+        """
+        
+        print(f"🚀 Starting comprehensive enhanced plotting analysis...")
+        print(f"⏰ Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"🎯 Individual plots: {'Enabled' if include_individual_plots else 'Disabled'}")
+        print("=" * 80)
+        
+        results = {
+            'timestamp': datetime.now().strftime("%Y%m%d_%H%M%S"),
+            'individual_plots': 0,
+            'population_plots': 0,
+            'statistical_plots': 0,
+            'generated_files': []
+        }
+        
+        try:
+            # 1. Individual stride change plots (OPTIONAL)
+            if include_individual_plots:
+                print("\n🎯 INDIVIDUAL STRIDE CHANGE PLOTS")
+                print("-" * 50)
+                individual_result = self.plot_all_individual_stride_changes(
+                    trial_types=['vis1', 'invis', 'vis2'],
+                    subject_ids=None,
+                    save_summary=True,
+                    max_subjects=max_individual_subjects
+                )
+                results['individual_plots'] = len(individual_result) if individual_result else 0
+            else:
+                print("\n⏭️ Skipping individual plots (set include_individual_plots=True to enable)")
+            
+            # 2. Enhanced population-level plots
+            print("\n👥 ENHANCED POPULATION-LEVEL ANALYSIS PLOTS")
+            print("-" * 50)
+            population_result = self.generate_enhanced_population_plots()
+            results['population_plots'] = population_result.get('n_plots', 0)
+            results['generated_files'].extend(population_result.get('files', []))
+            
+            # 3. Statistical analysis plots
+            print("\n📊 STATISTICAL ANALYSIS PLOTS")
+            print("-" * 50)
+            statistical_result = self.generate_statistical_plots()
+            results['statistical_plots'] = statistical_result.get('n_plots', 0)
+            results['generated_files'].extend(statistical_result.get('files', []))
+            
+            # 4. Summary dashboard
+            print("\n📋 SUMMARY DASHBOARD")
+            print("-" * 50)
+            dashboard_result = self.generate_summary_dashboard()
+            if dashboard_result.get('success'):
+                results['generated_files'].append(dashboard_result['file'])
+            
+            # Final summary
+            total_plots = results['individual_plots'] + results['population_plots'] + results['statistical_plots']
+            print("\n" + "=" * 80)
+            print("🎉 ENHANCED PLOTTING COMPLETED SUCCESSFULLY!")
+            print("=" * 80)
+            print(f"⏰ Completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+            print(f"📊 Total plots generated: {total_plots}")
+            print(f"   • Individual plots: {results['individual_plots']}")
+            print(f"   • Population plots: {results['population_plots']}")
+            print(f"   • Statistical plots: {results['statistical_plots']}")
+            print(f"📁 Files saved to: {self.config.BASE_OUTPUT_DIR}")
+            
+            if not include_individual_plots:
+                print("💡 To generate individual plots, use: generate_all_enhanced_plots(include_individual_plots=True)")
+            
+            return results
+            
+        except Exception as e:
+            print(f"\n❌ Enhanced plotting failed: {e}")
+            results['error'] = str(e)
+            raise
+
+    # Population and statistical figures as independent units (one pipeline stage
+    # each, see StreamlinedMotorLearningPipeline): (figure, drawing method, plot
+    # directory, data needed besides the filtered cohort - 'strides' for the
+    # per-stride trial data, 'analyzer' for the fitted models - and the Config
+    # parameters read besides FIGURE_DPI)
+    FIGURES = [
+        ('age_vs_success_rates_enhanced', '_plot_age_vs_success_rates_enhanced', 'population', None, ()),
+        ('age_vs_stride_variability_enhanced', '_plot_age_vs_stride_variability_enhanced', 'population', None, ()),
+        ('mean_stride_length_vs_success_rate', '_plot_msl_vs_sr_enhanced', 'population', None, ()),
+        ('age_vs_mean_stride_length_enhanced', '_plot_age_vs_mean_stride_length_enhanced', 'population', None, ()),
+        ('age_vs_mean_error_enhanced', '_plot_age_vs_mean_error_enhanced', 'population', None, ()),
+        ('mean_error_vs_success_rate_enhanced', '_plot_mean_error_vs_success_rate_enhanced', 'population', None, ()),
+        ('motor_noise_vs_success_rates_enhanced', '_plot_motor_noise_vs_success_rates_enhanced', 'population', None,
+         ('MOTOR_NOISE_THRESHOLD', 'SUCCESS_RATE_THRESHOLD')),
+        ('age_vs_motor_noise', '_plot_age_vs_motor_noise', 'population', None, ('MOTOR_NOISE_THRESHOLD',)),
+        ('correlation_matrix', '_plot_correlation_matrix', 'population', None, ()),
+        ('learning_curves_by_age', '_plot_learning_curves_by_age', 'population', 'strides', ()),
+        ('learner_clustering', '_plot_learner_clustering', 'population', None, ()),
+        ('motor_control_efficiency', '_plot_motor_control_efficiency', 'population', 'strides', ()),
+        ('asymmetry_analysis', '_plot_asymmetry_analysis', 'population', None, ()),
+        ('stride_change_density_by_age', '_plot_stride_change_density_by_age', 'population', 'strides',
+         ('AGE_BINS', 'AGE_LABELS', 'DENSITY_GRID_POINTS')),
+        ('success_rate_overview', '_plot_success_rate_overview', 'population', None, ()),
+        ('feature_importance_analysis', '_plot_feature_importance_analysis', 'statistical', 'analyzer', ()),
+        ('age_effects_summary', '_plot_age_effects_summary', 'statistical', None, ('RESAMPLES', 'ALPHA_LEVEL')),
+        ('trial_comparisons', '_plot_trial_comparisons', 'statistical', None, ()),
+        ('analysis_dashboard', 'generate_summary_dashboard', 'statistical', None, ('MOTOR_NOISE_THRESHOLD',))
+    ]
+
+    def draw_figure(self, name: str, df: pd.DataFrame = None) -> List[str]:
+        """
+        Draw one FIGURES entry from `df` (default: the filtered cohort).
+        Returns the files written, empty when the data does not allow the figure.
+        """
+        _, method_name, directory, _, _ = next(entry for entry in self.FIGURES if entry[0] == name)
+        method = getattr(self, method_name)
+        df = self.filtered_df if df is None else df
+        
+        if name == 'analysis_dashboard':
+            result = method(df)
+            return [result['file']] if result.get('success') else []
+        
+        figure_file = (self.population_plots_dir if directory == 'population'
+                       else self.statistical_plots_dir) / f'{name}.png'
+        signature = lambda path: (path.stat().st_size, path.stat().st_mtime_ns) if path.exists() else None
+        before = signature(figure_file)
+        
+        if name == 'success_rate_overview':
+            sr_cols = [col for col in df.columns if '_sr_' in col and '_const' in col]
+            if not sr_cols:
+                return []
+            method(df, sr_cols)
+        elif name == 'feature_importance_analysis':
+            method()
+        else:
+            method(df)
+        
+        written = signature(figure_file) not in (None, before)
+        return [str(figure_file)] if written else []
+
+    def generate_enhanced_population_plots(self) -> Dict:
+        """Generate ALL enhanced population-level analysis plots."""
+        
+        plot_count = 0
+        generated_files = []
+        df = self.filtered_df
+        
+        try:
+            print("📊 Generating enhanced population-level analysis plots...")
+            
+            # 1. ENHANCED: Age vs Success Rates by trial/condition with motor noise coloring
+            print("   🎯 Age vs Success Rates (Enhanced by trial/condition)...")
+            self._plot_age_vs_success_rates_enhanced(df)
+            plot_count += 1
+            generated_files.append('age_vs_success_rates_enhanced.png')
+            
+            # 2. ENHANCED: Age vs Stride Variability by trial/condition with motor noise coloring
+            print("   📏 Age vs Stride Variability (Enhanced by trial/condition)...")
+            self._plot_age_vs_stride_variability_enhanced(df)
+            plot_count += 1
+            generated_files.append('age_vs_stride_variability_enhanced.png')
+            
+            # 3. Mean Stride Length vs Success Rate by trial/condition with motor noise coloring
+            print("   📊 Mean Stride Length vs Success Rate (by trial/condition)...")
+            self._plot_msl_vs_sr_enhanced(df)
+            plot_count += 1
+            generated_files.append('mean_stride_length_vs_success_rate.png')
+            
+            # 4. Age vs Mean Stride Length by trial/condition with motor noise coloring
+            print("   📏 Age vs Mean Stride Length (Enhanced by trial/condition)...")
+            self._plot_age_vs_mean_stride_length_enhanced(df)
+            plot_count += 1
+            generated_files.append('age_vs_mean_stride_length_enhanced.png')
+            
+            # 5. Age vs Mean Error by trial/condition with motor noise coloring
+            print("   🎯 Age vs Mean Error (Enhanced by trial/condition)...")
+            self._plot_age_vs_mean_error_enhanced(df)
+            plot_count += 1
+            generated_files.append('age_vs_mean_error_enhanced.png')
+            
+            # 6. NEW: Mean Error vs Success Rate by trial/condition with motor noise coloring
+            print("   📊 Mean Error vs Success Rate (Enhanced by trial/condition)...")
+            self._plot_mean_error_vs_success_rate_enhanced(df)
+            plot_count += 1
+            generated_files.append('mean_error_vs_success_rate_enhanced.png')
+            
+            # 7. Motor Noise vs Success Rate by trial/condition with age coloring
+            print("   🧠 Motor Noise vs Success Rate (by trial/condition)...")
+            self._plot_motor_noise_vs_success_rates_enhanced(df)
+            plot_count += 1
+            generated_files.append('motor_noise_vs_success_rates_enhanced.png')
+            
+            # 8. Age vs Motor Noise
+            if 'age' in df.columns and 'mot_noise' in df.columns:
+                print("   👥 Age vs Motor Noise...")
+                self._plot_age_vs_motor_noise(df)
+                plot_count += 1
+                generated_files.append('age_vs_motor_noise.png')
+            
+            # 9. Correlation Matrix
+            print("   🔗 Correlation Matrix...")
+            self._plot_correlation_matrix(df)
+            plot_count += 1
+            generated_files.append('correlation_matrix.png')
+
+            print("   🎯 Learning curves by age...")
+            self._plot_learning_curves_by_age(df)
+            plot_count += 1
+            generated_files.append('learning_curves_by_age.png')
+            
+            print("   🎛️ Learner clustering...")
+            cluster_data = self._plot_learner_clustering(df)
+            plot_count += 1
+            generated_files.append('learner_clustering.png')
+            
+            print("   ⚖️ Motor control efficiency...")
+            self._plot_motor_control_efficiency(df)
+            plot_count += 1
+            generated_files.append('motor_control_efficiency.png')
+            
+            print("   🔄 Asymmetry analysis...")
+            self._plot_asymmetry_analysis(df)
+            plot_count += 1
+            generated_files.append('asymmetry_analysis.png')
+            
+            print("   📈 Stride change densities by age...")
+            self._plot_stride_change_density_by_age(df)
+            plot_count += 1
+            generated_files.append('stride_change_density_by_age.png')
+            
+            # 10. Success Rate Overview
+            sr_cols = [col for col in df.columns if '_sr_' in col and '_const' in col]
+            if sr_cols:
+                print("   📊 Success Rate Overview...")
+                self._plot_success_rate_overview(df, sr_cols)
+                plot_count += 1
+                generated_files.append('success_rate_overview.png')
+            
+            print(f"   ✓ Generated {plot_count} enhanced population-level plots")
+            
+            return {
+                'n_plots': plot_count,
+                'files': generated_files,
+                'output_dir': str(self.population_plots_dir),
+                'enhanced': True
+            }
+            
+        except Exception as e:
+            print(f"   ⚠️ Enhanced population plots failed: {e}")
+            return {'n_plots': 0, 'error': str(e), 'enhanced': False}
+
+    def generate_statistical_plots(self) -> Dict:
+        """Generate statistical analysis visualization plots."""
+        
+        plot_count = 0
+        generated_files = []
+        
+        try:
+            print("📊 Generating statistical analysis plots...")
+            
+            # 1. Feature importance analysis (if available)
+            if hasattr(self.analysis, 'analyzer'):
+                print("   📈 Feature Importance Analysis...")
+                self._plot_feature_importance_analysis()
+                plot_count += 1
+                generated_files.append('feature_importance_analysis.png')
+            
+            # 2. Age effects summary
+            print("   👥 Age Effects Summary...")
+            self._plot_age_effects_summary()
+            plot_count += 1
+            generated_files.append('age_effects_summary.png')
+            
+            # 3. Trial comparisons
+            print("   🎮 Trial Type Comparisons...")
+            self._plot_trial_comparisons()
+            plot_count += 1
+            generated_files.append('trial_comparisons.png')
+            
+            print(f"   ✓ Generated {plot_count} statistical analysis plots")
+            
+            return {
+                'n_plots': plot_count,
+                'files': generated_files,
+                'output_dir': str(self.statistical_plots_dir)
+            }
+            
+        except Exception as e:
+            print(f"   ⚠️ Statistical plots failed: {e}")
+            return {'n_plots': 0, 'error': str(e)}
+
+    # ==========================================================================
+    # ENHANCED POPULATION PLOTTING METHODS
+    # ==========================================================================
+
+    def _plot_age_vs_success_rates_enhanced(self, df: pd.DataFrame):
+        """Enhanced age vs success rates by trial/condition with motor noise coloring."""
+        
+        sr_columns = [col for col in df.columns if '_sr_' in col and '_const' in col]
+        if not sr_columns:
+            print("   ⚠️ No success rate columns found")
+            return
+        
+        trials = ['vis1', 'invis', 'vis2']
+        conditions = ['max', 'min']
+        has_motor_noise = 'mot_noise' in df.columns
+        
+        fig, axes = plt.subplots(len(trials), len(conditions), figsize=(12, 4*len(trials)))
+        if len(trials) == 1:
+            axes = axes.reshape(1, -1)
+        
+        for i, trial in enumerate(trials):
+            for j, condition in enumerate(conditions):
+                ax = axes[i, j]
+                col = f'{trial}_sr_{condition}_const'
+                
+                if col in df.columns:
+                    cols_to_use = ['age', col] + (['mot_noise'] if has_motor_noise else [])
+                    valid_data = df[cols_to_use].dropna()
+                    
+                    if not valid_data.empty:
+                        if has_motor_noise:
+                            scatter = ax.scatter(valid_data['age'], valid_data[col], 
+                                               c=valid_data['mot_noise'], cmap='plasma', 
+                                               alpha=0.7, s=60, edgecolors='white', linewidths=0.5)
+                            if i == 0 and j == len(conditions) - 1:
+                                cbar = plt.colorbar(scatter, ax=ax)
+                                cbar.set_label('Motor Noise', rotation=270, labelpad=15)
+                        else:
+                            ax.scatter(valid_data['age'], valid_data[col], alpha=0.7, s=60)
+                        
+                        # Add trend line and correlation
+                        self._add_trendline(ax, valid_data['age'], valid_data[col])
+                        
+                        ax.set_xlabel('Age (years)')
+                        ax.set_ylabel('Success Rate')
+                        ax.set_title(f'{trial.upper()}: {condition.capitalize()} Target')
+                        ax.set_ylim(-0.05, 1.05)
+                        ax.grid(True, alpha=0.3)
+                    else:
+                        ax.text(0.5, 0.5, 'No Data', ha='center', va='center',
+                               transform=ax.transAxes, fontsize=12)
+                        ax.set_title(f'{trial.upper()}: {condition.capitalize()} Target')
+                else:
+                    ax.text(0.5, 0.5, 'Column Not Found', ha='center', va='center',
+                           transform=ax.transAxes, fontsize=12)
+                    ax.set_title(f'{trial.upper()}: {condition.capitalize()} Target')
+        
+        plt.suptitle('Age vs Success Rates by Trial/Condition (Colored by Motor Noise)' if has_motor_noise 
+                     else 'Age vs Success Rates by Trial/Condition', fontsize=16, fontweight='bold')
+        plt.tight_layout()
+        plt.savefig(self.population_plots_dir / 'age_vs_success_rates_enhanced.png', 
+                   dpi=getattr(self.config, 'FIGURE_DPI', 300), bbox_inches='tight')
+        plt.close()
+
+    def _plot_age_vs_stride_variability_enhanced(self, df: pd.DataFrame):
+        """Enhanced age vs stride variability by trial/condition with motor noise coloring."""
+        
+        sd_columns = [col for col in df.columns if '_sd_' in col and '_const' in col]
+        if not sd_columns:
+            print("   ⚠️ No stride variability columns found")
+            return
+        
+        trials = ['vis1', 'invis', 'vis2']
+        conditions = ['max', 'min']
+        has_motor_noise = 'mot_noise' in df.columns
+        
+        fig, axes = plt.subplots(len(trials), len(conditions), figsize=(12, 4*len(trials)))
+        if len(trials) == 1:
+            axes = axes.reshape(1, -1)
+        
+        for i, trial in enumerate(trials):
+            for j, condition in enumerate(conditions):
+                ax = axes[i, j]
+                col = f'{trial}_sd_{condition}_const'
+                
+                if col in df.columns:
+                    cols_to_use = ['age', col] + (['mot_noise'] if has_motor_noise else [])
+                    valid_data = df[cols_to_use].dropna()
+                    
+                    if not valid_data.empty:
+                        if has_motor_noise:
+                            scatter = ax.scatter(valid_data['age'], valid_data[col], 
+                                               c=valid_data['mot_noise'], cmap='viridis', 
+                                               alpha=0.7, s=60, edgecolors='white', linewidths=0.5)
+                            if i == 0 and j == len(conditions) - 1:
+                                cbar = plt.colorbar(scatter, ax=ax)
+                                cbar.set_label('Motor Noise', rotation=270, labelpad=15)
+                        else:
+                            ax.scatter(valid_data['age'], valid_data[col], alpha=0.7, s=60)
+                        
+                        # Add trend line and correlation
+                        self._add_trendline(ax, valid_data['age'], valid_data[col])
+                        
+                        ax.set_xlabel('Age (years)')
+                        ax.set_ylabel('Stride Length SD')
+                        ax.set_title(f'{trial.upper()}: {condition.capitalize()} Target')
+                        ax.grid(True, alpha=0.3)
+                    else:
+                        ax.text(0.5, 0.5, 'No Data', ha='center', va='center',
+                               transform=ax.transAxes, fontsize=12)
+                        ax.set_title(f'{trial.upper()}: {condition.capitalize()} Target')
+                else:
+                    ax.text(0.5, 0.5, 'Column Not Found', ha='center', va='center',
+                           transform=ax.transAxes, fontsize=12)
+                    ax.set_title(f'{trial.upper()}: {condition.capitalize()} Target')
+        
+        plt.suptitle('Age vs Stride Variability by Trial/Condition (Colored by Motor Noise)' if has_motor_noise 
+                     else 'Age vs Stride Variability by Trial/Condition', fontsize=16, fontweight='bold')
+        plt.tight_layout()
+        plt.savefig(self.population_plots_dir / 'age_vs_stride_variability_enhanced.png', 
+                   dpi=getattr(self.config, 'FIGURE_DPI', 300), bbox_inches='tight')
+        plt.close()
+
+    def _plot_msl_vs_sr_enhanced(self, df: pd.DataFrame):
+        """Mean stride length vs success rate by trial/condition with motor noise coloring."""
+        
+        msl_columns = [col for col in df.columns if '_msl_' in col and '_const' in col]
+        sr_columns = [col for col in df.columns if '_sr_' in col and '_const' in col]
+        
+        if not msl_columns or not sr_columns:
+            print("   ⚠️ Missing mean stride length or success rate columns")
+            return
+        
+        trials = ['vis1', 'invis', 'vis2']
+        conditions = ['max', 'min']
+        has_motor_noise = 'mot_noise' in df.columns
+        
+        fig, axes = plt.subplots(len(trials), len(conditions), figsize=(12, 4*len(trials)))
+        if len(trials) == 1:
+            axes = axes.reshape(1, -1)
+        
+        for i, trial in enumerate(trials):
+            for j, condition in enumerate(conditions):
+                ax = axes[i, j]
+                msl_col = f'{trial}_msl_{condition}_const'
+                sr_col = f'{trial}_sr_{condition}_const'
+                
+                if msl_col in df.columns and sr_col in df.columns:
+                    cols_to_use = [msl_col, sr_col] + (['mot_noise'] if has_motor_noise else [])
+                    valid_data = df[cols_to_use].dropna()
+                    
+                    if not valid_data.empty:
+                        if has_motor_noise:
+                            scatter = ax.scatter(valid_data[msl_col], valid_data[sr_col], 
+                                               c=valid_data['mot_noise'], cmap='coolwarm', 
+                                               alpha=0.7, s=60, edgecolors='white', linewidths=0.5)
+                            if i == 0 and j == len(conditions) - 1:
+                                cbar = plt.colorbar(scatter, ax=ax)
+                                cbar.set_label('Motor Noise', rotation=270, labelpad=15)
+                        else:
+                            ax.scatter(valid_data[msl_col], valid_data[sr_col], alpha=0.7, s=60)
+                        
+                        # Add trend line and correlation
+                        self._add_trendline(ax, valid_data[msl_col], valid_data[sr_col])
+                        
+                        ax.set_xlabel('Mean Stride Length')
+                        ax.set_ylabel('Success Rate')
+                        ax.set_title(f'{trial.upper()}: {condition.capitalize()} Target')
+                        ax.set_ylim(-0.05, 1.05)
+                        ax.grid(True, alpha=0.3)
+                    else:
+                        ax.text(0.5, 0.5, 'No Data', ha='center', va='center',
+                               transform=ax.transAxes, fontsize=12)
+                        ax.set_title(f'{trial.upper()}: {condition.capitalize()} Target')
+                else:
+                    ax.text(0.5, 0.5, 'Columns Not Found', ha='center', va='center',
+                           transform=ax.transAxes, fontsize=12)
+                    ax.set_title(f'{trial.upper()}: {condition.capitalize()} Target')
+        
+        plt.suptitle('Mean Stride Length vs Success Rate by Trial/Condition (Colored by Motor Noise)' if has_motor_noise 
+                     else 'Mean Stride Length vs Success Rate by Trial/Condition', fontsize=16, fontweight='bold')
+        plt.tight_layout()
+        plt.savefig(self.population_plots_dir / 'mean_stride_length_vs_success_rate.png', 
+                   dpi=getattr(self.config, 'FIGURE_DPI', 300), bbox_inches='tight')
+        plt.close()
+
+    def _plot_age_vs_mean_stride_length_enhanced(self, df: pd.DataFrame):
+        """Enhanced age vs mean stride length by trial/condition with motor noise coloring."""
+        
+        msl_columns = [col for col in df.columns if '_msl_' in col and '_const' in col]
+        if not msl_columns:
+            print("   ⚠️ No mean stride length columns found")
+            return
+        
+        trials = ['vis1', 'invis', 'vis2']
+        conditions = ['max', 'min']
+        has_motor_noise = 'mot_noise' in df.columns
+        
+        fig, axes = plt.subplots(len(trials), len(conditions), figsize=(12, 4*len(trials)))
+        if len(trials) == 1:
+            axes = axes.reshape(1, -1)
+        
+        for i, trial in enumerate(trials):
+            for j, condition in enumerate(conditions):
+                ax = axes[i, j]
+                col = f'{trial}_msl_{condition}_const'
+                
+                if col in df.columns:
+                    cols_to_use = ['age', col] + (['mot_noise'] if has_motor_noise else [])
+                    valid_data = df[cols_to_use].dropna()
+                    
+                    if not valid_data.empty:
+                        if has_motor_noise:
+                            scatter = ax.scatter(valid_data['age'], valid_data[col], 
+                                               c=valid_data['mot_noise'], cmap='plasma', 
+                                               alpha=0.7, s=60, edgecolors='white', linewidths=0.5)
+                            if i == 0 and j == len(conditions) - 1:
+                                cbar = plt.colorbar(scatter, ax=ax)
+                                cbar.set_label('Motor Noise', rotation=270, labelpad=15)
+                        else:
+                            trial_colors = {'vis1': '#1f77b4', 'invis': '#ff7f0e', 'vis2': '#2ca02c'}
+                            ax.scatter(valid_data['age'], valid_data[col], 
+                                     alpha=0.7, s=60, color=trial_colors.get(trial, 'steelblue'),
+                                     edgecolors='white', linewidths=0.5)
+                        
+                        # Add trend line and correlation
+                        self._add_trendline(ax, valid_data['age'], valid_data[col])
+                        
+                        ax.set_xlabel('Age (years)')
+                        ax.set_ylabel('Mean Stride Length')
+                        ax.set_title(f'{trial.upper()}: {condition.capitalize()} Target')
+                        ax.grid(True, alpha=0.3)
+                    else:
+                        ax.text(0.5, 0.5, 'No Data', ha='center', va='center',
+                               transform=ax.transAxes, fontsize=12)
+                        ax.set_title(f'{trial.upper()}: {condition.capitalize()} Target')
+                else:
+                    ax.text(0.5, 0.5, 'Column Not Found', ha='center', va='center',
+                           transform=ax.transAxes, fontsize=12)
+                    ax.set_title(f'{trial.upper()}: {condition.capitalize()} Target')
+        
+        plt.suptitle('Age vs Mean Stride Length by Trial/Condition (Colored by Motor Noise)' if has_motor_noise 
+                     else 'Age vs Mean Stride Length by Trial/Condition', fontsize=16, fontweight='bold')
+        plt.tight_layout()
+        plt.savefig(self.population_plots_dir / 'age_vs_mean_stride_length_enhanced.png', 
+                   dpi=getattr(self.config, 'FIGURE_DPI', 300), bbox_inches='tight')
+        plt.close()
+
+    def _plot_age_vs_mean_error_enhanced(self, df: pd.DataFrame):
+        """Enhanced age vs mean error by trial/condition with motor noise coloring."""
+        
+        error_columns = [col for col in df.columns if '_error_' in col and '_const' in col]
+        if not error_columns:
+            print("   ⚠️ No mean error columns found")
+            return
+        
+        trials = ['vis1', 'invis', 'vis2']
+        conditions = ['max', 'min']
+        has_motor_noise = 'mot_noise' in df.columns
+        
+        fig, axes = plt.subplots(len(trials), len(conditions), figsize=(12, 4*len(trials)))
+        if len(trials) == 1:
+            axes = axes.reshape(1, -1)
+        
+        for i, trial in enumerate(trials):
+            for j, condition in enumerate(conditions):
+                ax = axes[i, j]
+                col = f'{trial}_error_{condition}_const'
+                
+                if col in df.columns:
+                    cols_to_use = ['age', col] + (['mot_noise'] if has_motor_noise else [])
+                    valid_data = df[cols_to_use].dropna()
+                    
+                    if not valid_data.empty:
+                        if has_motor_noise:
+                            scatter = ax.scatter(valid_data['age'], valid_data[col], 
+                                               c=valid_data['mot_noise'], alpha=0.7, s=60,
+                                               edgecolors='white', linewidths=0.5)
+                            if i == 0 and j == len(conditions) - 1:
+                                cbar = plt.colorbar(scatter, ax=ax)
+                                cbar.set_label('Motor Noise', rotation=270, labelpad=15)
+                        else:
+                            trial_colors = {'vis1': '#1f77b4', 'invis': '#ff7f0e', 'vis2': '#2ca02c'}
+                            ax.scatter(valid_data['age'], valid_data[col], 
+                                     alpha=0.7, s=60, color=trial_colors.get(trial, 'steelblue'),
+                                     edgecolors='white', linewidths=0.5)
+                        
+                        # Add trend line and correlation
+                        self._add_trendline(ax, valid_data['age'], valid_data[col])
+                        
+                        # Add horizontal line at zero (perfect accuracy)
+                        ax.axhline(y=0, color='green', linestyle='--', alpha=0.5, 
+                                  label='Perfect Accuracy (Error = 0)')
+                        
+                        ax.set_xlabel('Age (years)')
+                        ax.set_ylabel('Mean Error (Stride Length - Target)')
+                        ax.set_title(f'{trial.upper()}: {condition.capitalize()} Target')
+                        ax.grid(True, alpha=0.3)
+                        ax.set_ylim(-0.5, 0.5)
+                        
+                        # Add legend only to first subplot to avoid clutter
+                        if i == 0 and j == 0:
+                            ax.legend(loc='upper right', fontsize=9)
+                    else:
+                        ax.text(0.5, 0.5, 'No Data', ha='center', va='center',
+                               transform=ax.transAxes, fontsize=12)
+                        ax.set_title(f'{trial.upper()}: {condition.capitalize()} Target')
+                else:
+                    ax.text(0.5, 0.5, 'Column Not Found', ha='center', va='center',
+                           transform=ax.transAxes, fontsize=12)
+                    ax.set_title(f'{trial.upper()}: {condition.capitalize()} Target')
+        
+        plt.suptitle('Age vs Mean Error by Trial/Condition (Colored by Motor Noise)' if has_motor_noise 
+                     else 'Age vs Mean Error by Trial/Condition', fontsize=16, fontweight='bold')
+        plt.tight_layout()
+        plt.savefig(self.population_plots_dir / 'age_vs_mean_error_enhanced.png', 
+                   dpi=getattr(self.config, 'FIGURE_DPI', 300), bbox_inches='tight')
+        plt.close()
+
+    def _plot_mean_error_vs_success_rate_enhanced(self, df: pd.DataFrame):
+        """Enhanced mean error vs success rate by trial/condition with motor noise coloring."""
+        
+        error_columns = [col for col in df.columns if '_error_' in col and '_const' in col]
+        sr_columns = [col for col in df.columns if '_sr_' in col and '_const' in col]
+        
+        if not error_columns or not sr_columns:
+            print("   ⚠️ Missing error or success rate columns")
+            return
+        
+        trials = ['vis1', 'invis', 'vis2']
+        conditions = ['max', 'min']
+        has_motor_noise = 'mot_noise' in df.columns
+        has_age = 'age' in df.columns
+        
+        fig, axes = plt.subplots(len(trials), len(conditions), figsize=(12, 4*len(trials)))
+        if len(trials) == 1:
+            axes = axes.reshape(1, -1)
+        
+        for i, trial in enumerate(trials):
+            for j, condition in enumerate(conditions):
+                ax = axes[i, j]
+                error_col = f'{trial}_error_{condition}_const'
+                sr_col = f'{trial}_sr_{condition}_const'
+                
+                if error_col in df.columns and sr_col in df.columns:
+                    cols_to_use = [error_col, sr_col] + (['mot_noise'] if has_motor_noise else []) + (['age'] if has_age else [])
+                    valid_data = df[cols_to_use].dropna()
+                    
+                    if not valid_data.empty:
+                        if has_motor_noise:
+                            scatter = ax.scatter(valid_data[error_col], valid_data[sr_col], 
+                                               c=valid_data['mot_noise'], cmap='plasma', 
+                                               alpha=0.7, s=60, edgecolors='white', linewidths=0.5)
+                            if i == 0 and j == len(conditions) - 1:
+                                cbar = plt.colorbar(scatter, ax=ax)
+                                cbar.set_label('Motor Noise', rotation=270, labelpad=15)
+                        elif has_age:
+                            scatter = ax.scatter(valid_data[error_col], valid_data[sr_col], 
+                                               c=valid_data['age'], cmap='viridis', 
+                                               alpha=0.7, s=60, edgecolors='white', linewidths=0.5)
+                            if i == 0 and j == len(conditions) - 1:
+                                cbar = plt.colorbar(scatter, ax=ax)
+                                cbar.set_label('Age (years)', rotation=270, labelpad=15)
+                        else:
+                            trial_colors = {'vis1': '#1f77b4', 'invis': '#ff7f0e', 'vis2': '#2ca02c'}
+                            ax.scatter(valid_data[error_col], valid_data[sr_col], 
+                                     alpha=0.7, s=60, color=trial_colors.get(trial, 'steelblue'),
+                                     edgecolors='white', linewidths=0.5)
+                        
+                        # Add trend line and correlation
+                        self._add_trendline(ax, valid_data[error_col], valid_data[sr_col])
+                        
+                        # Add reference lines
+                        ax.axvline(x=0, color='green', linestyle='--', alpha=0.5, 
+                                  label='Perfect Accuracy (Error = 0)')
+                        ax.axhline(y=0.68, color='red', linestyle='--', alpha=0.5, 
+                                  label='68% Success Threshold')
+                        
+                        ax.set_xlabel('Mean Error (Stride Length - Target)')
+                        ax.set_ylabel('Success Rate')
+                        ax.set_title(f'{trial.upper()}: {condition.capitalize()} Target')
+                        ax.set_ylim(-0.05, 1.05)
+                        ax.set_xlim(-0.5, 0.5)
+                        ax.grid(True, alpha=0.3)
+                        
+                        # Add legend only to first subplot to avoid clutter
+                        if i == 0 and j == 0:
+                            ax.legend(loc='upper right', fontsize=9)
+                    else:
+                        ax.text(0.5, 0.5, 'No Data', ha='center', va='center',
+                               transform=ax.transAxes, fontsize=12)
+                        ax.set_title(f'{trial.upper()}: {condition.capitalize()} Target')
+                else:
+                    ax.text(0.5, 0.5, 'Columns Not Found', ha='center', va='center',
+                           transform=ax.transAxes, fontsize=12)
+                    ax.set_title(f'{trial.upper()}: {condition.capitalize()} Target')
+        
+        color_label = 'Motor Noise' if has_motor_noise else ('Age' if has_age else '')
+        title_suffix = f' (Colored by {color_label})' if color_label else ''
+        
+        plt.suptitle(f'Mean Error vs Success Rate by Trial/Condition{title_suffix}', 
+                     fontsize=16, fontweight='bold')
+        plt.tight_layout()
+        plt.savefig(self.population_plots_dir / 'mean_error_vs_success_rate_enhanced.png', 
+                   dpi=getattr(self.config, 'FIGURE_DPI', 300), bbox_inches='tight')
+        plt.close()
+
+    def _plot_motor_noise_vs_success_rates_enhanced(self, df: pd.DataFrame):
+        """Motor noise vs success rates by trial/condition with age coloring."""
+        
+        if 'mot_noise' not in df.columns:
+            print("   ⚠️ No motor noise data available")
+            return
+        
+        sr_columns = [col for col in df.columns if '_sr_' in col and '_const' in col]
+        if not sr_columns:
+            print("   ⚠️ No success rate columns found")
+            return
+        
+        trials = ['vis1', 'invis', 'vis2']
+        conditions = ['max', 'min']
+        has_age = 'age' in df.columns
+        
+        fig, axes = plt.subplots(len(trials), len(conditions), figsize=(12, 4*len(trials)))
+        if len(trials) == 1:
+            axes = axes.reshape(1, -1)
+        
+        for i, trial in enumerate(trials):
+            for j, condition in enumerate(conditions):
+                ax = axes[i, j]
+                col = f'{trial}_sr_{condition}_const'
+                
+                if col in df.columns:
+                    cols_to_use = ['mot_noise', col] + (['age'] if has_age else [])
+                    valid_data = df[cols_to_use].dropna()
+                    
+                    if not valid_data.empty:
+                        if has_age:
+                            scatter = ax.scatter(valid_data['mot_noise'], valid_data[col], 
+                                               c=valid_data['age'], alpha=0.7, s=60, 
+                                               edgecolors='white', linewidths=0.5)
+                            if i == 0 and j == len(conditions) - 1:
+                                cbar = plt.colorbar(scatter, ax=ax)
+                                cbar.set_label('Age (years)', rotation=270, labelpad=15)
+                        else:
+                            ax.scatter(valid_data['mot_noise'], valid_data[col], 
+                                     alpha=0.7, s=60, color='steelblue',
+                                     edgecolors='white', linewidths=0.5)
+                        
+                        # Add threshold lines
+                        motor_noise_threshold = getattr(self.config, 'MOTOR_NOISE_THRESHOLD', 0.3)
+                        success_threshold = getattr(self.config, 'SUCCESS_RATE_THRESHOLD', 0.68)
+                        
+                        ax.axvline(x=motor_noise_threshold, color='red', 
+                                  linestyle='--', alpha=0.7, linewidth=2,
+                                  label=f'Motor Noise Threshold')
+                        ax.axhline(y=success_threshold, color='green', 
+                                  linestyle='--', alpha=0.7, linewidth=2,
+                                  label=f'Success Threshold')
+                        
+                        ax.set_xlabel('Motor Noise')
+                        ax.set_ylabel('Success Rate')
+                        ax.set_title(f'{trial.upper()}: {condition.capitalize()} Target')
+                        ax.set_ylim(-0.05, 1.05)
+                        ax.grid(True, alpha=0.3)
+                        
+                        # Add legend only to the first subplot to avoid clutter
+                        if i == 0 and j == 0:
+                            ax.legend(loc='upper right', fontsize=9)
+                    else:
+                        ax.text(0.5, 0.5, 'No Data', ha='center', va='center',
+                               transform=ax.transAxes, fontsize=12)
+                        ax.set_title(f'{trial.upper()}: {condition.capitalize()} Target')
+                else:
+                    ax.text(0.5, 0.5, 'Column Not Found', ha='center', va='center',
+                           transform=ax.transAxes, fontsize=12)
+                    ax.set_title(f'{trial.upper()}: {condition.capitalize()} Target')
+        
+        plt.suptitle('Motor Noise vs Success Rates by Trial/Condition (Colored by Age)' if has_age 
+                     else 'Motor Noise vs Success Rates by Trial/Condition', fontsize=16, fontweight='bold')
+        plt.tight_layout()
+        plt.savefig(self.population_plots_dir / 'motor_noise_vs_success_rates_enhanced.png', 
+                   dpi=getattr(self.config, 'FIGURE_DPI', 300), bbox_inches='tight')
+        plt.close()
+
+    def _plot_age_vs_motor_noise(self, df: pd.DataFrame):
+        """Plot age vs motor noise relationship with robust error handling."""
+        
+        if 'age' not in df.columns or 'mot_noise' not in df.columns:
+            print("   ⚠️ Missing age or motor noise columns")
+            return
+        
+        plt.figure(figsize=(10, 8))
+        
+        try:
+            # Convert to numeric and drop NaN values
+            age_data = pd.to_numeric(df['age'], errors='coerce')
+            motor_noise_data = pd.to_numeric(df['mot_noise'], errors='coerce')
+            
+            plot_data = pd.DataFrame({
+                'age': age_data,
+                'mot_noise': motor_noise_data
+            }).dropna()
+            
+            if plot_data.empty or len(plot_data) < 2:
+                plt.text(0.5, 0.5, 'Insufficient valid data', ha='center', va='center',
+                        transform=plt.gca().transAxes, fontsize=14)
+                plt.title('Age vs Motor Noise - Insufficient Data')
+            else:
+                # Create scatter plot
+                plt.scatter(plot_data['age'], plot_data['mot_noise'], 
+                           alpha=0.6, s=60, color='steelblue', 
+                           edgecolors='white', linewidths=0.5)
+                
+                # Add trend line and correlation
+                self._add_trendline(plt.gca(), plot_data['age'], plot_data['mot_noise'])
+                
+                # Add motor noise threshold line
+                motor_noise_threshold = getattr(self.config, 'MOTOR_NOISE_THRESHOLD', 0.3)
+                plt.axhline(y=motor_noise_threshold, color='red', linestyle='--', alpha=0.7, 
+                           label=f'Threshold ({motor_noise_threshold})')
+                
+                plt.xlabel('Age (years)', fontsize=12)
+                plt.ylabel('Motor Noise', fontsize=12)
+                plt.title('Age vs Motor Noise Relationship', fontsize=14, fontweight='bold')
+                plt.grid(True, alpha=0.3)
+                plt.legend()
+                
+                # Set reasonable axis limits
+                age_range = plot_data['age'].max() - plot_data['age'].min()
+                motor_range = plot_data['mot_noise'].max() - plot_data['mot_noise'].min()
+                
+                plt.xlim(plot_data['age'].min() - age_range*0.05, 
+                        plot_data['age'].max() + age_range*0.05)
+                plt.ylim(max(0, plot_data['mot_noise'].min() - motor_range*0.05), 
+                        plot_data['mot_noise'].max() + motor_range*0.05)
+        
+        except Exception as e:
+            print(f"   ⚠️ Error in age vs motor noise plot: {e}")
+            plt.text(0.5, 0.5, f'Error creating plot:\\n{str(e)}', 
+                    ha='center', va='center', transform=plt.gca().transAxes, 
+                    fontsize=12, style='italic')
+            plt.title('Age vs Motor Noise - Error')
+        
+        plt.tight_layout()
+        plt.savefig(self.population_plots_dir / 'age_vs_motor_noise.png', 
+                   dpi=getattr(self.config, 'FIGURE_DPI', 300), bbox_inches='tight')
+        plt.close()
+
+    def _plot_correlation_matrix(self, df: pd.DataFrame):
+        """Plot correlation matrix of key variables."""
+        
+        key_cols = ['age']
+        if 'mot_noise' in df.columns:
+            key_cols.append('mot_noise')
+        if 'pref_asymmetry' in df.columns:
+            key_cols.append('pref_asymmetry')
+        
+        # Add success rate columns
+        sr_cols = [col for col in df.columns if '_sr_' in col and '_const' in col]
+        key_cols.extend(sr_cols[:6])  # Limit to prevent overcrowding
+        
+        if len(key_cols) > 1:
+            plt.figure(figsize=(12, 10))
+            
+            corr_matrix = df[key_cols].corr()
+            mask = np.triu(np.ones_like(corr_matrix, dtype=bool))
+            
+            sns.heatmap(corr_matrix, mask=mask, annot=True, cmap='RdBu_r', center=0,
+                       square=True, linewidths=0.5, fmt='.2f')
+            
+            plt.title('Correlation Matrix of Key Variables', fontsize=16, fontweight='bold')
+            plt.tight_layout()
+            
+            plt.savefig(self.population_plots_dir / 'correlation_matrix.png',
+                       dpi=getattr(self.config, 'FIGURE_DPI', 300), bbox_inches='tight')
+            plt.close()
+
+    def _plot_success_rate_overview(self, df: pd.DataFrame, sr_cols: List[str]):
+        """Plot success rate overview across conditions."""
+        
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+        
+        # 1. Mean success rates by condition
+        sr_means = [df[col].mean() for col in sr_cols[:8]]  # Limit for readability
+        sr_names = [col.replace('_sr_', ' ').replace('_const', '') for col in sr_cols[:8]]
+        
+        bars = ax1.bar(range(len(sr_names)), sr_means, alpha=0.7, color='steelblue')
+        ax1.set_title('Mean Success Rates by Condition')
+        ax1.set_ylabel('Success Rate')
+        ax1.set_ylim(0, 1)
+        ax1.set_xticks(range(len(sr_names)))
+        ax1.set_xticklabels(sr_names, rotation=45, ha='right')
+        ax1.grid(True, alpha=0.3)
+        
+        # Add value labels on bars
+        for i, bar in enumerate(bars):
+            height = bar.get_height()
+            ax1.text(bar.get_x() + bar.get_width()/2., height + 0.01,
+                    f'{height:.2f}', ha='center', va='bottom')
+        
+        # 2. Success rate distributions
+        plot_data = []
+        for col in sr_cols[:6]:  # Limit for readability
+            trial_type = col.split('_')[0]
+            condition = col.split('_')[2]
+            values = df[col].dropna()
+            for val in values:
+                plot_data.append({
+                    'condition': f'{trial_type}_{condition}',
+                    'success_rate': val
+                })
+        
+        if plot_data:
+            plot_df = pd.DataFrame(plot_data)
+            sns.boxplot(data=plot_df, x='condition', y='success_rate', ax=ax2)
+            ax2.set_title('Success Rate Distributions')
+            ax2.set_ylabel('Success Rate')
+            ax2.set_ylim(0, 1)
+            plt.setp(ax2.get_xticklabels(), rotation=45, ha='right')
+        
+        plt.tight_layout()
+        plt.savefig(self.population_plots_dir / 'success_rate_overview.png',
+                   dpi=getattr(self.config, 'FIGURE_DPI', 300), bbox_inches='tight')
+        plt.close()
+
+    # ==========================================================================
+    # STATISTICAL ANALYSIS PLOTTING METHODS
+    # ==========================================================================
+
+    def _plot_feature_importance_analysis(self):
+        """Plot feature importance analysis if regression results are available."""
+        
+        if not hasattr(self.analysis, 'analyzer'):
+            print("   ⚠️ No analyzer available for feature importance")
+            return
+        
+        try:
+            # Try to run a quick regression analysis
+            regression_results = self.analysis.analyzer.run_regression_analysis()
+            
+            if 'feature_importances' in regression_results:
+                plt.figure(figsize=(10, 6))
+                
+                features = list(regression_results['feature_importances'].keys())
+                importances = list(regression_results['feature_importances'].values())
+                
+                bars = plt.bar(features, importances, alpha=0.7, color='steelblue')
+                plt.title('Feature Importance for Success Rate Prediction')
+                plt.ylabel('Importance')
+                plt.xticks(rotation=45, ha='right')
+                plt.grid(True, alpha=0.3)
+                
+                # Add value labels
+                for bar, importance in zip(bars, importances):
+                    plt.text(bar.get_x() + bar.get_width()/2., bar.get_height() + 0.01,
+                            f'{importance:.3f}', ha='center', va='bottom')
+                
+                plt.tight_layout()
+                plt.savefig(self.statistical_plots_dir / 'feature_importance_analysis.png',
+                           dpi=getattr(self.config, 'FIGURE_DPI', 300), bbox_inches='tight')
+                plt.close()
+            
+        except Exception as e:
+            print(f"   ⚠️ Feature importance analysis failed: {e}")
+
+    def _plot_age_effects_summary(self, df: pd.DataFrame = None):
+        """Plot summary of age effects on performance measures."""
+        
+        df = self.filtered_df if df is None else df
+        if 'age' not in df.columns:
+            print("   ⚠️ No age data available for age effects analysis")
+            return
+        
+        # Calculate age effects for success rate measures (permutation p-values)
+        sr_cols = [col for col in df.columns if '_sr_' in col and '_const' in col]
+        age_effects = []
+        
+        engine = ResamplingEngine(n_resamples=getattr(self.config, 'RESAMPLES', 10000))
+        correlations = engine.correlations(df, 'age', sr_cols[:10])  # Limit for readability
+        for row in correlations.itertuples():
+            if row.n > 10 and pd.notna(row.r):
+                age_effects.append({
+                    'measure': row.metric.replace('_sr_', ' ').replace('_const', ''),
+                    'correlation': row.r,
+                    'p_value': row.p_value,
+                    'significant': row.p_value < getattr(self.config, 'ALPHA_LEVEL', 0.05)
+                })
+        
+        if not age_effects:
+            print("   ⚠️ No valid age effects calculated")
+            return
+        
+        # Sort by correlation strength
+        age_effects.sort(key=lambda x: abs(x['correlation']), reverse=True)
+        
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 8))
+        
+        # Correlation plot
+        measures = [e['measure'] for e in age_effects]
+        correlations = [e['correlation'] for e in age_effects]
+        significant = [e['significant'] for e in age_effects]
+        
+        colors = ['red' if sig else 'blue' for sig in significant]
+        bars = ax1.barh(range(len(measures)), correlations, color=colors, alpha=0.7)
+        ax1.set_yticks(range(len(measures)))
+        ax1.set_yticklabels([m.replace('_', ' ') for m in measures])
+        ax1.set_xlabel('Correlation with Age')
+        ax1.set_title('Age Effect Sizes')
+        ax1.axvline(x=0, color='black', linestyle='-', alpha=0.3)
+        ax1.grid(True, alpha=0.3)
+        
+        # Add legend
+        red_patch = plt.Rectangle((0,0),1,1, facecolor='red', alpha=0.7, label='Significant (p < 0.05)')
+        blue_patch = plt.Rectangle((0,0),1,1, facecolor='blue', alpha=0.7, label='Not significant')
+        ax1.legend(handles=[red_patch, blue_patch])
+        
+        # P-value plot
+        p_values = [e['p_value'] for e in age_effects]
+        log_p = [-np.log10(p) for p in p_values]
+        bars2 = ax2.barh(range(len(measures)), log_p, color=colors, alpha=0.7)
+        ax2.set_yticks(range(len(measures)))
+        ax2.set_yticklabels([m.replace('_', ' ') for m in measures])
+        ax2.set_xlabel('-log10(p-value)')
+        ax2.set_title('Statistical Significance')
+        ax2.axvline(x=-np.log10(0.05), color='red', linestyle='--', alpha=0.8, label='p = 0.05')
+        ax2.grid(True, alpha=0.3)
+        ax2.legend()
+        
+        plt.tight_layout()
+        plt.savefig(self.statistical_plots_dir / 'age_effects_summary.png',
+                   dpi=getattr(self.config, 'FIGURE_DPI', 300), bbox_inches='tight')
+        plt.close()
+
+    def _plot_trial_comparisons(self, df: pd.DataFrame = None):
+        """Plot comparisons between trial types."""
+        
+        df = self.filtered_df if df is None else df
+        
+        # Compare success rates across trial types
+        comparison_data = []
+        
+        for condition in ['max', 'min']:
+            for trial in ['vis1', 'invis', 'vis2']:
+                col = f'{trial}_sr_{condition}_const'
+                if col in df.columns:
+                    values = df[col].dropna()
+                    for val in values:
+                        comparison_data.append({
+                            'trial_type': trial,
+                            'condition': condition,
+                            'success_rate': val
+                        })
+        
+        if not comparison_data:
+            print("   ⚠️ No trial comparison data available")
+            return
+        
+        comparison_df = pd.DataFrame(comparison_data)
+        
+        fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+        
+        # 1. Box plot by trial type
+        sns.boxplot(data=comparison_df, x='trial_type', y='success_rate', ax=axes[0, 0])
+        axes[0, 0].set_title('Success Rates by Trial Type')
+        axes[0, 0].set_ylabel('Success Rate')
+        axes[0, 0].set_ylim(-0.05, 1.05)
+        
+        # 2. Box plot by condition
+        sns.boxplot(data=comparison_df, x='condition', y='success_rate', ax=axes[0, 1])
+        axes[0, 1].set_title('Success Rates by Target Condition')
+        axes[0, 1].set_ylabel('Success Rate')
+        axes[0, 1].set_ylim(-0.05, 1.05)
+        
+        # 3. Box plot by trial type and condition
+        sns.boxplot(data=comparison_df, x='trial_type', y='success_rate', 
+                   hue='condition', ax=axes[1, 0])
+        axes[1, 0].set_title('Success Rates by Trial Type and Condition')
+        axes[1, 0].set_ylabel('Success Rate')
+        axes[1, 0].set_ylim(-0.05, 1.05)
+        
+        # 4. Violin plot for distribution shapes
+        sns.violinplot(data=comparison_df, x='trial_type', y='success_rate', 
+                      hue='condition', ax=axes[1, 1])
+        axes[1, 1].set_title('Success Rate Distributions')
+        axes[1, 1].set_ylabel('Success Rate')
+        axes[1, 1].set_ylim(-0.05, 1.05)
+        
+        plt.suptitle('Trial Type Comparisons Across Conditions', fontsize=16, fontweight='bold')
+        plt.tight_layout()
+        
+        plt.savefig(self.statistical_plots_dir / 'trial_comparisons.png',
+                   dpi=getattr(self.config, 'FIGURE_DPI', 300), bbox_inches='tight')
+        plt.close()
+
+    def generate_summary_dashboard(self, df: pd.DataFrame = None) -> Dict:
+        """Generate comprehensive summary dashboard."""
+        
+        try:
+            df = self.filtered_df if df is None else df
+            
+            fig = plt.figure(figsize=(16, 12))
+            gs = fig.add_gridspec(3, 3, hspace=0.3, wspace=0.3)
+            
+            # 1. Age distribution
+            ax1 = fig.add_subplot(gs[0, 0])
+            if 'age' in df.columns:
+                df['age'].hist(bins=range(7, 19), ax=ax1, alpha=0.7, color='skyblue')
+                ax1.set_title('Age Distribution')
+                ax1.set_xlabel('Age (years)')
+                ax1.set_ylabel('Count')
+            
+            # 2. Motor noise distribution
+            ax2 = fig.add_subplot(gs[0, 1])
+            if 'mot_noise' in df.columns:
+                df['mot_noise'].hist(bins=15, ax=ax2, alpha=0.7, color='lightcoral')
+                motor_noise_threshold = getattr(self.config, 'MOTOR_NOISE_THRESHOLD', 0.3)
+                ax2.axvline(motor_noise_threshold, color='red', linestyle='--', 
+                           label=f"Threshold ({motor_noise_threshold})")
+                ax2.set_title('Motor Noise Distribution')
+                ax2.set_xlabel('Motor Noise')
+                ax2.set_ylabel('Count')
+                ax2.legend()
+            
+            # 3. Success rates overview
+            ax3 = fig.add_subplot(gs[0, 2])
+            sr_cols = [col for col in df.columns if '_sr_' in col and '_const' in col]
+            if sr_cols:
+                sr_means = [df[col].mean() for col in sr_cols[:6]]
+                sr_names = [col.replace('_sr_', ' ').replace('_const', '') for col in sr_cols[:6]]
+                
+                bars = ax3.bar(range(len(sr_names)), sr_means, alpha=0.7)
+                ax3.set_title('Mean Success Rates')
+                ax3.set_ylabel('Success Rate')
+                ax3.set_ylim(0, 1)
+                ax3.set_xticks(range(len(sr_names)))
+                ax3.set_xticklabels(sr_names, rotation=45, ha='right')
+            
+            # 4. Summary statistics table
+            ax4 = fig.add_subplot(gs[1:, :])
+            ax4.axis('tight')
+            ax4.axis('off')
+            
+            # Create summary table
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            motor_noise_threshold = getattr(self.config, 'MOTOR_NOISE_THRESHOLD', 0.3)
+            
+            summary_data = [
+                ['Total Subjects', f"{len(df)}"],
+                ['Age Range', f"{df['age'].min():.1f} - {df['age'].max():.1f} years" if 'age' in df.columns else "N/A"],
+                ['Mean Age ± SD', f"{df['age'].mean():.1f} ± {df['age'].std():.1f} years" if 'age' in df.columns else "N/A"],
+                ['Motor Noise Range', f"{df['mot_noise'].min():.3f} - {df['mot_noise'].max():.3f}" if 'mot_noise' in df.columns else "N/A"],
+                ['Success Rate Measures', f"{len(sr_cols)}"],
+                ['High Motor Noise Subjects', f"{(df['mot_noise'] > motor_noise_threshold).sum()}" if 'mot_noise' in df.columns else "N/A"],
+                ['Enhanced Population Plots', "✓ Age vs SR, Age vs SD, MSL vs SR (by trial/condition)"],
+                ['Motor Noise Coloring', "✓ All plots colored by motor noise level"],
+                ['Analysis Timestamp', timestamp]
+            ]
+            
+            table = ax4.table(cellText=summary_data, colLabels=['Metric', 'Value'],
+                             cellLoc='left', loc='center')
+            table.auto_set_font_size(False)
+            table.set_fontsize(12)
+            table.scale(1.2, 2)
+            ax4.set_title('Enhanced Motor Learning Analysis Summary', fontsize=16, fontweight='bold', pad=20)
+            
+            plt.suptitle('Enhanced Motor Learning Analysis Dashboard', fontsize=18, y=0.95)
+            
+            # Save dashboard
+            dashboard_file = self.statistical_plots_dir / f'analysis_dashboard_{timestamp}.png'
+            plt.savefig(dashboard_file, dpi=getattr(self.config, 'FIGURE_DPI', 300), bbox_inches='tight')
+            plt.close()
+            
+            print(f"   Generated summary dashboard: {dashboard_file.name}")
+            
+            return {
+                'success': True,
+                'file': str(dashboard_file)
+            }
+            
+        except Exception as e:
+            print(f"   ⚠️ Dashboard generation failed: {e}")
+            return {'success': False, 'error': str(e)}
+
+    # ==========================================================================
+    # INDIVIDUAL PLOTTING METHODS (EXISTING)
+    # ==========================================================================
+
+    # Bump when the stride-change figure layout changes, so cached PNGs are redrawn
+    STRIDE_CHANGE_RENDER_VERSION = 3
+    STRIDE_CHANGE_MANIFEST = 'render_manifest.json'
+
+    def plot_all_individual_stride_changes(self, trial_types: List[str] = None, 
+                                         subject_ids: List[str] = None,
+                                         save_summary: bool = True,
+                                         max_subjects: int = None,
+                                         workers: Optional[int] = None,
+                                         skip_unchanged: bool = True,
+                                         stride_col: str = 'Sum of gains and steps',
+                                         figsize: Tuple[int, int] = (16, 18),
+                                         alpha: float = 0.7) -> Dict:
+        """
+        Generate stride change distribution plots for all participants.
+        
+        One 3x2 figure is rendered per subject. With ``workers`` > 1 (default
+        config.PLOT_WORKERS) figures are rendered in a process pool with the Agg
+        backend. With ``skip_unchanged`` a subject is skipped when the hash of its
+        plotted data and plot parameters matches the PNG already on disk
+        (recorded in render_manifest.json next to the figures).
+        """
+        
+        if trial_types is None:
+            trial_types = ['vis1', 'invis', 'vis2']
+        
+        if subject_ids is None:
+            subject_ids = list(self.data_manager.processed_data.keys())
+        
+        # Limit subjects if requested
+        if max_subjects and len(subject_ids) > max_subjects:
+            subject_ids = subject_ids[:max_subjects]
+            print(f"🔄 Limited to first {max_subjects} subjects for testing")
+        
+        workers = workers or getattr(self.config, 'PLOT_WORKERS', 1)
+        params = {'stride_col': stride_col, 'figsize': tuple(figsize), 'alpha': alpha}
+        save_dir = self.individual_plots_dir / "stride_change_after_success_vs_failure"
+        save_dir.mkdir(parents=True, exist_ok=True)
+        
+        print(f"🎯 Generating individual stride change plots...")
+        print(f"   📊 {len(subject_ids)} subjects")
+        print(f"   🎮 Trial types: {trial_types}")
+        print(f"   💾 Saving to: {self.individual_plots_dir}")
+        
+        # Skip subjects whose figure is already up to date
+        manifest = self._load_render_manifest(save_dir)
+        signatures = {}
+        stats_by_subject = {}
+        to_render = []
+        
+        for subject_id in subject_ids:
+            if subject_id not in self.data_manager.processed_data:
+                continue
+            signatures[subject_id] = self._stride_change_signature(subject_id, trial_types, params)
+            entry = manifest['subjects'].get(subject_id)
+            if (skip_unchanged and entry and entry['signature'] == signatures[subject_id] and
+                    (save_dir / entry['file']).exists()):
+                stats_by_subject[subject_id] = entry['stats']
+            else:
+                to_render.append(subject_id)
+        
+        skipped = len(stats_by_subject)
+        if skipped:
+            print(f"   ⏭️ {skipped} unchanged figures skipped, {len(to_render)} to render")
+        
+        # Stride changes and densities of every figure to draw, looked up in one pass
+        periods = self._stride_change_periods(to_render, trial_types, stride_col)
+        densities = self._get_stride_densities(to_render, trial_types, stride_col)
+        rendered, errors = self._render_stride_change_figures(to_render, trial_types, params, workers,
+                                                              periods, densities)
+        failed_plots = len(errors)
+        
+        for subject_id, stats in rendered.items():
+            stats_by_subject[subject_id] = stats
+            manifest['subjects'][subject_id] = {
+                'signature': signatures[subject_id],
+                'file': f"stride_change_{subject_id}_fixed_grid.png",
+                'stats': stats
+            }
+        self._save_render_manifest(save_dir, manifest)
+        
+        # Collect per-trial statistics in subject order
+        all_stats = {}
+        for subject_id in subject_ids:
+            stats = stats_by_subject.get(subject_id)
+            if not stats:
+                continue
+            subject_stats = {
+                'age': self.data_manager.processed_data[subject_id]['metadata'].get('age_months', np.nan) / 12
+            }
+            subject_stats.update({trial_type: stats[trial_type] for trial_type in trial_types if trial_type in stats})
+            all_stats[subject_id] = subject_stats
+        
+        print(f"✓ Completed: {len(rendered)} rendered, {skipped} unchanged, {failed_plots} failed")
+        
+        # Save summary if requested
+        if save_summary:
+            self._save_stride_analysis_summary(all_stats, trial_types, stride_col)
+        
+        return all_stats
+
+    def _render_stride_change_figures(self, subject_ids: List[str], trial_types: List[str],
+                                      params: Dict, workers: int, periods: Dict,
+                                      densities: Dict) -> Tuple[Dict, Dict]:
+        """
+        Render one stride-change figure per subject; returns (stats, errors) by subject.
+        
+        Falls back to rendering in this process if the pool cannot be used (e.g.
+        workers on spawn-based platforms such as Windows cannot import muh).
+        """
+        rendered, errors = {}, {}
+        
+        if workers > 1 and len(subject_ids) > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=min(workers, len(subject_ids))) as executor:
+                    futures = [
+                        executor.submit(_render_stride_change_job, self.config, self.individual_plots_dir,
+                                        subject_id, self.data_manager.processed_data[subject_id],
+                                        trial_types, params, periods.get(subject_id), densities.get(subject_id))
+                        for subject_id in subject_ids
+                    ]
+                    outcomes = [future.result() for future in tqdm(futures, desc="Processing subjects")]
+            except Exception as e:
+                print(f"   ⚠️ Process pool unavailable ({type(e).__name__}: {e}) - rendering serially")
+            else:
+                for subject_id, (stats, log, error) in zip(subject_ids, outcomes):
+                    print(log, end='')
+                    if error:
+                        print(f"   ⚠️ Error plotting {subject_id}: {error}")
+                        errors[subject_id] = error
+                    elif stats:
+                        rendered[subject_id] = stats
+                return rendered, errors
+        
+        for subject_id in tqdm(subject_ids, desc="Processing subjects"):
+            try:
+                stats = self._plot_individual_stride_change_internal(
+                    subject_id, trial_types, save=True, show_stats=False,
+                    periods_by_trial=periods.get(subject_id), densities=densities.get(subject_id), **params
+                )
+                if stats:
+                    rendered[subject_id] = stats
+            except Exception as e:
+                print(f"   ⚠️ Error plotting {subject_id}: {str(e)}")
+                errors[subject_id] = str(e)
+        
+        return rendered, errors
+
+    def _stride_change_signature(self, subject_id: str, trial_types: List[str], params: Dict) -> str:
+        """Hash of everything a subject's stride-change figure is drawn from."""
+        subject_data = self.data_manager.processed_data[subject_id]
+        digest = hashlib.sha1(json.dumps({
+            'version': self.STRIDE_CHANGE_RENDER_VERSION,
+            'subject_id': subject_id,
+            'age_months': subject_data['metadata'].get('age_months'),
+            'trial_types': list(trial_types),
+            'dpi': getattr(self.config, 'FIGURE_DPI', 300),
+            'density_grid_points': getattr(self.config, 'DENSITY_GRID_POINTS', 1024),
+            **params
+        }, sort_keys=True, default=str).encode('utf-8'))
+        
+        plotted_cols = [params['stride_col'], 'Success', 'Stride Number', 'Target size', 'Constant']
+        for trial_type in trial_types:
+            trial_dict = subject_data['trial_data'].get(trial_type)
+            df = trial_dict.get('data') if trial_dict else None
+            if df is None:
+                digest.update(f"{trial_type}:none".encode('utf-8'))
+                continue
+            cols = [col for col in plotted_cols if col in df.columns]
+            digest.update(f"{trial_type}:{cols}".encode('utf-8'))
+            digest.update(pd.util.hash_pandas_object(df[cols], index=False).to_numpy().tobytes())
+        
+        return digest.hexdigest()
+
+    def _load_render_manifest(self, save_dir: Path) -> Dict:
+        """Load the figure manifest, or start a new one if missing or outdated."""
+        try:
+            with open(save_dir / self.STRIDE_CHANGE_MANIFEST, 'r') as f:
+                manifest = json.load(f)
+            if manifest.get('version') == self.STRIDE_CHANGE_RENDER_VERSION:
+                return manifest
+        except (OSError, ValueError):
+            pass
+        return {'version': self.STRIDE_CHANGE_RENDER_VERSION, 'subjects': {}}
+
+    def _save_render_manifest(self, save_dir: Path, manifest: Dict) -> None:
+        """Write the figure manifest (via a temp file, so a crash cannot corrupt it)."""
+        manifest_path = save_dir / self.STRIDE_CHANGE_MANIFEST
+        tmp_path = manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=1, default=float)
+        os.replace(tmp_path, manifest_path)
+
+# ADD THESE METHODS TO YOUR StandaloneEnhancedVisualizer CLASS
+# Insert around line 800-900 (after existing population plotting methods)
+    
+    def _get_learning_curves(self) -> pd.DataFrame:
+        """Rolling learning curves of the whole cohort (computed once per visualizer)."""
+        if getattr(self, '_learning_curves', None) is None:
+            self._learning_curves = MetricsCalculator(self.data_manager).calculate_learning_curves(
+                window=10, min_periods=5)
+        return self._learning_curves
+    
+    def _get_stride_changes(self, stride_col: str = 'Sum of gains and steps') -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Cohort stride changes and their per-period summary (loaded once per visualizer)."""
+        cache = getattr(self, '_stride_changes', None)
+        if cache is None:
+            cache = self._stride_changes = {}
+        if stride_col not in cache:
+            cache[stride_col] = MetricsCalculator(self.data_manager).load_stride_changes(stride_col=stride_col)
+        return cache[stride_col]
+    
+    def _plot_learning_curves_by_age(self, df: pd.DataFrame):
+        """Plot learning curves showing improvement over time, grouped by age."""
+        
+        trials = ['vis1', 'invis', 'vis2']
+        age_bins = [7, 10, 13, 16, 18]
+        age_labels = ['7-10', '10-13', '13-16', '16-18']
+        colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728']
+        
+        fig, axes = plt.subplots(1, 3, figsize=(18, 6))
+        
+        # Every stride of every subject in df, with its age group
+        curves = pd.DataFrame()
+        if 'age' in df.columns and 'ID' in df.columns:
+            ages = df[['ID', 'age']].assign(age_group=pd.cut(df['age'], bins=age_bins, labels=age_labels))
+            curves = self._get_learning_curves().merge(ages, on='ID')
+            curves = curves[curves['rolling_sr'].notna() & curves['age_group'].notna()]
+        
+        for i, trial in enumerate(trials):
+            ax = axes[i]
+            ax.set_title(f'{trial.upper()}: Learning Curves by Age Group', fontweight='bold')
+            ax.set_xlabel('Stride Number')
+            ax.set_ylabel('Rolling Success Rate')
+            ax.set_ylim(0, 1)
+            
+            if 'age' not in df.columns:
+                ax.text(0.5, 0.5, 'No age data available', ha='center', va='center',
+                       transform=ax.transAxes, fontsize=12)
+                continue
+            
+            trial_curves = curves[curves['trial_type'] == trial] if len(curves) else curves
+            if trial_curves.empty:
+                ax.text(0.5, 0.5, f'No valid learning curves\nfor {trial.upper()} trial', 
+                       ha='center', va='center', transform=ax.transAxes, fontsize=12)
+                continue
+            
+            for idx, age_group in enumerate(age_labels):
+                group = trial_curves[trial_curves['age_group'] == age_group]
+                if group.empty:
+                    continue
+                
+                # All subjects as one line collection, plus the group mean per stride
+                segments = [subject[['stride', 'rolling_sr']].to_numpy()
+                            for _, subject in group.groupby('ID', sort=False)]
+                ax.add_collection(LineCollection(segments, colors=colors[idx], alpha=0.15, linewidths=0.8))
+                mean_curve = group.groupby('stride')['rolling_sr'].mean()
+                ax.plot(mean_curve.index, mean_curve.values, color=colors[idx], linewidth=2.5,
+                       label=f'{age_group} years (n={len(segments)})', alpha=0.9)
+            
+            ax.autoscale_view(scaley=False)
+            ax.legend()
+            ax.grid(True, alpha=0.3)
+        
+        plt.tight_layout()
+        plt.savefig(self.population_plots_dir / 'learning_curves_by_age.png', 
+                   dpi=getattr(self.config, 'FIGURE_DPI', 300), bbox_inches='tight')
+        plt.close()
+        
+        print(f"   Learning curves: {curves['ID'].nunique() if len(curves) else 0} subjects "
+              f"across {len(trials)} trial types")
+
+        
+    def _plot_learner_clustering(self, df: pd.DataFrame):
+        """Cluster subjects by learning patterns and visualize clusters."""
+        
+        try:
+            from sklearn.cluster import KMeans
+            from sklearn.preprocessing import StandardScaler
+        except ImportError:
+            print("   ⚠️ Scikit-learn not available for clustering")
+            return None
+        
+        # Select features for clustering
+        feature_cols = ['age', 'mot_noise']
+        
+        # Add success rate features
+        sr_cols = [col for col in df.columns if '_sr_' in col and '_const' in col]
+        feature_cols.extend(sr_cols[:4])  # Limit to prevent overfitting
+        
+        # Select only available columns
+        available_features = [col for col in feature_cols if col in df.columns]
+        cluster_data = df[available_features].dropna()
+        
+        if len(cluster_data) < 10:
+            print("   ⚠️ Insufficient data for clustering")
+            return None
+        
+        # Standardize features
+        scaler = StandardScaler()
+        scaled_data = scaler.fit_transform(cluster_data)
+        
+        # Perform clustering
+        n_clusters = 3
+        kmeans = KMeans(n_clusters=n_clusters, random_state=42)
+        cluster_labels = kmeans.fit_predict(scaled_data)
+        
+        # Add cluster labels to dataframe
+        cluster_data = cluster_data.copy()
+        cluster_data['cluster'] = cluster_labels
+        
+        fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+        
+        # Define cluster colors
+        cluster_colors = ['red', 'blue', 'green']
+        
+        # Plot 1: Age vs Success Rate colored by cluster
+        ax = axes[0, 0]
+        if 'age' in cluster_data.columns and 'invis_sr_max_const' in cluster_data.columns:
+            for cluster in range(n_clusters):
+                cluster_subset = cluster_data[cluster_data['cluster'] == cluster]
+                ax.scatter(cluster_subset['age'], cluster_subset['invis_sr_max_const'], 
+                          c=cluster_colors[cluster], label=f'Cluster {cluster}', alpha=0.7, s=60)
+            
+            ax.set_xlabel('Age (years)')
+            ax.set_ylabel('Success Rate (Invis Max)')
+            ax.set_title('Learner Clusters: Age vs Performance')
+            ax.legend()
+            ax.grid(True, alpha=0.3)
+        
+        # Plot 2: Motor Noise vs Success Rate colored by cluster
+        ax = axes[0, 1]
+        if 'mot_noise' in cluster_data.columns and 'invis_sr_max_const' in cluster_data.columns:
+            for cluster in range(n_clusters):
+                cluster_subset = cluster_data[cluster_data['cluster'] == cluster]
+                ax.scatter(cluster_subset['mot_noise'], cluster_subset['invis_sr_max_const'], 
+                          c=cluster_colors[cluster], label=f'Cluster {cluster}', alpha=0.7, s=60)
+            
+            ax.set_xlabel('Motor Noise')
+            ax.set_ylabel('Success Rate (Invis Max)')
+            ax.set_title('Clusters: Motor Noise vs Performance')
+            ax.legend()
+            ax.grid(True, alpha=0.3)
+        
+        # Plot 3: Cluster sizes
+        ax = axes[1, 0]
+        cluster_sizes = cluster_data['cluster'].value_counts().sort_index()
+        bars = ax.bar(range(n_clusters), cluster_sizes.values, 
+                      color=cluster_colors[:n_clusters], alpha=0.7)
+        ax.set_xlabel('Cluster')
+        ax.set_ylabel('Number of Subjects')
+        ax.set_title('Cluster Sizes')
+        ax.set_xticks(range(n_clusters))
+        ax.set_xticklabels([f'Cluster {i}' for i in range(n_clusters)])
+        
+        # Add count labels
+        for i, bar in enumerate(bars):
+            ax.text(bar.get_x() + bar.get_width()/2., bar.get_height() + 0.5,
+                   f'{int(bar.get_height())}', ha='center', va='bottom')
+        
+        # Plot 4: Performance comparison across clusters
+        ax = axes[1, 1]
+        if 'invis_sr_max_const' in cluster_data.columns:
+            performance_by_cluster = [cluster_data[cluster_data['cluster'] == i]['invis_sr_max_const'].values 
+                                     for i in range(n_clusters)]
+            
+            bp = ax.boxplot(performance_by_cluster, patch_artist=True)
+            for patch, color in zip(bp['boxes'], cluster_colors[:n_clusters]):
+                patch.set_facecolor(color)
+                patch.set_alpha(0.7)
+            
+            ax.set_xlabel('Cluster')
+            ax.set_ylabel('Success Rate (Invis Max)')
+            ax.set_title('Performance Distribution by Cluster')
+            ax.set_xticklabels([f'Cluster {i}' for i in range(n_clusters)])
+            ax.grid(True, alpha=0.3)
+        
+        plt.tight_layout()
+        plt.savefig(self.population_plots_dir / 'learner_clustering.png', 
+                   dpi=getattr(self.config, 'FIGURE_DPI', 300), bbox_inches='tight')
+        plt.close()
+        
+        return cluster_data
+    
+    def _plot_motor_control_efficiency(self, df: pd.DataFrame):
+        """Analyze motor control efficiency across age groups."""
+        
+        fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+        
+        # 1. Success Rate vs Motor Noise Efficiency
+        ax = axes[0, 0]
+        if 'mot_noise' in df.columns and 'invis_sr_max_const' in df.columns:
+            valid_data = df[['mot_noise', 'invis_sr_max_const', 'age']].dropna()
+            
+            # Calculate efficiency metric (high success rate despite motor noise)
+            valid_data = valid_data.copy()
+            valid_data['efficiency'] = valid_data['invis_sr_max_const'] / (valid_data['mot_noise'] + 0.01)
+            
+            scatter = ax.scatter(valid_data['age'], valid_data['efficiency'], 
+                               c=valid_data['mot_noise'], cmap='plasma', 
+                               alpha=0.7, s=60, edgecolors='white', linewidths=0.5)
+            
+            self._add_trendline(ax, valid_data['age'], valid_data['efficiency'])
+            
+            ax.set_xlabel('Age (years)')
+            ax.set_ylabel('Motor Control Efficiency')
+            ax.set_title('Age vs Motor Control Efficiency')
+            ax.grid(True, alpha=0.3)
+            
+            cbar = plt.colorbar(scatter, ax=ax)
+            cbar.set_label('Motor Noise')
+        
+        # 2. Stride Precision Analysis
+        ax = axes[0, 1]
+        precision_data = []
+        
+        for subject_id in df.index[:30]:  # Sample for performance
+            trial_data = self.data_manager.get_trial_data(subject_id, 'invis')
+            if trial_data is not None and 'Sum of gains and steps' in trial_data.columns:
+                # Get periods with smallest target size
+                periods = self.data_manager.get_period_index(subject_id, 'invis')
+                if periods is None or periods['n_strides'] != len(trial_data):
+                    periods = DataUtils.build_period_index(trial_data)
+                if periods is not None:
+                    precision_periods = trial_data.iloc[periods['min_target_positions']]
+                    
+                    if not precision_periods.empty:
+                        target_distance = np.abs(precision_periods['Sum of gains and steps'] - precision_periods['Constant'])
+                        mean_precision = target_distance.mean()
+                        
+                        precision_data.append({
+                            'subject_id': subject_id,
+                            'age': df.loc[subject_id, 'age'] if 'age' in df.columns else np.nan,
+                            'precision': mean_precision,
+                            'success_rate': precision_periods['Success'].mean()
+                        })
+        
+        if precision_data:
+            precision_df = pd.DataFrame(precision_data).dropna()
+            
+            scatter = ax.scatter(precision_df['age'], precision_df['precision'], 
+                               c=precision_df['success_rate'], cmap='RdYlGn', 
+                               alpha=0.7, s=60, edgecolors='white', linewidths=0.5)
+            
+            self._add_trendline(ax, precision_df['age'], precision_df['precision'])
+            
+            ax.set_xlabel('Age (years)')
+            ax.set_ylabel('Mean Distance from Target')
+            ax.set_title('Age vs Stride Precision')
+            ax.grid(True, alpha=0.3)
+            
+            cbar = plt.colorbar(scatter, ax=ax)
+            cbar.set_label('Success Rate')
+        
+        # 3. Learning Rate Analysis
+        ax = axes[1, 0]
+        learning_rate_data = []
+        
+        for subject_id in df.index[:30]:
+            trial_data = self.data_manager.get_trial_data(subject_id, 'invis')
+            if trial_data is not None and len(trial_data) > 50:
+                # Calculate learning rate as improvement in first vs last quarter
+                quarter_size = len(trial_data) // 4
+                first_quarter_sr = trial_data.iloc[:quarter_size]['Success'].mean()
+                last_quarter_sr = trial_data.iloc[-quarter_size:]['Success'].mean()
+                learning_rate = last_quarter_sr - first_quarter_sr
+                
+                learning_rate_data.append({
+                    'subject_id': subject_id,
+                    'age': df.loc[subject_id, 'age'] if 'age' in df.columns else np.nan,
+                    'learning_rate': learning_rate,
+                    'final_performance': last_quarter_sr
+                })
+        
+        if learning_rate_data:
+            lr_df = pd.DataFrame(learning_rate_data).dropna()
+            
+            scatter = ax.scatter(lr_df['age'], lr_df['learning_rate'], 
+                               c=lr_df['final_performance'], cmap='coolwarm', 
+                               alpha=0.7, s=60, edgecolors='white', linewidths=0.5)
+            
+            self._add_trendline(ax, lr_df['age'], lr_df['learning_rate'])
+            
+            ax.axhline(y=0, color='black', linestyle='--', alpha=0.5)
+            ax.set_xlabel('Age (years)')
+            ax.set_ylabel('Learning Rate (Δ Success Rate)')
+            ax.set_title('Age vs Learning Rate')
+            ax.grid(True, alpha=0.3)
+            
+            cbar = plt.colorbar(scatter, ax=ax)
+            cbar.set_label('Final Performance')
+        
+        # 4. Motor Noise vs Age with Performance Overlay
+        ax = axes[1, 1]
+        if 'age' in df.columns and 'mot_noise' in df.columns and 'invis_sr_max_const' in df.columns:
+            valid_data = df[['age', 'mot_noise', 'invis_sr_max_const']].dropna()
+            
+            # Create performance categories
+            valid_data = valid_data.copy()
+            valid_data['performance_cat'] = pd.cut(valid_data['invis_sr_max_const'], 
+                                                 bins=[0, 0.3, 0.7, 1.0], 
+                                                 labels=['Low', 'Medium', 'High'])
+            
+            colors = {'Low': 'red', 'Medium': 'orange', 'High': 'green'}
+            
+            for cat in ['Low', 'Medium', 'High']:
+                cat_data = valid_data[valid_data['performance_cat'] == cat]
+                if not cat_data.empty:
+                    ax.scatter(cat_data['age'], cat_data['mot_noise'], 
+                              c=colors[cat], label=f'{cat} Performance', 
+                              alpha=0.7, s=60, edgecolors='white', linewidths=0.5)
+            
+            # Add overall trend line
+            self._add_trendline(ax, valid_data['age'], valid_data['mot_noise'])
+            
+            ax.set_xlabel('Age (years)')
+            ax.set_ylabel('Motor Noise')
+            ax.set_title('Motor Noise Development by Performance Level')
+            ax.legend()
+            ax.grid(True, alpha=0.3)
+        
+        plt.tight_layout()
+        plt.savefig(self.population_plots_dir / 'motor_control_efficiency.png', 
+                   dpi=getattr(self.config, 'FIGURE_DPI', 300), bbox_inches='tight')
+        plt.close()
+    
+    def _plot_asymmetry_analysis(self, df: pd.DataFrame):
+        """Analyze left-right asymmetry patterns across development."""
+        
+        fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+        
+        # 1. Age vs Asymmetry Development
+        ax = axes[0, 0]
+        if 'age' in df.columns and 'pref_asymmetry' in df.columns:
+            valid_data = df[['age', 'pref_asymmetry']].dropna()
+            
+            # Add motor noise coloring if available
+            if 'mot_noise' in df.columns:
+                noise_data = df.loc[valid_data.index, 'mot_noise']
+                scatter = ax.scatter(valid_data['age'], valid_data['pref_asymmetry'], 
+                                   c=noise_data, cmap='plasma', 
+                                   alpha=0.7, s=60, edgecolors='white', linewidths=0.5)
+                cbar = plt.colorbar(scatter, ax=ax)
+                cbar.set_label('Motor Noise')
+            else:
+                ax.scatter(valid_data['age'], valid_data['pref_asymmetry'], 
+                          alpha=0.7, s=60, color='steelblue')
+            
+            self._add_trendline(ax, valid_data['age'], valid_data['pref_asymmetry'])
+            
+            ax.set_xlabel('Age (years)')
+            ax.set_ylabel('Preferred Asymmetry')
+            ax.set_title('Development of Step Length Asymmetry')
+            ax.grid(True, alpha=0.3)
+        
+        # 2. Asymmetry vs Performance
+        ax = axes[0, 1]
+        if 'pref_asymmetry' in df.columns and 'invis_sr_max_const' in df.columns:
+            valid_data = df[['pref_asymmetry', 'invis_sr_max_const', 'age']].dropna()
+            
+            scatter = ax.scatter(valid_data['pref_asymmetry'], valid_data['invis_sr_max_const'], 
+                               c=valid_data['age'], cmap='viridis', 
+                               alpha=0.7, s=60, edgecolors='white', linewidths=0.5)
+            
+            self._add_trendline(ax, valid_data['pref_asymmetry'], valid_data['invis_sr_max_const'])
+            
+            ax.set_xlabel('Preferred Asymmetry')
+            ax.set_ylabel('Success Rate (Invis Max)')
+            ax.set_title('Asymmetry vs Performance')
+            ax.grid(True, alpha=0.3)
+            
+            cbar = plt.colorbar(scatter, ax=ax)
+            cbar.set_label('Age (years)')
+        
+        # 3. Asymmetry Distribution by Age Groups
+        ax = axes[1, 0]
+        if 'age' in df.columns and 'pref_asymmetry' in df.columns:
+            age_groups = pd.cut(df['age'], bins=[7, 10, 13, 16, 18], labels=['7-10', '10-13', '13-16', '16-18'])
+            
+            asymmetry_by_age = []
+            age_labels = []
+            
+            for group in age_groups.cat.categories:
+                group_data = df[age_groups == group]['pref_asymmetry'].dropna()
+                if len(group_data) > 0:
+                    asymmetry_by_age.append(group_data.values)
+                    age_labels.append(group)
+            
+            if asymmetry_by_age:
+                bp = ax.boxplot(asymmetry_by_age, tick_labels=age_labels, patch_artist=True)
+                
+                # Color boxes
+                colors = ['lightblue', 'lightgreen', 'lightyellow', 'lightcoral']
+                for patch, color in zip(bp['boxes'], colors[:len(bp['boxes'])]):
+                    patch.set_facecolor(color)
+                    patch.set_alpha(0.7)
+                
+                ax.set_xlabel('Age Group')
+                ax.set_ylabel('Preferred Asymmetry')
+                ax.set_title('Asymmetry Distribution by Age Group')
+                ax.grid(True, alpha=0.3)
+        
+        # 4. Motor Noise vs Asymmetry
+        ax = axes[1, 1]
+        if 'mot_noise' in df.columns and 'pref_asymmetry' in df.columns:
+            valid_data = df[['mot_noise', 'pref_asymmetry', 'age']].dropna()
+            
+            scatter = ax.scatter(valid_data['mot_noise'], valid_data['pref_asymmetry'], 
+                               c=valid_data['age'], cmap='coolwarm', 
+                               alpha=0.7, s=60, edgecolors='white', linewidths=0.5)
+            
+            self._add_trendline(ax, valid_data['mot_noise'], valid_data['pref_asymmetry'])
+            
+            ax.set_xlabel('Motor Noise')
+            ax.set_ylabel('Preferred Asymmetry')
+            ax.set_title('Motor Noise vs Asymmetry')
+            ax.grid(True, alpha=0.3)
+            
+            cbar = plt.colorbar(scatter, ax=ax)
+            cbar.set_label('Age (years)')
+        
+        plt.tight_layout()
+        plt.savefig(self.population_plots_dir / 'asymmetry_analysis.png', 
+                   dpi=getattr(self.config, 'FIGURE_DPI', 300), bbox_inches='tight')
+        plt.close()
+    
+    def _plot_stride_change_density_by_age(self, df: pd.DataFrame):
+        """
+        Mean density of the stride changes after success and after failure by
+        age group, per trial and target, from the same KDEs as the individual
+        stride change figures (see _get_stride_densities).
+        """
+        
+        trials = ['vis1', 'invis', 'vis2']
+        conditions = [('max', 'Upper Target (Max Constant)'), ('min', 'Lower Target (Min Constant)')]
+        age_bins = getattr(self.config, 'AGE_BINS', [7, 10, 13, 16, 18])
+        age_labels = getattr(self.config, 'AGE_LABELS', ['7-10', '10-13', '13-16', '16-18'])
+        colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728']
+        outcomes = [('success', '-', 'after success'), ('failure', '--', 'after failure')]
+        
+        fig, axes = plt.subplots(3, 2, figsize=(16, 18))
+        
+        # Subjects of df with trial data, and their age group
+        groups = pd.Series(dtype=object)
+        if 'age' in df.columns and 'ID' in df.columns:
+            subjects = df[df['ID'].isin(list(self.data_manager.processed_data.keys()))]
+            groups = pd.Series(pd.cut(subjects['age'], bins=age_bins, labels=age_labels).to_numpy(),
+                               index=subjects['ID'].to_numpy()).dropna()
+        densities = self._get_stride_densities(list(groups.index), trials)
+        
+        # One grid for the whole cohort; subject densities are interpolated onto it
+        if densities:
+            low = min(entry['grid'][0] for entry in densities.values())
+            high = max(entry['grid'][-1] for entry in densities.values())
+            cohort_grid = np.linspace(low, high, getattr(self.config, 'DENSITY_GRID_POINTS', 1024))
+        
+        for row, trial in enumerate(trials):
+            for col, (condition, condition_name) in enumerate(conditions):
+                ax = axes[row, col]
+                ax.set_title(f'{trial.upper()}: {condition_name}', fontweight='bold')
+                ax.set_xlabel('Change in Sum of gains and steps')
+                ax.set_ylabel('Mean Probability Density')
+                ax.grid(True, alpha=0.3)
+                
+                curves = []
+                for idx, age_group in enumerate(age_labels):
+                    for outcome, linestyle, outcome_label in outcomes:
+                        rows = [np.interp(cohort_grid, densities[subject_id]['grid'], values, left=0, right=0)
+                                for subject_id in groups.index[groups == age_group] if subject_id in densities
+                                for values in [densities[subject_id]['series'].get((trial, condition, outcome))]
+                                if values is not None and not np.isnan(values).all()]
+                        if not rows:
+                            continue
+                        mean_density = np.mean(rows, axis=0)
+                        ax.plot(cohort_grid, mean_density, color=colors[idx % len(colors)], linestyle=linestyle,
+                               linewidth=2, label=f'{age_group} years {outcome_label} (n={len(rows)})')
+                        curves.append(mean_density)
+                
+                if not curves:
+                    ax.text(0.5, 0.5, f'No stride change densities\nfor {trial.upper()} trial',
+                           ha='center', va='center', transform=ax.transAxes, fontsize=12)
+                    continue
+                
+                # Zoom to where the curves carry visible density
+                visible = np.flatnonzero(np.max(curves, axis=0) >= 0.01 * np.max(curves))
+                ax.set_xlim(cohort_grid[visible[0]], cohort_grid[visible[-1]])
+                ax.axvline(0, color='black', linestyle='-', alpha=0.3, linewidth=1)
+                ax.legend(fontsize=8)
+        
+        fig.suptitle('Stride Length Change Distributions by Age Group', fontsize=16, fontweight='bold')
+        plt.tight_layout(rect=[0, 0, 1, 0.97])
+        plt.savefig(self.population_plots_dir / 'stride_change_density_by_age.png', 
+                   dpi=getattr(self.config, 'FIGURE_DPI', 300), bbox_inches='tight')
+        plt.close()
+        
+        print(f"   Stride change densities: {len(densities)} subjects by age group")
+    
+    def _plot_individual_stride_change_internal(self, subject_id: str, trial_types: List[str] = None,
+                                               stride_col: str = 'Sum of gains and steps',
+                                               figsize: Tuple[int, int] = (16, 18), 
+                                               save: bool = True, alpha: float = 0.7,
+                                               show_stats: bool = False,
+                                               periods_by_trial: Dict = None,
+                                               densities: Dict = None) -> Optional[Dict]:
+        """
+        Internal method for plotting individual stride changes with FIXED 3x2 grid layout.
+        Always creates exactly 6 subplots (3 trials × 2 conditions) regardless of data availability.
+        The panels are drawn from `periods_by_trial` and `densities` (this subject's
+        entries of _stride_change_periods and _get_stride_densities), which are
+        looked up here when not given.
+        """
+        
+        if trial_types is None:
+            trial_types = ['vis1', 'invis', 'vis2']
+        
+        # Check if subject exists
+        if subject_id not in self.data_manager.processed_data:
+            return None
+        
+        if periods_by_trial is None:
+            periods_by_trial = self._stride_change_periods([subject_id], trial_types, stride_col)[subject_id]
+        if densities is None:
+            densities = self._get_stride_densities([subject_id], trial_types, stride_col)[subject_id]
+        
+        # Get subject age for title
+        subject_age = self.data_manager.processed_data[subject_id]['metadata'].get('age_months', np.nan) / 12
+        
+        # FIXED: Always create 3x2 grid regardless of data availability
+        fig, axes = plt.subplots(3, 2, figsize=figsize, sharey=False)
+        
+        # Define the fixed layout mapping
+        layout_mapping = {
+            'vis1': (0, 0, 0, 1),    # Row 0, columns 0 and 1
+            'invis': (1, 0, 1, 1),   # Row 1, columns 0 and 1  
+            'vis2': (2, 0, 2, 1)     # Row 2, columns 0 and 1
+        }
+        
+        # Condition names for column headers
+        condition_names = ['Upper Target (Max Constant)', 'Lower Target (Min Constant)']
+        
+        # Function to process and plot data for each condition
+        def plot_condition_data(ax, period_sorted, condition_name, const_type, trial_type, row, col):
+            # Set title and labels regardless of data availability
+            ax.set_title(f'{trial_type.upper()}: {condition_name}\\n(last 20 strides)', 
+                        fontsize=12, fontweight='bold')
+            ax.set_xlabel(f'Change in {stride_col.replace("_", " ")}', fontsize=11)
+            ax.set_ylabel('Probability Density', fontsize=11)
+            ax.grid(True, alpha=0.3)
+            
+            if period_sorted is None:
+                ax.text(0.5, 0.5, f'No {condition_name.split()[0].lower()}\\ntarget data available', 
+                       ha='center', va='center', transform=ax.transAxes,
+                       fontsize=12, style='italic', color='gray',
+                       bbox=dict(boxstyle="round,pad=0.5", facecolor="lightgray", alpha=0.5))
+                ax.set_xlim(-2, 2)
+                ax.set_ylim(0, 1)
+                return None
+            
+            # Separate changes after success vs failure
+            success_deltas = period_sorted[period_sorted['Success'] == 1]['Delta'].dropna()
+            failure_deltas = period_sorted[period_sorted['Success'] == 0]['Delta'].dropna()
+            
+            if len(success_deltas) == 0 and len(failure_deltas) == 0:
+                ax.text(0.5, 0.5, f'No valid stride changes\\nfor {condition_name.split()[0].lower()} target', 
+                       ha='center', va='center', transform=ax.transAxes,
+                       fontsize=12, style='italic', color='gray',
+                       bbox=dict(boxstyle="round,pad=0.5", facecolor="lightgray", alpha=0.5))
+                ax.set_xlim(-2, 2)
+                ax.set_ylim(0, 1)
+                return None
+            
+            # Plot distributions using KDE or fallback methods
+            grid = densities['grid']
+            if len(success_deltas) > 0:
+                self._plot_distribution(ax, success_deltas, 'green', f'After Success (n={len(success_deltas)})', alpha,
+                                        density=(grid, densities['series'][(trial_type, const_type, 'success')]))
+            
+            if len(failure_deltas) > 0:
+                self._plot_distribution(ax, failure_deltas, 'red', f'After Failure (n={len(failure_deltas)})', alpha,
+                                        density=(grid, densities['series'][(trial_type, const_type, 'failure')]))
+            
+            # Add mean lines and formatting
+            if len(success_deltas) > 0:
+                ax.axvline(success_deltas.mean(), color='darkgreen', linestyle='--', linewidth=2,
+                           label=f'Success Mean: {success_deltas.mean():.3f}')
+            
+            if len(failure_deltas) > 0:
+                ax.axvline(failure_deltas.mean(), color='darkred', linestyle='--', linewidth=2,
+                           label=f'Failure Mean: {failure_deltas.mean():.3f}')
+            
+            ax.axvline(0, color='black', linestyle='-', alpha=0.3, linewidth=1)
+            
+            # Success rate annotation
+            if len(period_sorted) > 0:
+                success_rate = period_sorted['Success'].mean()
+                ax.text(0.02, 0.98, f'Success Rate: {success_rate:.1%}', 
+                       transform=ax.transAxes, fontsize=10, fontweight='bold',
+                       bbox=dict(boxstyle="round,pad=0.3", facecolor="lightblue", alpha=0.8),
+                       verticalalignment='top', horizontalalignment='left')
+            
+            ax.legend(loc='upper right', fontsize=9)
+            
+            # Return statistics
+            return {
+                f'{const_type}_success_mean': success_deltas.mean() if len(success_deltas) > 0 else None,
+                f'{const_type}_failure_mean': failure_deltas.mean() if len(failure_deltas) > 0 else None,
+                f'{const_type}_success_rate': period_sorted['Success'].mean(),
+                f'{const_type}_n_success': len(success_deltas),
+                f'{const_type}_n_failure': len(failure_deltas)
+            }
+        
+        # FIXED: Process all trial types in fixed positions
+        all_stats = {'subject_id': subject_id}
+        
+        for trial_type in trial_types:
+            # Get the fixed row and column positions for this trial type
+            if trial_type not in layout_mapping:
+                continue
+                
+            row_max, col_max, row_min, col_min = layout_mapping[trial_type]
+            
+            # Plot both conditions in their fixed positions
+            max_stats = plot_condition_data(
+                axes[row_max, col_max], periods_by_trial.get((trial_type, 'max')), condition_names[0], 'max',
+                trial_type, row_max, col_max
+            )
+            min_stats = plot_condition_data(
+                axes[row_min, col_min], periods_by_trial.get((trial_type, 'min')), condition_names[1], 'min',
+                trial_type, row_min, col_min
+            )
+            
+            # Combine statistics for this trial type
+            trial_stats = {}
+            if max_stats:
+                trial_stats.update(max_stats)
+            if min_stats:
+                trial_stats.update(min_stats)
+            
+            all_stats[trial_type] = trial_stats
+        
+        # FIXED: Add column headers at the top
+        for col, condition_name in enumerate(condition_names):
+            fig.text(0.25 + col * 0.5, 0.95, condition_name, ha='center', va='bottom', 
+                    fontsize=14, fontweight='bold', transform=fig.transFigure)
+        
+        # Overall title
+        fig.suptitle(f'Stride Length Change Distributions\\n'
+                    f'Subject: {subject_id} (Age: {subject_age:.1f} years)', 
+                    fontsize=16, fontweight='bold', y=0.98)
+        
+        plt.tight_layout(rect=[0, 0, 1, 0.94])  # Leave space for title and headers
+        
+        # Save figure
+        if save:
+            filename = f"stride_change_{subject_id}_fixed_grid.png"
+            save_dir = self.individual_plots_dir / "stride_change_after_success_vs_failure"
+            save_dir.mkdir(parents=True, exist_ok=True)
+            plt.savefig(save_dir / filename, dpi=getattr(self.config, 'FIGURE_DPI', 300), bbox_inches='tight')
+        
+        plt.close()  # Close to save memory
+        
+        return all_stats
+
+    def _stride_change_periods(self, subject_ids: List[str], trial_types: List[str],
+                               stride_col: str = 'Sum of gains and steps') -> Dict:
+        """
+        Rows of the cohort stride change table (see
+        MetricsCalculator.calculate_stride_changes) by subject and (trial type,
+        'max'/'min' target), for every period with data. The rows hold each
+        stride of the period but the last, in stride order, with the change to
+        the next stride as 'Delta'.
+        """
+        changes, summary = self._get_stride_changes(stride_col)
+        periods = summary[summary['ID'].isin(subject_ids) & summary['trial_type'].isin(trial_types)]
+        rows = changes[changes['ID'].isin(subject_ids) & changes['trial_type'].isin(trial_types)]
+        groups = dict(list(rows.groupby(['ID', 'trial_type', 'condition'], observed=True, sort=False)))
+        
+        periods_by_subject = {subject_id: {} for subject_id in subject_ids}
+        for subject_id, trial_type, condition in zip(periods['ID'], periods['trial_type'], periods['condition']):
+            periods_by_subject[subject_id][(trial_type, condition)] = groups.get(
+                (subject_id, trial_type, condition), rows.iloc[:0])
+        return periods_by_subject
+
+    def _get_stride_densities(self, subject_ids: List[str], trial_types: List[str] = None,
+                              stride_col: str = 'Sum of gains and steps') -> Dict:
+        """
+        KDEs of the stride changes after success and after failure in every
+        panel of the given subjects (computed once per visualizer).
+        
+        Subjects not cached yet are estimated together in one DensityEstimator
+        pass, each on its own grid covering all of its panels. Returns, by
+        subject, {'grid': array, 'series': {(trial_type, condition, outcome): densities}};
+        densities are NaN where there are too few changes for a KDE.
+        """
+        if trial_types is None:
+            trial_types = ['vis1', 'invis', 'vis2']
+        
+        cache = getattr(self, '_stride_densities', None)
+        if cache is None:
+            cache = self._stride_densities = {}
+        
+        estimator = DensityEstimator(grid_points=getattr(self.config, 'DENSITY_GRID_POINTS', 1024))
+        keys, samples, grids, pending = [], [], [], []
+        uncached = [subject_id for subject_id in subject_ids
+                    if (subject_id, stride_col, tuple(trial_types)) not in cache
+                    and subject_id in self.data_manager.processed_data]
+        periods_by_subject = self._stride_change_periods(uncached, trial_types, stride_col) if uncached else {}
+        
+        for subject_id in uncached:
+            subject_keys, subject_samples = [], []
+            for (trial_type, condition), period in periods_by_subject[subject_id].items():
+                for outcome, success in [('success', 1), ('failure', 0)]:
+                    subject_keys.append((trial_type, condition, outcome))
+                    subject_samples.append(period.loc[period['Success'] == success, 'Delta'].dropna().to_numpy())
+            
+            grid = estimator.grid_for(subject_samples)
+            pending.append((subject_id, grid, len(subject_keys)))
+            keys.extend(subject_keys)
+            samples.extend(subject_samples)
+            grids.extend([grid] * len(subject_keys))
+        
+        if pending:
+            densities = estimator.evaluate(samples, np.vstack(grids)) if samples else None
+            row = 0
+            for subject_id, grid, n_series in pending:
+                cache[(subject_id, stride_col, tuple(trial_types))] = {
+                    'grid': grid,
+                    'series': {keys[i]: densities[i] for i in range(row, row + n_series)}
+                }
+                row += n_series
+        
+        return {subject_id: cache[(subject_id, stride_col, tuple(trial_types))] for subject_id in subject_ids
+                if (subject_id, stride_col, tuple(trial_types)) in cache}
+
+    def _plot_distribution(self, ax, data, color, label, alpha, density: Tuple = None):
+        """
+        Helper method to plot distributions with KDE or fallback.
+        `density` is the KDE of `data` precomputed on a grid covering it, as a
+        (grid, values) pair (see _get_stride_densities); it is evaluated here when not given.
+        """
+        try:
+            if len(data) >= 2:
+                if density is None:
+                    estimator = DensityEstimator(grid_points=getattr(self.config, 'DENSITY_GRID_POINTS', 1024))
+                    grid = estimator.grid_for([data])
+                    density = (grid, estimator.evaluate([data], grid)[0])
+                grid, values = density
+                if np.isnan(values).all():
+                    raise ValueError("no spread to estimate a density from")
+                
+                x_min, x_max = data.min(), data.max()
+                x_range = x_max - x_min
+                if x_range > 0:
+                    x_min -= x_range * 0.1
+                    x_max += x_range * 0.1
+                else:
+                    x_min -= 0.1
+                    x_max += 0.1
+                
+                x_smooth = np.linspace(x_min, x_max, 200)
+                y_smooth = np.interp(x_smooth, grid, values)
+                
+                ax.plot(x_smooth, y_smooth, color=color, linewidth=3, alpha=0.8, label=label)
+                ax.fill_between(x_smooth, y_smooth, alpha=alpha*0.5, color=color)
+            else:
+                for i, val in enumerate(data):
+                    ax.axvline(val, color=color, alpha=0.7, linewidth=2,
+                              label=label if i == 0 else "")
+        except Exception:
+            # Fallback to histogram
+            if len(data) >= 2:
+                ax.hist(data, bins=min(10, len(data)), alpha=alpha, color=color, 
+                        label=label, density=True, edgecolor='black', linewidth=0.5)
+            else:
+                for i, val in enumerate(data):
+                    ax.axvline(val, color=color, alpha=0.7, linewidth=3,
+                              label=label if i == 0 else "")
+
+    def _save_stride_analysis_summary(self, all_stats: Dict, trial_types: List[str] = None,
+                                      stride_col: str = 'Sum of gains and steps') -> None:
+        """Save the per-period summary and every stride change of the plotted subjects to CSV."""
+        
+        if trial_types is None:
+            trial_types = ['vis1', 'invis', 'vis2']
+        
+        changes, summary = self._get_stride_changes(stride_col)
+        subject_ids = list(all_stats.keys())
+        summary_df = summary[summary['ID'].isin(subject_ids) & summary['trial_type'].isin(trial_types)]
+        if summary_df.empty:
+            return
+        
+        ages = {subject_id: stats.get('age', np.nan) for subject_id, stats in all_stats.items()}
+        summary_df = summary_df.rename(columns={'ID': 'subject_id'})
+        summary_df.insert(1, 'age', summary_df['subject_id'].astype(object).map(ages))
+        summary_path = self.individual_plots_dir / 'stride_analysis_summary.csv'
+        summary_df.to_csv(summary_path, index=False)
+        
+        changes_path = self.individual_plots_dir / 'stride_changes.csv'
+        changes[changes['ID'].isin(subject_ids) & changes['trial_type'].isin(trial_types)].to_csv(
+            changes_path, index=False)
+        print(f"📊 Stride analysis summary saved to: {summary_path} (per-stride changes: {changes_path.name})")
+
+    # ==========================================================================
+    # UTILITY METHODS
+    # ==========================================================================
+
+    def _add_trendline(self, ax, x, y):
+        """Add trendline with correlation coefficient to plot."""
+        x_clean = pd.to_numeric(x, errors='coerce')
+        y_clean = pd.to_numeric(y, errors='coerce')
+        valid = x_clean.notna() & y_clean.notna()
+        
+        if valid.sum() < 2:
+            return
+        
+        x_vals = x_clean[valid]
+        y_vals = y_clean[valid]
+        
+        try:
+            # Fit line
+            coeffs = np.polyfit(x_vals, y_vals, 1)
+            trendline = np.poly1d(coeffs)
+            
+            # Calculate correlation
+            r, p = pearsonr(x_vals, y_vals)
+            
+            # Plot trendline
+            ax.plot(x_vals, trendline(x_vals), 'r--', alpha=0.8, linewidth=2)
+            
+            # Add correlation text
+            ax.text(0.05, 0.95, f'r² = {r**2:.3f}\\np = {p:.3f}\\nn = {len(x_vals)}', 
+                   transform=ax.transAxes,
+                   bbox=dict(boxstyle='round', facecolor='white', alpha=0.8),
+                   verticalalignment='top', fontsize=10)
+        except Exception as e:
+            print(f"Could not add trendline: {e}")
+
+        
+
+
+def _render_stride_change_job(config: Config, individual_plots_dir: Path, subject_id: str,
+                              subject_data: Dict, trial_types: List[str], params: Dict,
+                              periods_by_trial: Optional[Dict] = None, densities: Optional[Dict] = None):
+    """Process-pool worker: render one subject's stride-change figure with the Agg backend."""
+    plt.switch_backend('Agg')
+    
+    data_manager = MotorLearningDataManager.__new__(MotorLearningDataManager)
+    data_manager.config = config
+    data_manager.processed_data = {subject_id: subject_data}
+    
+    visualizer = StandaloneEnhancedVisualizer.__new__(StandaloneEnhancedVisualizer)
+    visualizer.config = config
+    visualizer.data_manager = data_manager
+    visualizer.individual_plots_dir = individual_plots_dir
+    
+    log = io.StringIO()
+    error = None
+    stats = None
+    with contextlib.redirect_stdout(log):
+        try:
+            stats = visualizer._plot_individual_stride_change_internal(
+                subject_id, trial_types, save=True, show_stats=False,
+                periods_by_trial=periods_by_trial, densities=densities, **params
+            )
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+    
+    return stats, log.getvalue(), error
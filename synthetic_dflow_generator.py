@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Synthetic D-Flow Data Generator for Motor Learning Benchmarks
+Writes realistic, shareable subject folders in the same layout as muh_data/.
+
+Each subject gets tab-separated per-sample exports (primer/trial/vis/pref),
+with per-stride target size / Constant schedules, learning curves, duplicate
+sample rows, occasional time jumps and split or restarted fragments, plus a
+metadata CSV row. Output is fully determined by the seed and parameters.
+
+Requirements:
+- pip install numpy pandas
+
+Usage:
+    python synthetic_dflow_generator.py --subjects 100 --output synthetic_data
+    python synthetic_dflow_generator.py --subjects 5000 --sample-rate 30 --workers 8
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Column layout of the D-Flow exports (as found in muh_data/)
+STRIDE_TRIAL_COLUMNS = [
+    'Time', 'Left foot marker', 'Right foot marker', 'Left vertical force', 'Right vertical force',
+    'Success', 'Preferred left step length', 'Preferred Right step length', 'Left gain', 'Right gain',
+    'Constant', 'Stride Number', 'Right step length', 'Left step length', 'Sum of gains and steps',
+    'Lower bound success', 'Upper bound success', 'Score', 'Success Region', 'Left heel strike',
+    'Right heel strike', 'Short or long first', 'Feedback', 'Firework position',
+    'Left foot lateral position', 'Right foot lateral position'
+]
+
+PREF_TRIAL_COLUMNS = [
+    'Time', 'Left foot marker', 'Right foot marker', 'Left vertical force', 'Right vertical force',
+    'Stride length', 'Right step length', 'Left step length', 'Right preferred step length',
+    'Left preferred step length', 'Right heel strike', 'Left heel strike'
+]
+
+# File prefixes of the stride trials (see Config.TRIAL_TYPE_MAPPING)
+STRIDE_TRIAL_PREFIXES = ['primer', 'trial', 'vis']
+
+# Raw 'Sum of gains and steps' is scaled by 1.5 during processing
+SOGS_SCALE = 1.5
+
+DEFAULTS = {
+    'n_subjects': 100,
+    'n_strides': 300,
+    'pref_strides': 60,
+    'sample_rate': 300.0,
+    'seed': 0,
+    'split_prob': 0.3,
+    'restart_prob': 0.1,
+    'missing_trial_prob': 0.03,
+    'duplicate_row_prob': 0.002,
+    'time_jump_prob': 0.05,
+    'max_constant': 2.0,
+    'min_constant': 1.6,
+    'target_sizes': [1.1, 0.6, 0.31]
+}
+
+
+def subject_ids(n_subjects: int, start: int = 1) -> List[str]:
+    """Synthetic subject IDs (SYN00001, SYN00002, ...)."""
+    return [f"SYN{i:05d}" for i in range(start, start + n_subjects)]
+
+
+def subject_profile(rng: np.random.Generator) -> Dict:
+    """Draw one subject's age and motor characteristics."""
+    age_months = int(rng.integers(84, 216))
+    age_years = age_months / 12
+
+    # Younger children are noisier and learn more slowly
+    maturity = (age_years - 7) / 11
+    return {
+        'age_months': age_months,
+        'motor_noise': float(np.clip(rng.normal(0.18 - 0.08 * maturity, 0.03), 0.04, None)),
+        'initial_bias': float(rng.normal(-0.35, 0.15)),
+        'learning_tau': float(np.clip(rng.normal(80 - 40 * maturity, 15), 10, None)),
+        'asymmetry': float(rng.normal(0.0, 0.04)),
+        'preferred_step': float(np.clip(rng.normal(0.30 + 0.12 * maturity, 0.03), 0.15, None)),
+        'stride_duration': float(np.clip(rng.normal(1.15 - 0.15 * maturity, 0.05), 0.7, None))
+    }
+
+
+def metadata_row(subject_id: str, profile: Dict, rng: np.random.Generator) -> Dict:
+    """Metadata CSV row in the muh_metadata.csv format."""
+    session = date(2023, 1, 1) + timedelta(days=int(rng.integers(0, 730)))
+    dob = session - timedelta(days=int(round(profile['age_months'] * 30.4375)) + int(rng.integers(0, 30)))
+    return {
+        'ID': subject_id,
+        'DOB': f"{dob.month}/{dob.day}/{dob.year}",
+        'Session Date': f"{session.month}/{session.day}/{session.year}",
+        'age_years': profile['age_months'] // 12,
+        'age_months': profile['age_months']
+    }
+
+
+def stride_schedule(n_strides: int, params: Dict, rng: np.random.Generator,
+                    max_first: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-stride target size and Constant for one trial.
+
+    Target size shrinks block by block; the final (minimum) target size is
+    split between the max and min Constant, in the given order.
+    """
+    target_sizes = params['target_sizes']
+    n_warmup = len(target_sizes) - 1
+    warmup_len = max(1, n_strides // (2 * max(n_warmup, 1) + 2))
+
+    targets, constants = [], []
+    for size in target_sizes[:-1]:
+        targets.append(np.full(warmup_len, size))
+        constants.append(np.full(warmup_len, params['max_constant']))
+
+    remaining = n_strides - warmup_len * n_warmup
+    first_half = remaining // 2
+    order = ([params['max_constant'], params['min_constant']] if max_first
+             else [params['min_constant'], params['max_constant']])
+    for constant, length in zip(order, [first_half, remaining - first_half]):
+        targets.append(np.full(length, target_sizes[-1]))
+        constants.append(np.full(length, constant))
+
+    return np.concatenate(targets)[:n_strides], np.concatenate(constants)[:n_strides]
+
+
+def _stride_samples(rng: np.random.Generator, n_strides: int, profile: Dict,
+                    sample_rate: float) -> np.ndarray:
+    """Number of samples recorded for each stride."""
+    durations = np.clip(rng.normal(profile['stride_duration'], 0.05, n_strides), 0.5, None)
+    return np.maximum(2, np.round(durations * sample_rate).astype(np.int64))
+
+
+# Phase of the stride cycle at which each foot's stance (and its heel strike counter) starts
+RIGHT_STANCE_PHASE = 0.4
+
+
+def _heel_strike_counters(samples_per_stride: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """D-Flow heel strike counters: left steps up at each stride start, right at the right stance onset."""
+    stride_of = np.repeat(np.arange(len(samples_per_stride)), samples_per_stride)
+    starts = np.cumsum(samples_per_stride) - samples_per_stride
+    phase = (np.arange(len(stride_of)) - starts[stride_of]) / samples_per_stride[stride_of]
+    return stride_of.astype(float), (stride_of + (phase >= RIGHT_STANCE_PHASE)).astype(float)
+
+
+def _gait_channels(rng: np.random.Generator, samples_per_stride: np.ndarray,
+                   step_lengths: Tuple[np.ndarray, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Per-sample marker, force and lateral channels shaped by the gait cycle.
+
+    The left foot is loaded from phase 0 and the right from RIGHT_STANCE_PHASE.
+    The markers are phased so their distance at each heel strike is that
+    stride's step length (left foot ahead by the left step at the left heel
+    strike, right foot ahead by the right step at the right one), held
+    around each heel strike and eased between them with a half cosine.
+    """
+    n_samples = int(samples_per_stride.sum())
+    stride_of = np.repeat(np.arange(len(samples_per_stride)), samples_per_stride)
+    starts = np.cumsum(samples_per_stride) - samples_per_stride
+    phase = (np.arange(n_samples) - starts[stride_of]) / samples_per_stride[stride_of]
+
+    # Left-minus-right marker distance: +left step at phase 0, -right step at
+    # RIGHT_STANCE_PHASE, then +left step of the next stride at phase 1
+    right_step, left_step = step_lengths
+    next_left = np.append(left_step[1:], left_step[-1:])
+    first_half = phase < RIGHT_STANCE_PHASE
+    ease = np.where(first_half, phase / RIGHT_STANCE_PHASE,
+                    (phase - RIGHT_STANCE_PHASE) / (1 - RIGHT_STANCE_PHASE))
+    ease = np.clip((ease - 0.15) / 0.7, 0, 1)  # held around heel strikes, so detection lag does not matter
+    start = np.where(first_half, left_step[stride_of], -right_step[stride_of])
+    end = np.where(first_half, -right_step[stride_of], next_left[stride_of])
+    separation = end + (start - end) * (1 + np.cos(np.pi * ease)) / 2
+
+    stance = 1 - RIGHT_STANCE_PHASE
+    left_force = np.where(phase < stance, 260 * np.sin(np.pi * np.clip(phase / stance, 0, 1)), 0.0)
+    right_force = np.where(phase >= RIGHT_STANCE_PHASE,
+                           260 * np.sin(np.pi * np.clip((phase - RIGHT_STANCE_PHASE) / stance, 0, 1)), 0.0)
+
+    noise = lambda scale: rng.normal(0, scale, n_samples)
+    return {
+        'Left foot marker': separation / 2 + noise(0.002),
+        'Right foot marker': -separation / 2 + noise(0.002),
+        'Left vertical force': np.maximum(left_force + noise(1.5), -5),
+        'Right vertical force': np.maximum(right_force + noise(1.5), -5),
+        'Left foot lateral position': -0.1 + noise(0.01),
+        'Right foot lateral position': 0.1 + noise(0.01)
+    }
+
+
+def simulate_stride_trial(rng: np.random.Generator, profile: Dict, params: Dict,
+                          start_time: float, max_first: bool = True) -> pd.DataFrame:
+    """Per-sample export of one stride trial (primer/trial/vis)."""
+    n_strides = params['n_strides']
+    targets, constants = stride_schedule(n_strides, params, rng, max_first=max_first)
+
+    # Learning curve: the bias decays with practice, motor noise stays
+    stride = np.arange(n_strides)
+    bias = profile['initial_bias'] * np.exp(-stride / profile['learning_tau'])
+    scaled_sogs = constants + bias + rng.normal(0, profile['motor_noise'], n_strides)
+    success = (np.abs(scaled_sogs - constants) <= targets / 2).astype(float)
+    raw_sogs = scaled_sogs / SOGS_SCALE
+
+    asymmetry = profile['asymmetry'] + rng.normal(0, 0.02, n_strides)
+    right_step = raw_sogs / 2 * (1 + asymmetry)
+    left_step = raw_sogs / 2 * (1 - asymmetry)
+
+    # Stride 0 is the initial stride before any step is scored
+    success[0] = 0.0
+    raw_sogs[0] = right_step[0] = left_step[0] = 0.0
+
+    samples_per_stride = _stride_samples(rng, n_strides, profile, params['sample_rate'])
+    n_samples = int(samples_per_stride.sum())
+    stride_of = np.repeat(stride, samples_per_stride)
+    per_stride = lambda values: np.repeat(values, samples_per_stride)
+    left_strikes, right_strikes = _heel_strike_counters(samples_per_stride)
+
+    columns = {
+        'Time': start_time + np.arange(n_samples) / params['sample_rate'],
+        'Success': per_stride(success),
+        'Preferred left step length': np.full(n_samples, round(profile['preferred_step'], 2)),
+        'Preferred Right step length': np.full(n_samples, round(profile['preferred_step'], 2)),
+        'Left gain': np.ones(n_samples),
+        'Right gain': np.ones(n_samples),
+        'Constant': per_stride(constants),
+        'Stride Number': stride_of.astype(float),
+        'Right step length': per_stride(right_step),
+        'Left step length': per_stride(left_step),
+        'Sum of gains and steps': per_stride(raw_sogs),
+        'Lower bound success': per_stride(constants - targets / 2),
+        'Upper bound success': per_stride(constants + targets / 2),
+        'Score': per_stride(np.concatenate([[0.0], np.cumsum(success)[:-1]])),
+        'Success Region': per_stride(targets / 2),
+        'Left heel strike': left_strikes,
+        'Right heel strike': right_strikes,
+        'Short or long first': np.full(n_samples, 1.0 if max_first else 2.0),
+        'Feedback': np.full(n_samples, 2.0),
+        'Firework position': np.ones(n_samples)
+    }
+    columns.update(_gait_channels(rng, samples_per_stride, (right_step, left_step)))
+
+    return _add_recording_artifacts(rng, pd.DataFrame(columns)[STRIDE_TRIAL_COLUMNS], params)
+
+
+def simulate_pref_trial(rng: np.random.Generator, profile: Dict, params: Dict,
+                        start_time: float) -> pd.DataFrame:
+    """Per-sample export of the preferred-speed walking trial (no stride numbering)."""
+    n_strides = params['pref_strides']
+    noise = profile['motor_noise'] / 4
+    right_step = profile['preferred_step'] * (1 + profile['asymmetry'] / 2) + rng.normal(0, noise, n_strides)
+    left_step = profile['preferred_step'] * (1 - profile['asymmetry'] / 2) + rng.normal(0, noise, n_strides)
+    right_step[0] = 0.0
+
+    samples_per_stride = _stride_samples(rng, n_strides, profile, params['sample_rate'])
+    n_samples = int(samples_per_stride.sum())
+    per_stride = lambda values: np.repeat(values, samples_per_stride)
+    left_strikes, right_strikes = _heel_strike_counters(samples_per_stride)
+
+    columns = {
+        'Time': start_time + np.arange(n_samples) / params['sample_rate'],
+        'Stride length': per_stride(right_step + left_step),
+        'Right step length': per_stride(right_step),
+        'Left step length': per_stride(left_step),
+        'Right preferred step length': per_stride(right_step),
+        'Left preferred step length': per_stride(left_step),
+        'Right heel strike': right_strikes,
+        'Left heel strike': left_strikes
+    }
+    columns.update(_gait_channels(rng, samples_per_stride, (right_step, left_step)))
+
+    return pd.DataFrame(columns)[PREF_TRIAL_COLUMNS]
+
+
+def _add_recording_artifacts(rng: np.random.Generator, df: pd.DataFrame, params: Dict) -> pd.DataFrame:
+    """Duplicate sample rows and an occasional time jump, as seen in real exports."""
+    n_rows = len(df)
+    duplicates = np.flatnonzero(rng.random(n_rows) < params['duplicate_row_prob'])
+    if len(duplicates):
+        order = np.sort(np.concatenate([np.arange(n_rows), duplicates]), kind='stable')
+        df = df.iloc[order].reset_index(drop=True)
+
+    if rng.random() < params['time_jump_prob'] and len(df) > 10:
+        jump_at = int(rng.integers(len(df) // 4, len(df)))
+        time = df['Time'].to_numpy().copy()
+        time[jump_at:] += rng.uniform(0.5, 3.0)
+        df['Time'] = time
+
+    return df
+
+
+def split_fragments(rng: np.random.Generator, df: pd.DataFrame, params: Dict) -> List[pd.DataFrame]:
+    """
+    Split a trial into the fragments D-Flow would have written.
+
+    A trial may be split at stride boundaries into contiguous pieces, and may
+    be preceded by a short aborted attempt whose stride numbers restart at 0.
+    """
+    fragments = [df]
+
+    if rng.random() < params['split_prob']:
+        strides = df['Stride Number'].to_numpy()
+        n_strides = int(strides.max()) + 1
+        n_cuts = int(rng.integers(1, 3))
+        cuts = np.sort(rng.choice(np.arange(5, max(6, n_strides - 5)), size=n_cuts, replace=False))
+        bounds = [0, *np.searchsorted(strides, cuts), len(df)]
+        fragments = [df.iloc[start:end] for start, end in zip(bounds[:-1], bounds[1:]) if end > start]
+
+    if rng.random() < params['restart_prob']:
+        aborted_strides = int(rng.integers(2, 8))
+        aborted = df[df['Stride Number'] < aborted_strides].copy()
+        aborted['Time'] = aborted['Time'] - (aborted['Time'].iloc[-1] - aborted['Time'].iloc[0] + 30)
+        fragments = [aborted] + fragments
+
+    return fragments
+
+
+def write_export(df: pd.DataFrame, path: Path) -> None:
+    """Write a tab-separated export with D-Flow's 6-decimal formatting."""
+    # Formatting whole rows at once is several times faster than to_csv(float_format=...)
+    row_format = '\t'.join(['%.6f'] * len(df.columns)) + '\n'
+    with open(path, 'w', newline='\n') as f:
+        f.write('\t'.join(df.columns) + '\n')
+        f.writelines(row_format % tuple(row) for row in df.to_numpy(dtype=np.float64).tolist())
+
+
+def generate_subject(subject_id: str, output_dir: Path, params: Dict) -> Dict:
+    """Generate one subject folder; returns its metadata row."""
+    # Seeded per subject, so any subset can be regenerated identically
+    rng = np.random.default_rng([params['seed'], int(subject_id[3:])])
+    profile = subject_profile(rng)
+    subject_dir = Path(output_dir) / subject_id
+    subject_dir.mkdir(parents=True, exist_ok=True)
+
+    start_time = float(rng.uniform(500, 5000))
+
+    pref = simulate_pref_trial(rng, profile, params, start_time)
+    write_export(pref, subject_dir / 'pref0001.txt')
+    start_time = pref['Time'].iloc[-1] + 60
+
+    for prefix in STRIDE_TRIAL_PREFIXES:
+        if rng.random() < params['missing_trial_prob']:
+            continue
+        trial = simulate_stride_trial(rng, profile, params, start_time, max_first=bool(rng.random() < 0.5))
+        for number, fragment in enumerate(split_fragments(rng, trial, params), 1):
+            write_export(fragment, subject_dir / f'{prefix}{number:04d}.txt')
+        start_time = trial['Time'].iloc[-1] + 60
+
+    return metadata_row(subject_id, profile, rng)
+
+
+def generate_cohort(output_dir: str, n_subjects: int = DEFAULTS['n_subjects'],
+                    workers: int = 1, overwrite: bool = False, **overrides) -> Dict:
+    """
+    Generate a synthetic cohort: one folder per subject plus metadata.csv.
+
+    Returns the generation parameters (also written to generator.json). An
+    existing cohort generated with the same parameters is reused unless
+    ``overwrite`` is set.
+    """
+    output_dir = Path(output_dir)
+    params = {**DEFAULTS, **overrides, 'n_subjects': n_subjects}
+    params_path = output_dir / 'generator.json'
+
+    if not overwrite and params_path.exists():
+        try:
+            with open(params_path, 'r') as f:
+                if json.load(f) == json.loads(json.dumps(params)):
+                    print(f"♻️ Reusing synthetic cohort in {output_dir}")
+                    return params
+        except (OSError, ValueError):
+            pass
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    ids = subject_ids(n_subjects)
+    print(f"🧪 Generating {n_subjects} synthetic subjects in {output_dir}...")
+
+    if workers > 1 and n_subjects > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            rows = list(executor.map(generate_subject, ids, [output_dir] * n_subjects,
+                                     [params] * n_subjects, chunksize=max(1, n_subjects // (4 * workers))))
+    else:
+        rows = [generate_subject(subject_id, output_dir, params) for subject_id in ids]
+
+    pd.DataFrame(rows).to_csv(output_dir / 'metadata.csv', index=False)
+    with open(params_path, 'w') as f:
+        json.dump(params, f, indent=2)
+
+    print(f"✓ Wrote {n_subjects} subjects and {output_dir / 'metadata.csv'}")
+    return params
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic D-Flow cohort")
+    parser.add_argument('--output', default='synthetic_data', help="Output directory")
+    parser.add_argument('--subjects', type=int, default=DEFAULTS['n_subjects'], help="Number of subjects")
+    parser.add_argument('--strides', type=int, default=DEFAULTS['n_strides'], help="Strides per trial")
+    parser.add_argument('--pref-strides', type=int, default=DEFAULTS['pref_strides'], help="Strides in the pref trial")
+    parser.add_argument('--sample-rate', type=float, default=DEFAULTS['sample_rate'], help="Samples per second")
+    parser.add_argument('--seed', type=int, default=DEFAULTS['seed'], help="Random seed")
+    parser.add_argument('--split-prob', type=float, default=DEFAULTS['split_prob'],
+                        help="Probability that a trial is split into fragments")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Generator processes")
+    parser.add_argument('--overwrite', action='store_true', help="Regenerate even if parameters match")
+    args = parser.parse_args()
+
+    generate_cohort(args.output, n_subjects=args.subjects, workers=args.workers, overwrite=args.overwrite,
+                    n_strides=args.strides, pref_strides=args.pref_strides,
+                    sample_rate=args.sample_rate, seed=args.seed, split_prob=args.split_prob)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Shared fixtures: a small synthetic D-Flow cohort and managers over it."""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from muh.config import Config
+from muh.data import MotorLearningDataManager
+from synthetic_dflow_generator import generate_cohort
+
+COHORT = {'n_subjects': 6, 'n_strides': 120, 'pref_strides': 30, 'sample_rate': 30.0, 'seed': 1}
+
+
+@pytest.fixture(scope='session')
+def cohort_dir(tmp_path_factory) -> Path:
+    """Read-only synthetic cohort (one folder per subject plus metadata.csv)."""
+    root = tmp_path_factory.mktemp('cohort')
+    generate_cohort(str(root), **COHORT)
+    return root
+
+
+@pytest.fixture
+def cohort_copy(cohort_dir, tmp_path) -> Path:
+    """Writable copy of the cohort, for tests that add, change or remove exports."""
+    root = tmp_path / 'data'
+    shutil.copytree(cohort_dir, root)
+    return root
+
+
+@pytest.fixture
+def make_manager(tmp_path):
+    """Build a MotorLearningDataManager whose caches live under this test's tmp_path."""
+    def make(data_root: Path, output: str = 'output', settings: dict = None, **kwargs) -> MotorLearningDataManager:
+        config = Config(str(tmp_path / output), verbose=False)
+        for name, value in (settings or {}).items():
+            setattr(config, name, value)
+        kwargs.setdefault('debug', False)
+        return MotorLearningDataManager(str(Path(data_root) / 'metadata.csv'), str(data_root), config, **kwargs)
+    return make
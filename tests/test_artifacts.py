@@ -0,0 +1,107 @@
+"""ArtifactGraph: memoized stages are reused, regenerated and invalidated as their inputs change."""
+
+import pytest
+
+from muh.artifacts import ArtifactGraph
+
+SETTINGS = {}
+CALLS = []
+
+
+def make_a():
+    CALLS.append('a')
+    return SETTINGS['a']
+
+
+def make_b():
+    CALLS.append('b')
+    return SETTINGS['b']
+
+
+def double(a):
+    CALLS.append('double')
+    return 2 * a
+
+
+def total(a, b):
+    CALLS.append('total')
+    return a + b
+
+
+def parity(b):
+    CALLS.append('parity')
+    return b % 2
+
+
+def label(parity_value):
+    CALLS.append('label')
+    return 'odd' if parity_value else 'even'
+
+
+def write_total(total_value):
+    CALLS.append('write_total')
+    path = SETTINGS['output'] / 'total.txt'
+    path.write_text(str(total_value))
+    return str(path)
+
+
+@pytest.fixture
+def run_graph(tmp_path):
+    """Run the graph as a fresh process would (new ArtifactGraph, same cache); returns values and statuses."""
+    SETTINGS.clear()
+    SETTINGS.update({'a': 1, 'b': 10, 'output': tmp_path})
+
+    def run():
+        graph = ArtifactGraph(tmp_path / 'cache', params=[SETTINGS])
+        graph.add('a', make_a, params=['a'])
+        graph.add('b', make_b, params=['b'])
+        graph.add('double', double, deps=['a'])
+        graph.add('total', total, deps=['a', 'b'])
+        graph.add('parity', parity, deps=['b'])
+        graph.add('label', label, deps=['parity'])
+        graph.add('write_total', write_total, deps=['total'], files=lambda path: [path])
+        CALLS.clear()
+        values = graph.run()
+        return values, dict(zip(graph.summary()['stage'], graph.summary()['status']))
+    return run
+
+
+def test_unchanged_stages_are_reused(run_graph):
+    first, statuses = run_graph()
+    assert set(statuses.values()) == {'run'}
+
+    second, statuses = run_graph()
+
+    assert set(statuses.values()) == {'cached'} and CALLS == []
+    assert second == first
+    assert second['total'] == 11 and second['label'] == 'even'
+
+
+def test_deleted_output_file_is_regenerated(run_graph, tmp_path):
+    run_graph()
+    (tmp_path / 'total.txt').unlink()
+
+    _, statuses = run_graph()
+
+    assert CALLS == ['write_total']
+    assert statuses['write_total'] == 'run'
+    assert (tmp_path / 'total.txt').read_text() == '11'
+
+
+def test_input_change_invalidates_only_downstream_stages(run_graph, tmp_path):
+    run_graph()
+    SETTINGS['b'] = 20
+
+    values, statuses = run_graph()
+
+    assert sorted(CALLS) == ['b', 'parity', 'total', 'write_total']
+    assert {name for name, status in statuses.items() if status == 'run'} == {'b', 'parity', 'total', 'write_total'}
+    # parity reproduced its value, so label stays cached
+    assert statuses['label'] == 'cached' and statuses['a'] == statuses['double'] == 'cached'
+    assert values['total'] == 21 and (tmp_path / 'total.txt').read_text() == '21'
+
+    # Toggling back reuses the older artifacts; only the overwritten file is written again
+    SETTINGS['b'] = 10
+    _, statuses = run_graph()
+    assert CALLS == ['write_total']
+    assert (tmp_path / 'total.txt').read_text() == '11'
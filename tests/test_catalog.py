@@ -0,0 +1,95 @@
+"""ExportCatalog: duplicate and truncated copies of an export are one recording."""
+
+import os
+import shutil
+
+import pytest
+
+from muh.catalog import ExportCatalog
+from test_data import _assert_same_processed_data
+
+HEADER = 'Time\tStride Number\tLeft step length\n'
+
+
+def _export(n_rows, offset=0.0):
+    return HEADER + ''.join(f"{offset + i / 100:.3f}\t{i // 100}\t0.{i % 1000:03d}\n" for i in range(n_rows))
+
+
+def _truncate(path, n_bytes):
+    data = path.read_bytes()
+    path.write_bytes(data[:data.rindex(b'\n', 0, n_bytes) + 1])
+
+
+@pytest.fixture
+def roots(tmp_path):
+    primary, extra = tmp_path / 'muh_data', tmp_path / 'dflow_data'
+    for folder in (primary / 'S1', primary / 'S2', extra / 'S1' / 'backup'):
+        folder.mkdir(parents=True)
+    complete = _export(1000)
+    (extra / 'S1' / 'trial0001.txt').write_text(complete)
+    (extra / 'S1' / 'backup' / 'find trial0001.txt').write_text(complete)
+    (primary / 'S1' / 'trial0001.txt').write_text(complete)
+    _truncate(primary / 'S1' / 'trial0001.txt', 6000)  # longer than HEAD_BYTES
+    (primary / 'S1' / 'trial0002.txt').write_text(complete[:200])  # shorter than HEAD_BYTES
+    (primary / 'S1' / 'vis0001.txt').write_text(_export(50, offset=20.0))
+    (primary / 'S2' / 'vis0001.txt').write_text(_export(50, offset=20.0))
+    (primary / 'README.txt').write_text('Exports copied from the lab PC\n')
+    return primary, extra
+
+
+def test_copies_resolve_to_the_most_complete_file(roots):
+    primary, extra = roots
+    catalog = ExportCatalog([primary, extra])
+    frame = catalog.scan().set_index('path')
+    status = lambda path: frame.loc[str(path.resolve()), 'status']
+
+    complete = (extra / 'S1' / 'trial0001.txt').resolve()
+    assert status(complete) == 'canonical'
+    assert status(extra / 'S1' / 'backup' / 'find trial0001.txt') == 'duplicate'
+    assert status(primary / 'S1' / 'trial0001.txt') == 'truncated'
+    assert status(primary / 'S1' / 'trial0002.txt') == 'truncated'
+    assert status(primary / 'S1' / 'vis0001.txt') == 'canonical'
+    assert status(primary / 'S2' / 'vis0001.txt') == 'duplicate'
+    assert status(primary / 'README.txt') == 'not_export'
+
+    assert catalog.explain(complete)['slots'] == ['S1/trial0001', 'S1/trial0002']
+    assert 'several subjects' in catalog.explain(primary / 'S2' / 'vis0001.txt')['reason']
+    assert catalog.resolve_files(sorted((primary / 'S1').glob('trial*.txt'))) == [complete]
+    assert len(catalog.copies(primary / 'S1' / 'trial0002.txt')) == 4
+
+
+def test_hashes_are_reused_while_files_are_unchanged(roots, tmp_path, monkeypatch):
+    primary, extra = roots
+    catalog_file = tmp_path / 'export_catalog.json'
+    expected = ExportCatalog([primary, extra], catalog_file=catalog_file).scan()
+
+    hashed = []
+    hash_file = ExportCatalog._hash
+    def record(self, file_path, *args, **kwargs):
+        hashed.append(file_path)
+        return hash_file(self, file_path, *args, **kwargs)
+    monkeypatch.setattr(ExportCatalog, '_hash', record)
+
+    assert ExportCatalog([primary, extra], catalog_file=catalog_file).scan().equals(expected)
+    assert hashed == []
+
+    touched = primary / 'S1' / 'vis0001.txt'
+    os.utime(touched, ns=(touched.stat().st_mtime_ns + 10**9,) * 2)
+    ExportCatalog([primary, extra], catalog_file=catalog_file).scan()
+    assert hashed == [touched.resolve()]
+
+
+def test_truncated_and_duplicate_exports_match_the_clean_cohort(cohort_dir, cohort_copy, tmp_path, make_manager):
+    # trial0001 only complete under another root; primer0002 copied into a new fragment slot
+    extra = tmp_path / 'dflow_data'
+    (extra / 'SYN00002').mkdir(parents=True)
+    shutil.copy2(cohort_copy / 'SYN00002' / 'trial0001.txt', extra / 'SYN00002' / 'trial0001.txt')
+    export = cohort_copy / 'SYN00002' / 'trial0001.txt'
+    _truncate(export, export.stat().st_size // 2)
+    shutil.copy2(cohort_copy / 'SYN00001' / 'primer0002.txt', cohort_copy / 'SYN00001' / 'primer0004.txt')
+
+    manager = make_manager(cohort_copy, settings={'EXTRA_DATA_ROOTS': [str(extra)]})
+
+    statuses = manager.trial_processor.catalog.to_frame()['status'].value_counts()
+    assert statuses['truncated'] == 1 and statuses['duplicate'] == 1
+    _assert_same_processed_data(manager, make_manager(cohort_dir, output='clean'))
@@ -0,0 +1,88 @@
+"""MotorLearningDataManager: incremental updates of the processed-data cache."""
+
+import shutil
+
+import pandas as pd
+import pytest
+
+from muh.data import MotorLearningDataManager
+from muh.metrics import MetricsCalculator
+from muh.utils import AnomalyLog, DataUtils
+
+
+def _assert_same_processed_data(actual: MotorLearningDataManager, expected: MotorLearningDataManager):
+    assert list(actual.processed_data) == list(expected.processed_data)
+    for subject_id, subject_data in expected.processed_data.items():
+        trials = actual.processed_data[subject_id]['trial_data']
+        assert set(trials) == set(subject_data['trial_data']), subject_id
+        for trial_type, trial in subject_data['trial_data'].items():
+            pd.testing.assert_frame_equal(trials[trial_type]['data'], trial['data'])
+    pd.testing.assert_frame_equal(MetricsCalculator(actual).calculate_all_metrics(),
+                                  MetricsCalculator(expected).calculate_all_metrics())
+
+
+def test_incremental_update_matches_full_reprocess(cohort_copy, make_manager, monkeypatch):
+    make_manager(cohort_copy)
+
+    # Add a subject, change one export, remove a subject
+    metadata = pd.read_csv(cohort_copy / 'metadata.csv')
+    shutil.copytree(cohort_copy / 'SYN00006', cohort_copy / 'SYN00007')
+    metadata = pd.concat([metadata, metadata[metadata['ID'] == 'SYN00006'].assign(ID='SYN00007')])
+    export = cohort_copy / 'SYN00002' / 'trial0001.txt'
+    lines = export.read_text().splitlines(keepends=True)
+    export.write_text(''.join(lines[:len(lines) // 2]))
+    shutil.rmtree(cohort_copy / 'SYN00004')
+    metadata[metadata['ID'] != 'SYN00005'].to_csv(cohort_copy / 'metadata.csv', index=False)
+
+    processed = []
+    process_subject_data = MotorLearningDataManager._process_subject_data
+    def record(self, subject_id, metadata_row, trial_prefixes=None):
+        processed.append((subject_id, trial_prefixes))
+        return process_subject_data(self, subject_id, metadata_row, trial_prefixes)
+    monkeypatch.setattr(MotorLearningDataManager, '_process_subject_data', record)
+
+    updated = make_manager(cohort_copy)
+
+    assert sorted(processed) == [('SYN00002', ['trial']),
+                                 ('SYN00007', list(updated.config.TRIAL_TYPE_MAPPING))]
+    assert list(updated.processed_data) == ['SYN00001', 'SYN00002', 'SYN00003', 'SYN00006', 'SYN00007']
+    monkeypatch.undo()
+    _assert_same_processed_data(updated, make_manager(cohort_copy, output='fresh', force_reprocess=True))
+
+
+def test_unchanged_data_is_not_reprocessed(cohort_dir, make_manager, monkeypatch):
+    make_manager(cohort_dir)
+    monkeypatch.setattr(MotorLearningDataManager, '_process_subject_data',
+                        lambda *args, **kwargs: (_ for _ in ()).throw(AssertionError('reprocessed')))
+
+    cached = make_manager(cohort_dir)
+
+    assert len(cached.processed_data) == 6
+
+
+def test_every_trial_has_an_anomaly_log(cohort_dir, make_manager):
+    trial_types = set()
+    for subject_data in make_manager(cohort_dir).processed_data.values():
+        for trial_type, trial in subject_data['trial_data'].items():
+            assert isinstance(trial['anomalies'], AnomalyLog), trial_type
+            trial_types.add(trial_type)
+    assert 'pref' in trial_types
+
+
+@pytest.mark.parametrize('copy_on_write', [True, False])
+@pytest.mark.parametrize('compact', [True, False])
+def test_filtered_edits_do_not_reach_the_parent(cohort_dir, make_manager, monkeypatch, compact, copy_on_write):
+    # Without Copy-on-Write (pandas < 3.0 by default) the filtered frames must be deep copies
+    monkeypatch.setattr(DataUtils, 'copy_on_write_enabled', staticmethod(lambda: copy_on_write))
+    parent = make_manager(cohort_dir, settings={'COMPACT_TRIALS': compact})
+    parent_df = parent.processed_data['SYN00001']['trial_data']['invis']['data']  # built before filtering
+    expected = parent_df.copy()
+
+    filtered = parent.filter_trials(required_trial_types=['invis'])
+    df = filtered.processed_data['SYN00001']['trial_data']['invis']['data']
+    df.iloc[0, df.columns.get_loc('Success')] = 99.0
+    df.loc[:, 'Constant'] = 0.0
+    df['Extra'] = 1.0
+
+    assert filtered.processed_data['SYN00001']['trial_data']['invis']['data']['Success'].iloc[0] == 99.0
+    pd.testing.assert_frame_equal(parent.processed_data['SYN00001']['trial_data']['invis']['data'], expected)
@@ -0,0 +1,67 @@
+"""Stride change deck: an in-place update must match a fresh build."""
+
+import os
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('pptx')
+from PIL import Image
+from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+
+from muh import deck
+
+
+def _figure(path, color, size=(900, 500)):
+    Image.new('RGB', size, color).save(path)
+    os.utime(path, ns=(os.stat(path).st_mtime_ns + 10**9,) * 2)  # a new mtime even within one clock tick
+
+
+def _write_metadata(path, ages):
+    pd.DataFrame({'ID': list(ages), 'age_months': [age * 12 for age in ages.values()]}).to_csv(path, index=False)
+
+
+def _slides(path):
+    """Text, and image content and placement, of every slide in order."""
+    slides = []
+    for slide in Presentation(path).slides:
+        texts = [shape.text_frame.text for shape in slide.shapes if shape.has_text_frame]
+        pictures = [(shape.image.sha1, shape.left, shape.top, shape.width, shape.height)
+                    for shape in slide.shapes if shape.shape_type == MSO_SHAPE_TYPE.PICTURE]
+        slides.append((texts, pictures))
+    return slides
+
+
+def test_incremental_update_matches_fresh_build(tmp_path, capsys):
+    figures = tmp_path / 'figures'
+    figures.mkdir()
+    metadata = tmp_path / 'metadata.csv'
+    path = lambda subject_id: figures / f'stride_change_{subject_id}_fixed_grid.png'
+    build = lambda output, update: deck.create_powerpoint_from_images(
+        image_paths=deck.find_images_in_directory(str(figures), recursive=False),
+        output_filename=str(output), metadata_path=str(metadata), update=update,
+        thumbnail_dir=str(tmp_path / 'thumbnails'))
+
+    colors = {'SYN00001': 'red', 'SYN00002': 'green', 'SYN00003': 'blue', 'SYN00004': 'gray'}
+    for subject_id, color in colors.items():
+        _figure(path(subject_id), color)
+    _write_metadata(metadata, {'SYN00001': 9.0, 'SYN00002': 12.0, 'SYN00003': 8.0, 'SYN00004': 15.0})
+    updated = tmp_path / 'updated.pptx'
+    assert build(updated, update=True)
+
+    # Add, change and remove a figure, and move a subject in the age order
+    _figure(path('SYN00005'), 'yellow')
+    _figure(path('SYN00002'), 'purple', size=(600, 600))
+    path('SYN00003').unlink()
+    _write_metadata(metadata, {'SYN00001': 9.0, 'SYN00002': 12.0, 'SYN00004': 7.5, 'SYN00005': 10.0})
+    capsys.readouterr()
+    assert build(updated, update=True)
+    assert '1 added, 1 replaced, 1 removed, 2 unchanged' in capsys.readouterr().out
+
+    fresh = tmp_path / 'fresh.pptx'
+    assert build(fresh, update=False)
+    slides = _slides(updated)
+    assert slides == _slides(fresh)
+    assert [texts[0].split(' ')[1] for texts, _ in slides[1:]] == ['SYN00004', 'SYN00001', 'SYN00005', 'SYN00002']
+    assert all(len(pictures) == 1 for _, pictures in slides[1:])
@@ -0,0 +1,55 @@
+"""DensityEstimator: batched densities against one gaussian_kde fit per sample."""
+
+import numpy as np
+import pytest
+from scipy.stats import gaussian_kde
+
+from muh.density import DensityEstimator
+
+
+def _samples():
+    rng = np.random.default_rng(0)
+    return [rng.normal(0.0, 1.0, 40), rng.normal(2.0, 0.5, 7), np.array([]), np.array([1.5]),
+            np.full(5, 0.3), np.append(rng.normal(-1.0, 2.0, 120), np.nan),
+            rng.normal(1.0, 0.8, 3), rng.standard_t(3, 2000)]
+
+
+@pytest.mark.parametrize('max_batch_elements', [4_000_000, 2_000])
+def test_direct_densities_match_gaussian_kde(max_batch_elements):
+    samples = _samples()
+    estimator = DensityEstimator(grid_points=256, max_batch_elements=max_batch_elements,
+                                 binned_min_samples=10**9)
+    grid = estimator.grid_for(samples)
+
+    densities = estimator.evaluate(samples, grid)
+
+    assert densities.shape == (len(samples), 256)
+    for sample, density in zip(samples, densities):
+        sample = sample[~np.isnan(sample)]
+        if len(sample) < 2 or np.ptp(sample) == 0:
+            assert np.isnan(density).all()
+        else:
+            np.testing.assert_allclose(density, gaussian_kde(sample)(grid), rtol=1e-9, atol=1e-12)
+
+
+def test_binned_densities_approximate_gaussian_kde(monkeypatch):
+    samples = _samples()
+    estimator = DensityEstimator(grid_points=1024, binned_min_samples=100)
+    binned_rows = []
+    binned = DensityEstimator._binned
+    def record(self, samples, grids, h):
+        binned_rows.append(len(samples))
+        return binned(self, samples, grids, h)
+    monkeypatch.setattr(DensityEstimator, '_binned', record)
+
+    shared = estimator.grid_for(samples)
+    per_sample = np.array([estimator.grid_for([sample]) for sample in samples])
+    for grid in (shared, per_sample):
+        densities = estimator.evaluate(samples, grid)
+        grids = np.broadcast_to(grid, per_sample.shape)
+        for i in (5, 7):  # the samples of at least binned_min_samples points
+            expected = gaussian_kde(samples[i][~np.isnan(samples[i])])(grids[i])
+            np.testing.assert_allclose(densities[i], expected, atol=2e-3 * expected.max())
+        np.testing.assert_allclose(densities[0], gaussian_kde(samples[0])(grids[0]), rtol=1e-9, atol=1e-12)
+
+    assert binned_rows == [2, 2]
@@ -0,0 +1,72 @@
+"""GaitEventDetector: heel strikes from the force plates against D-Flow's counters."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from muh.gait import GaitEventDetector
+
+N_STRIDES = 6
+STEP = 0.3
+
+
+def _walk(sample_rate: float = 100.0, stride_time: float = 1.0) -> pd.DataFrame:
+    """Square-wave stance phases (left 0.05-0.65, right 0.55-0.95 of each stride) with matching counters."""
+    time = np.arange(int(N_STRIDES * stride_time * sample_rate)) / sample_rate
+    phase = (time / stride_time) % 1
+    columns = {'Time': time}
+    for side, (on, off) in {'Left': (0.05, 0.65), 'Right': (0.55, 0.95)}.items():
+        contact = (phase >= on) & (phase < off)
+        columns[f'{side} vertical force'] = np.where(contact, 200.0, 0.0)
+        columns[f'{side} heel strike'] = np.cumsum(contact & ~np.roll(contact, 1)).astype(float)
+        columns[f'{side} step length'] = np.full(len(time), STEP)
+    columns['Left foot marker'] = np.full(len(time), STEP / 2)
+    columns['Right foot marker'] = np.full(len(time), -STEP / 2)
+    return pd.DataFrame(columns)
+
+
+def test_detected_strikes_match_dflow_counters():
+    events = GaitEventDetector().detect([_walk(), _walk(sample_rate=300.0)])
+
+    assert (events['status'] == 'matched').all()
+    assert events.groupby(['trial', 'side']).size().tolist() == [N_STRIDES] * 4
+    assert events['lag'].abs().max() < 1e-9
+    assert events['step_length'].to_numpy() == pytest.approx(STEP)
+    assert events['step_ok'].all()
+    strides = GaitEventDetector().strides(events)
+    assert strides['valid'].all() and strides.groupby('trial')['stride'].max().tolist() == [N_STRIDES] * 2
+
+
+@pytest.mark.parametrize('counter', ['constant', 'missing'])
+def test_strikes_without_counter_increments(counter):
+    silent = _walk()
+    if counter == 'constant':
+        silent['Right heel strike'] = 0.0
+    else:
+        silent = silent.drop(columns=['Left heel strike', 'Right heel strike'])
+
+    # Alone (no increments anywhere in the batch) and next to a trial that has them
+    for samples in [[silent], [_walk(), silent]]:
+        events = GaitEventDetector().detect(samples)
+
+        trial = len(samples) - 1
+        assert (events.loc[events['trial'] < trial, 'status'] == 'matched').all()
+        events = events[events['trial'] == trial]
+        unmatched = events[events['side'] == 'Right'] if counter == 'constant' else events
+        assert len(unmatched) == N_STRIDES * (1 if counter == 'constant' else 2)
+        assert (unmatched['status'] == 'detected_only').all()
+        assert unmatched[['dflow_count', 'dflow_time', 'dflow_step_length', 'lag']].isna().all().all()
+        assert not unmatched['step_ok'].any()
+
+
+def test_synthetic_exports_agree_with_their_counters(cohort_dir):
+    detector = GaitEventDetector()
+    files = sorted(cohort_dir.glob('SYN*/*.txt'))
+    events = detector.detect([detector.load(path) for path in files])
+
+    # Unmatched: the first left heel strike of each export (before any counter
+    # increment) and the odd strike split by a simulated time jump
+    matched = events[events['status'] == 'matched']
+    for side in GaitEventDetector.SIDES:
+        assert (matched['side'] == side).sum() >= 0.98 * (events['side'] == side).sum()
+    assert matched['step_ok'].all()
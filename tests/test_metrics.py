@@ -0,0 +1,74 @@
+"""MetricsCalculator: the cohort engine against the per-subject engine and pandas."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from muh.metrics import MetricsCalculator
+
+
+def test_cohort_engine_matches_subject_engine(cohort_dir, make_manager):
+    calculator = MetricsCalculator(make_manager(cohort_dir))
+
+    cohort = calculator.calculate_all_metrics(engine='cohort')
+    subject = calculator.calculate_all_metrics(engine='subject')
+
+    assert len(cohort) == 6
+    assert cohort.filter(like='_sr_').notna().all().all()
+    pd.testing.assert_frame_equal(cohort, subject)
+
+
+def test_cohort_engine_matches_subject_engine_on_filtered_manager(cohort_dir, make_manager):
+    data_manager = make_manager(cohort_dir).filter_trials(required_trial_types=['vis1', 'invis', 'vis2'])
+    calculator = MetricsCalculator(data_manager)
+
+    pd.testing.assert_frame_equal(calculator.calculate_all_metrics(engine='cohort'),
+                                  calculator.calculate_all_metrics(engine='subject'))
+
+
+def test_stride_change_tables_are_cached_per_parameter_set(cohort_dir, make_manager, monkeypatch):
+    calculator = MetricsCalculator(make_manager(cohort_dir))
+    parameter_sets = [{'length': 20}, {'length': 10}, {'length': 20, 'trial_types': ['invis']}]
+    expected = [calculator.calculate_stride_changes(**params) for params in parameter_sets]
+
+    # Alternating parameter sets must not evict each other
+    for params, tables in zip(parameter_sets + parameter_sets, expected + expected):
+        for loaded, table in zip(calculator.load_stride_changes(**params), tables):
+            pd.testing.assert_frame_equal(loaded, table)
+
+    monkeypatch.setattr(MetricsCalculator, 'calculate_stride_changes',
+                        lambda *args, **kwargs: (_ for _ in ()).throw(AssertionError('recomputed')))
+    for params in parameter_sets:
+        calculator.load_stride_changes(**params)
+    assert not list(calculator.config.STRIDE_CACHE_DIR.glob('.stride_change*'))
+
+
+@pytest.mark.parametrize('window, min_periods', [(20, None), (10, 4), (1, None)])
+def test_learning_curves_match_pandas_rolling(cohort_dir, make_manager, window, min_periods):
+    data_manager = make_manager(cohort_dir, settings={'COMPACT_TRIALS': False})
+    df = data_manager.processed_data['SYN00002']['trial_data']['invis']['data']
+    df.loc[df.index[5:12], 'Success'] = np.nan  # gaps the windows have to skip
+    df.loc[df.index[::7], 'Sum of gains and steps'] = np.nan
+    calculator = MetricsCalculator(data_manager)
+    criterion = 0.5
+
+    curves = calculator.calculate_learning_curves(window=window, min_periods=min_periods, criterion=criterion)
+
+    expected = []
+    for subject_id, data in data_manager.processed_data.items():
+        for trial_type in calculator.TRIAL_TYPES:
+            trial = data['trial_data'].get(trial_type)
+            if not trial or trial['data'] is None or trial['data'].empty:
+                continue
+            df = trial['data']
+            rolling_sr = df['Success'].rolling(window, min_periods=min_periods).mean().to_numpy()
+            rolling_sd = df['Sum of gains and steps'].rolling(window, min_periods=min_periods).std().to_numpy()
+            reached = np.flatnonzero((rolling_sr >= criterion) & (np.arange(len(df)) >= window - 1))
+            expected.append(pd.DataFrame({
+                'ID': subject_id, 'trial_type': trial_type, 'stride': np.arange(1, len(df) + 1),
+                'rolling_sr': rolling_sr, 'rolling_sd': rolling_sd,
+                'strides_to_criterion': reached[0] + 1.0 if len(reached) else np.nan}))
+    expected = pd.concat(expected, ignore_index=True)
+
+    assert curves['strides_to_criterion'].notna().any()
+    pd.testing.assert_frame_equal(curves, expected, check_dtype=False, atol=1e-9)
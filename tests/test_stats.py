@@ -0,0 +1,96 @@
+"""StatisticalAnalyzer: cached long-format tables and repeated cross-validation."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from muh import cli, stats
+from muh.config import Config
+from muh.metrics import MetricsCalculator
+from muh.stats import StatisticalAnalyzer
+
+
+@pytest.fixture
+def analyzer(cohort_dir, make_manager):
+    data_manager = make_manager(cohort_dir)
+    return StatisticalAnalyzer(MetricsCalculator(data_manager).calculate_all_metrics(), data_manager.config)
+
+
+@pytest.mark.parametrize('attribute, use_filtered', [('filtered_df', True), ('metrics_df', False)])
+def test_long_format_follows_reassigned_frames(analyzer, attribute, use_filtered):
+    n_measures = len(analyzer.long_format(use_filtered=use_filtered)) // len(getattr(analyzer, attribute))
+
+    setattr(analyzer, attribute, getattr(analyzer, attribute).iloc[:2])
+
+    df_long = analyzer.long_format(use_filtered=use_filtered)
+    assert len(df_long) == 2 * n_measures
+    assert set(df_long['subject']) == set(getattr(analyzer, attribute)['ID'])
+
+
+@pytest.fixture
+def cv_analyzer(tmp_path):
+    # 40 subjects (the 6-subject cohort is too small to cross-validate); vis1 is missing for 8
+    rng = np.random.default_rng(0)
+    n = 40
+    age = rng.uniform(7, 18, n)
+    df = pd.DataFrame({'ID': [f'S{i:02d}' for i in range(n)], 'age': age,
+                       'mot_noise': rng.uniform(0, 0.1, n), 'pref_asymmetry': rng.normal(0, 0.05, n)})
+    for trial in ['vis1', 'invis']:
+        df[f'{trial}_sr_max_const'] = np.clip(0.3 + 0.03 * age + rng.normal(0, 0.1, n), 0, 1)
+    df.loc[:7, 'vis1_sr_max_const'] = np.nan
+    return StatisticalAnalyzer(df, Config(str(tmp_path), verbose=False))
+
+
+def test_repeated_cv_runs_every_fold_of_every_repeat(cv_analyzer):
+    cv = cv_analyzer.run_repeated_cv('regression', n_splits=4, n_repeats=3)
+
+    assert (cv['n_splits'], cv['n_repeats']) == (4, 3)
+    assert len(cv['scores']) == 12
+    assert cv['scores'].groupby('repeat')['fold'].apply(list).tolist() == [[0, 1, 2, 3]] * 3
+    assert cv_analyzer.run_repeated_cv('regression', n_repeats=None)['n_repeats'] == cv_analyzer.DEFAULT_CV_REPEATS
+    with pytest.raises(ValueError):
+        cv_analyzer.run_repeated_cv('regression', n_repeats=0)
+
+
+def test_model_sweep_reuses_folds(cv_analyzer, monkeypatch):
+    calls = []
+    cv_folds = stats._cv_folds
+    monkeypatch.setattr(stats, '_cv_folds', lambda task, y, n_splits, seed: calls.append((task, len(y), seed))
+                        or cv_folds(task, y, n_splits, seed))
+
+    sweep = cv_analyzer.run_model_sweep(trial_types=['vis1', 'invis'], conditions=['max'],
+                                        models=[('regression', 'linear'), ('regression', 'random_forest')],
+                                        predictor_sets=[('age',), ('age', 'mot_noise')], n_splits=4, n_repeats=3)
+
+    assert len(sweep) == 8 and sweep['error'].isna().all()
+    assert (sweep['n_splits'] == 4).all() and (sweep['n_repeats'] == 3).all()
+    # One fold set per sample count (32 with vis1, 40 with invis), shared by every model and predictor set
+    assert sorted(calls) == sorted(('regression', n, 42 + repeat) for n in (32, 40) for repeat in range(3))
+    with pytest.raises(ValueError):
+        cv_analyzer.run_model_sweep(n_repeats=0)
+
+
+
+def test_parallel_sweep_matches_serial_sweep_and_repeated_cv(cv_analyzer, capsys):
+    sweep_args = {'trial_types': ['vis1', 'invis'], 'conditions': ['max'],
+                  'predictor_sets': [('age',), ('age', 'mot_noise')],
+                  'models': [('regression', 'linear'), ('classification', 'logistic')], 'n_splits': 4, 'n_repeats': 3}
+
+    parallel = cv_analyzer.run_model_sweep(workers=2, **sweep_args)
+    assert 'Process pool unavailable' not in capsys.readouterr().out
+    serial = cv_analyzer.run_model_sweep(workers=1, **sweep_args)
+
+    pd.testing.assert_frame_equal(parallel, serial)
+    assert parallel['error'].isna().all()
+    for row in parallel.itertuples():
+        cv = cv_analyzer.run_repeated_cv(row.task, row.trial_type, row.condition, row.model_type,
+                                         row.predictors.split('+'), n_splits=4, n_repeats=3)
+        for score, summary in cv['summary'].items():
+            assert getattr(row, f'{score}_mean') == pytest.approx(summary['mean'], rel=1e-12), (row.Index, score)
+
+
+def test_cli_rejects_zero_cv_repeats(capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main(['stats', '--cv-repeats', '0'])
+    assert exit_info.value.code == 2
+    assert '--cv-repeats must be at least 1' in capsys.readouterr().err
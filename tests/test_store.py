@@ -0,0 +1,42 @@
+"""MetricsStore: change detection and lossless text values."""
+
+import json
+
+import pytest
+
+from muh import cli
+from muh.analysis import MotorLearningAnalysis
+from muh.metrics import MetricsCalculator
+from muh.pipeline import StreamlinedMotorLearningPipeline
+from muh.store import MetricsStore
+
+
+def test_index_metrics_are_stored_as_json_lists(cohort_dir, make_manager, tmp_path):
+    metrics_df = MetricsCalculator(make_manager(cohort_dir)).calculate_all_metrics()
+    store = MetricsStore(tmp_path / 'metrics.sqlite')
+
+    first = store.record(metrics_df)
+    assert store.record(metrics_df.copy())['n_changed'] == 0
+
+    stored = store.values(runs=[first['run_id']], metrics=['invis_max_const_indices'])
+    assert len(stored) == len(metrics_df)
+    for row in stored.itertuples():
+        indices = metrics_df.set_index('ID').loc[row.subject_id, 'invis_max_const_indices']
+        assert len(indices) > 0
+        assert json.loads(row.text) == indices.tolist()
+
+
+def test_pipeline_runs_are_visible_to_history(cohort_dir, make_manager, tmp_path, capsys):
+    data_manager = make_manager(cohort_dir)
+    metrics_df = MetricsCalculator(data_manager).calculate_all_metrics()
+    pipeline = StreamlinedMotorLearningPipeline(MotorLearningAnalysis(data_manager, metrics_df),
+                                                str(tmp_path / 'elsewhere'))
+
+    exported = pipeline._stage_export_metrics(data_manager, metrics_df)['exported_files']
+
+    assert exported[0] == str(data_manager.config.METRICS_STORE_FILE)
+    capsys.readouterr()
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main(['history', '--output', str(data_manager.config.BASE_OUTPUT_DIR)])
+    assert exit_info.value.code == 0
+    assert pipeline.analysis_timestamp in capsys.readouterr().out
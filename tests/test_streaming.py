@@ -0,0 +1,58 @@
+"""LiveTrialMonitor against the batch metrics of the finished export."""
+
+import math
+import multiprocessing
+import shutil
+
+import pandas as pd
+import pytest
+
+from muh.metrics import MetricsCalculator
+from muh.streaming import LiveTrialMonitor
+from synthetic_dflow_generator import write_export
+
+SUBJECT = 'SYN00003'
+
+
+def _append_in_chunks(source, target, chunk_size):
+    """Write `source` to `target` in odd-sized chunks (another process, as D-Flow would)."""
+    data = source.read_bytes().rstrip(b'\n')  # the last line stays partial
+    with open(target, 'ab') as file:
+        for start in range(0, len(data), chunk_size):
+            file.write(data[start:start + chunk_size])
+            file.flush()
+
+
+@pytest.mark.parametrize('step_sign', [1, -1])
+def test_snapshot_matches_batch_metrics(cohort_dir, make_manager, tmp_path, step_sign):
+    # One-subject cohort with a single invis export; negated step lengths sum
+    # to a negative denominator, as in some real recordings
+    root = tmp_path / 'data'
+    (root / SUBJECT).mkdir(parents=True)
+    metadata = pd.read_csv(cohort_dir / 'metadata.csv')
+    metadata[metadata['ID'] == SUBJECT].to_csv(root / 'metadata.csv', index=False)
+    export = root / SUBJECT / 'trial0001.txt'
+    if step_sign == 1:
+        shutil.copy(cohort_dir / SUBJECT / 'trial0001.txt', export)
+    else:
+        df = pd.read_csv(cohort_dir / SUBJECT / 'trial0001.txt', sep='\t')
+        df[['Right step length', 'Left step length']] *= -1
+        write_export(df, export)
+
+    batch = MetricsCalculator(make_manager(root)).calculate_all_metrics().iloc[0]
+
+    live_file = tmp_path / 'live.txt'
+    live_file.touch()
+    monitor = LiveTrialMonitor(str(live_file), trial_type='invis')
+    writer = multiprocessing.Process(target=_append_in_chunks, args=(export, live_file, 7919))
+    writer.start()
+    while writer.is_alive():
+        monitor.poll()
+    writer.join()
+    assert writer.exitcode == 0
+    snapshot = monitor.finish()
+
+    keys = [key for key in snapshot if key.endswith('_const') and key in batch.index]
+    assert {'invis_sr_max_const', 'invis_asymmetry_max_const', 'invis_asymmetry_min_const'} <= set(keys)
+    for key in keys:
+        assert math.isclose(snapshot[key], batch[key], rel_tol=1e-9, abs_tol=1e-12), key
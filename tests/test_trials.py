@@ -0,0 +1,71 @@
+"""TrialProcessor: stride ranges probed from the header and file tail, and fragment merging."""
+
+import io
+
+import pandas as pd
+import pytest
+
+from muh.trials import TrialProcessor
+
+
+def _stride_numbers(path):
+    return pd.read_csv(path, sep='\t', usecols=['Stride Number'])['Stride Number']
+
+
+def test_probe_matches_full_read(cohort_dir):
+    processor = TrialProcessor(debug=False)
+    for path in sorted(cohort_dir.glob('SYN*/*.txt')):
+        if path.name.startswith('pref'):
+            continue
+        strides = _stride_numbers(path)
+        info = processor.probe_stride_range(path)
+        assert (info['first'], info['last']) == (strides.iloc[0], strides.iloc[-1]), path
+
+
+def test_probe_skips_partial_last_line(cohort_dir, tmp_path):
+    source = cohort_dir / 'SYN00001' / 'trial0001.txt'
+    lines = source.read_text().splitlines(keepends=True)
+    partial = tmp_path / 'trial0001.txt'
+    partial.write_text(''.join(lines[:-1]) + lines[-1][:len(lines[-1]) // 3])
+
+    info = TrialProcessor(debug=False).probe_stride_range(partial)
+
+    assert info['last'] == float(lines[-2].split('\t')[11])
+
+
+def test_probe_is_cached_until_the_file_changes(cohort_dir, tmp_path):
+    source = cohort_dir / 'SYN00001' / 'trial0001.txt'
+    lines = source.read_text().splitlines(keepends=True)
+    path = tmp_path / 'trial0001.txt'
+    path.write_text(''.join(lines[:50]))
+    processor = TrialProcessor(debug=False)
+
+    first = processor.probe_stride_range(path)
+    assert processor.probe_stride_range(path) is first
+
+    path.write_text(''.join(lines))
+    assert processor.probe_stride_range(path)['last'] == _stride_numbers(source).iloc[-1]
+
+
+@pytest.mark.parametrize('block_size', [1, 7, 64, 8192])
+def test_read_last_line_across_blocks(block_size):
+    file = io.BytesIO(b'header\n1\t2\n3\t4\n\n5\t6')
+    assert TrialProcessor._read_last_line(file, block_size=block_size) == '3\t4'
+
+    file = io.BytesIO(b'header\n1\t2\n')
+    assert TrialProcessor._read_last_line(file, block_size=block_size) == '1\t2'
+
+
+def test_probed_merge_matches_sorted_merge(cohort_dir):
+    files = sorted((cohort_dir / 'SYN00001').glob('primer*.txt'))
+    assert len(files) > 1
+    processor = TrialProcessor(debug=False)
+    ranges = sorted((processor.probe_stride_range(f) for f in files), key=lambda info: info['first'])
+    sequence = processor._find_best_sequence(ranges)
+    paths = [info['path'] for info in sequence]
+
+    merged = processor._combine_trial_fragments(files)
+
+    # Without probed ranges _merge_files always sorts and deduplicates
+    pd.testing.assert_frame_equal(merged, processor._merge_files(paths))
+    assert merged['Stride Number'].is_monotonic_increasing
@@ -0,0 +1,71 @@
+"""CompactFrame / TrialRecord: compact trial storage must be lossless."""
+
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from muh.metrics import MetricsCalculator
+from muh.utils import AnomalyLog, CompactFrame, DataUtils, TrialRecord
+
+
+@pytest.fixture
+def plain_manager(cohort_dir, make_manager):
+    return make_manager(cohort_dir, output='plain', settings={'COMPACT_TRIALS': False})
+
+
+def test_processed_trials_round_trip_exactly(plain_manager):
+    n_trials = 0
+    for subject_data in plain_manager.processed_data.values():
+        for trial in subject_data['trial_data'].values():
+            df = trial['data']
+            compact = CompactFrame.from_frame(df)
+            pd.testing.assert_frame_equal(compact.to_frame(), df, check_exact=True)
+            columns = list(df.columns[1::3])
+            pd.testing.assert_frame_equal(compact.to_frame(columns), df[columns], check_exact=True)
+            assert compact.nbytes < df.memory_usage(index=True).sum()
+
+            record = pickle.loads(pickle.dumps(TrialRecord.from_dict(trial)))
+            pd.testing.assert_frame_equal(record['data'], df, check_exact=True)
+            assert set(record) == set(trial)
+            n_trials += 1
+    assert n_trials >= 18
+
+
+def test_compact_manager_matches_plain_manager(cohort_dir, make_manager, plain_manager):
+    compact_manager = make_manager(cohort_dir)
+    assert isinstance(compact_manager.processed_data['SYN00001']['trial_data']['invis'], TrialRecord)
+
+    pd.testing.assert_frame_equal(MetricsCalculator(compact_manager).calculate_all_metrics(),
+                                  MetricsCalculator(plain_manager).calculate_all_metrics())
+
+
+def test_encodings_round_trip():
+    n = 400
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'runs': np.repeat([1.5, np.nan, 2.25, -0.1], n // 4),
+        'flags': rng.integers(0, 2, n).astype(np.int64),
+        'wide_ints': rng.integers(-40000, 40000, n),
+        'six_decimals': np.round(rng.normal(size=n), 6),
+        'full_precision': rng.normal(size=n),
+        'with_nan': np.where(rng.random(n) < 0.1, np.nan, np.round(rng.random(n), 3)),
+        'labels': rng.choice(['a', 'b', None], n),
+        'bools': rng.random(n) < 0.5
+    }, index=pd.Index(np.arange(n) * 3 + 7, name='sample'))
+
+    compact = CompactFrame.from_frame(df)
+    kinds = {col: encoded['kind'] for col, encoded in zip(compact.columns, compact.encoded)}
+
+    assert kinds['runs'] == 'rle' and kinds['flags'] == 'int' and kinds['six_decimals'] == 'float32'
+    pd.testing.assert_frame_equal(compact.to_frame(), df, check_exact=True)
+    pd.testing.assert_frame_equal(CompactFrame.from_frame(df.iloc[:0]).to_frame(), df.iloc[:0], check_exact=True)
+
+
+@pytest.mark.parametrize('df', [None, pd.DataFrame({'Sum of gains and steps': []})])
+def test_detect_anomalies_returns_a_log_for_empty_input(df):
+    result, anomalies = DataUtils.detect_anomalies(df)
+    assert result is df
+    assert isinstance(anomalies, AnomalyLog) and len(anomalies) == 0
+    assert pickle.loads(pickle.dumps(anomalies)).count(DataUtils.ANOMALY_TIME_JUMP) == 0